@@ -51,7 +51,8 @@ try:
     
     # Import Phase 2 modules
     from utils.async_file_handler import AsyncFileHandler
-    from utils.resource_manager import ResourceManager, RateLimiter
+    from utils.resource_manager import ResourceManager, RateLimiter, get_connection_pool, close_connection_pool
+    from utils.replicate_client import AsyncReplicateClient
     from models.config_models import (
         ApplicationConfig,
         AssetGenerationRequest,
@@ -73,6 +74,10 @@ except ImportError as e:
     ErrorHandler = None
     AsyncFileHandler = None
     ResourceManager = None
+    RateLimiter = None
+    get_connection_pool = None
+    close_connection_pool = None
+    AsyncReplicateClient = None
     ApplicationConfig = None
 
 # Initialize colorama for cross-platform colored output
@@ -351,8 +356,25 @@ class AssetGenerator:
         # Set both variables for compatibility
         os.environ['REPLICATE_API_TOKEN'] = api_key
         os.environ['REPLICATE_API_KEY'] = api_key
+        
+        # Async client: one poller resolves every in-flight prediction
+        self.replicate_client = AsyncReplicateClient.from_env(
+            api_key,
+            http_pool=get_connection_pool(),
+            logger=self.logger
+        ) if AsyncReplicateClient else None
         self.logger.info("✓ Replicate API client initialized")
     
+    async def run_replicate(self, model_id: str, model_input: Dict[str, Any]) -> Any:
+        """Run a Replicate prediction and return its output
+        
+        Uses the async client when available so no thread is held per
+        in-flight prediction; falls back to replicate.run in a thread.
+        """
+        if self.replicate_client:
+            return await self.replicate_client.run(model_id, model_input)
+        return await asyncio.to_thread(replicate.run, model_id, input=model_input)
+    
     def sync_with_yaml(self) -> Dict[str, List[Dict]]:
         """Use comprehensive YAML sync with fallback parsing for malformed files"""
         self.logger.info("Using comprehensive YAML sync with fallback parsing...")
@@ -444,11 +466,7 @@ class AssetGenerator:
                 # Define API call function
                 async def api_call():
                     await asyncio.sleep(1 / self.config['replicate']['rate_limit'])
-                    return await asyncio.to_thread(
-                        replicate.run,
-                        model_id,
-                        input={"prompt": prompt}
-                    )
+                    return await self.run_replicate(model_id, {"prompt": prompt})
                 
                 # Define download function
                 async def download_call(output):
@@ -539,11 +557,7 @@ class AssetGenerator:
             await asyncio.sleep(1 / self.config['replicate']['rate_limit'])
             
             # Generate image
-            output = await asyncio.to_thread(
-                replicate.run,
-                model_id,
-                input={"prompt": prompt}
-            )
+            output = await self.run_replicate(model_id, {"prompt": prompt})
             
             # Update cost and statistics
             self.total_cost += cost
@@ -888,6 +902,221 @@ class AssetGenerator:
             self.logger.error(f"Sample generation failed: {str(e)}")
             return False
     
+    async def _run_prediction(self, asset_type: str, prompt: str, cost: float, limiter: RateLimiter) -> Any:
+        """Run one Replicate prediction (no download) with circuit breaker and transaction safety
+        
+        Returns:
+            Replicate output (URL or list of URLs)
+        """
+        model_id = self.config['replicate']['models'][asset_type]['model_id']
+        
+        if self.replicate_circuit and not self.replicate_circuit.can_attempt_call():
+            raise APIError("Replicate API circuit breaker is open")
+        
+        async def api_call():
+            await limiter.acquire()
+            return await self.run_replicate(model_id, {"prompt": prompt})
+        
+        try:
+            if self.transaction_manager:
+                output = await self.transaction_manager.execute_with_transaction(
+                    asset_type=asset_type,
+                    cost=cost,
+                    api_call=api_call,
+                    prompt=prompt,
+                    is_production=True
+                )
+                self.total_cost = self.transaction_manager.total_cost
+            else:
+                output = await api_call()
+                self.total_cost += cost
+        except Exception:
+            if self.replicate_circuit:
+                self.replicate_circuit.call_failed()
+            raise
+        
+        if self.replicate_circuit:
+            self.replicate_circuit.call_succeeded()
+        return output
+    
+    def _write_production_manifest(self, total_assets: int):
+        """Atomically (re)write the production manifest"""
+        manifest_path = Path(self.config['output']['production_directory']) / "manifest.json"
+        tmp_path = manifest_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'assets': self.generated_assets,
+                'total_cost': self.total_cost,
+                'errors': self.errors,
+                'timestamp': datetime.now().isoformat(),
+                'production': True,
+                'total_generated': len(self.generated_assets),
+                'total_expected': total_assets
+            }, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+    
+    async def run_production_pipeline(self, jobs: List[Tuple[str, int, int, Dict]], budget: float,
+                                      total_assets: int, pbar: Optional[tqdm] = None) -> bool:
+        """Generate, download and persist assets as three concurrent stages
+        
+        Predictions are submitted concurrently (replicate.max_concurrent_predictions)
+        under the shared rate limit; finished outputs are downloaded by
+        AsyncImageDownloader workers; a single persist stage records results
+        and checkpoints the manifest. Bounded queues between the stages apply
+        backpressure, so predictions pause when downloads fall behind. Each
+        stage records a failing job and moves on, so one error cannot stop a
+        stage and leave the others blocked on a full queue.
+        
+        Args:
+            jobs: (asset_type, index, type_total, page item) per asset
+            budget: Production budget; in-flight predictions count against it
+            total_assets: Expected total, recorded in the manifest
+            pbar: Optional progress bar advanced once per finished job
+            
+        Returns:
+            False if the budget stopped generation early, True otherwise
+        """
+        from utils.async_downloader import AsyncImageDownloader, DownloadTask, DownloadStatus
+        
+        replicate_config = self.config['replicate']
+        prediction_workers = replicate_config.get('max_concurrent_predictions', 4)
+        download_workers = replicate_config.get('max_concurrent_downloads', 5)
+        limiter = RateLimiter(replicate_config['rate_limit'], 1, self.logger)
+        downloader = AsyncImageDownloader(max_concurrent=download_workers, timeout=30, retry_delay=2.0)
+        output_dir = Path(self.config['output']['production_directory'])
+        if self.path_validator:
+            output_dir = self.path_validator.ensure_directory_exists(output_dir)
+        else:
+            output_dir.mkdir(parents=True, exist_ok=True)
+        
+        download_queue: asyncio.Queue = asyncio.Queue(maxsize=download_workers * 2)
+        persist_queue: asyncio.Queue = asyncio.Queue(maxsize=download_workers * 2)
+        pending_jobs = iter(jobs)
+        reserved_cost = 0.0
+        budget_hit = False
+        
+        def record_failure(job, error: str):
+            asset_type, i, _, item = job
+            self.logger.error(f"Failed to generate {asset_type} #{i}: {error}")
+            self.errors.append({
+                'type': asset_type,
+                'index': i,
+                'title': item.get('title', 'Unknown'),
+                'error': error
+            })
+            if pbar:
+                pbar.update(1)
+        
+        async def predict_stage():
+            nonlocal reserved_cost, budget_hit
+            for job in pending_jobs:
+                asset_type, i, type_total, item = job
+                if budget_hit:
+                    return
+                cost = self.get_model_price(self.config['replicate']['models'][asset_type]['model_id'])
+                if self.total_cost + reserved_cost + cost > budget:
+                    self.logger.error(f"Budget limit would be exceeded: ${self.total_cost + reserved_cost + cost:.2f} > ${budget:.2f}")
+                    budget_hit = True
+                    return
+                
+                reserved_cost += cost
+                try:
+                    output = await self._run_prediction(asset_type, item['prompt'], cost, limiter)
+                except Exception as e:
+                    record_failure(job, str(e))
+                    continue
+                finally:
+                    reserved_cost -= cost
+                
+                if not output:
+                    record_failure(job, "Replicate returned no output")
+                    continue
+                image_url = output[0] if isinstance(output, list) else output
+                # Waits here when downloads are behind
+                await download_queue.put((job, str(image_url), cost))
+        
+        async def download_stage():
+            while True:
+                entry = await download_queue.get()
+                if entry is None:
+                    return
+                job, image_url, cost = entry
+                asset_type, i, _, _ = job
+                filename = f"{asset_type}_{i:03d}.png"
+                task = DownloadTask(url=image_url, filepath=output_dir / filename, task_id=filename)
+                try:
+                    task = await downloader.download_single(task)
+                except Exception as e:
+                    record_failure(job, f"Download failed: {e}")
+                    continue
+                await persist_queue.put((job, image_url, cost, task))
+        
+        async def persist_stage():
+            while True:
+                entry = await persist_queue.get()
+                if entry is None:
+                    return
+                job, image_url, cost, task = entry
+                asset_type, i, _, item = job
+                if task.status != DownloadStatus.COMPLETED:
+                    record_failure(job, f"Download failed: {task.error}")
+                    continue
+                
+                try:
+                    # Cost was charged when the prediction finished
+                    self.update_statistics(asset_type, count=1)
+                    self.generation_stats['total_cost'] = self.total_cost
+                    self.generated_assets.append({
+                        'type': asset_type,
+                        'asset_type': asset_type,
+                        'filename': task.filepath.name,
+                        'prompt': item['prompt'],
+                        'output': image_url,
+                        'cost': cost,
+                        'checksum': task.checksum,
+                        'timestamp': datetime.now().isoformat(),
+                        'model_id': self.config['replicate']['models'][asset_type]['model_id'],
+                        'index': i,
+                        'metadata': {
+                            'title': item.get('title', 'Unknown'),
+                            'slug': item.get('slug', ''),
+                            'category': item.get('category', ''),
+                            'production': True
+                        }
+                    })
+                except Exception as e:
+                    record_failure(job, f"Recording result failed: {e}")
+                    continue
+                if pbar:
+                    pbar.update(1)
+                
+                # Checkpoint so an interrupted run keeps what it paid for
+                if len(self.generated_assets) % 10 == 0:
+                    try:
+                        await asyncio.to_thread(self._write_production_manifest, total_assets)
+                    except Exception as e:
+                        # The asset is kept; the final manifest write retries
+                        self.logger.error(f"Manifest checkpoint failed: {e}")
+                        continue
+                    self.print_status("PROGRESS", f"Generated {len(self.generated_assets)}/{total_assets} assets")
+        
+        predictors = [asyncio.create_task(predict_stage()) for _ in range(prediction_workers)]
+        downloaders = [asyncio.create_task(download_stage()) for _ in range(download_workers)]
+        persister = asyncio.create_task(persist_stage())
+        try:
+            await asyncio.gather(*predictors)
+            for _ in downloaders:
+                await download_queue.put(None)
+            await asyncio.gather(*downloaders)
+            await persist_queue.put(None)
+            await persister
+        finally:
+            for task in predictors + downloaders + [persister]:
+                task.cancel()
+            await downloader.cleanup()
+        
+        return not budget_hit
+    
     async def generate_mass_production(self):
         """Generate all production assets after approval"""
         self.logger.info("\n" + "="*80)
@@ -926,68 +1155,24 @@ class AssetGenerator:
         self.config['output']['sample_directory'] = self.config['output']['production_directory']
         
         try:
-            # Process each asset type with progress tracking
-            with tqdm(total=total_assets, desc="Mass Production", unit="asset") as pbar:
-                for asset_type, items in pages_by_type.items():
-                    if asset_type not in self.config['replicate']['models']:
-                        self.logger.warning(f"Skipping {asset_type}: no model configured")
-                        pbar.update(len(items))
-                        continue
-                    
-                    self.print_status("PRODUCTION", f"Generating {len(items)} {asset_type}")
-                    
-                    for i, item in enumerate(items, 1):
-                        # Check budget before each generation
-                        model_config = self.config['replicate']['models'][asset_type]
-                        cost = model_config['cost_per_image']
-                        
-                        if self.total_cost + cost > production_budget:
-                            self.logger.error(f"Budget limit would be exceeded: ${self.total_cost + cost:.2f} > ${production_budget:.2f}")
-                            self.logger.warning(f"Stopping after {len(self.generated_assets)} assets")
-                            return False
-                        
-                        # Generate the asset
-                        try:
-                            result = await self.generate_asset(asset_type, item['prompt'], i, len(items))
-                            if result:
-                                # Add metadata from YAML
-                                result['metadata'] = {
-                                    'title': item.get('title', 'Unknown'),
-                                    'slug': item.get('slug', ''),
-                                    'category': item.get('category', ''),
-                                    'production': True
-                                }
-                                self.generated_assets.append(result)
-                        except Exception as e:
-                            self.logger.error(f"Failed to generate {asset_type} #{i}: {str(e)}")
-                            self.errors.append({
-                                'type': asset_type,
-                                'index': i,
-                                'title': item.get('title', 'Unknown'),
-                                'error': str(e)
-                            })
-                        
-                        pbar.update(1)
-                        
-                        # Show periodic status updates
-                        if len(self.generated_assets) % 10 == 0:
-                            self.print_status(
-                                "PROGRESS",
-                                f"Generated {len(self.generated_assets)}/{total_assets} assets"
-                            )
+            # Queue every asset that has a model configured
+            jobs = []
+            for asset_type, items in pages_by_type.items():
+                if asset_type not in self.config['replicate']['models']:
+                    self.logger.warning(f"Skipping {asset_type}: no model configured")
+                    continue
+                self.print_status("PRODUCTION", f"Queued {len(items)} {asset_type}")
+                jobs.extend((asset_type, i, len(items), item) for i, item in enumerate(items, 1))
+            
+            # Generate, download and persist as a pipeline
+            with tqdm(total=len(jobs), desc="Mass Production", unit="asset") as pbar:
+                within_budget = await self.run_production_pipeline(jobs, production_budget, total_assets, pbar)
             
             # Save production manifest
-            manifest_path = Path(self.config['output']['production_directory']) / "manifest.json"
-            with open(manifest_path, 'w') as f:
-                json.dump({
-                    'assets': self.generated_assets,
-                    'total_cost': self.total_cost,
-                    'errors': self.errors,
-                    'timestamp': datetime.now().isoformat(),
-                    'production': True,
-                    'total_generated': len(self.generated_assets),
-                    'total_expected': total_assets
-                }, f, indent=2)
+            self._write_production_manifest(total_assets)
+            if not within_budget:
+                self.logger.warning(f"Stopped after {len(self.generated_assets)} assets: production budget reached")
+                return False
             
             self.logger.info("\n" + "="*80)
             self.logger.info(f"✅ MASS PRODUCTION COMPLETE")
@@ -1022,11 +1207,7 @@ class AssetGenerator:
             await asyncio.sleep(1 / self.config['replicate']['rate_limit'])
             
             # Generate image with new prompt
-            output = await asyncio.to_thread(
-                replicate.run,
-                model_id,
-                input={"prompt": prompt}
-            )
+            output = await self.run_replicate(model_id, {"prompt": prompt})
             
             # Update cost tracking and statistics
             self.total_cost += cost
@@ -1279,24 +1460,20 @@ class AssetGenerator:
             ) -> Optional[str]:
                 """Generate single image for queue processing"""
                 try:
-                    # Use existing generation method
-                    output = await self.replicate_client.predictions.create(
-                        model=self.config['replicate']['model_version'],
-                        input={
-                            "prompt": prompt,
-                            "width": 1024,
-                            "height": 1024,
-                            "num_outputs": 1
-                        }
-                    )
+                    # The batch is queued as "mixed"; look up this prompt's own type
+                    asset_type = asset_types[metadata['batch_index']]
+                    model_id = self.config['replicate']['models'][asset_type]['model_id']
                     
-                    # Wait for completion
-                    while output.status not in ['succeeded', 'failed']:
-                        await asyncio.sleep(1)
-                        output = await self.replicate_client.predictions.get(output.id)
+                    # Resolved by the client's shared poller
+                    output = await self.run_replicate(model_id, {
+                        "prompt": prompt,
+                        "width": 1024,
+                        "height": 1024,
+                        "num_outputs": 1
+                    })
                     
-                    if output.status == 'succeeded' and output.output:
-                        return output.output[0] if isinstance(output.output, list) else output.output
+                    if output:
+                        return output[0] if isinstance(output, list) else output
                     
                     return None
                     
@@ -1601,6 +1778,10 @@ async def main():
     except Exception as e:
         generator.logger.error(f"Fatal error: {str(e)}")
     finally:
+        if generator.replicate_client:
+            await generator.replicate_client.close()
+        if close_connection_pool:
+            await close_connection_pool()
         generator.print_final_summary()
 
 if __name__ == "__main__":
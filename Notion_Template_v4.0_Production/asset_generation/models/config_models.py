@@ -79,6 +79,18 @@ class ReplicateConfig(BaseModel):
         le=10.0,
         description="Requests per second rate limit"
     )
+    max_concurrent_predictions: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="Predictions in flight during mass production"
+    )
+    max_concurrent_downloads: int = Field(
+        default=5,
+        ge=1,
+        le=32,
+        description="Concurrent image downloads during mass production"
+    )
     models: Dict[str, ModelConfig] = Field(
         ...,
         description="Model configurations by asset type"
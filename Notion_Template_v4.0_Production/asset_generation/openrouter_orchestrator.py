@@ -7,9 +7,13 @@ Orchestrates multiple AI models to generate competing prompts with quality scori
 import os
 import json
 import asyncio
-import aiohttp
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, AsyncIterator
 from websocket_broadcaster import get_broadcaster
+from utils.resource_manager import (
+    ConnectionPoolManager, RateLimiter, get_connection_pool, close_connection_pool
+)
+from utils.prompt_cache import get_master_prompt_cache, master_prompt_type
+from utils.llm_log_sink import LLMLogSink, get_llm_log_sink, close_llm_log_sinks
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import logging
@@ -51,11 +55,31 @@ class PromptCompetition:
 class OpenRouterOrchestrator:
     """Orchestrates multiple AI models via OpenRouter for competitive prompt generation"""
     
-    def __init__(self, api_key: str = None):
-        """Initialize the orchestrator with OpenRouter API key"""
+    def __init__(self, api_key: str = None, http_pool: Optional[ConnectionPoolManager] = None,
+                 max_concurrency: Optional[int] = None, requests_per_second: Optional[float] = None,
+                 llm_log: Optional[LLMLogSink] = None):
+        """Initialize the orchestrator with OpenRouter API key
+        
+        Args:
+            api_key: OpenRouter API key (defaults to OPENROUTER_API_KEY)
+            http_pool: Connection pool for API calls (defaults to the process-wide pool)
+            max_concurrency: Maximum OpenRouter calls in flight (defaults to OPENROUTER_MAX_CONCURRENCY or 8)
+            requests_per_second: Sustained OpenRouter request rate (defaults to OPENROUTER_RPS or 4)
+            llm_log: Sink for LLM interaction records (defaults to logs/llm_generations/master_llm_log.jsonl)
+        """
         self.api_key = api_key or os.getenv('OPENROUTER_API_KEY')
         if not self.api_key:
             raise ValueError("OpenRouter API key is required")
+        self.http_pool = http_pool or get_connection_pool()
+        self.logger = self._setup_logger()
+        
+        # Concurrency and rate limits shared by every OpenRouter call
+        self.max_concurrency = max_concurrency or int(os.getenv('OPENROUTER_MAX_CONCURRENCY', '8'))
+        self.requests_per_second = requests_per_second or float(os.getenv('OPENROUTER_RPS', '4'))
+        self.max_retries = int(os.getenv('OPENROUTER_MAX_RETRIES', '3'))
+        self._call_slots: Optional[asyncio.Semaphore] = None
+        self._rate_limiter: Optional[RateLimiter] = None
+        self._limits_loop: Optional[asyncio.AbstractEventLoop] = None
         
         # Model configurations for different perspectives
 
@@ -86,10 +110,10 @@ class OpenRouterOrchestrator:
         }
         
         self.base_url = "https://openrouter.ai/api/v1/chat/completions"
-        self.logger = self._setup_logger()
-        # Master prompt is now loaded dynamically based on asset_type
+        # Master prompt is loaded per asset_type through the shared cache
+        self.prompt_cache = get_master_prompt_cache(Path("meta_prompts"))
         self.logs_dir = Path("logs/llm_generations")
-        self.logs_dir.mkdir(parents=True, exist_ok=True)
+        self.llm_log = llm_log or get_llm_log_sink(self.logs_dir / "master_llm_log.jsonl")
         
     def _setup_logger(self) -> logging.Logger:
         """Set up logging for the orchestrator"""
@@ -112,47 +136,19 @@ class OpenRouterOrchestrator:
         return logger
     
     def _load_master_prompt(self, asset_type: str = None) -> str:
-        """Load the master prompt from file based on asset type
+        """Load the master prompt for an asset type
+        
+        Served from the process-wide prompt cache; the file is only reread
+        after it changes on disk or the dashboard saves a new version.
         
         Args:
             asset_type: Type of asset ('icons', 'covers', etc.)
                        If None, loads the default master_prompt.txt
         """
-        # Determine which master prompt file to use
-        if asset_type in ['icons', 'database_icons']:
-            # Use icon-specific master prompt for icon assets
-            master_prompt_file = "master_prompt_icons.txt"
-        elif asset_type in ['covers', 'cover']:
-            # Use cover-specific master prompt for cover assets
-            master_prompt_file = "master_prompt_covers.txt"
-        else:
-            # Use default master prompt for other assets or when not specified
-            master_prompt_file = "master_prompt.txt"
-        
-        master_prompt_path = Path("meta_prompts") / master_prompt_file
-        
-        # Try to load the specific master prompt, fall back to default if not found
         try:
-            with open(master_prompt_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            self.logger.info(f"Loaded master prompt from {master_prompt_path} for asset_type: {asset_type}")
+            content, path = self.prompt_cache.get(master_prompt_type(asset_type))
+            self.logger.debug(f"Using master prompt {path} for asset_type: {asset_type}")
             return content
-        except FileNotFoundError:
-            if master_prompt_file != "master_prompt.txt":
-                # Try to fall back to default master prompt
-                self.logger.warning(f"Master prompt file not found: {master_prompt_path}, trying default")
-                default_path = Path("meta_prompts/master_prompt.txt")
-                try:
-                    with open(default_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    self.logger.info(f"Loaded default master prompt from {default_path}")
-                    return content
-                except FileNotFoundError:
-                    self.logger.error(f"Default master prompt file not found: {default_path}")
-                    raise ValueError(f"Neither specific nor default master prompt file found")
-            else:
-                self.logger.error(f"Master prompt file not found: {master_prompt_path}")
-                raise ValueError(f"Master prompt file not found: {master_prompt_path}")
         except Exception as e:
             self.logger.error(f"Failed to load master prompt: {e}")
             raise
@@ -208,33 +204,78 @@ class OpenRouterOrchestrator:
             }
         }
         
-        # Save to individual log file
-        log_filename = f"llm_generation_{model}_{timestamp.replace(':', '-').replace('.', '-')}.json"
-        log_path = self.logs_dir / log_filename
+        # Queued and appended to the master JSONL log in batches off the event loop
+        self.llm_log.write(log_entry)
+    
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://estate-planning-concierge.com",
+            "X-Title": "Estate Planning Concierge v4.0"
+        }
+    
+    def _limits(self) -> Tuple[asyncio.Semaphore, RateLimiter]:
+        """Concurrency slots and rate limiter for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._limits_loop is not loop:
+            self._call_slots = asyncio.Semaphore(self.max_concurrency)
+            self._rate_limiter = RateLimiter(self.requests_per_second, self.max_concurrency, self.logger)
+            self._limits_loop = loop
+        return self._call_slots, self._rate_limiter
+    
+    async def _post_completion(self, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        """POST a chat completion within the concurrency and rate limits
         
-        try:
-            with open(log_path, 'w', encoding='utf-8') as f:
-                json.dump(log_entry, f, indent=2, ensure_ascii=False)
-            self.logger.info(f"Logged LLM interaction to {log_path}")
-        except Exception as e:
-            self.logger.error(f"Failed to log LLM interaction: {e}")
+        A 429 pauses every caller for its Retry-After and the request is
+        retried up to max_retries times.
         
-        # Also append to master log
-        master_log = self.logs_dir / "master_llm_log.jsonl"
+        Returns:
+            (status, parsed JSON on 200 otherwise the response text)
+        """
+        slots, limiter = self._limits()
+        session = await self.http_pool.session()
+        for attempt in range(self.max_retries + 1):
+            async with slots:
+                await limiter.acquire()
+                async with session.post(self.base_url, headers=self._headers(), json=payload) as response:
+                    if response.status == 200:
+                        return response.status, await response.json()
+                    body = await response.text()
+                    if response.status != 429 or attempt == self.max_retries:
+                        return response.status, body
+                    try:
+                        retry_after = float(response.headers.get('Retry-After', 5))
+                    except ValueError:
+                        retry_after = 5.0
+            self.logger.warning(f"OpenRouter rate limited, retrying in {retry_after:.1f}s")
+            limiter.pause(retry_after)
+    
+    async def _call_openrouter(self, model_id: str, prompt: str, temperature: float = 0.7) -> Dict[str, Any]:
+        """Make an async call to OpenRouter with a plain user prompt"""
+        payload = {
+            "model": model_id,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": 2000
+        }
         try:
-            with open(master_log, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+            status, body = await self._post_completion(payload)
+            if status == 200:
+                return {
+                    'success': True,
+                    'content': body['choices'][0]['message']['content'],
+                    'model': model_id,
+                    'usage': body.get('usage', {})
+                }
+            self.logger.error(f"OpenRouter API error: {status} - {body}")
+            return {'success': False, 'error': f"API error: {status}", 'model': model_id}
         except Exception as e:
-            self.logger.error(f"Failed to append to master log: {e}")
+            self.logger.error(f"OpenRouter request failed: {str(e)}")
+            return {'success': False, 'error': str(e), 'model': model_id}
     
     async def _call_openrouter_with_master_prompt(self, model_id: str, context_data: Dict[str, Any]) -> Dict[str, Any]:
         """Make an async call to OpenRouter API using ONLY master prompt + context data"""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://estate-planning-concierge.com",
-            "X-Title": "Estate Planning Concierge v4.0"
-        }
         
         # Load the appropriate master prompt based on asset type
         asset_type = context_data.get('asset_type', 'UNKNOWN')
@@ -269,41 +310,38 @@ CONTEXT DATA:
         
         timestamp = datetime.now().isoformat()
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(self.base_url, headers=headers, json=payload) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        raw_response = result['choices'][0]['message']['content']
-                        
-                        # Parse structured response
-                        structured_prompt = self._parse_structured_response(raw_response)
-                        
-                        # Log the interaction comprehensively
-                        self._log_llm_interaction(model_id, context_data, structured_prompt, timestamp)
-                        
-                        return {
-                            'success': True,
-                            'structured_prompt': structured_prompt,
-                            'model': model_id,
-                            'usage': result.get('usage', {}),
-                            'timestamp': timestamp
-                        }
-                    else:
-                        error_text = await response.text()
-                        self.logger.error(f"OpenRouter API error: {response.status} - {error_text}")
-                        return {
-                            'success': False,
-                            'error': f"API error: {response.status}",
-                            'model': model_id
-                        }
-            except Exception as e:
-                self.logger.error(f"OpenRouter request failed: {str(e)}")
+        try:
+            status, result = await self._post_completion(payload)
+            if status == 200:
+                raw_response = result['choices'][0]['message']['content']
+                
+                # Parse structured response
+                structured_prompt = self._parse_structured_response(raw_response)
+                
+                # Log the interaction comprehensively
+                self._log_llm_interaction(model_id, context_data, structured_prompt, timestamp)
+                
+                return {
+                    'success': True,
+                    'structured_prompt': structured_prompt,
+                    'model': model_id,
+                    'usage': result.get('usage', {}),
+                    'timestamp': timestamp
+                }
+            else:
+                self.logger.error(f"OpenRouter API error: {status} - {result}")
                 return {
                     'success': False,
-                    'error': str(e),
+                    'error': f"API error: {status}",
                     'model': model_id
                 }
+        except Exception as e:
+            self.logger.error(f"OpenRouter request failed: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'model': model_id
+            }
     
     def _prepare_context_data(self, page_info: Dict[str, Any], model_config: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare context data for the master prompt"""
@@ -330,17 +368,17 @@ CONTEXT DATA:
                 'timestamp': datetime.now().isoformat()
             })
         
-        # Create tasks for parallel execution using new structured approach
-        tasks = []
-        for model_name, model_config in self.models.items():
-            context_data = self._prepare_context_data(page_info, model_config)
-            task = self._call_openrouter_with_master_prompt(model_config['id'], context_data)
-            tasks.append((model_name, task))
+        # Call every model concurrently; _post_completion enforces the limits
+        model_names = list(self.models)
+        responses = await asyncio.gather(*[
+            self._call_openrouter_with_master_prompt(
+                self.models[name]['id'], self._prepare_context_data(page_info, self.models[name]))
+            for name in model_names
+        ])
         
-        # Execute all tasks in parallel
         results = []
-        for model_name, task in tasks:
-            result = await task
+        for model_name, result in zip(model_names, responses):
+            model_config = self.models[model_name]
             
             # Emit prompt generation event
             if self.broadcaster and result['success']:
@@ -409,6 +447,8 @@ CONTEXT DATA:
     async def score_prompts(self, competition: PromptCompetition) -> PromptCompetition:
         """Score competing prompts using AI evaluation"""
         self.logger.info(f"Scoring prompts for: {competition.page_title}")
+        if not competition.variants:
+            return competition
         
         # Build scoring prompt
         scoring_prompt = f"""
@@ -432,7 +472,7 @@ Prompts to evaluate:
             scoring_prompt += f"""
 
 Prompt {i} ({variant.model}):
-{variant.prompt}
+{variant.structured_prompt.prompt}
 Style elements: {', '.join(variant.style_elements)}
 Emotional markers: {', '.join(variant.emotional_markers)}
 Luxury indicators: {', '.join(variant.luxury_indicators)}
@@ -480,25 +520,49 @@ Provide scores in JSON format:
         
         return competition
     
+    async def _run_competitions(self, pages: List[Dict[str, Any]],
+                                max_pages_in_flight: Optional[int] = None) -> AsyncIterator[Tuple[int, PromptCompetition]]:
+        """Yield (page index, scored competition) in completion order"""
+        page_slots = asyncio.Semaphore(max_pages_in_flight or self.max_concurrency)
+        
+        async def run_page(index: int, page: Dict[str, Any]):
+            async with page_slots:
+                self.logger.info(f"Starting competition for: {page['title']}")
+                try:
+                    competition = await self.generate_competitive_prompts(page)
+                    # Score as soon as this page's variants are in
+                    return index, await self.score_prompts(competition)
+                except Exception as e:
+                    self.logger.error(f"Competition failed for {page['title']}: {e}")
+                    return index, None
+        
+        tasks = [asyncio.create_task(run_page(i, page)) for i, page in enumerate(pages)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, competition = await next_done
+                if competition is not None:
+                    yield index, competition
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def stream_competitions(self, pages: List[Dict[str, Any]],
+                                  max_pages_in_flight: Optional[int] = None) -> AsyncIterator[PromptCompetition]:
+        """Run competitions for many pages concurrently, yielding each one as soon as it is scored
+        
+        Model calls across pages share the orchestrator's concurrency limit and
+        rate limiter. At most max_pages_in_flight pages (default: max_concurrency)
+        are worked on at once so early pages finish first instead of every page
+        waiting behind the whole queue of generation calls.
+        """
+        async for _, competition in self._run_competitions(pages, max_pages_in_flight):
+            yield competition
+    
     async def orchestrate_competition(self, pages: List[Dict[str, Any]]) -> List[PromptCompetition]:
-        """Orchestrate prompt competition for multiple pages"""
-        competitions = []
-        
-        for page in pages:
-            self.logger.info(f"Starting competition for: {page['title']}")
-            
-            # Generate competitive prompts
-            competition = await self.generate_competitive_prompts(page)
-            
-            # Score the prompts
-            competition = await self.score_prompts(competition)
-            
-            competitions.append(competition)
-            
-            # Small delay to avoid rate limiting
-            await asyncio.sleep(1)
-        
-        return competitions
+        """Orchestrate prompt competition for multiple pages, returned in page order"""
+        finished = [item async for item in self._run_competitions(pages)]
+        await self.llm_log.flush()
+        return [competition for _, competition in sorted(finished, key=lambda item: item[0])]
     
     def save_competition_results(self, competitions: List[PromptCompetition], output_file: str = "prompt_competitions.json"):
         """Save competition results to file"""
@@ -608,7 +672,11 @@ async def test_orchestrator():
     ]
     
     # Run competition
-    competitions = await orchestrator.orchestrate_competition(test_pages)
+    try:
+        competitions = await orchestrator.orchestrate_competition(test_pages)
+    finally:
+        await close_llm_log_sinks()
+        await close_connection_pool()
     
     # Save results
     output_file = orchestrator.save_competition_results(competitions)
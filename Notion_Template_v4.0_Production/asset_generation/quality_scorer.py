@@ -7,7 +7,6 @@ Evaluates prompt quality using multiple AI models for objective scoring
 import os
 import json
 import asyncio
-import aiohttp
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
@@ -15,6 +14,8 @@ import logging
 from pathlib import Path
 from enum import Enum
 
+from utils.resource_manager import ConnectionPoolManager, get_connection_pool, close_connection_pool
+
 class ScoringCriterion(Enum):
     """Quality scoring criteria for estate planning prompts"""
     EMOTIONAL_INTELLIGENCE = "emotional_intelligence"
@@ -68,11 +69,17 @@ class CompetitiveEvaluation:
 class QualityScorer:
     """AI-powered quality scoring system for estate planning prompts"""
     
-    def __init__(self, openrouter_api_key: str = None):
-        """Initialize the quality scorer"""
+    def __init__(self, openrouter_api_key: str = None, http_pool: Optional[ConnectionPoolManager] = None):
+        """Initialize the quality scorer
+        
+        Args:
+            openrouter_api_key: OpenRouter API key (defaults to OPENROUTER_API_KEY)
+            http_pool: Connection pool for API calls (defaults to the process-wide pool)
+        """
         self.api_key = openrouter_api_key or os.getenv('OPENROUTER_API_KEY')
         if not self.api_key:
             raise ValueError("OpenRouter API key is required")
+        self.http_pool = http_pool or get_connection_pool()
             
         self.base_url = "https://openrouter.ai/api/v1/chat/completions"
         self.logger = self._setup_logger()
@@ -152,32 +159,32 @@ class QualityScorer:
             "max_tokens": 2000
         }
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(self.base_url, headers=headers, json=payload) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return {
-                            'success': True,
-                            'content': result['choices'][0]['message']['content'],
-                            'model': model_id,
-                            'usage': result.get('usage', {})
-                        }
-                    else:
-                        error_text = await response.text()
-                        self.logger.error(f"Evaluator API error: {response.status} - {error_text}")
-                        return {
-                            'success': False,
-                            'error': f"API error: {response.status}",
-                            'model': model_id
-                        }
-            except Exception as e:
-                self.logger.error(f"Evaluator request failed: {str(e)}")
-                return {
-                    'success': False,
-                    'error': str(e),
-                    'model': model_id
-                }
+        session = await self.http_pool.session()
+        try:
+            async with session.post(self.base_url, headers=headers, json=payload) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    return {
+                        'success': True,
+                        'content': result['choices'][0]['message']['content'],
+                        'model': model_id,
+                        'usage': result.get('usage', {})
+                    }
+                else:
+                    error_text = await response.text()
+                    self.logger.error(f"Evaluator API error: {response.status} - {error_text}")
+                    return {
+                        'success': False,
+                        'error': f"API error: {response.status}",
+                        'model': model_id
+                    }
+        except Exception as e:
+            self.logger.error(f"Evaluator request failed: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'model': model_id
+            }
     
     def _build_evaluation_prompt(self, prompt_to_evaluate: str, context: Dict[str, Any], 
                                 evaluator_perspective: str) -> str:
@@ -698,7 +705,10 @@ async def test_quality_scorer():
     print("🎯 Testing Quality Scorer with Estate Planning prompts...")
     
     # Evaluate competitive prompts
-    competitive_eval = await scorer.evaluate_competitive_prompts(test_prompts, test_context)
+    try:
+        competitive_eval = await scorer.evaluate_competitive_prompts(test_prompts, test_context)
+    finally:
+        await close_connection_pool()
     
     # Save results
     output_file = scorer.save_evaluation_results([competitive_eval])
@@ -38,6 +38,7 @@ from utils.session_manager import SessionManager
 # from services.prompt_competition_service import PromptCompetitionService  # TODO: Fix import issues
 from quality_scorer import QualityScorer, CompetitiveEvaluation
 from prompt_templates import ConfigurablePromptTemplates
+from utils.prompt_cache import MASTER_PROMPT_FILES, get_master_prompt_cache
 
 # Security configuration
 REVIEW_API_TOKEN = os.getenv('REVIEW_API_TOKEN', 'estate-planning-review-2024')
@@ -939,15 +940,8 @@ class ReviewDashboard:
                 # Get prompt type from query parameter (default, icons, covers)
                 prompt_type = request.args.get('type', 'default')
                 
-                # Map prompt types to file names
-                prompt_files = {
-                    'default': 'master_prompt.txt',
-                    'icons': 'master_prompt_icons.txt',
-                    'covers': 'master_prompt_covers.txt'
-                }
-                
                 # Get the appropriate file
-                prompt_file = prompt_files.get(prompt_type, 'master_prompt.txt')
+                prompt_file = MASTER_PROMPT_FILES.get(prompt_type, MASTER_PROMPT_FILES['default'])
                 master_prompt_path = Path(__file__).parent / 'meta_prompts' / prompt_file
                 
                 # Read current master prompt
@@ -965,7 +959,7 @@ class ReviewDashboard:
                 
                 # Get all available prompts for tabs
                 available_prompts = []
-                for ptype, pfile in prompt_files.items():
+                for ptype, pfile in MASTER_PROMPT_FILES.items():
                     ppath = Path(__file__).parent / 'meta_prompts' / pfile
                     available_prompts.append({
                         'type': ptype,
@@ -1002,14 +996,7 @@ class ReviewDashboard:
                 # Get prompt type from query parameter
                 prompt_type = request.args.get('type', 'default')
                 
-                # Map prompt types to file names
-                prompt_files = {
-                    'default': 'master_prompt.txt',
-                    'icons': 'master_prompt_icons.txt',
-                    'covers': 'master_prompt_covers.txt'
-                }
-                
-                prompt_file = prompt_files.get(prompt_type, 'master_prompt.txt')
+                prompt_file = MASTER_PROMPT_FILES.get(prompt_type, MASTER_PROMPT_FILES['default'])
                 master_prompt_path = Path(__file__).parent / 'meta_prompts' / prompt_file
                 
                 if master_prompt_path.exists():
@@ -1054,14 +1041,7 @@ class ReviewDashboard:
                         'error': 'Master prompt cannot be empty'
                     }), 400
                 
-                # Map prompt types to file names
-                prompt_files = {
-                    'default': 'master_prompt.txt',
-                    'icons': 'master_prompt_icons.txt',
-                    'covers': 'master_prompt_covers.txt'
-                }
-                
-                prompt_file = prompt_files.get(prompt_type, 'master_prompt.txt')
+                prompt_file = MASTER_PROMPT_FILES.get(prompt_type, MASTER_PROMPT_FILES['default'])
                 master_prompt_path = Path(__file__).parent / 'meta_prompts' / prompt_file
                 
                 # Create backup of current prompt
@@ -1076,6 +1056,7 @@ class ReviewDashboard:
                 master_prompt_path.parent.mkdir(parents=True, exist_ok=True)
                 with open(master_prompt_path, 'w', encoding='utf-8') as f:
                     f.write(content)
+                get_master_prompt_cache(master_prompt_path.parent).invalidate(prompt_type)
                 
                 self.logger.info(f"Master prompt ({prompt_type}) updated - {len(content)} characters")
                 
@@ -462,6 +462,7 @@ class AssetGenerationService:
         
         # Clear expired cache
         await self.cache.clear_expired()
+        await self.cache.flush_hit_counts()
         
         # Close database
         await self.db.close()
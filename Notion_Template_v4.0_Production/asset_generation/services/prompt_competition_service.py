@@ -13,21 +13,25 @@ from datetime import datetime
 import logging
 
 from utils.database_manager import AssetDatabase
+from utils.resource_manager import ConnectionPoolManager, get_connection_pool, close_connection_pool
 from prompt_templates import ESTATE_PROMPT_BUILDER
 
 
 class PromptCompetitionService:
     """Generates competitive prompt variations using multiple AI models."""
     
-    def __init__(self, db: AssetDatabase, api_key: str = None):
+    def __init__(self, db: AssetDatabase, api_key: str = None,
+                 http_pool: Optional[ConnectionPoolManager] = None):
         """Initialize the prompt competition service.
         
         Args:
             db: Database manager instance
             api_key: OpenRouter API key
+            http_pool: Connection pool for API calls (defaults to the process-wide pool)
         """
         self.db = db
         self.api_key = api_key or os.getenv('OPENROUTER_API_KEY')
+        self.http_pool = http_pool or get_connection_pool()
         self.logger = self._setup_logger()
         
         # AI models for competitive prompt generation
@@ -156,39 +160,39 @@ Return only the enhanced prompt, no explanation.
 """
 
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'Authorization': f'Bearer {self.api_key}',
-                    'Content-Type': 'application/json'
-                }
-                
-                payload = {
-                    'model': model_config['model_id'],
-                    'messages': [
-                        {'role': 'user', 'content': variation_prompt}
-                    ],
-                    'max_tokens': 200,
-                    'temperature': 0.7
-                }
-                
-                async with session.post(
-                    'https://openrouter.ai/api/v1/chat/completions',
-                    headers=headers,
-                    json=payload,
-                    timeout=30
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        variation = result['choices'][0]['message']['content'].strip()
-                        
-                        # Clean up the response (remove quotes, explanations, etc.)
-                        variation = self._clean_prompt_response(variation)
-                        
-                        return variation
-                    else:
-                        error_text = await response.text()
-                        raise Exception(f"API error {response.status}: {error_text}")
-                        
+            session = await self.http_pool.session()
+            headers = {
+                'Authorization': f'Bearer {self.api_key}',
+                'Content-Type': 'application/json'
+            }
+            
+            payload = {
+                'model': model_config['model_id'],
+                'messages': [
+                    {'role': 'user', 'content': variation_prompt}
+                ],
+                'max_tokens': 200,
+                'temperature': 0.7
+            }
+            
+            async with session.post(
+                'https://openrouter.ai/api/v1/chat/completions',
+                headers=headers,
+                json=payload,
+                timeout=30
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    variation = result['choices'][0]['message']['content'].strip()
+                    
+                    # Clean up the response (remove quotes, explanations, etc.)
+                    variation = self._clean_prompt_response(variation)
+                    
+                    return variation
+                else:
+                    error_text = await response.text()
+                    raise Exception(f"API error {response.status}: {error_text}")
+                    
         except Exception as e:
             self.logger.error(f"API call failed for {model_config['name']}: {e}")
             raise
@@ -349,6 +353,7 @@ async def test_prompt_competition_service():
     )
     print(f"✅ Created {len(competition_ids)} batch competitions")
     
+    await close_connection_pool()
     await db.close()
     print("🎭 Prompt Competition Service test complete!")
 
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test the bounded LRU memory tier of AssetCache.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.cache_manager import AssetCache
+from utils.database_manager import AssetDatabase
+
+
+def make_files(directory: Path, count: int, size: int = 1000):
+    files = []
+    for i in range(count):
+        path = directory / f"icon_{i}.png"
+        path.write_bytes(b'\x89PNG' + b'\x00' * (size - 4))
+        files.append(path)
+    return files
+
+
+async def test_lru_bounds(tmp: Path):
+    print("\n[TEST 1] Memory tier is bounded by entries and bytes...")
+    files = make_files(tmp, 6)
+    db = AssetDatabase(str(tmp / 'lru.db'))
+    await db.initialize()
+    by_entries = AssetCache(db, tmp / 'cache_entries', max_memory_entries=3)
+    by_bytes = AssetCache(db, tmp / 'cache_bytes', max_memory_bytes=2500)
+    try:
+        for i, path in enumerate(files[:3]):
+            await by_entries.store(f'prompt {i}', 'icons', path)
+        assert await by_entries.check_exists('prompt 0', 'icons')  # now most recently used
+        for i, path in enumerate(files[3:5], 3):
+            await by_entries.store(f'prompt {i}', 'icons', path)
+        for i, path in enumerate(files):
+            await by_bytes.store(f'prompt {i}', 'icons', path)
+
+        kept = [i for i in range(5) if await by_entries.check_exists(f'prompt {i}', 'icons')]
+        stats = await by_entries.get_cache_stats()
+    finally:
+        await db.close()
+
+    assert kept == [0, 3, 4], kept
+    assert len(by_bytes._memory_cache) == 2 and by_bytes._memory_bytes <= 2500
+    assert stats['evictions'] == 2 and stats['misses'] == 2 and stats['memory_hits'] == 4
+    print(f"   ✅ PASS: Kept {kept}, {stats['evictions']} evictions, hit rate {stats['hit_rate']}")
+
+
+async def test_lazy_existence_check(tmp: Path):
+    print("\n[TEST 2] Memory hits only re-check the file after validate_interval...")
+    path = make_files(tmp, 1)[0]
+    db = AssetDatabase(str(tmp / 'lazy.db'))
+    await db.initialize()
+    cache = AssetCache(db, tmp / 'cache_lazy', validate_interval=0.2)
+    try:
+        await cache.store('lazy', 'icons', path)
+        cached = cache._memory_cache[cache._generate_cache_key('lazy', 'icons')].path
+        cached.unlink()
+        still_served = await cache.check_exists('lazy', 'icons')
+        await asyncio.sleep(0.25)
+        after_interval = await cache.check_exists('lazy', 'icons')
+    finally:
+        await db.close()
+
+    assert still_served == cached and after_interval is None
+    assert not cache._memory_cache and cache._memory_bytes == 0
+    print("   ✅ PASS: Deleted file noticed on the first hit after the interval")
+
+
+async def test_batched_use_counts(tmp: Path):
+    print("\n[TEST 3] Hits update prompt_cache use counts in one batch...")
+    path = make_files(tmp, 1)[0]
+    db = AssetDatabase(str(tmp / 'hits.db'))
+    await db.initialize()
+    cache = AssetCache(db, tmp / 'cache_hits', hit_flush_threshold=100)
+    try:
+        asset_id = await db.record_generation_attempt('icons', 'desk icon', 0.003, 'sdxl')
+        await db.update_asset_status(asset_id, 'completed', file_path=str(path))
+        await db.flush()
+        writes_before = db.stats['writes']
+
+        for _ in range(50):
+            assert await cache.check_exists('desk icon', 'icons') == path
+        writes_during = db.stats['writes'] - writes_before
+
+        await cache.get_cache_stats()
+        await db.flush()
+        async with db._reader() as conn:
+            cursor = await conn.execute("SELECT use_count FROM prompt_cache")
+            use_count = (await cursor.fetchone())['use_count']
+    finally:
+        await db.close()
+
+    assert cache.stats['database_hits'] == 1 and cache.stats['memory_hits'] == 49
+    assert writes_during == 0, writes_during
+    assert use_count == 1 + 50, use_count
+    print(f"   ✅ PASS: 50 hits, no writes until flushed, use_count {use_count}")
+
+
+async def main():
+    # AsyncFileHandler only copies files below the working directory
+    with tempfile.TemporaryDirectory(dir=os.getcwd()) as tmp:
+        for name in ('lru', 'lazy', 'hits'):
+            (Path(tmp) / name).mkdir()
+        await test_lru_bounds(Path(tmp) / 'lru')
+        await test_lazy_existence_check(Path(tmp) / 'lazy')
+        await test_batched_use_counts(Path(tmp) / 'hits')
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("ASSET CACHE TESTING")
+    print("=" * 60)
+    asyncio.run(main())
+    print("\n🎉 ALL ASSET CACHE TESTS PASSED!")
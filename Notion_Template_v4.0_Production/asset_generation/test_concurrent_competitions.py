@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test concurrent prompt-competition orchestration.
+Runs against a local fake OpenRouter with fixed latency; no API key or network needed.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+from aiohttp import web
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.resource_manager import ConnectionPoolManager
+from openrouter_orchestrator import OpenRouterOrchestrator
+from utils.llm_log_sink import LLMLogSink
+
+LATENCY = 0.2
+
+STRUCTURED = "SYSTEM: designer\n\nTEMPERATURE: 0.6\n\nROLE: artist\n\nPROMPT: warm mahogany legacy icon"
+SCORES = json.dumps({"scores": {"prompt_1": {"total": 40}}, "recommended": 1, "reasoning": "best"})
+
+
+class FakeOpenRouter:
+    """Chat-completions stand-in tracking concurrency; the first request gets a 429"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def completions(self, request):
+        self.calls += 1
+        if self.calls == 1:
+            return web.json_response({'error': 'rate limited'}, status=429, headers={'Retry-After': '0.1'})
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            payload = await request.json()
+            await asyncio.sleep(LATENCY)
+            content = SCORES if 'Provide scores in JSON format' in payload['messages'][0]['content'] else STRUCTURED
+            return web.json_response({'choices': [{'message': {'content': content}}], 'usage': {}})
+        finally:
+            self.in_flight -= 1
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post('/api/v1/chat/completions', self.completions)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/api/v1/chat/completions"
+
+
+def make_orchestrator(pool, log_dir, **kwargs):
+    """Orchestrator that logs into log_dir instead of the working directory's logs/"""
+    orchestrator = OpenRouterOrchestrator('test-key', http_pool=pool, requests_per_second=100,
+                                          llm_log=LLMLogSink(Path(log_dir) / "master_llm_log.jsonl"), **kwargs)
+    orchestrator.broadcaster = None
+    return orchestrator
+
+
+def make_pages(count):
+    return [{'title': f'Page {i}', 'category': 'executor', 'asset_type': 'icons'} for i in range(count)]
+
+
+async def test_concurrent_orchestration():
+    print("\n[TEST 1] Pages and models run concurrently within the limit...")
+    fake = FakeOpenRouter()
+    url = await fake.start()
+    pool = ConnectionPoolManager()
+    log_dir = tempfile.TemporaryDirectory()
+    orchestrator = make_orchestrator(pool, log_dir.name, max_concurrency=6)
+    orchestrator.base_url = url
+    pages = make_pages(6)
+    try:
+        started = time.perf_counter()
+        competitions = await orchestrator.orchestrate_competition(pages)
+        elapsed = time.perf_counter() - started
+    finally:
+        await orchestrator.llm_log.close()
+        await pool.close()
+        await fake.runner.cleanup()
+        log_dir.cleanup()
+
+    assert [c.page_title for c in competitions] == [p['title'] for p in pages]
+    assert all(len(c.variants) == 3 and c.winner is not None for c in competitions)
+    assert fake.calls == 6 * 4 + 1, fake.calls  # 3 variants + 1 scoring per page, plus the 429
+    assert fake.peak <= 6, f"concurrency limit exceeded: {fake.peak}"
+    serial = 6 * 4 * LATENCY
+    assert elapsed < serial / 2, f"{elapsed:.2f}s is not much faster than serial {serial:.2f}s"
+    print(f"   ✅ PASS: {fake.calls} calls in {elapsed:.2f}s (serial ≥ {serial:.1f}s), peak {fake.peak} in flight")
+
+
+async def test_streaming_yields_early():
+    print("\n[TEST 2] Finished competitions stream before the batch completes...")
+    fake = FakeOpenRouter()
+    url = await fake.start()
+    pool = ConnectionPoolManager()
+    log_dir = tempfile.TemporaryDirectory()
+    orchestrator = make_orchestrator(pool, log_dir.name, max_concurrency=4)
+    orchestrator.base_url = url
+    try:
+        started = time.perf_counter()
+        arrivals = []
+        async for competition in orchestrator.stream_competitions(make_pages(8), max_pages_in_flight=2):
+            arrivals.append(time.perf_counter() - started)
+    finally:
+        await orchestrator.llm_log.close()
+        await pool.close()
+        await fake.runner.cleanup()
+        log_dir.cleanup()
+
+    assert len(arrivals) == 8
+    assert arrivals[0] < arrivals[-1] / 2, arrivals
+    print(f"   ✅ PASS: first result after {arrivals[0]:.2f}s, last after {arrivals[-1]:.2f}s")
+
+
+async def main():
+    await test_concurrent_orchestration()
+    await test_streaming_yields_early()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("CONCURRENT COMPETITION TESTING")
+    print("=" * 60)
+    asyncio.run(main())
+    print("\n🎉 ALL CONCURRENT COMPETITION TESTS PASSED!")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test the shared HTTP connection pool used for OpenRouter calls.
+Runs against a local aiohttp server; no API key or network needed.
+"""
+
+import asyncio
+import os
+import sys
+
+from aiohttp import web
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.resource_manager import ConnectionPoolManager
+from quality_scorer import QualityScorer
+
+
+async def start_fake_openrouter(peers: list):
+    """Chat-completions stand-in that records the client port of every request"""
+    async def completions(request):
+        peers.append(request.transport.get_extra_info('peername')[1])
+        return web.json_response({'choices': [{'message': {'content': 'ok'}}], 'usage': {}})
+
+    app = web.Application()
+    app.router.add_post('/api/v1/chat/completions', completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/api/v1/chat/completions"
+
+
+async def test_connections_are_reused():
+    print("\n[TEST 1] Sequential and concurrent evaluator calls share connections...")
+    peers = []
+    runner, url = await start_fake_openrouter(peers)
+    pool = ConnectionPoolManager(limit_per_host=4)
+    scorer = QualityScorer('test-key', http_pool=pool)
+    scorer.base_url = url
+    try:
+        for _ in range(5):
+            result = await scorer._call_evaluator_model('test/model', 'prompt')
+            assert result['success'], result
+        results = await asyncio.gather(*[scorer._call_evaluator_model('test/model', 'prompt') for _ in range(20)])
+        assert all(r['success'] for r in results)
+    finally:
+        await pool.close()
+        await runner.cleanup()
+
+    assert len(peers) == 25
+    assert len(set(peers[:5])) == 1, "sequential calls should reuse one keep-alive connection"
+    assert len(set(peers)) <= 4, f"per-host limit exceeded: {len(set(peers))} connections"
+    print(f"   ✅ PASS: 25 requests over {len(set(peers))} connections")
+
+
+def test_pool_survives_new_event_loop():
+    print("\n[TEST 2] Pool can be reopened from a later asyncio.run()...")
+    pool = ConnectionPoolManager()
+
+    async def use_pool():
+        session = await pool.session()
+        assert not session.closed
+        assert await pool.session() is session
+        await pool.close()
+        assert session.closed
+        return session
+
+    first = asyncio.run(use_pool())
+    second = asyncio.run(use_pool())
+    assert first is not second
+    print("   ✅ PASS: Session shared within a loop and rebuilt for the next one")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("CONNECTION POOL TESTING")
+    print("=" * 60)
+    asyncio.run(test_connections_are_reused())
+    test_pool_survives_new_event_loop()
+    print("\n🎉 ALL CONNECTION POOL TESTS PASSED!")
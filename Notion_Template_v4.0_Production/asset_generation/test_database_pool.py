@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Test the pooled AssetDatabase connections, group-committing writer and
+write-behind bookkeeping.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.database_manager import AssetDatabase
+
+
+async def test_concurrent_writes_group_commit(db_path: Path):
+    print("\n[TEST 1] Concurrent writes share a few commits...")
+    db = AssetDatabase(str(db_path))
+    await db.initialize()
+    run_id = await db.create_generation_run('production', 200)
+    try:
+        asset_ids = await asyncio.gather(*(
+            db.record_generation_attempt('icons', f'icon {i}', 0.003, 'sdxl', run_id=run_id, batch_index=i)
+            for i in range(200)
+        ))
+        stats = await db.get_generation_stats()
+    finally:
+        await db.close()
+
+    assert len(set(asset_ids)) == 200 and all(isinstance(i, int) for i in asset_ids)
+    assert stats['overall']['total_attempts'] == 200
+    assert db.stats['commits'] < 20, db.stats
+    print(f"   ✅ PASS: 200 attempts in {db.stats['commits']} commit(s)")
+
+
+async def test_failing_write_is_isolated(db_path: Path):
+    print("\n[TEST 2] A failing write doesn't roll back the rest of its batch...")
+    db = AssetDatabase(str(db_path))
+    await db.initialize()
+
+    async def broken(conn):
+        await conn.execute("INSERT INTO assets (asset_type) VALUES ('icons')")  # NOT NULL violations
+
+    try:
+        results = await asyncio.gather(
+            db.record_generation_attempt('icons', 'kept 1', 0.003, 'sdxl'),
+            db._write(broken),
+            db.record_generation_attempt('icons', 'kept 2', 0.003, 'sdxl'),
+            return_exceptions=True
+        )
+        await db.flush()
+        async with db._reader() as conn:
+            cursor = await conn.execute("SELECT prompt FROM assets ORDER BY id")
+            prompts = [row['prompt'] for row in await cursor.fetchall()]
+    finally:
+        await db.close()
+
+    assert isinstance(results[1], Exception)
+    assert prompts == ['kept 1', 'kept 2'], prompts
+    print(f"   ✅ PASS: {type(results[1]).__name__} raised to its caller only")
+
+
+async def test_reads_alongside_writes(db_path: Path):
+    print("\n[TEST 3] Readers run while writes are queued...")
+    db = AssetDatabase(str(db_path))
+    await db.initialize()
+    try:
+        writes = [
+            asyncio.create_task(db.record_generation_attempt('covers', f'cover {i}', 0.04, 'flux'))
+            for i in range(50)
+        ]
+        reads = await asyncio.gather(*(db.get_generation_stats() for _ in range(10)))
+        await asyncio.gather(*writes)
+        final = await db.get_generation_stats()
+    finally:
+        await db.close()
+
+    assert all(r['overall']['total_attempts'] <= 50 for r in reads)
+    assert final['by_type']['covers']['count'] == 50
+    print(f"   ✅ PASS: 10 reads during 50 writes, {db.stats['commits']} commit(s)")
+
+
+async def test_approval_writes_persist(db_path: Path):
+    print("\n[TEST 4] Approval workflow writes are committed...")
+    db = AssetDatabase(str(db_path))
+    await db.initialize()
+    competition_id = await db.create_competition('A calm desk', 'icons', 'Estate', 1)
+    prompt_id = await db.store_competitive_prompt(competition_id, 'claude', 'minimal desk icon')
+    await db.store_quality_evaluation(prompt_id, {'clarity': 9}, 9.0, 8.5, 'gpt-4')
+    await db.close()
+
+    reopened = AssetDatabase(str(db_path))
+    try:
+        evaluation = await reopened.get_competition_evaluations(competition_id)
+    finally:
+        await reopened.close()
+
+    assert evaluation['competition']['base_prompt'] == 'A calm desk'
+    assert evaluation['winner']['id'] == prompt_id and evaluation['winner']['weighted_score'] == 8.5
+    print("   ✅ PASS: Competition, prompt and evaluation survive a reopen")
+
+
+async def test_write_behind_sequential(db_path: Path):
+    print("\n[TEST 5] Awaited bookkeeping writes are committed together...")
+    db = AssetDatabase(str(db_path), max_batch_size=500, flush_interval=60.0)
+    await db.initialize()
+    try:
+        for i in range(100):
+            asset_id = await db.record_generation_attempt('icons', f'icon {i}', 0.003, 'sdxl')
+            await db.update_asset_status(asset_id, 'failed', error_message='timeout')
+            await db.record_retry_attempt(asset_id, 'same_prompt', success=False)
+        commits_before = db.stats['commits']
+        async with db._reader() as conn:
+            cursor = await conn.execute("SELECT COUNT(*) FROM assets")
+            visible_before = (await cursor.fetchone())[0]
+        await db.flush()
+        async with db._reader() as conn:
+            cursor = await conn.execute("SELECT COUNT(*) FROM retry_log")
+            retries = (await cursor.fetchone())[0]
+        stats = await db.get_generation_stats()
+    finally:
+        await db.close()
+
+    assert visible_before == 0 and commits_before == 0
+    assert retries == 100 and stats['overall']['failed'] == 100
+    assert db.stats['commits'] == 1, db.stats
+    print(f"   ✅ PASS: 300 writes in {db.stats['commits']} commit(s), flushed on demand")
+
+
+async def test_write_behind_interval(db_path: Path):
+    print("\n[TEST 6] Written-behind writes commit within flush_interval...")
+    db = AssetDatabase(str(db_path), flush_interval=0.2)
+    await db.initialize()
+    try:
+        await db.record_generation_attempt('covers', 'cover', 0.04, 'flux')
+        await asyncio.sleep(0.4)
+        commits = db.stats['commits']
+        async with db._reader() as conn:
+            cursor = await conn.execute("SELECT COUNT(*) FROM transactions")
+            visible = (await cursor.fetchone())[0]
+    finally:
+        await db.close()
+
+    assert commits == 1 and visible == 1
+    print("   ✅ PASS: Committed by the interval without a flush")
+
+
+async def test_writer_recovers_from_broken_transaction(db_path: Path):
+    print("\n[TEST 7] A broken transaction fails its writes instead of hanging them...")
+    db = AssetDatabase(str(db_path))
+    await db.initialize()
+
+    async def commits_itself(conn):
+        await conn.execute("COMMIT")  # Savepoint is gone, so the rollback to it fails too
+
+    try:
+        results = await asyncio.wait_for(asyncio.gather(
+            db.record_generation_attempt('icons', 'lost', 0.003, 'sdxl'),
+            db._write(commits_itself),
+            db.record_generation_attempt('icons', 'queued', 0.003, 'sdxl'),
+            return_exceptions=True
+        ), timeout=10)
+        kept = await asyncio.wait_for(db.record_generation_attempt('icons', 'after', 0.003, 'sdxl'), timeout=10)
+        async with db.get_connection() as conn:  # Lock was released
+            cursor = await conn.execute("SELECT prompt FROM assets WHERE id = ?", (kept,))
+            prompt = (await cursor.fetchone())['prompt']
+    finally:
+        await db.close()
+
+    assert all(isinstance(r, Exception) for r in results[1:]), results
+    assert prompt == 'after'
+    print(f"   ✅ PASS: {sum(isinstance(r, Exception) for r in results)} write(s) failed, writer kept running")
+
+
+async def test_completed_asset_deduplicates_before_flush(db_path: Path):
+    print("\n[TEST 8] A just-completed asset is found as a duplicate without a flush...")
+    db = AssetDatabase(str(db_path), max_batch_size=500, flush_interval=60.0)
+    await db.initialize()
+    try:
+        asset_id = await db.record_generation_attempt('icons', 'calm desk', 0.003, 'sdxl')
+        await db.update_asset_status(asset_id, 'completed', file_path='icons/desk.png')
+        duplicate = await db.check_duplicate('calm desk', 'icons', record_hit=False)
+    finally:
+        await db.close()
+
+    assert duplicate is not None and duplicate['file_path'] == 'icons/desk.png', duplicate
+    print("   ✅ PASS: Repeated prompt served from the cache, not generated again")
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        await test_concurrent_writes_group_commit(Path(tmp) / 'group.db')
+        await test_failing_write_is_isolated(Path(tmp) / 'isolated.db')
+        await test_reads_alongside_writes(Path(tmp) / 'readers.db')
+        await test_approval_writes_persist(Path(tmp) / 'approval.db')
+        await test_write_behind_sequential(Path(tmp) / 'behind.db')
+        await test_write_behind_interval(Path(tmp) / 'interval.db')
+        await test_writer_recovers_from_broken_transaction(Path(tmp) / 'broken.db')
+        await test_completed_asset_deduplicates_before_flush(Path(tmp) / 'dedupe.db')
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("DATABASE CONNECTION POOL TESTING")
+    print("=" * 60)
+    asyncio.run(main())
+    print("\n🎉 ALL DATABASE POOL TESTS PASSED!")
@@ -16,6 +16,8 @@ from typing import List, Dict, Any
 os.environ['OPENROUTER_API_KEY'] = os.getenv('OPENROUTER_API_KEY', 'test-key-for-testing')
 
 from openrouter_orchestrator import OpenRouterOrchestrator, StructuredPrompt, PromptVariant, PromptCompetition
+from utils.prompt_cache import get_master_prompt_cache
+from utils.llm_log_sink import get_llm_log_sink
 
 class MockOpenRouterOrchestrator(OpenRouterOrchestrator):
     """Mock orchestrator that simulates API responses for testing"""
@@ -42,9 +44,11 @@ class MockOpenRouterOrchestrator(OpenRouterOrchestrator):
         }
         self.base_url = "https://openrouter.ai/api/v1/chat/completions"
         self.logger = self._setup_logger()
+        self.prompt_cache = get_master_prompt_cache(Path("meta_prompts"))
         self.master_prompt = self._load_master_prompt()
         self.logs_dir = Path("logs/llm_generations")
-        self.logs_dir.mkdir(parents=True, exist_ok=True)
+        self.llm_log = get_llm_log_sink(self.logs_dir / "master_llm_log.jsonl")
+        self.broadcaster = None
     
     async def _call_openrouter_with_master_prompt(self, model_id: str, context_data: Dict[str, Any]) -> Dict[str, Any]:
         """Simulate API call with realistic structured responses"""
@@ -200,9 +204,7 @@ async def generate_test_samples():
     print(f"✅ Summary report saved to: {summary_file}")
     
     # Check logs were created
-    log_files = list(orchestrator.logs_dir.glob("*.json"))
-    print(f"✅ Individual log files created: {len(log_files)}")
-    
+    await orchestrator.llm_log.flush()
     if orchestrator.logs_dir.joinpath("master_llm_log.jsonl").exists():
         with open(orchestrator.logs_dir / "master_llm_log.jsonl", 'r') as f:
             log_lines = f.readlines()
@@ -222,7 +224,7 @@ async def generate_test_samples():
     
     print("\n🚀 NEXT STEPS:")
     print("1. Review generated prompts in: test_sample_competitions.json")
-    print("2. Check individual logs in: logs/llm_generations/")
+    print("2. Check the master log in: logs/llm_generations/master_llm_log.jsonl")
     print("3. Modify master_prompt.txt to refine output quality")
     print("4. Set OPENROUTER_API_KEY for real API calls")
     print("5. Run with actual API for production prompts")
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test the continuous worker pool in MassGenerationQueue.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.generation_queue import (
+    MassGenerationQueue,
+    BatchConfig,
+    GenerationTask,
+    GenerationPriority,
+    GenerationStatus
+)
+
+
+def make_queue(**overrides) -> MassGenerationQueue:
+    config = BatchConfig(rate_limit=60000, concurrent_limit=3, cost_limit=10.0, task_timeout=5.0)
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return MassGenerationQueue(batch_config=config)
+
+
+async def test_slow_task_does_not_stall_pool():
+    print("\n[TEST 1] Idle workers are refilled while a slow task runs...")
+    queue = make_queue()
+    queue.add_task(GenerationTask(task_id='slow', prompt='slow', asset_type='icons', priority=GenerationPriority.HIGH))
+    queue.add_batch([f'fast {i}' for i in range(10)], 'icons')
+    finished = []
+
+    async def generator(prompt, asset_type, metadata):
+        await asyncio.sleep(1.0 if prompt == 'slow' else 0.1)
+        finished.append(prompt)
+        return f"https://example.com/{len(finished)}.png"
+
+    started = time.perf_counter()
+    await queue.process_queue(generator_func=generator)
+    elapsed = time.perf_counter() - started
+
+    assert finished[-1] == 'slow', finished
+    assert len(queue.completed_tasks) == 11 and not queue.active_tasks
+    assert elapsed < 1.3, f"{elapsed:.2f}s; fast tasks waited on the slow one"
+    print(f"   ✅ PASS: 11 tasks in {elapsed:.2f}s, slow task finished last")
+
+
+async def test_timeout_requeues_task():
+    print("\n[TEST 2] A task exceeding task_timeout is retried at its own priority...")
+    queue = make_queue(task_timeout=0.2)
+    queue.add_task(GenerationTask(task_id='hang', prompt='hang', asset_type='icons'))
+    attempts = []
+
+    async def generator(prompt, asset_type, metadata):
+        attempts.append(time.perf_counter())
+        if len(attempts) == 1:
+            await asyncio.sleep(60)
+        return "https://example.com/hang.png"
+
+    started = time.perf_counter()
+    await queue.process_queue(generator_func=generator)
+    elapsed = time.perf_counter() - started
+
+    task = queue.completed_tasks['hang']
+    assert task.status == GenerationStatus.COMPLETED and task.retry_count == 1
+    assert task.priority == GenerationPriority.NORMAL
+    assert elapsed < 1.0
+    print(f"   ✅ PASS: Requeued after {attempts[1] - started:.2f}s and completed")
+
+
+async def test_priority_and_retry_semantics():
+    print("\n[TEST 3] Priority order and failure retries are unchanged...")
+    queue = make_queue(concurrent_limit=1)
+    queue.add_task(GenerationTask(task_id='low', prompt='low', asset_type='icons', priority=GenerationPriority.LOW))
+    queue.add_task(GenerationTask(task_id='flaky', prompt='flaky', asset_type='icons', priority=GenerationPriority.HIGH))
+    queue.add_task(GenerationTask(task_id='normal', prompt='normal', asset_type='icons'))
+    queue.add_task(GenerationTask(task_id='broken', prompt='broken', asset_type='icons', priority=GenerationPriority.CRITICAL))
+    order = []
+    statuses = []
+
+    async def generator(prompt, asset_type, metadata):
+        order.append(prompt)
+        if prompt == 'broken' or (prompt == 'flaky' and order.count('flaky') == 1):
+            raise RuntimeError(f"{prompt} failed")
+        return prompt
+
+    await queue.process_queue(
+        generator_func=generator,
+        progress_callback=lambda task_id, status, result: statuses.append((task_id, status))
+    )
+
+    # Retries drop one priority level and keep their place among equals by creation time
+    assert order == ['broken', 'flaky', 'broken', 'flaky', 'normal', 'broken', 'low'], order
+    assert queue.failed_tasks['broken'].retry_count == 3
+    assert queue.completed_tasks['flaky'].priority == GenerationPriority.NORMAL
+    assert ('broken', 'failed') in statuses and len(queue.completed_tasks) == 3
+    print(f"   ✅ PASS: Order {order}")
+
+
+async def test_cost_admission_per_task():
+    print("\n[TEST 4] Tasks start only while estimated cost in flight fits cost_limit...")
+    queue = make_queue(concurrent_limit=4, cost_limit=0.05)
+    queue.add_batch([f'icon {i}' for i in range(8)], 'icons')  # estimated $0.02 each
+    in_flight = 0
+    peak = 0
+
+    async def generator(prompt, asset_type, metadata):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return prompt
+
+    await queue.process_queue(generator_func=generator)
+
+    assert peak == 2, peak
+    assert len(queue.completed_tasks) == 8
+    assert abs(queue.stats['total_cost'] - 0.16) < 1e-9
+    print(f"   ✅ PASS: Peak {peak} tasks in flight under a $0.05 limit")
+
+
+async def test_rate_limit_spaces_starts():
+    print("\n[TEST 5] Task starts follow the token bucket rate...")
+    queue = make_queue(rate_limit=600, concurrent_limit=3)  # 10 per second, burst of 3
+    queue.add_batch([f'icon {i}' for i in range(8)], 'icons')
+    starts = []
+
+    async def generator(prompt, asset_type, metadata):
+        starts.append(time.perf_counter())
+        return prompt
+
+    await queue.process_queue(generator_func=generator)
+
+    span = starts[-1] - starts[0]
+    assert 0.4 < span < 0.8, f"{span:.2f}s for 8 starts"
+    print(f"   ✅ PASS: 8 starts spread over {span:.2f}s")
+
+
+async def main():
+    await test_slow_task_does_not_stall_pool()
+    await test_timeout_requeues_task()
+    await test_priority_and_retry_semantics()
+    await test_cost_admission_per_task()
+    await test_rate_limit_spaces_starts()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("GENERATION QUEUE TESTING")
+    print("=" * 60)
+    asyncio.run(main())
+    print("\n🎉 ALL GENERATION QUEUE TESTS PASSED!")
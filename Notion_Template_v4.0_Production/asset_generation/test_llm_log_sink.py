@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test the buffered LLM interaction log sink.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.llm_log_sink import LLMLogSink
+
+
+def entry(i):
+    return {'timestamp': f't{i}', 'model': 'anthropic/claude', 'prompt': 'x' * 200, 'index': i}
+
+
+async def test_batched_writes(log_dir: Path):
+    print("\n[TEST 1] Entries are batched into one JSONL file...")
+    sink = LLMLogSink(log_dir / 'master_llm_log.jsonl', flush_interval=0.05, batch_size=50)
+    batches = []
+    original = sink._write_lines
+    sink._write_lines = lambda lines: (batches.append(len(lines)), original(lines))
+
+    for i in range(500):
+        sink.write(entry(i))
+    await asyncio.sleep(0.2)
+    for i in range(500, 510):
+        sink.write(entry(i))
+    await sink.close()
+
+    lines = (log_dir / 'master_llm_log.jsonl').read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['index'] for line in lines] == list(range(510))
+    assert list(log_dir.iterdir()) == [log_dir / 'master_llm_log.jsonl'], "no per-call files"
+    assert len(batches) < 20, batches
+    print(f"   ✅ PASS: 510 entries written in {len(batches)} batches")
+
+
+async def test_rotation(log_dir: Path):
+    print("\n[TEST 2] Log rotates to compressed archives within the size cap...")
+    log_path = log_dir / 'rotating.jsonl'
+    sink = LLMLogSink(log_path, batch_size=10, max_bytes=4096, backup_count=3)
+    for i in range(200):
+        sink.write(entry(i))
+        if i % 10 == 9:
+            await sink.flush()
+    await sink.close()
+
+    archives = sorted(log_dir.glob('rotating.*.jsonl.gz'))
+    assert len(archives) == 3, archives
+    assert log_path.stat().st_size <= 4096
+    with gzip.open(archives[-1], 'rt', encoding='utf-8') as f:
+        last_archived = [json.loads(line)['index'] for line in f]
+    current = [json.loads(line)['index'] for line in log_path.read_text(encoding='utf-8').splitlines()]
+    assert last_archived[-1] + 1 == current[0] and current[-1] == 199
+    print(f"   ✅ PASS: {len(archives)} gzip archives kept, current log {log_path.stat().st_size} bytes")
+
+
+def test_sync_callers(log_dir: Path):
+    print("\n[TEST 3] Synchronous callers flush once a batch accumulates...")
+    log_path = log_dir / 'sync.jsonl'
+    sink = LLMLogSink(log_path, batch_size=5)
+    for i in range(4):
+        sink.write(entry(i))
+    assert not log_path.exists()
+    sink.write(entry(4))
+    assert len(log_path.read_text(encoding='utf-8').splitlines()) == 5
+    sink.write(entry(5))
+    sink.flush_sync()
+    assert len(log_path.read_text(encoding='utf-8').splitlines()) == 6
+    print("   ✅ PASS: Batched without an event loop")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("LLM LOG SINK TESTING")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / 'batched').mkdir()
+        asyncio.run(test_batched_writes(Path(tmp) / 'batched'))
+        asyncio.run(test_rotation(Path(tmp)))
+        test_sync_callers(Path(tmp))
+    print("\n🎉 ALL LLM LOG SINK TESTS PASSED!")
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Test the pipelined generate -> download -> persist mass production stages.
+The Replicate client is replaced by a fake with fixed latency and images come
+from a local server, so no API key or network is needed.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('REPLICATE_API_TOKEN', 'r8_test_token_for_pipeline')
+
+from asset_generator import AssetGenerator
+from utils.async_downloader import AsyncImageDownloader
+
+PREDICTION_LATENCY = 0.2
+PNG_BYTES = b'\x89PNG\r\n\x1a\n' + b'\x00' * 1024
+
+
+class FakeReplicate:
+    """AsyncReplicateClient stand-in that tracks predictions in flight"""
+
+    def __init__(self, image_url: str):
+        self.image_url = image_url
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def run(self, model_id, model_input):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        call = self.calls
+        try:
+            await asyncio.sleep(PREDICTION_LATENCY)
+            return [f"{self.image_url}?n={call}"]
+        finally:
+            self.in_flight -= 1
+
+
+async def start_image_server():
+    async def image(request):
+        await asyncio.sleep(0.05)
+        return web.Response(body=PNG_BYTES, content_type='image/png')
+
+    app = web.Application()
+    app.router.add_get('/image.png', image)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/image.png"
+
+
+def make_generator(output_dir: Path, concurrency: int, fake: FakeReplicate) -> AssetGenerator:
+    generator = AssetGenerator()
+    generator.replicate_client = fake
+    generator.config['output']['production_directory'] = str(output_dir)
+    generator.config['replicate']['rate_limit'] = 100
+    generator.config['replicate']['max_concurrent_predictions'] = concurrency
+    generator.config['replicate']['max_concurrent_downloads'] = 3
+    generator.path_validator = None
+    generator.transaction_manager = None
+    return generator
+
+
+def make_jobs(asset_type: str, count: int):
+    items = [{'title': f'Page {i}', 'slug': f'page-{i}', 'prompt': f'prompt {i}'} for i in range(1, count + 1)]
+    return [(asset_type, i, count, item) for i, item in enumerate(items, 1)]
+
+
+async def test_pipeline_overlaps_predictions(output_dir: Path):
+    print("\n[TEST 1] Predictions run concurrently and every asset is persisted...")
+    runner, image_url = await start_image_server()
+    fake = FakeReplicate(image_url)
+    generator = make_generator(output_dir, concurrency=4, fake=fake)
+    try:
+        started = time.perf_counter()
+        ok = await generator.run_production_pipeline(make_jobs('icons', 12), budget=100.0, total_assets=12)
+        elapsed = time.perf_counter() - started
+    finally:
+        await runner.cleanup()
+
+    assert ok
+    assert fake.calls == 12 and 1 < fake.peak <= 4, fake.peak
+    assert sorted(a['index'] for a in generator.generated_assets) == list(range(1, 13))
+    assert all((output_dir / a['filename']).read_bytes() == PNG_BYTES for a in generator.generated_assets)
+    assert all(a['checksum'] for a in generator.generated_assets)
+    manifest = json.loads((output_dir / 'manifest.json').read_text())
+    assert manifest['total_generated'] == 10, "checkpoint written mid-run"
+    serial = 12 * PREDICTION_LATENCY
+    assert elapsed < serial / 2, f"{elapsed:.2f}s is not much faster than serial {serial:.2f}s"
+    print(f"   ✅ PASS: 12 assets in {elapsed:.2f}s (serial ≥ {serial:.1f}s), peak {fake.peak} predictions in flight")
+
+
+async def test_budget_counts_in_flight(output_dir: Path):
+    print("\n[TEST 2] Budget admission counts predictions still in flight...")
+    runner, image_url = await start_image_server()
+    fake = FakeReplicate(image_url)
+    generator = make_generator(output_dir, concurrency=4, fake=fake)
+    cost = generator.get_model_price(generator.config['replicate']['models']['icons']['model_id'])
+    try:
+        ok = await generator.run_production_pipeline(make_jobs('icons', 12), budget=cost * 5.5, total_assets=12)
+    finally:
+        await runner.cleanup()
+
+    assert not ok
+    assert fake.calls == 5 and len(generator.generated_assets) == 5, fake.calls
+    assert generator.total_cost <= cost * 5.5
+    print(f"   ✅ PASS: Stopped at {fake.calls} predictions, ${generator.total_cost:.3f} spent")
+
+
+async def test_failed_download_recorded(output_dir: Path):
+    print("\n[TEST 3] A failed download is recorded without re-running the prediction...")
+    runner, image_url = await start_image_server()
+    fake = FakeReplicate(image_url.replace('/image.png', '/missing.png'))
+    generator = make_generator(output_dir, concurrency=2, fake=fake)
+    try:
+        await generator.run_production_pipeline(make_jobs('icons', 2), budget=100.0, total_assets=2)
+    finally:
+        await runner.cleanup()
+
+    assert fake.calls == 2 and not generator.generated_assets
+    assert len(generator.errors) == 2 and all('Download failed' in e['error'] for e in generator.errors)
+    print("   ✅ PASS: 2 download errors, 2 paid predictions")
+
+
+async def test_stage_errors_do_not_stall(output_dir: Path):
+    print("\n[TEST 4] Unexpected download and checkpoint errors fail jobs, not the pipeline...")
+    runner, image_url = await start_image_server()
+    fake = FakeReplicate(image_url)
+    generator = make_generator(output_dir, concurrency=4, fake=fake)
+    download_single = AsyncImageDownloader.download_single
+
+    async def flaky_download(self, task):
+        if task.task_id == 'icons_003.png':
+            raise OSError(28, 'No space left on device')
+        return await download_single(self, task)
+
+    def full_disk(total_assets):
+        raise OSError(28, 'No space left on device')
+
+    AsyncImageDownloader.download_single = flaky_download
+    generator._write_production_manifest = full_disk
+    try:
+        ok = await asyncio.wait_for(
+            generator.run_production_pipeline(make_jobs('icons', 12), budget=100.0, total_assets=12),
+            timeout=10)
+    finally:
+        AsyncImageDownloader.download_single = download_single
+        await runner.cleanup()
+
+    assert ok and len(generator.generated_assets) == 11
+    assert [e['index'] for e in generator.errors] == [3] and 'No space' in generator.errors[0]['error']
+    print("   ✅ PASS: 11 assets persisted, 1 download error recorded, checkpoint failure logged")
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ('overlap', 'budget', 'failure', 'errors'):
+            (Path(tmp) / name).mkdir()
+        await test_pipeline_overlaps_predictions(Path(tmp) / 'overlap')
+        await test_budget_counts_in_flight(Path(tmp) / 'budget')
+        await test_failed_download_recorded(Path(tmp) / 'failure')
+        await test_stage_errors_do_not_stall(Path(tmp) / 'errors')
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("PIPELINED PRODUCTION TESTING")
+    print("=" * 60)
+    asyncio.run(main())
+    print("\n🎉 ALL PIPELINED PRODUCTION TESTS PASSED!")
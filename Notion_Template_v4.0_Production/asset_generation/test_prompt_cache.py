@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test the master prompt cache used by OpenRouterOrchestrator.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.prompt_cache import MasterPromptCache, master_prompt_type
+
+
+def write(path: Path, text: str, mtime: int):
+    path.write_text(text, encoding='utf-8')
+    os.utime(path, (mtime, mtime))
+
+
+def test_cached_until_changed(prompts_dir: Path):
+    print("\n[TEST 1] Prompts are read once and reloaded when the file changes...")
+    write(prompts_dir / 'master_prompt_icons.txt', 'icons v1', 1_000_000)
+    cache = MasterPromptCache(prompts_dir, check_interval=0)
+
+    for _ in range(100):
+        assert cache.get('icons')[0] == 'icons v1'
+    assert cache.loads == 1 and cache.hits == 99
+
+    write(prompts_dir / 'master_prompt_icons.txt', 'icons v2', 1_000_100)
+    assert cache.get('icons')[0] == 'icons v2'
+    assert cache.loads == 2
+    print("   ✅ PASS: 100 lookups, 1 read; edit picked up on mtime change")
+
+
+def test_check_interval_and_invalidate(prompts_dir: Path):
+    print("\n[TEST 2] Within the check interval only invalidate() forces a reload...")
+    write(prompts_dir / 'master_prompt_covers.txt', 'covers v1', 1_000_000)
+    cache = MasterPromptCache(prompts_dir, check_interval=3600)
+    assert cache.get('covers')[0] == 'covers v1'
+
+    write(prompts_dir / 'master_prompt_covers.txt', 'covers v2', 1_000_100)
+    assert cache.get('covers')[0] == 'covers v1'
+    cache.invalidate('covers')
+    assert cache.get('covers')[0] == 'covers v2'
+    print("   ✅ PASS: Saved prompt visible immediately after invalidate()")
+
+
+def test_fallback_to_default(prompts_dir: Path):
+    print("\n[TEST 3] Missing type-specific prompt falls back to the default...")
+    write(prompts_dir / 'master_prompt.txt', 'default', 1_000_000)
+    cache = MasterPromptCache(prompts_dir)
+    text, path = cache.get(master_prompt_type('letter_headers'))
+    assert text == 'default' and path.name == 'master_prompt.txt'
+    os.remove(prompts_dir / 'master_prompt_icons.txt')
+    assert cache.get(master_prompt_type('database_icons'))[0] == 'default'
+    print("   ✅ PASS: Default prompt used")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("MASTER PROMPT CACHE TESTING")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        test_cached_until_changed(Path(tmp))
+        test_check_interval_and_invalidate(Path(tmp))
+        test_fallback_to_default(Path(tmp))
+    print("\n🎉 ALL PROMPT CACHE TESTS PASSED!")
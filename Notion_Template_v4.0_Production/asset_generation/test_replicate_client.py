@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Test the async Replicate prediction client.
+Runs against a local fake Replicate API; no API token or network needed.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+import aiohttp
+from aiohttp import web
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.exceptions import ReplicateAPIError, ValidationError
+from utils.replicate_client import AsyncReplicateClient
+from utils.resource_manager import ConnectionPoolManager
+
+SECRET = "whsec_" + base64.b64encode(b"test-signing-key").decode()
+
+
+class FakeReplicateAPI:
+    """Predictions API stand-in; each prediction runs for a fixed time"""
+
+    def __init__(self, latency: float = 0.5, webhook_url: str = None):
+        self.latency = latency
+        self.webhook_url = webhook_url
+        self.predictions = {}
+        self.create_calls = 0
+        self.get_calls = 0
+        self.cancel_calls = 0
+
+    def _view(self, prediction_id):
+        prediction = self.predictions[prediction_id]
+        done = time.monotonic() - prediction['created'] >= self.latency
+        status = prediction['final_status'] if done else 'processing'
+        view = {'id': prediction_id, 'status': status, 'output': None, 'error': None}
+        if status == 'succeeded':
+            view['output'] = [f"https://replicate.delivery/{prediction_id}.png"]
+        elif status == 'failed':
+            view['error'] = 'NSFW content detected'
+        return view
+
+    async def create(self, request):
+        self.create_calls += 1
+        body = await request.json()
+        prediction_id = f"p{self.create_calls:04d}"
+        final_status = 'failed' if body['input']['prompt'] == 'fail' else 'succeeded'
+        self.predictions[prediction_id] = {'created': time.monotonic(), 'final_status': final_status}
+        if body.get('webhook'):
+            asyncio.get_running_loop().create_task(self._deliver(prediction_id, body['webhook']))
+        return web.json_response(self._view(prediction_id), status=201)
+
+    async def get(self, request):
+        self.get_calls += 1
+        return web.json_response(self._view(request.match_info['prediction_id']))
+
+    async def cancel(self, request):
+        self.cancel_calls += 1
+        prediction = self.predictions[request.match_info['prediction_id']]
+        prediction['final_status'], prediction['created'] = 'canceled', 0.0
+        return web.json_response(self._view(request.match_info['prediction_id']))
+
+    async def _deliver(self, prediction_id, url):
+        await asyncio.sleep(self.latency)
+        body = json.dumps(self._view(prediction_id)).encode()
+        key = base64.b64decode(SECRET.split('_', 1)[1])
+        signature = base64.b64encode(hmac.new(key, b"msg_1.1700000000." + body, hashlib.sha256).digest()).decode()
+        headers = {'webhook-id': 'msg_1', 'webhook-timestamp': '1700000000',
+                   'webhook-signature': f"v1,{signature}", 'Content-Type': 'application/json'}
+        async with aiohttp.ClientSession() as session:
+            await session.post(url, data=body, headers=headers)
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post('/v1/predictions', self.create)
+        app.router.add_post('/v1/models/{owner}/{name}/predictions', self.create)
+        app.router.add_get('/v1/predictions/{prediction_id}', self.get)
+        app.router.add_post('/v1/predictions/{prediction_id}/cancel', self.cancel)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/v1"
+
+
+async def test_many_predictions_one_poller():
+    print("\n[TEST 1] 100 predictions resolve through one poller without threads...")
+    fake = FakeReplicateAPI(latency=0.5)
+    base_url = await fake.start()
+    pool = ConnectionPoolManager()
+    client = AsyncReplicateClient('r8_test', http_pool=pool, base_url=base_url,
+                                  min_poll_interval=0.2, max_poll_interval=1.0)
+    threads_before = threading.active_count()
+    try:
+        started = time.perf_counter()
+        outputs = await asyncio.gather(*(
+            client.run("stability-ai/sdxl:abc123", {"prompt": f"icon {i}"}) for i in range(100)
+        ))
+        elapsed = time.perf_counter() - started
+        threads_during = threading.active_count()
+    finally:
+        await client.close()
+        await pool.close()
+        await fake.runner.cleanup()
+
+    assert len(outputs) == 100 and all(o[0].endswith('.png') for o in outputs)
+    assert threads_during <= threads_before + 1, "a thread per prediction"
+    assert client.stats['completed'] == 100
+    assert fake.get_calls <= 100 * 3, f"{fake.get_calls} polls for 100 predictions"
+    assert elapsed < 2.0, f"{elapsed:.2f}s"
+    print(f"   ✅ PASS: 100 predictions in {elapsed:.2f}s with {fake.get_calls} status polls")
+
+
+async def test_adaptive_interval():
+    print("\n[TEST 2] Poll interval backs off while a prediction keeps running...")
+    fake = FakeReplicateAPI(latency=3.0)
+    base_url = await fake.start()
+    pool = ConnectionPoolManager()
+    client = AsyncReplicateClient('r8_test', http_pool=pool, base_url=base_url,
+                                  min_poll_interval=0.1, max_poll_interval=1.0, poll_backoff=2.0)
+    try:
+        output = await client.run("black-forest-labs/flux-schnell", {"prompt": "cover"})
+    finally:
+        await client.close()
+        await pool.close()
+        await fake.runner.cleanup()
+
+    assert output
+    # 0.1, 0.2, 0.4, 0.8, then every 1.0s: about 6 polls over 3s instead of 30
+    assert fake.get_calls <= 7, fake.get_calls
+    print(f"   ✅ PASS: {fake.get_calls} polls over a 3s prediction")
+
+
+async def test_failed_prediction_raises():
+    print("\n[TEST 3] A failed prediction raises ReplicateAPIError...")
+    fake = FakeReplicateAPI(latency=0.2)
+    base_url = await fake.start()
+    pool = ConnectionPoolManager()
+    client = AsyncReplicateClient('r8_test', http_pool=pool, base_url=base_url, min_poll_interval=0.1)
+    try:
+        await client.run("stability-ai/sdxl:abc123", {"prompt": "fail"})
+        raise AssertionError("expected ReplicateAPIError")
+    except ReplicateAPIError as e:
+        assert 'failed' in str(e) and 'NSFW' in str(e)
+    finally:
+        await client.close()
+        await pool.close()
+        await fake.runner.cleanup()
+    print("   ✅ PASS: Error raised with the prediction's error message")
+
+
+async def test_webhook_resolves_predictions():
+    print("\n[TEST 4] Signed webhooks resolve predictions without polling...")
+    fake = FakeReplicateAPI(latency=0.3)
+    base_url = await fake.start()
+    pool = ConnectionPoolManager()
+    with socket.socket() as probe:  # free port for the webhook receiver
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+
+    client = AsyncReplicateClient('r8_test', http_pool=pool, base_url=base_url, max_poll_interval=30.0,
+                                  webhook_url=f"http://127.0.0.1:{port}/replicate/webhook",
+                                  webhook_secret=SECRET, webhook_port=port)
+    try:
+        started = time.perf_counter()
+        outputs = await asyncio.gather(*(
+            client.run("stability-ai/sdxl:abc123", {"prompt": f"icon {i}"}) for i in range(10)
+        ))
+        elapsed = time.perf_counter() - started
+    finally:
+        await client.close()
+        await pool.close()
+        await fake.runner.cleanup()
+
+    assert len(outputs) == 10 and client.stats['webhooks'] == 10
+    assert fake.get_calls == 0 and elapsed < 2.0
+    assert not client.verify_webhook({'webhook-id': 'x', 'webhook-timestamp': '1',
+                                      'webhook-signature': 'v1,bad'}, b'{}')
+    print(f"   ✅ PASS: 10 predictions via webhook in {elapsed:.2f}s, 0 polls")
+
+
+async def test_timed_out_wait_cancels_prediction():
+    print("\n[TEST 5] A wait cancelled by a timeout cancels the prediction on Replicate...")
+    fake = FakeReplicateAPI(latency=30.0)
+    base_url = await fake.start()
+    pool = ConnectionPoolManager()
+    client = AsyncReplicateClient('r8_test', http_pool=pool, base_url=base_url,
+                                  min_poll_interval=0.1, max_poll_interval=0.2)
+    try:
+        prediction = await client.create_prediction("stability-ai/sdxl:abc123", {"prompt": "slow"})
+        try:
+            await asyncio.wait_for(client.wait(prediction['id']), timeout=0.3)
+            raise AssertionError("expected a timeout")
+        except asyncio.TimeoutError:
+            pass
+        final = await asyncio.wait_for(client.wait(prediction['id']), timeout=2.0)
+    finally:
+        await client.close()
+        await pool.close()
+        await fake.runner.cleanup()
+
+    assert fake.cancel_calls == 1 and client.stats['cancelled'] == 1
+    assert final['status'] == 'canceled'
+    try:
+        AsyncReplicateClient('r8_test', http_pool=pool, webhook_port=8765)
+        raise AssertionError("expected ValidationError")
+    except ValidationError:
+        pass
+    assert not client.verify_webhook({}, b'{}')
+    print("   ✅ PASS: Prediction cancelled; unsigned webhook receiver refused")
+
+
+async def main():
+    await test_many_predictions_one_poller()
+    await test_adaptive_interval()
+    await test_failed_prediction_raises()
+    await test_webhook_resolves_predictions()
+    await test_timed_out_wait_cancels_prediction()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("ASYNC REPLICATE CLIENT TESTING")
+    print("=" * 60)
+    asyncio.run(main())
+    print("\n🎉 ALL REPLICATE CLIENT TESTS PASSED!")
@@ -13,8 +13,9 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
-import replicate
 from tqdm import tqdm
+from utils.replicate_client import AsyncReplicateClient
+from utils.resource_manager import close_connection_pool
 
 # Configure logging
 logging.basicConfig(
@@ -142,7 +143,7 @@ class EstateExecutiveThemeGenerator:
         self.replicate_client = None
         api_token = os.environ.get('REPLICATE_API_TOKEN')
         if api_token:
-            self.replicate_client = replicate.Client(api_token=api_token)
+            self.replicate_client = AsyncReplicateClient.from_env(api_token)
             logger.info("✅ Replicate client initialized")
         else:
             logger.warning("⚠️ REPLICATE_API_TOKEN not found - running in planning mode only")
@@ -332,9 +333,9 @@ class EstateExecutiveThemeGenerator:
             
             # Generate image
             logger.debug(f"Generating {asset.filename}...")
-            output = await self.replicate_client.predictions.create(
-                model="black-forest-labs/flux-schnell",
-                input={
+            prediction = await self.replicate_client.create_prediction(
+                "black-forest-labs/flux-schnell",
+                {
                     "prompt": asset.prompt,
                     "num_outputs": 1,
                     "aspect_ratio": "1:1" if asset.asset_type == 'icon' else "16:9",
@@ -343,13 +344,12 @@ class EstateExecutiveThemeGenerator:
                 }
             )
             
-            # Wait for completion
-            while output.status not in ['succeeded', 'failed', 'canceled']:
-                await asyncio.sleep(1)
-                output = await self.replicate_client.predictions.get(output.id)
+            # Wait for completion (resolved by the client's shared poller)
+            prediction = await self.replicate_client.wait(prediction['id'])
             
-            if output.status == 'succeeded' and output.output:
-                asset.url = output.output[0] if isinstance(output.output, list) else output.output
+            if prediction['status'] == 'succeeded' and prediction.get('output'):
+                output = prediction['output']
+                asset.url = output[0] if isinstance(output, list) else output
                 asset.status = "generated"
                 asset.cost = cost
                 
@@ -360,7 +360,7 @@ class EstateExecutiveThemeGenerator:
                 logger.info(f"✅ Generated {asset.filename}")
                 return True
             else:
-                raise Exception(f"Generation failed: {output.status}")
+                raise Exception(f"Generation failed: {prediction['status']}")
                 
         except Exception as e:
             logger.error(f"❌ Failed to generate {asset.filename}: {e}")
@@ -536,7 +536,12 @@ async def main():
         logger.info(f"💰 Budget override: ${args.budget:.2f}")
     
     # Generate theme
-    results = await generator.generate_theme(test_mode=args.test)
+    try:
+        results = await generator.generate_theme(test_mode=args.test)
+    finally:
+        if generator.replicate_client:
+            await generator.replicate_client.close()
+        await close_connection_pool()
     
     return results
 
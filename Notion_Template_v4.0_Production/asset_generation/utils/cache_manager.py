@@ -2,10 +2,18 @@
 
 Prevents costly regeneration of identical prompts by checking cache before
 generating new assets. Integrates with SQLite database for persistent storage.
+
+Recent lookups are served from a bounded in-memory LRU tier without touching
+the disk or the database: file existence is only re-checked once an entry is
+older than ``validate_interval``, and use counts are accumulated in memory
+and written to ``prompt_cache`` in batches.
 """
 
 import hashlib
 import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
@@ -14,13 +22,22 @@ import aiofiles
 import asyncio
 from contextlib import asynccontextmanager
 
-from .database_manager import DatabaseManager
+from .database_manager import AssetDatabase
 from .async_file_handler import AsyncFileHandler
 from .path_validator import PathValidator
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _MemoryEntry:
+    """Cached asset held in the memory tier"""
+    path: Path
+    size: int
+    prompt_hash: Optional[str]  # prompt_cache row to credit hits to
+    checked_at: float  # time.monotonic() of the last existence check
+
+
 class AssetCache:
     """Intelligent caching system for generated assets.
     
@@ -30,13 +47,18 @@ class AssetCache:
         - File existence validation
         - Cache expiration management
         - Memory-efficient streaming for large files
+        - Bounded LRU memory tier with hit/miss/eviction counters
     """
     
     def __init__(
         self,
-        db_manager: DatabaseManager,
+        db_manager: AssetDatabase,
         cache_dir: Path = Path("cache/assets"),
-        max_cache_age_days: int = 30
+        max_cache_age_days: int = 30,
+        max_memory_entries: int = 1000,
+        max_memory_bytes: int = 512 * 1024 * 1024,
+        validate_interval: float = 300.0,
+        hit_flush_threshold: int = 100
     ):
         """Initialize asset cache manager.
         
@@ -44,13 +66,27 @@ class AssetCache:
             db_manager: Database manager instance
             cache_dir: Directory for cached assets
             max_cache_age_days: Maximum age for cached items
+            max_memory_entries: Most entries kept in the memory tier
+            max_memory_bytes: Most total asset bytes the memory tier refers to
+            validate_interval: Seconds before a memory hit re-checks the file exists
+            hit_flush_threshold: Pending hits that trigger a use_count update
         """
         self.db = db_manager
         self.cache_dir = Path(cache_dir)
         self.max_cache_age = timedelta(days=max_cache_age_days)
         self.file_handler = AsyncFileHandler()
         self.path_validator = PathValidator()
-        self._memory_cache: Dict[str, Path] = {}  # In-memory cache for session
+        self.max_memory_entries = max_memory_entries
+        self.max_memory_bytes = max_memory_bytes
+        self.validate_interval = validate_interval
+        self.hit_flush_threshold = hit_flush_threshold
+        
+        # In-memory LRU tier for the session, least recently used first
+        self._memory_cache: "OrderedDict[str, _MemoryEntry]" = OrderedDict()
+        self._memory_bytes = 0
+        self._pending_hits: Dict[str, int] = {}
+        self._pending_hit_count = 0
+        self.stats = {'memory_hits': 0, 'database_hits': 0, 'misses': 0, 'evictions': 0}
         
         # Ensure cache directory exists
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -73,6 +109,61 @@ class AssetCache:
         cache_string = ":".join(components)
         return hashlib.sha256(cache_string.encode()).hexdigest()
     
+    def _remember(
+        self,
+        cache_key: str,
+        file_path: Path,
+        prompt_hash: Optional[str] = None,
+        size: Optional[int] = None
+    ) -> None:
+        """Add or refresh a memory tier entry, evicting least recently used ones.
+        
+        Args:
+            cache_key: Cache key
+            file_path: Path to the cached asset (known to exist)
+            prompt_hash: prompt_cache hash to credit hits to
+            size: File size if already known
+        """
+        if size is None:
+            size = file_path.stat().st_size
+        self._forget(cache_key)
+        self._memory_cache[cache_key] = _MemoryEntry(file_path, size, prompt_hash, time.monotonic())
+        self._memory_bytes += size
+        
+        while len(self._memory_cache) > 1 and (
+            len(self._memory_cache) > self.max_memory_entries or
+            self._memory_bytes > self.max_memory_bytes
+        ):
+            _, evicted = self._memory_cache.popitem(last=False)
+            self._memory_bytes -= evicted.size
+            self.stats['evictions'] += 1
+    
+    def _forget(self, cache_key: str) -> None:
+        """Drop a memory tier entry if present."""
+        entry = self._memory_cache.pop(cache_key, None)
+        if entry is not None:
+            self._memory_bytes -= entry.size
+    
+    async def _count_hit(self, prompt_hash: Optional[str]) -> None:
+        """Queue a use_count/last_used update for a prompt_cache row."""
+        if prompt_hash is None:
+            return
+        self._pending_hits[prompt_hash] = self._pending_hits.get(prompt_hash, 0) + 1
+        self._pending_hit_count += 1
+        if self._pending_hit_count >= self.hit_flush_threshold:
+            await self.flush_hit_counts()
+    
+    async def flush_hit_counts(self) -> None:
+        """Write accumulated hit counts to the database in one batch."""
+        if not self._pending_hits:
+            return
+        hits, count = self._pending_hits, self._pending_hit_count
+        self._pending_hits, self._pending_hit_count = {}, 0
+        try:
+            await self.db.record_cache_hits(hits)
+        except Exception as e:
+            logger.warning(f"Failed to record {count} cache hits: {e}")
+    
     async def check_exists(
         self,
         prompt: str,
@@ -92,17 +183,25 @@ class AssetCache:
         cache_key = self._generate_cache_key(prompt, asset_type, model)
         
         # Check memory cache first
-        if cache_key in self._memory_cache:
-            cached_path = self._memory_cache[cache_key]
-            if cached_path.exists():
+        entry = self._memory_cache.get(cache_key)
+        if entry is not None:
+            now = time.monotonic()
+            if now - entry.checked_at >= self.validate_interval:
+                if entry.path.exists():
+                    entry.checked_at = now
+                else:
+                    # File was deleted, remove from memory cache
+                    self._forget(cache_key)
+                    entry = None
+            if entry is not None:
+                self._memory_cache.move_to_end(cache_key)
+                self.stats['memory_hits'] += 1
                 logger.debug(f"Cache hit (memory): {cache_key[:8]}...")
-                return cached_path
-            else:
-                # File was deleted, remove from memory cache
-                del self._memory_cache[cache_key]
+                await self._count_hit(entry.prompt_hash)
+                return entry.path
         
         # Check database cache
-        cached_info = await self.db.check_duplicate(prompt, asset_type)
+        cached_info = await self.db.check_duplicate(prompt, asset_type, record_hit=False)
         if cached_info:
             file_path = Path(cached_info['file_path'])
             
@@ -112,13 +211,17 @@ class AssetCache:
                 created_at = datetime.fromisoformat(cached_info['created_at'])
                 if datetime.now() - created_at < self.max_cache_age:
                     logger.info(f"Cache hit (database): {cache_key[:8]}...")
-                    self._memory_cache[cache_key] = file_path
+                    self.stats['database_hits'] += 1
+                    self._remember(cache_key, file_path, prompt_hash=cached_info['prompt_hash'],
+                                   size=cached_info.get('file_size') or None)
+                    await self._count_hit(cached_info['prompt_hash'])
                     return file_path
                 else:
                     logger.debug(f"Cache expired: {cache_key[:8]}...")
             else:
                 logger.warning(f"Cached file missing: {file_path}")
         
+        self.stats['misses'] += 1
         return None
     
     async def store(
@@ -160,7 +263,7 @@ class AssetCache:
                 file_path = cache_path
             
             # Store in memory cache
-            self._memory_cache[cache_key] = file_path
+            self._remember(cache_key, file_path)
             
             # Store in database (the database manager handles the prompt_cache table)
             # We'll record this as part of the generation attempt
@@ -193,8 +296,14 @@ class AssetCache:
         Returns:
             Dictionary with cache statistics
         """
+        await self.flush_hit_counts()
+        
+        lookups = self.stats['memory_hits'] + self.stats['database_hits'] + self.stats['misses']
         stats = {
             'memory_cache_size': len(self._memory_cache),
+            'memory_cache_bytes': self._memory_bytes,
+            **self.stats,
+            'hit_rate': round((lookups - self.stats['misses']) / lookups, 3) if lookups else 0.0,
             'cache_directory': str(self.cache_dir),
             'max_cache_age_days': self.max_cache_age.days
         }
@@ -245,8 +354,8 @@ class AssetCache:
                     
                     # Remove from memory cache
                     cache_key = metadata.get('cache_key')
-                    if cache_key and cache_key in self._memory_cache:
-                        del self._memory_cache[cache_key]
+                    if cache_key:
+                        self._forget(cache_key)
                     
                     removed_count += 1
                     logger.debug(f"Removed expired cache: {asset_file.name}")
@@ -280,7 +389,7 @@ class AssetCache:
                     asset_file = meta_file.with_suffix('')
                     
                     if cache_key and asset_file.exists():
-                        self._memory_cache[cache_key] = asset_file
+                        self._remember(cache_key, asset_file)
                         loaded_count += 1
                         
             except Exception as e:
@@ -315,7 +424,7 @@ class AssetCache:
         
         # Remove from memory cache
         if key in self._memory_cache:
-            del self._memory_cache[key]
+            self._forget(key)
             logger.debug(f"Invalidated memory cache: {key[:8]}...")
         
         # Remove from disk
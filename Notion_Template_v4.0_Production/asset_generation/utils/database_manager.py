@@ -2,8 +2,21 @@
 
 This module provides comprehensive database functionality for tracking asset
 generation, costs, retries, and analytics using SQLite with async support.
+
+Connections are long-lived: one writer connection owned by a writer task
+that applies queued writes in group commits, and a small pool of reader
+connections that WAL mode lets run alongside it. Statements are reused from
+each connection's prepared statement cache instead of being recompiled on a
+fresh connection per call.
+
+Generation bookkeeping (assets, transactions, retry_log and run stats) is
+written behind: those writes run straight away on the writer connection but
+are only committed once ``flush_interval`` seconds or ``max_batch_size``
+writes have accumulated, or when something calls ``flush()``. Checkpoints,
+resume points and budget checks flush first so they never read stale totals.
 """
 
+import asyncio
 import aiosqlite
 import sqlite3
 import hashlib
@@ -12,9 +25,11 @@ import uuid
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable, Awaitable, TypeVar
 import logging
 
+T = TypeVar('T')
+
 # Database schema
 SCHEMA_SQL = """
 -- Core asset tracking table
@@ -185,29 +200,270 @@ class AssetDatabase:
     - Analytics and reporting
     """
     
-    def __init__(self, db_path: str = "assets.db", logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        db_path: str = "assets.db",
+        logger: Optional[logging.Logger] = None,
+        read_pool_size: int = 2,
+        max_batch_size: int = 200,
+        flush_interval: float = 1.0
+    ):
         """Initialize database manager.
         
         Args:
             db_path: Path to SQLite database file
             logger: Optional logger instance
+            read_pool_size: Reader connections kept open alongside the writer
+            max_batch_size: Most writes applied in one commit
+            flush_interval: Longest time written-behind bookkeeping stays uncommitted
         """
         self.db_path = Path(db_path)
         self.logger = logger or logging.getLogger(__name__)
+        self.read_pool_size = read_pool_size
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
         self._initialized = False
         
+        # Connections and writer task, bound to the event loop that opened them
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle_readers: Optional[asyncio.Queue] = None
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._open_lock: Optional[asyncio.Lock] = None
+        self.stats = {'writes': 0, 'commits': 0}
+    
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open a connection in autocommit mode; transactions are explicit."""
+        connection = aiosqlite.connect(str(self.db_path), isolation_level=None, cached_statements=256)
+        # Don't keep the interpreter alive if close() is never awaited
+        getattr(connection, '_thread', connection).daemon = True
+        db = await connection
+        db.row_factory = aiosqlite.Row
+        await db.execute("PRAGMA foreign_keys = ON")
+        await db.execute("PRAGMA busy_timeout = 5000")
+        return db
+    
+    async def _open(self) -> None:
+        """Open the writer, readers and writer task for the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._writer is not None:
+            return
+        if self._loop is not loop:
+            if self._writer is not None:
+                self.logger.debug("Event loop changed; reopening database connections")
+                for db in [self._writer] + self._readers:
+                    db.stop()
+                self._writer = None
+                self._readers = []
+            self._open_lock = asyncio.Lock()
+            self._loop = loop
+        
+        async with self._open_lock:
+            if self._writer is not None:
+                return
+            writer = await self._connect()
+            await writer.execute("PRAGMA journal_mode = WAL")  # Readers don't block the writer
+            await writer.execute("PRAGMA synchronous = NORMAL")  # Safe with WAL; one fsync per checkpoint
+            self._readers = [await self._connect() for _ in range(self.read_pool_size)]
+            self._idle_readers = asyncio.Queue()
+            for db in self._readers:
+                self._idle_readers.put_nowait(db)
+            self._write_queue = asyncio.Queue()
+            self._write_lock = asyncio.Lock()
+            self._writer = writer
+            self._writer_task = loop.create_task(self._run_writer())
+    
+    async def _run_writer(self) -> None:
+        """Apply queued writes inside one open transaction and commit it when due.
+        
+        Each write runs in its own savepoint so a failing one is rolled back
+        alone. Written-behind operations get their result as soon as they
+        have run; durable ones wait for the commit, which happens as soon as
+        the queue is drained. Otherwise the transaction is committed once it
+        holds max_batch_size writes or has been open for flush_interval.
+        If the connection itself fails, the open transaction and everything
+        queued are failed and the writer starts over with the next write.
+        """
+        loop = asyncio.get_running_loop()
+        waiting: List[asyncio.Future] = []
+        pending = 0
+        deadline = 0.0
+        locked = False
+        
+        while True:
+            future = None
+            try:
+                if pending:
+                    try:
+                        item = await asyncio.wait_for(self._write_queue.get(), max(deadline - loop.time(), 0))
+                    except asyncio.TimeoutError:
+                        item = None
+                else:
+                    item = await self._write_queue.get()
+                
+                if item is not None:
+                    operation, future, durable = item
+                    if operation is None and not pending:
+                        future.set_result(None)  # Nothing to flush
+                        continue
+                    if not pending:
+                        await self._write_lock.acquire()
+                        try:
+                            await self._writer.execute("BEGIN IMMEDIATE")
+                        except Exception as e:
+                            self._write_lock.release()
+                            if not future.done():
+                                future.set_exception(e)
+                            continue
+                        locked = True
+                        deadline = loop.time() + self.flush_interval
+                    pending += 1
+                    
+                    if operation is not None:
+                        await self._writer.execute("SAVEPOINT write_op")
+                        try:
+                            result = await operation(self._writer)
+                            await self._writer.execute("RELEASE write_op")
+                        except Exception as e:
+                            await self._writer.execute("ROLLBACK TO write_op")
+                            await self._writer.execute("RELEASE write_op")
+                            if not future.done():
+                                future.set_exception(e)
+                            future = None
+                        if future is not None and not durable and not future.done():
+                            future.set_result(result)
+                    if future is not None and durable:
+                        waiting.append((future, result if operation is not None else None))
+                        future = None
+                    
+                    due = (
+                        pending >= self.max_batch_size or
+                        loop.time() >= deadline or
+                        (waiting and self._write_queue.empty())
+                    )
+                    if not due:
+                        continue
+                
+                try:
+                    await self._writer.execute("COMMIT")
+                    self.stats['commits'] += 1
+                    self.stats['writes'] += pending
+                    error = None
+                except Exception as e:
+                    error = e
+                    self.logger.error(f"Database commit of {pending} writes failed: {e}")
+                    if self._writer.in_transaction:
+                        await self._writer.execute("ROLLBACK")
+                finally:
+                    self._write_lock.release()
+                    locked = False
+                
+                for future, result in waiting:
+                    if future.done():
+                        continue
+                    if error is not None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(result)
+                waiting = []
+                pending = 0
+            except Exception as e:
+                self.logger.error(f"Database writer failed with {pending} writes in its transaction: {e}")
+                await self._abort_writes(e, [future] + [f for f, _ in waiting], locked)
+                waiting = []
+                pending = 0
+                locked = False
+    
+    async def _abort_writes(
+        self,
+        error: Exception,
+        futures: List[Optional[asyncio.Future]],
+        locked: bool
+    ) -> None:
+        """Fail the writes of a broken transaction and everything queued behind it.
+        
+        Args:
+            error: Exception raised to every waiting caller
+            futures: Futures of the writes in the transaction
+            locked: Whether the writer holds _write_lock
+        """
+        try:
+            if self._writer.in_transaction:
+                await self._writer.execute("ROLLBACK")
+        except Exception as e:
+            self.logger.error(f"Database rollback after writer failure failed: {e}")
+        finally:
+            if locked:
+                self._write_lock.release()
+        
+        while not self._write_queue.empty():
+            futures.append(self._write_queue.get_nowait()[1])
+        for future in futures:
+            if future is not None and not future.done():
+                future.set_exception(error)
+    
+    async def _write(
+        self,
+        operation: Optional[Callable[[aiosqlite.Connection], Awaitable[T]]],
+        durable: bool = True
+    ) -> T:
+        """Queue a write for the writer task.
+        
+        Args:
+            operation: Coroutine function run with the writer connection;
+                it must not commit. None just waits for a commit.
+            durable: Wait until the write is committed rather than only run
+            
+        Returns:
+            Whatever the operation returns
+        """
+        await self._open()
+        future = asyncio.get_running_loop().create_future()
+        self._write_queue.put_nowait((operation, future, durable))
+        return await future
+    
+    async def flush(self) -> None:
+        """Commit all written-behind bookkeeping now.
+        
+        Raises:
+            sqlite3.Error: If the commit fails; written-behind writes in it are lost
+        """
+        if self._writer is None:
+            return
+        await self._write(None)
+    
+    @asynccontextmanager
+    async def _reader(self):
+        """Borrow a reader connection from the pool."""
+        await self._open()
+        db = await self._idle_readers.get()
+        try:
+            yield db
+        finally:
+            self._idle_readers.put_nowait(db)
+    
     @asynccontextmanager
     async def get_connection(self):
-        """Get async database connection with row factory.
+        """Get exclusive use of the writer connection with row factory.
+        
+        For ad-hoc queries outside the methods below. Statements run in
+        autocommit mode unless the caller begins a transaction; anything
+        left open is committed on exit.
         
         Yields:
             Async database connection
         """
-        async with aiosqlite.connect(str(self.db_path)) as db:
-            db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA foreign_keys = ON")
-            await db.execute("PRAGMA journal_mode = WAL")  # Better concurrent access
-            yield db
+        await self.flush()
+        await self._open()
+        async with self._write_lock:
+            try:
+                yield self._writer
+            finally:
+                if self._writer.in_transaction:
+                    await self._writer.commit()
             
     async def initialize(self) -> None:
         """Create database schema if not exists."""
@@ -218,26 +474,32 @@ class AssetDatabase:
         
         async with self.get_connection() as db:
             await db.executescript(SCHEMA_SQL)
-            await db.commit()
             
         self._initialized = True
         self.logger.info("Database initialized successfully")
     
     # === Asset Management ===
     
-    async def check_duplicate(self, prompt: str, asset_type: str) -> Optional[Dict[str, Any]]:
+    async def check_duplicate(
+        self,
+        prompt: str,
+        asset_type: str,
+        record_hit: bool = True
+    ) -> Optional[Dict[str, Any]]:
         """Check if this exact prompt was already generated.
         
         Args:
             prompt: Generation prompt
             asset_type: Type of asset (icons, covers, etc.)
+            record_hit: Bump use_count/last_used on a hit; callers that batch
+                hits pass False and use record_cache_hits()
             
         Returns:
             Asset data if found, None otherwise
         """
         prompt_hash = self._hash_prompt(prompt, asset_type)
         
-        async with self.get_connection() as db:
+        async with self._reader() as db:
             # Check cache first
             cursor = await db.execute(
                 """SELECT pc.*, a.cost 
@@ -249,19 +511,31 @@ class AssetDatabase:
             )
             row = await cursor.fetchone()
             
-            if row:
-                # Update cache hit count
-                await db.execute(
-                    """UPDATE prompt_cache 
-                       SET use_count = use_count + 1, 
-                           last_used = CURRENT_TIMESTAMP
-                       WHERE prompt_hash = ?""",
-                    (prompt_hash,)
-                )
-                await db.commit()
-                return dict(row)
-                
-            return None
+        if row:
+            if record_hit:
+                await self.record_cache_hits({prompt_hash: 1})
+            return dict(row)
+            
+        return None
+    
+    async def record_cache_hits(self, hits: Dict[str, int]) -> None:
+        """Add accumulated hits to prompt_cache use counts (written behind).
+        
+        Args:
+            hits: Number of hits per prompt hash
+        """
+        if not hits:
+            return
+        
+        async def write(db: aiosqlite.Connection):
+            await db.executemany(
+                """UPDATE prompt_cache 
+                   SET use_count = use_count + ?, 
+                       last_used = CURRENT_TIMESTAMP
+                   WHERE prompt_hash = ?""",
+                [(count, prompt_hash) for prompt_hash, count in hits.items()]
+            )
+        await self._write(write, durable=False)
     
     async def record_generation_attempt(
         self, 
@@ -273,7 +547,7 @@ class AssetDatabase:
         batch_index: Optional[int] = None,
         metadata: Optional[Dict] = None
     ) -> int:
-        """Record a new generation attempt.
+        """Record a new generation attempt (written behind, see flush()).
         
         Args:
             asset_type: Type of asset
@@ -289,7 +563,7 @@ class AssetDatabase:
         """
         prompt_hash = self._hash_prompt(prompt, asset_type)
         
-        async with self.get_connection() as db:
+        async def write(db: aiosqlite.Connection) -> int:
             cursor = await db.execute(
                 """INSERT INTO assets 
                    (asset_type, prompt, prompt_hash, cost, status, model_id, 
@@ -305,9 +579,9 @@ class AssetDatabase:
                    VALUES (?, ?, 'charge', 'pending')""",
                 (cursor.lastrowid, cost)
             )
-            
-            await db.commit()
             return cursor.lastrowid
+        
+        return await self._write(write, durable=False)
     
     async def update_asset_status(
         self,
@@ -320,6 +594,10 @@ class AssetDatabase:
     ) -> None:
         """Update asset after generation attempt.
         
+        Failures are written behind (see flush()). A completed asset is
+        committed before this returns, so check_duplicate() finds it right
+        away and a repeated prompt is not generated and paid for twice.
+        
         Args:
             asset_id: Asset ID to update
             status: New status
@@ -328,7 +606,7 @@ class AssetDatabase:
             error_message: Error message if failed
             actual_cost: Actual cost if different from estimate
         """
-        async with self.get_connection() as db:
+        async def write(db: aiosqlite.Connection):
             # Update asset
             await db.execute(
                 """UPDATE assets 
@@ -361,8 +639,8 @@ class AssetDatabase:
             row = await cursor.fetchone()
             if row and row['run_id']:
                 await self._update_run_stats(db, row['run_id'])
-            
-            await db.commit()
+        
+        await self._write(write, durable=status == 'completed' and bool(file_path))
     
     # === Progress Tracking ===
     
@@ -382,15 +660,15 @@ class AssetDatabase:
         """
         run_id = str(uuid.uuid4())
         
-        async with self.get_connection() as db:
+        async def write(db: aiosqlite.Connection):
             await db.execute(
                 """INSERT INTO generation_runs 
                    (id, mode, total_assets, status)
                    VALUES (?, ?, ?, 'pending')""",
                 (run_id, mode, total_assets)
             )
-            await db.commit()
-            
+        
+        await self._write(write)
         return run_id
     
     async def get_resume_point(self, run_id: str) -> Tuple[int, Dict[str, Any]]:
@@ -402,7 +680,7 @@ class AssetDatabase:
         Returns:
             Tuple of (last completed index, run info)
         """
-        async with self.get_connection() as db:
+        async def write(db: aiosqlite.Connection) -> Tuple[int, Dict[str, Any]]:
             # Get run info
             cursor = await db.execute(
                 "SELECT * FROM generation_runs WHERE id = ?", (run_id,)
@@ -428,9 +706,10 @@ class AssetDatabase:
                    WHERE id = ?""",
                 (json.dumps({'last_index': last_index}), run_id)
             )
-            await db.commit()
             
             return last_index, dict(run_info)
+        
+        return await self._write(write)
     
     async def checkpoint_progress(
         self,
@@ -443,14 +722,15 @@ class AssetDatabase:
             run_id: Run ID
             checkpoint_data: Data to save for resuming
         """
-        async with self.get_connection() as db:
+        async def write(db: aiosqlite.Connection):
             await db.execute(
                 """UPDATE generation_runs 
-                   SET checkpoint = ?, updated_at = CURRENT_TIMESTAMP
+                   SET checkpoint = ?
                    WHERE id = ?""",
                 (json.dumps(checkpoint_data), run_id)
             )
-            await db.commit()
+        
+        await self._write(write)
     
     # === Financial Tracking ===
     
@@ -468,7 +748,8 @@ class AssetDatabase:
             
         date_str = date.strftime('%Y-%m-%d')
         
-        async with self.get_connection() as db:
+        await self.flush()
+        async with self._reader() as db:
             cursor = await db.execute(
                 """SELECT COALESCE(SUM(amount), 0) as total
                    FROM transactions 
@@ -506,7 +787,7 @@ class AssetDatabase:
         error_message: Optional[str] = None,
         success: bool = False
     ) -> None:
-        """Record a retry attempt for failed generation.
+        """Record a retry attempt for failed generation (written behind, see flush()).
         
         Args:
             asset_id: Asset being retried
@@ -514,7 +795,7 @@ class AssetDatabase:
             error_message: Error if retry failed
             success: Whether retry succeeded
         """
-        async with self.get_connection() as db:
+        async def write(db: aiosqlite.Connection):
             # Get current retry count
             cursor = await db.execute(
                 "SELECT retry_count FROM assets WHERE id = ?", (asset_id,)
@@ -538,8 +819,8 @@ class AssetDatabase:
                    WHERE id = ?""",
                 (retry_number, success, asset_id)
             )
-            
-            await db.commit()
+        
+        await self._write(write, durable=False)
     
     async def get_failed_assets_for_retry(
         self,
@@ -557,7 +838,8 @@ class AssetDatabase:
         """
         cutoff_time = datetime.now() - timedelta(hours=hours_old)
         
-        async with self.get_connection() as db:
+        await self.flush()
+        async with self._reader() as db:
             cursor = await db.execute(
                 """SELECT a.*, 
                           (SELECT COUNT(*) FROM retry_log WHERE asset_id = a.id) as retry_attempts
@@ -599,7 +881,8 @@ class AssetDatabase:
             
         where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         
-        async with self.get_connection() as db:
+        await self.flush()
+        async with self._reader() as db:
             # Overall stats
             cursor = await db.execute(f"""
                 SELECT 
@@ -664,7 +947,7 @@ class AssetDatabase:
         Returns:
             List of duplicate generations with waste analysis
         """
-        async with self.get_connection() as db:
+        async with self._reader() as db:
             cursor = await db.execute("""
                 SELECT 
                     prompt,
@@ -778,7 +1061,7 @@ class AssetDatabase:
         self, base_prompt: str, asset_type: str, category: str, index: int
     ) -> int:
         """Create a new prompt competition."""
-        async with self.get_connection() as db:
+        async def write(db: aiosqlite.Connection) -> int:
             cursor = await db.execute(
                 """INSERT INTO prompt_competitions 
                    (base_prompt, asset_type, category, index_in_category)
@@ -786,12 +1069,14 @@ class AssetDatabase:
                 (base_prompt, asset_type, category, index)
             )
             return cursor.lastrowid
+        
+        return await self._write(write)
 
     async def store_competitive_prompt(
         self, competition_id: int, model_source: str, prompt_text: str, metadata: Dict = None
     ) -> int:
         """Store a competitive prompt variation."""
-        async with self.get_connection() as db:
+        async def write(db: aiosqlite.Connection) -> int:
             cursor = await db.execute(
                 """INSERT INTO competitive_prompts 
                    (competition_id, model_source, prompt_text, generation_metadata)
@@ -799,13 +1084,15 @@ class AssetDatabase:
                 (competition_id, model_source, prompt_text, json.dumps(metadata or {}))
             )
             return cursor.lastrowid
+        
+        return await self._write(write)
 
     async def store_quality_evaluation(
         self, prompt_id: int, scores: Dict, overall_score: float, 
         weighted_score: float, evaluator_model: str, summary: str = ""
     ) -> int:
         """Store quality evaluation for a competitive prompt."""
-        async with self.get_connection() as db:
+        async def write(db: aiosqlite.Connection) -> int:
             cursor = await db.execute(
                 """INSERT INTO quality_evaluations 
                    (prompt_id, scores, overall_score, weighted_score, evaluator_model, evaluation_summary)
@@ -813,13 +1100,15 @@ class AssetDatabase:
                 (prompt_id, json.dumps(scores), overall_score, weighted_score, evaluator_model, summary)
             )
             return cursor.lastrowid
+        
+        return await self._write(write)
 
     async def store_human_decision(
         self, competition_id: int, selected_prompt_id: int, reviewer_name: str,
         reasoning: str, custom_modifications: str = None, quality_override: float = None
     ) -> int:
         """Store human decision for a competition."""
-        async with self.get_connection() as db:
+        async def write(db: aiosqlite.Connection) -> int:
             cursor = await db.execute(
                 """INSERT INTO human_decisions 
                    (competition_id, selected_prompt_id, reviewer_name, reasoning, 
@@ -835,10 +1124,12 @@ class AssetDatabase:
                 (competition_id,)
             )
             return cursor.lastrowid
+        
+        return await self._write(write)
 
     async def get_pending_competitions(self) -> List[Dict]:
         """Get all competitions pending human review."""
-        async with self.get_connection() as db:
+        async with self._reader() as db:
             cursor = await db.execute(
                 """SELECT * FROM prompt_competitions 
                    WHERE competition_status = 'evaluated'
@@ -848,7 +1139,7 @@ class AssetDatabase:
 
     async def get_competitive_prompts(self, competition_id: int) -> List[Dict]:
         """Get all competitive prompts for a competition."""
-        async with self.get_connection() as db:
+        async with self._reader() as db:
             cursor = await db.execute(
                 """SELECT cp.*, qe.overall_score, qe.weighted_score, qe.evaluation_summary
                    FROM competitive_prompts cp
@@ -861,31 +1152,31 @@ class AssetDatabase:
 
     async def get_competition_evaluations(self, competition_id: int) -> Dict:
         """Get complete evaluation data for a competition."""
-        async with self.get_connection() as db:
+        async with self._reader() as db:
             # Get competition info
             cursor = await db.execute(
                 "SELECT * FROM prompt_competitions WHERE id = ?", (competition_id,)
             )
             competition = dict(await cursor.fetchone())
             
-            # Get competitive prompts with evaluations
-            prompts = await self.get_competitive_prompts(competition_id)
-            
-            # Find winner (highest weighted score)
-            winner = max(prompts, key=lambda p: p.get('weighted_score', 0)) if prompts else None
-            
-            return {
-                'competition': competition,
-                'prompts': prompts,
-                'winner': winner,
-                'page_title': f"{competition['asset_type']} {competition['index_in_category']}",
-                'page_category': competition['category'],
-                'asset_type': competition['asset_type']
-            }
+        # Get competitive prompts with evaluations
+        prompts = await self.get_competitive_prompts(competition_id)
+        
+        # Find winner (highest weighted score)
+        winner = max(prompts, key=lambda p: p.get('weighted_score', 0)) if prompts else None
+        
+        return {
+            'competition': competition,
+            'prompts': prompts,
+            'winner': winner,
+            'page_title': f"{competition['asset_type']} {competition['index_in_category']}",
+            'page_category': competition['category'],
+            'asset_type': competition['asset_type']
+        }
 
     async def get_approved_prompts(self) -> List[Dict]:
         """Get all human-approved prompts ready for generation."""
-        async with self.get_connection() as db:
+        async with self._reader() as db:
             cursor = await db.execute(
                 """SELECT 
                      hd.*,
@@ -904,15 +1195,32 @@ class AssetDatabase:
 
     async def mark_competition_completed(self, competition_id: int) -> None:
         """Mark a competition as completed after asset generation."""
-        async with self.get_connection() as db:
+        async def write(db: aiosqlite.Connection):
             await db.execute(
                 "UPDATE prompt_competitions SET competition_status = 'completed' WHERE id = ?",
                 (competition_id,)
             )
+        
+        await self._write(write)
 
     async def close(self) -> None:
-        """Close database connections and cleanup."""
-        # SQLite handles connection cleanup automatically
+        """Commit queued writes, then close the writer and reader connections."""
+        if self._writer is not None and self._loop is asyncio.get_running_loop():
+            await self.flush()
+            async with self._write_lock:
+                self._writer_task.cancel()
+                try:
+                    await self._writer_task
+                except asyncio.CancelledError:
+                    pass
+            for db in [self._writer] + self._readers:
+                await db.close()
+        elif self._writer is not None:
+            for db in [self._writer] + self._readers:
+                db.stop()
+        self._writer = None
+        self._readers = []
+        self._writer_task = None
         self.logger.info("Database manager closed")
 
 
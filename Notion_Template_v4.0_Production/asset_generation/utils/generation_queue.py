@@ -6,7 +6,7 @@ Manages efficient batching and queueing of image generation requests
 import asyncio
 import time
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any, Callable
+from typing import List, Dict, Optional, Any, Callable, Tuple
 from enum import Enum
 from queue import PriorityQueue
 import logging
@@ -14,6 +14,8 @@ from datetime import datetime
 import json
 from pathlib import Path
 
+from .resource_manager import RateLimiter
+
 logger = logging.getLogger(__name__)
 
 class GenerationPriority(Enum):
@@ -57,16 +59,15 @@ class GenerationTask:
 
 @dataclass
 class BatchConfig:
-    """Configuration for batch processing"""
-    batch_size: int = 5
-    batch_delay: float = 1.0  # Delay between batches
+    """Configuration for queue processing"""
     rate_limit: int = 10  # Requests per minute
-    concurrent_limit: int = 3  # Concurrent API calls
-    cost_limit: float = 10.0  # Maximum cost per batch
+    concurrent_limit: int = 3  # Concurrent API calls (worker count)
+    cost_limit: float = 10.0  # Maximum estimated cost in flight at once
+    task_timeout: float = 300.0  # Seconds before a running task is abandoned and retried
     safety_check: bool = True  # Enable prompt safety checks
 
 class MassGenerationQueue:
-    """Manages queuing and batch processing of generation tasks"""
+    """Manages queuing and continuous processing of generation tasks"""
     
     def __init__(
         self,
@@ -79,11 +80,16 @@ class MassGenerationQueue:
         
         Args:
             batch_config: Batch processing configuration
-            rate_limiter: Rate limiting implementation
+            rate_limiter: Rate limiting implementation (defaults to a token bucket
+                at batch_config.rate_limit requests per minute)
             cost_tracker: Cost tracking implementation
         """
         self.batch_config = batch_config or BatchConfig()
-        self.rate_limiter = rate_limiter
+        self.rate_limiter = rate_limiter or RateLimiter(
+            self.batch_config.rate_limit / 60,
+            self.batch_config.concurrent_limit,
+            logger
+        )
         self.cost_tracker = cost_tracker
         
         # Queue management
@@ -96,7 +102,10 @@ class MassGenerationQueue:
         # Processing state
         self.is_processing = False
         self.processing_task = None
-        self.semaphore = asyncio.Semaphore(self.batch_config.concurrent_limit)
+        self.claimed_count = 0  # Taken off the queue but not yet finished
+        self.cost_in_flight = 0.0
+        self._work_available: Optional[asyncio.Event] = None
+        self._cost_released: Optional[asyncio.Condition] = None
         
         # Statistics
         self.stats = {
@@ -106,8 +115,7 @@ class MassGenerationQueue:
             'total_failed': 0,
             'total_cancelled': 0,
             'total_cost': 0.0,
-            'total_time': 0.0,
-            'batches_processed': 0
+            'total_time': 0.0
         }
     
     def add_task(self, task: GenerationTask) -> str:
@@ -122,6 +130,8 @@ class MassGenerationQueue:
         """
         self.priority_queue.put(task)
         self.stats['total_queued'] += 1
+        if self._work_available:
+            self._work_available.set()
         logger.info(f"Added task {task.task_id} to queue with priority {task.priority.name}")
         return task.task_id
     
@@ -160,7 +170,13 @@ class MassGenerationQueue:
         safety_check_func: Optional[Callable] = None
     ):
         """
-        Process the queue with batching and rate limiting
+        Process the queue with a continuous pool of workers
+        
+        Each of concurrent_limit workers takes the highest-priority task as
+        soon as it is free, so one slow prediction never holds up the rest.
+        Every task waits for a rate limiter token and for room under
+        cost_limit before it starts, and is abandoned and retried if it runs
+        longer than task_timeout.
         
         Args:
             generator_func: Async function to generate images
@@ -168,152 +184,158 @@ class MassGenerationQueue:
             safety_check_func: Optional function to validate prompts
         """
         self.is_processing = True
+        self._work_available = asyncio.Event()
+        self._cost_released = asyncio.Condition()
         
         try:
-            while not self.priority_queue.empty() or self.active_tasks:
-                # Collect batch of tasks
-                batch = []
-                batch_cost = 0.0
-                
-                while len(batch) < self.batch_config.batch_size and not self.priority_queue.empty():
-                    task = self.priority_queue.get()
-                    
-                    # Safety check if enabled
-                    if self.batch_config.safety_check and safety_check_func:
-                        is_safe, reason = await safety_check_func(task.prompt)
-                        if not is_safe:
-                            task.status = GenerationStatus.FAILED
-                            task.error = f"Safety check failed: {reason}"
-                            self.failed_tasks[task.task_id] = task
-                            logger.warning(f"Task {task.task_id} failed safety check: {reason}")
-                            continue
-                    
-                    # Cost check
-                    estimated_cost = self._estimate_cost(task)
-                    if batch_cost + estimated_cost > self.batch_config.cost_limit:
-                        # Put task back if it exceeds cost limit
-                        self.priority_queue.put(task)
-                        break
-                    
-                    batch.append(task)
-                    batch_cost += estimated_cost
-                    self.active_tasks[task.task_id] = task
-                
-                if batch:
-                    # Process batch
-                    logger.info(f"Processing batch of {len(batch)} tasks (estimated cost: ${batch_cost:.2f})")
-                    
-                    # Rate limiting
-                    if self.rate_limiter:
-                        await self.rate_limiter.acquire()
-                    
-                    # Process tasks concurrently within batch
-                    batch_results = await self._process_batch(
-                        batch,
-                        generator_func,
-                        progress_callback
-                    )
-                    
-                    # Update statistics
-                    self.stats['batches_processed'] += 1
-                    self.stats['total_cost'] += batch_cost
-                    
-                    # Delay between batches
-                    await asyncio.sleep(self.batch_config.batch_delay)
-                
-                # Check for stalled active tasks
-                await self._check_stalled_tasks()
-                
-                # Small delay if queue is empty but active tasks remain
-                if self.priority_queue.empty() and self.active_tasks:
-                    await asyncio.sleep(0.5)
+            workers = [
+                asyncio.create_task(self._worker(generator_func, progress_callback, safety_check_func))
+                for _ in range(self.batch_config.concurrent_limit)
+            ]
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                for worker in workers:
+                    worker.cancel()
         
         finally:
             self.is_processing = False
+            self._work_available = None
+            self._cost_released = None
             logger.info("Queue processing completed")
     
-    async def _process_batch(
+    async def _next_task(self) -> Optional[GenerationTask]:
+        """Take the next task, waiting while others may still requeue work
+        
+        Returns:
+            Next task, or None once the queue is drained and nothing is running
+        """
+        while True:
+            if not self.priority_queue.empty():
+                self.claimed_count += 1
+                return self.priority_queue.get_nowait()
+            if self.claimed_count == 0:
+                # Wake the other idle workers so they can exit too
+                self._work_available.set()
+                return None
+            self._work_available.clear()
+            await self._work_available.wait()
+    
+    async def _admit_cost(self, cost: float):
+        """Wait until the task's estimated cost fits under cost_limit"""
+        async with self._cost_released:
+            await self._cost_released.wait_for(
+                lambda: self.cost_in_flight == 0
+                or self.cost_in_flight + cost <= self.batch_config.cost_limit
+            )
+            self.cost_in_flight += cost
+    
+    async def _release_cost(self, cost: float):
+        async with self._cost_released:
+            self.cost_in_flight -= cost
+            self._cost_released.notify_all()
+    
+    async def _worker(
         self,
-        batch: List[GenerationTask],
         generator_func: Callable,
-        progress_callback: Optional[Callable]
-    ) -> List[GenerationTask]:
-        """Process a batch of tasks concurrently"""
-        async def process_single_task(task: GenerationTask):
-            async with self.semaphore:
-                task.status = GenerationStatus.PROCESSING
-                task.started_at = time.time()
-                
-                try:
-                    # Call generator function
-                    result = await generator_func(
-                        prompt=task.prompt,
-                        asset_type=task.asset_type,
-                        metadata=task.metadata
-                    )
-                    
-                    task.result = result
-                    task.status = GenerationStatus.COMPLETED
-                    task.completed_at = time.time()
-                    
-                    # Move to completed
-                    self.completed_tasks[task.task_id] = task
-                    del self.active_tasks[task.task_id]
-                    
-                    self.stats['total_completed'] += 1
-                    
-                    if progress_callback:
-                        progress_callback(task.task_id, 'completed', result)
-                    
-                    logger.info(f"Task {task.task_id} completed successfully")
-                    
-                except Exception as e:
-                    task.error = str(e)
-                    task.retry_count += 1
-                    
-                    if task.retry_count < task.max_retries:
-                        # Retry with lower priority
-                        task.status = GenerationStatus.QUEUED
-                        task.priority = GenerationPriority(min(task.priority.value + 1, GenerationPriority.BACKGROUND.value))
-                        self.priority_queue.put(task)
-                        del self.active_tasks[task.task_id]
-                        logger.warning(f"Task {task.task_id} failed, retrying ({task.retry_count}/{task.max_retries})")
-                    else:
-                        # Move to failed
+        progress_callback: Optional[Callable],
+        safety_check_func: Optional[Callable]
+    ):
+        """Run tasks one after another until the queue is drained"""
+        while True:
+            task = await self._next_task()
+            if task is None:
+                return
+            try:
+                # Safety check if enabled
+                if self.batch_config.safety_check and safety_check_func:
+                    is_safe, reason = await safety_check_func(task.prompt)
+                    if not is_safe:
                         task.status = GenerationStatus.FAILED
-                        task.completed_at = time.time()
+                        task.error = f"Safety check failed: {reason}"
                         self.failed_tasks[task.task_id] = task
-                        del self.active_tasks[task.task_id]
-                        self.stats['total_failed'] += 1
-                        
-                        if progress_callback:
-                            progress_callback(task.task_id, 'failed', str(e))
-                        
-                        logger.error(f"Task {task.task_id} failed after {task.retry_count} attempts: {e}")
+                        logger.warning(f"Task {task.task_id} failed safety check: {reason}")
+                        continue
                 
-                self.stats['total_processed'] += 1
-                return task
-        
-        # Process all tasks in batch concurrently
-        results = await asyncio.gather(
-            *[process_single_task(task) for task in batch],
-            return_exceptions=True
-        )
-        
-        return [r for r in results if not isinstance(r, Exception)]
+                estimated_cost = self._estimate_cost(task)
+                await self._admit_cost(estimated_cost)
+                try:
+                    await self.rate_limiter.acquire()
+                    self.stats['total_cost'] += estimated_cost
+                    await self._process_task(task, generator_func, progress_callback)
+                finally:
+                    await self._release_cost(estimated_cost)
+            finally:
+                self.claimed_count -= 1
+                self._work_available.set()
     
-    async def _check_stalled_tasks(self):
-        """Check for and handle stalled tasks"""
-        current_time = time.time()
-        stalled_timeout = 300  # 5 minutes
+    async def _process_task(
+        self,
+        task: GenerationTask,
+        generator_func: Callable,
+        progress_callback: Optional[Callable]
+    ) -> GenerationTask:
+        """Run a single task, requeueing it on failure or timeout"""
+        task.status = GenerationStatus.PROCESSING
+        task.started_at = time.time()
+        self.active_tasks[task.task_id] = task
         
-        for task_id, task in list(self.active_tasks.items()):
-            if task.started_at and (current_time - task.started_at) > stalled_timeout:
-                logger.warning(f"Task {task_id} appears stalled, requeueing")
+        try:
+            # Call generator function
+            result = await asyncio.wait_for(
+                generator_func(
+                    prompt=task.prompt,
+                    asset_type=task.asset_type,
+                    metadata=task.metadata
+                ),
+                timeout=self.batch_config.task_timeout
+            )
+            
+            task.result = result
+            task.status = GenerationStatus.COMPLETED
+            task.completed_at = time.time()
+            
+            # Move to completed
+            self.completed_tasks[task.task_id] = task
+            del self.active_tasks[task.task_id]
+            
+            self.stats['total_completed'] += 1
+            
+            if progress_callback:
+                progress_callback(task.task_id, 'completed', result)
+            
+            logger.info(f"Task {task.task_id} completed successfully")
+            
+        except Exception as e:
+            timed_out = isinstance(e, asyncio.TimeoutError)
+            task.error = f"Timed out after {self.batch_config.task_timeout:.0f}s" if timed_out else str(e)
+            task.retry_count += 1
+            del self.active_tasks[task.task_id]
+            
+            if task.retry_count < task.max_retries:
                 task.status = GenerationStatus.QUEUED
-                task.retry_count += 1
+                if timed_out:
+                    # Stalled tasks are requeued at their own priority
+                    logger.warning(f"Task {task.task_id} timed out, requeueing ({task.retry_count}/{task.max_retries})")
+                else:
+                    # Retry with lower priority
+                    task.priority = GenerationPriority(min(task.priority.value + 1, GenerationPriority.BACKGROUND.value))
+                    logger.warning(f"Task {task.task_id} failed, retrying ({task.retry_count}/{task.max_retries})")
                 self.priority_queue.put(task)
-                del self.active_tasks[task_id]
+            else:
+                # Move to failed
+                task.status = GenerationStatus.FAILED
+                task.completed_at = time.time()
+                self.failed_tasks[task.task_id] = task
+                self.stats['total_failed'] += 1
+                
+                if progress_callback:
+                    progress_callback(task.task_id, 'failed', task.error)
+                
+                logger.error(f"Task {task.task_id} failed after {task.retry_count} attempts: {task.error}")
+        
+        self.stats['total_processed'] += 1
+        return task
     
     def _estimate_cost(self, task: GenerationTask) -> float:
         """Estimate cost for a generation task"""
@@ -366,10 +388,10 @@ class MassGenerationQueue:
             'failed_count': len(self.failed_tasks),
             'statistics': self.stats,
             'config': {
-                'batch_size': self.batch_config.batch_size,
                 'rate_limit': self.batch_config.rate_limit,
                 'concurrent_limit': self.batch_config.concurrent_limit,
-                'cost_limit': self.batch_config.cost_limit
+                'cost_limit': self.batch_config.cost_limit,
+                'task_timeout': self.batch_config.task_timeout
             }
         }
     
@@ -420,10 +442,8 @@ class MassGenerationQueue:
 async def example_usage():
     """Example of using the mass generation queue"""
     
-    # Configure batch processing
+    # Configure queue processing
     config = BatchConfig(
-        batch_size=3,
-        batch_delay=2.0,
         rate_limit=10,
         concurrent_limit=2,
         cost_limit=5.0,
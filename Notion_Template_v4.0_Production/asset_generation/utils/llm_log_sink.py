@@ -0,0 +1,218 @@
+"""Buffered JSONL sink for LLM interaction logs.
+
+Entries are queued in memory and appended to a single JSONL file in
+batches by a background task, with the file I/O done in a worker thread so
+the event loop never blocks on disk. When the file grows past ``max_bytes``
+it is rotated to a compressed, timestamped archive and old archives beyond
+``backup_count`` are removed.
+"""
+
+import os
+import gzip
+import json
+import atexit
+import asyncio
+import logging
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class LLMLogSink:
+    """Batched, rotating JSONL writer for LLM interactions."""
+
+    def __init__(
+        self,
+        log_path: Union[str, Path],
+        flush_interval: float = 1.0,
+        batch_size: int = 200,
+        max_bytes: int = 50 * 1024 * 1024,
+        backup_count: int = 10,
+        compression: Optional[str] = 'gzip'
+    ):
+        """Initialize the sink.
+
+        Args:
+            log_path: JSONL file entries are appended to
+            flush_interval: Seconds the background writer waits between batches
+            batch_size: Queued entries that trigger an early flush
+            max_bytes: Size at which the log is rotated (0 disables rotation)
+            backup_count: Rotated archives to keep
+            compression: 'gzip', 'zstd' (falls back to gzip if unavailable) or None
+        """
+        self.log_path = Path(log_path)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        if compression == 'zstd' and not ZSTD_AVAILABLE:
+            logger.warning("zstandard not installed; rotating LLM logs with gzip")
+            compression = 'gzip'
+        self.compression = compression
+
+        self._buffer: List[str] = []
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.entries_written = 0
+
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, entry: Dict[str, Any]):
+        """Queue an entry; never blocks on disk inside a running event loop.
+
+        Args:
+            entry: JSON-serialisable log record
+        """
+        line = json.dumps(entry, ensure_ascii=False, default=str) + '\n'
+        with self._buffer_lock:
+            self._buffer.append(line)
+            pending = len(self._buffer)
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Synchronous caller: write once a batch has accumulated
+            if pending >= self.batch_size:
+                self.flush_sync()
+            return
+
+        self._ensure_writer(loop)
+        if pending >= self.batch_size:
+            self._wakeup.set()
+
+    def _ensure_writer(self, loop: asyncio.AbstractEventLoop):
+        """Start the background writer on the running loop if it is not already there."""
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        """Background writer: flush every flush_interval or when a batch fills."""
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                await self.flush()
+        except asyncio.CancelledError:
+            pass
+
+    def _drain(self) -> List[str]:
+        with self._buffer_lock:
+            lines, self._buffer = self._buffer, []
+        return lines
+
+    async def flush(self):
+        """Write all queued entries without blocking the event loop."""
+        lines = self._drain()
+        if lines:
+            await asyncio.to_thread(self._write_lines, lines)
+
+    def flush_sync(self):
+        """Write all queued entries from synchronous code (or at exit)."""
+        lines = self._drain()
+        if lines:
+            self._write_lines(lines)
+
+    def _write_lines(self, lines: List[str]):
+        data = ''.join(lines)
+        with self._write_lock:
+            try:
+                if self.max_bytes and self.log_path.exists() and \
+                        self.log_path.stat().st_size + len(data) > self.max_bytes:
+                    self._rotate()
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(data)
+                self.entries_written += len(lines)
+            except Exception as e:
+                logger.error(f"Failed to write {len(lines)} LLM log entries: {e}")
+
+    def _rotate(self):
+        """Move the current log to a compressed archive and prune old archives."""
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        archive = self.log_path.with_name(f"{self.log_path.stem}.{stamp}{self.log_path.suffix}")
+        if self.compression == 'gzip':
+            archive = archive.with_name(archive.name + '.gz')
+            with open(self.log_path, 'rb') as src, gzip.open(archive, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            self.log_path.unlink()
+        elif self.compression == 'zstd':
+            archive = archive.with_name(archive.name + '.zst')
+            with open(self.log_path, 'rb') as src, open(archive, 'wb') as dst:
+                zstandard.ZstdCompressor().copy_stream(src, dst)
+            self.log_path.unlink()
+        else:
+            os.replace(self.log_path, archive)
+        logger.info(f"Rotated LLM log to {archive}")
+
+        archives = sorted(self.log_path.parent.glob(f"{self.log_path.stem}.*{self.log_path.suffix}*"))
+        for old in archives[:-self.backup_count] if self.backup_count else archives:
+            old.unlink()
+
+    async def close(self):
+        """Stop the background writer and flush everything queued."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        await self.flush()
+
+
+_sinks: Dict[str, LLMLogSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_llm_log_sink(log_path: Union[str, Path], **kwargs) -> LLMLogSink:
+    """Get the process-wide sink for a log file.
+
+    Rotation settings default to LLM_LOG_MAX_MB, LLM_LOG_BACKUPS and
+    LLM_LOG_COMPRESSION from the environment.
+
+    Args:
+        log_path: JSONL file entries are appended to
+        **kwargs: LLMLogSink options, used only when the sink is first created
+
+    Returns:
+        Shared LLMLogSink for that file
+    """
+    key = str(Path(log_path).resolve())
+    with _sinks_lock:
+        if key not in _sinks:
+            kwargs.setdefault('max_bytes', int(float(os.getenv('LLM_LOG_MAX_MB', '50')) * 1024 * 1024))
+            kwargs.setdefault('backup_count', int(os.getenv('LLM_LOG_BACKUPS', '10')))
+            kwargs.setdefault('compression', os.getenv('LLM_LOG_COMPRESSION', 'gzip').lower() or None)
+            if kwargs['compression'] == 'none':
+                kwargs['compression'] = None
+            _sinks[key] = LLMLogSink(log_path, **kwargs)
+        return _sinks[key]
+
+
+async def close_llm_log_sinks():
+    """Flush and stop every sink created in this process."""
+    for sink in list(_sinks.values()):
+        await sink.close()
+
+
+@atexit.register
+def _flush_all_at_exit():
+    for sink in list(_sinks.values()):
+        sink.flush_sync()
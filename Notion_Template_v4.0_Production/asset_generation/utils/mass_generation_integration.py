@@ -33,7 +33,6 @@ class MassGenerationConfig:
     organize_by_timestamp: bool = True
     
     # Safety limits
-    max_batch_size: int = 50
     max_total_items: int = 500
     max_total_cost: float = 20.0  # Maximum $20 budget
     require_confirmation: bool = True
@@ -42,7 +41,8 @@ class MassGenerationConfig:
     # Performance settings
     concurrent_downloads: int = 5
     concurrent_generations: int = 3
-    batch_delay_seconds: float = 2.0
+    generations_per_minute: int = 60
+    generation_timeout_seconds: float = 300.0
     
     # Logging and audit
     enable_audit_log: bool = True
@@ -67,10 +67,10 @@ class MassGenerationCoordinator:
         
         # Initialize components
         batch_config = BatchConfig(
-            batch_size=self.config.max_batch_size,
-            batch_delay=self.config.batch_delay_seconds,
+            rate_limit=self.config.generations_per_minute,
             concurrent_limit=self.config.concurrent_generations,
-            cost_limit=self.config.max_total_cost / 10  # Per-batch cost limit
+            cost_limit=self.config.max_total_cost / 10,  # Cost in flight at once
+            task_timeout=self.config.generation_timeout_seconds
         )
         
         self.generation_queue = MassGenerationQueue(batch_config=batch_config)
@@ -285,6 +285,9 @@ class ProgressTracker:
         if not self.current_run_id:
             return
         
+        # Commit written-behind bookkeeping so the checkpoint matches the database
+        await self.db.flush()
+        
         checkpoint_file = self.checkpoint_dir / f"{self.current_run_id}.json"
         
         # Load existing state
@@ -0,0 +1,153 @@
+"""In-process cache for master prompt templates.
+
+Master prompts are read once and served from memory until the file on disk
+changes. The file's mtime is re-checked at most every ``check_interval``
+seconds, so tight generation loops do not touch the filesystem; editors
+that save a prompt (e.g. the review dashboard) call ``invalidate()`` to make
+the new text visible immediately.
+"""
+
+import os
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Prompt type -> file name inside the meta_prompts directory
+MASTER_PROMPT_FILES: Dict[str, str] = {
+    'default': 'master_prompt.txt',
+    'icons': 'master_prompt_icons.txt',
+    'covers': 'master_prompt_covers.txt'
+}
+
+
+def master_prompt_type(asset_type: Optional[str]) -> str:
+    """Map an asset type to the master prompt type that serves it.
+
+    Args:
+        asset_type: Asset type such as 'icons', 'database_icons' or 'covers'
+
+    Returns:
+        Key into MASTER_PROMPT_FILES
+    """
+    if asset_type in ('icons', 'database_icons'):
+        return 'icons'
+    if asset_type in ('covers', 'cover'):
+        return 'covers'
+    return 'default'
+
+
+class MasterPromptCache:
+    """Master prompt texts keyed by prompt type, reloaded when their file changes."""
+
+    def __init__(self, prompts_dir: Union[str, Path] = "meta_prompts", check_interval: float = 2.0):
+        """Initialize the cache.
+
+        Args:
+            prompts_dir: Directory holding the master prompt files
+            check_interval: Seconds between mtime checks of a cached file
+        """
+        self.prompts_dir = Path(prompts_dir)
+        self.check_interval = check_interval
+        self._entries: Dict[str, Tuple[int, float, str]] = {}  # path -> (mtime_ns, checked_at, text)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    def _read(self, path: Path) -> Optional[str]:
+        """Text of ``path`` from the cache, reloading it if its mtime changed.
+
+        Returns:
+            File contents, or None if the file does not exist
+        """
+        key = str(path)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[1] < self.check_interval:
+                self.hits += 1
+                return entry[2]
+
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == mtime_ns:
+                self._entries[key] = (mtime_ns, now, entry[2])
+                self.hits += 1
+                return entry[2]
+
+        text = path.read_text(encoding='utf-8')
+        with self._lock:
+            self._entries[key] = (mtime_ns, now, text)
+            self.loads += 1
+        logger.info(f"Loaded master prompt from {path}")
+        return text
+
+    def get(self, prompt_type: str = 'default') -> Tuple[str, Path]:
+        """Get a master prompt, falling back to the default one if missing.
+
+        Args:
+            prompt_type: Key into MASTER_PROMPT_FILES
+
+        Returns:
+            (prompt text, path it was loaded from)
+
+        Raises:
+            ValueError: If neither the requested nor the default file exists
+        """
+        file_name = MASTER_PROMPT_FILES.get(prompt_type, MASTER_PROMPT_FILES['default'])
+        path = self.prompts_dir / file_name
+        text = self._read(path)
+        if text is not None:
+            return text, path
+
+        default_path = self.prompts_dir / MASTER_PROMPT_FILES['default']
+        if path != default_path:
+            logger.warning(f"Master prompt file not found: {path}, trying default")
+            text = self._read(default_path)
+            if text is not None:
+                return text, default_path
+            raise ValueError("Neither specific nor default master prompt file found")
+        raise ValueError(f"Master prompt file not found: {path}")
+
+    def invalidate(self, prompt_type: Optional[str] = None):
+        """Drop cached prompts so the next get() rereads them.
+
+        Args:
+            prompt_type: Prompt type to drop, or None for all of them
+        """
+        with self._lock:
+            if prompt_type is None:
+                self._entries.clear()
+            else:
+                file_name = MASTER_PROMPT_FILES.get(prompt_type, MASTER_PROMPT_FILES['default'])
+                self._entries.pop(str(self.prompts_dir / file_name), None)
+
+
+_caches: Dict[str, MasterPromptCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_master_prompt_cache(prompts_dir: Union[str, Path] = "meta_prompts") -> MasterPromptCache:
+    """Get the process-wide cache for a prompts directory.
+
+    Args:
+        prompts_dir: Directory holding the master prompt files
+
+    Returns:
+        Shared MasterPromptCache for that directory
+    """
+    key = str(Path(prompts_dir).resolve())
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = MasterPromptCache(prompts_dir)
+        return _caches[key]
@@ -0,0 +1,357 @@
+"""Native async client for Replicate predictions.
+
+Predictions are created over the shared aiohttp connection pool and
+resolved by a single background poller per event loop rather than one
+polling loop (or one worker thread) per prediction. Each in-flight
+prediction is polled on its own adaptive schedule: quickly at first, then
+backing off towards ``max_poll_interval`` while it keeps running.
+
+If a webhook URL is configured, Replicate posts completed predictions to a
+small aiohttp receiver instead and the poller only runs at the slowest
+interval as a fallback for missed deliveries. The receiver only accepts
+deliveries signed with the webhook secret.
+"""
+
+import os
+import hmac
+import base64
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+
+from aiohttp import web
+
+from .exceptions import ReplicateAPIError, ValidationError
+from .resource_manager import ConnectionPoolManager, get_connection_pool
+
+REPLICATE_API_URL = "https://api.replicate.com/v1"
+TERMINAL_STATUSES = ('succeeded', 'failed', 'canceled')
+
+
+@dataclass
+class _PendingPrediction:
+    """In-flight prediction tracked by the poller"""
+    future: asyncio.Future
+    interval: float
+    next_poll: float
+
+
+class AsyncReplicateClient:
+    """Creates Replicate predictions and resolves them through one multiplexed poller."""
+
+    def __init__(
+        self,
+        api_token: str,
+        http_pool: Optional[ConnectionPoolManager] = None,
+        base_url: str = REPLICATE_API_URL,
+        min_poll_interval: float = 0.5,
+        max_poll_interval: float = 5.0,
+        poll_backoff: float = 1.5,
+        max_concurrent_polls: int = 20,
+        max_retries: int = 3,
+        webhook_url: Optional[str] = None,
+        webhook_secret: Optional[str] = None,
+        webhook_port: Optional[int] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        """Initialize the client.
+
+        Args:
+            api_token: Replicate API token
+            http_pool: Connection pool for API calls (defaults to the process-wide pool)
+            base_url: Replicate API base URL
+            min_poll_interval: First poll delay after a prediction is created
+            max_poll_interval: Longest delay between polls of one prediction
+            poll_backoff: Factor the poll delay grows by while a prediction runs
+            max_concurrent_polls: Status requests in flight at once
+            max_retries: Retries for a create request rejected with 429
+            webhook_url: Public URL Replicate should post completed predictions to
+            webhook_secret: Signing secret ("whsec_...") used to verify webhooks
+            webhook_port: Local port to serve the webhook receiver on (requires webhook_secret)
+            logger: Logger instance
+
+        Raises:
+            ValidationError: If webhook_port is set without webhook_secret
+        """
+        if webhook_port and not webhook_secret:
+            raise ValidationError("REPLICATE_WEBHOOK_SECRET is required to serve the webhook receiver")
+        self.api_token = api_token
+        self.http_pool = http_pool or get_connection_pool()
+        self.base_url = base_url.rstrip('/')
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.poll_backoff = poll_backoff
+        self.max_concurrent_polls = max_concurrent_polls
+        self.max_retries = max_retries
+        self.webhook_url = webhook_url
+        self.webhook_secret = webhook_secret
+        self.webhook_port = webhook_port
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._pending: Dict[str, _PendingPrediction] = {}
+        self._poller: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._webhook_runner: Optional[web.AppRunner] = None
+        self._cancels: Set[asyncio.Task] = set()
+        self.stats = {'created': 0, 'polls': 0, 'webhooks': 0, 'completed': 0, 'cancelled': 0}
+
+    @classmethod
+    def from_env(cls, api_token: str, **kwargs) -> 'AsyncReplicateClient':
+        """Create a client using REPLICATE_WEBHOOK_URL, REPLICATE_WEBHOOK_SECRET and
+        REPLICATE_WEBHOOK_PORT from the environment, if set."""
+        port = os.getenv('REPLICATE_WEBHOOK_PORT')
+        kwargs.setdefault('webhook_url', os.getenv('REPLICATE_WEBHOOK_URL') or None)
+        kwargs.setdefault('webhook_secret', os.getenv('REPLICATE_WEBHOOK_SECRET') or None)
+        kwargs.setdefault('webhook_port', int(port) if port else None)
+        return cls(api_token, **kwargs)
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_token}",
+            "Content-Type": "application/json"
+        }
+
+    def _create_url_and_payload(self, model_id: str, model_input: Dict[str, Any]):
+        """Endpoint and body for "owner/name:version" or "owner/name" model ids"""
+        payload: Dict[str, Any] = {"input": model_input}
+        if self.webhook_url:
+            payload["webhook"] = self.webhook_url
+            payload["webhook_events_filter"] = ["completed"]
+        if ':' in model_id:
+            payload["version"] = model_id.split(':', 1)[1]
+            return f"{self.base_url}/predictions", payload
+        return f"{self.base_url}/models/{model_id}/predictions", payload
+
+    async def create_prediction(self, model_id: str, model_input: Dict[str, Any]) -> Dict[str, Any]:
+        """Start a prediction and begin tracking it.
+
+        Args:
+            model_id: "owner/name:version" or "owner/name" for official models
+            model_input: Model input, e.g. {"prompt": ...}
+
+        Returns:
+            Prediction as returned by the API
+
+        Raises:
+            ReplicateAPIError: If the prediction cannot be created
+        """
+        if self.webhook_url and self.webhook_port and self._webhook_runner is None:
+            await self.start_webhook_receiver(self.webhook_port)
+
+        url, payload = self._create_url_and_payload(model_id, model_input)
+        session = await self.http_pool.session()
+        for attempt in range(self.max_retries + 1):
+            async with session.post(url, headers=self._headers(), json=payload) as response:
+                if response.status in (200, 201):
+                    prediction = await response.json()
+                    break
+                body = await response.text()
+                if response.status != 429 or attempt == self.max_retries:
+                    raise ReplicateAPIError(f"Replicate create failed with {response.status}: {body[:200]}")
+                try:
+                    retry_after = float(response.headers.get('Retry-After', 2))
+                except ValueError:
+                    retry_after = 2.0
+            self.logger.warning(f"Replicate rate limited, retrying in {retry_after:.1f}s")
+            await asyncio.sleep(retry_after)
+
+        self.stats['created'] += 1
+        self._track(prediction['id'])
+        if prediction.get('status') in TERMINAL_STATUSES:
+            self._resolve(prediction)
+        return prediction
+
+    def _track(self, prediction_id: str):
+        """Register a prediction with the poller for the running loop"""
+        if prediction_id in self._pending:
+            return
+        loop = asyncio.get_running_loop()
+        # With webhooks the poller is only a safety net
+        interval = self.max_poll_interval if self.webhook_url else self.min_poll_interval
+        self._pending[prediction_id] = _PendingPrediction(
+            future=loop.create_future(),
+            interval=interval,
+            next_poll=time.monotonic() + interval
+        )
+        if self._poller is None or self._poller.done() or self._poller.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._poller = loop.create_task(self._poll_loop())
+        else:
+            self._wakeup.set()
+
+    def _resolve(self, prediction: Dict[str, Any]):
+        pending = self._pending.pop(prediction.get('id'), None)
+        if pending and not pending.future.done():
+            self.stats['completed'] += 1
+            pending.future.set_result(prediction)
+
+    async def wait(self, prediction_id: str) -> Dict[str, Any]:
+        """Wait until a prediction reaches a terminal status.
+
+        If the waiting task is cancelled (e.g. by a timeout), the prediction
+        is cancelled on Replicate too so it stops running and billing.
+
+        Args:
+            prediction_id: ID returned by create_prediction
+
+        Returns:
+            Final prediction (succeeded, failed or canceled)
+        """
+        self._track(prediction_id)
+        future = self._pending[prediction_id].future
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.done():  # The waiter was cancelled, not the client closed
+                task = asyncio.get_running_loop().create_task(self.cancel(prediction_id))
+                self._cancels.add(task)
+                task.add_done_callback(self._cancels.discard)
+            raise
+
+    async def cancel(self, prediction_id: str) -> bool:
+        """Cancel a running prediction; the poller then resolves it as canceled.
+
+        Args:
+            prediction_id: ID returned by create_prediction
+
+        Returns:
+            True if Replicate accepted the cancellation
+        """
+        session = await self.http_pool.session()
+        try:
+            async with session.post(f"{self.base_url}/predictions/{prediction_id}/cancel",
+                                    headers=self._headers()) as response:
+                if response.status == 200:
+                    self.stats['cancelled'] += 1
+                    return True
+                self.logger.warning(f"Cancelling {prediction_id} returned {response.status}")
+        except Exception as e:
+            self.logger.warning(f"Cancelling {prediction_id} failed: {e}")
+        return False
+
+    async def run(self, model_id: str, model_input: Dict[str, Any]) -> Any:
+        """Create a prediction and return its output, like replicate.run.
+
+        Args:
+            model_id: "owner/name:version" or "owner/name" for official models
+            model_input: Model input, e.g. {"prompt": ...}
+
+        Returns:
+            Prediction output (usually a URL or list of URLs)
+
+        Raises:
+            ReplicateAPIError: If the prediction fails or is canceled
+        """
+        prediction = await self.create_prediction(model_id, model_input)
+        if prediction.get('status') not in TERMINAL_STATUSES:
+            prediction = await self.wait(prediction['id'])
+        if prediction['status'] != 'succeeded':
+            raise ReplicateAPIError(
+                f"Prediction {prediction['id']} {prediction['status']}: {prediction.get('error')}"
+            )
+        return prediction.get('output')
+
+    async def _poll_loop(self):
+        """Poll every due prediction, then sleep until the next one is due."""
+        slots = asyncio.Semaphore(self.max_concurrent_polls)
+        session = await self.http_pool.session()
+
+        async def poll(prediction_id: str, pending: _PendingPrediction):
+            async with slots:
+                self.stats['polls'] += 1
+                try:
+                    async with session.get(f"{self.base_url}/predictions/{prediction_id}",
+                                           headers=self._headers()) as response:
+                        if response.status == 200:
+                            prediction = await response.json()
+                            if prediction.get('status') in TERMINAL_STATUSES:
+                                self._resolve(prediction)
+                                return
+                        elif response.status == 404:
+                            self._pending.pop(prediction_id, None)
+                            pending.future.set_exception(
+                                ReplicateAPIError(f"Prediction {prediction_id} not found"))
+                            return
+                        else:
+                            self.logger.warning(f"Polling {prediction_id} returned {response.status}")
+                except Exception as e:
+                    self.logger.warning(f"Polling {prediction_id} failed: {e}")
+                pending.interval = min(pending.interval * self.poll_backoff, self.max_poll_interval)
+                pending.next_poll = time.monotonic() + pending.interval
+
+        while self._pending:
+            now = time.monotonic()
+            due = [(pid, p) for pid, p in self._pending.items() if p.next_poll <= now]
+            if due:
+                await asyncio.gather(*(poll(pid, p) for pid, p in due))
+                continue
+            self._wakeup.clear()
+            next_due = min(p.next_poll for p in self._pending.values())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(next_due - now, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    def verify_webhook(self, headers, body: bytes) -> bool:
+        """Check a webhook's signature against webhook_secret (always False without one)."""
+        if not self.webhook_secret:
+            return False
+        webhook_id = headers.get('webhook-id', '')
+        timestamp = headers.get('webhook-timestamp', '')
+        signatures = headers.get('webhook-signature', '')
+        key = base64.b64decode(self.webhook_secret.split('_', 1)[-1])
+        signed = f"{webhook_id}.{timestamp}.".encode() + body
+        expected = base64.b64encode(hmac.new(key, signed, hashlib.sha256).digest()).decode()
+        return any(hmac.compare_digest(expected, sig.split(',', 1)[-1]) for sig in signatures.split())
+
+    async def handle_webhook(self, request: web.Request) -> web.Response:
+        """aiohttp handler for Replicate's completed-prediction webhook"""
+        body = await request.read()
+        if not self.verify_webhook(request.headers, body):
+            return web.Response(status=401)
+        prediction = await request.json()
+        self.stats['webhooks'] += 1
+        if prediction.get('status') in TERMINAL_STATUSES:
+            self._resolve(prediction)
+        return web.Response(status=200)
+
+    async def start_webhook_receiver(self, port: int, host: str = '127.0.0.1', path: str = '/replicate/webhook'):
+        """Serve handle_webhook on the running loop.
+
+        Args:
+            port: Local port to listen on
+            host: Interface to bind; loopback by default, behind a reverse proxy or tunnel
+            path: Route the public webhook URL is forwarded to
+
+        Raises:
+            ValidationError: If no webhook_secret is configured
+        """
+        if not self.webhook_secret:
+            raise ValidationError("REPLICATE_WEBHOOK_SECRET is required to serve the webhook receiver")
+        app = web.Application()
+        app.router.add_post(path, self.handle_webhook)
+        self._webhook_runner = web.AppRunner(app)
+        await self._webhook_runner.setup()
+        await web.TCPSite(self._webhook_runner, host, port).start()
+        self.logger.info(f"Replicate webhook receiver listening on {host}:{port}{path}")
+
+    async def close(self):
+        """Stop the poller and webhook receiver; pending waits are cancelled."""
+        if self._cancels:
+            await asyncio.gather(*self._cancels, return_exceptions=True)
+        if self._poller is not None and not self._poller.done():
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+        self._poller = None
+        for pending in self._pending.values():
+            pending.future.cancel()
+        self._pending.clear()
+        if self._webhook_runner is not None:
+            await self._webhook_runner.cleanup()
+            self._webhook_runner = None
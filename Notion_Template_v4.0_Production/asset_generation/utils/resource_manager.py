@@ -1,6 +1,9 @@
 """Resource management with context managers for proper cleanup."""
 
+import os
+import time
 import asyncio
+import threading
 import aiohttp
 import aiofiles
 from contextlib import asynccontextmanager, contextmanager
@@ -264,13 +267,28 @@ class RateLimiter:
         self.burst = burst
         self.logger = logger or logging.getLogger(__name__)
         self.tokens = burst
-        self.last_update = asyncio.get_event_loop().time()
+        self.last_update = time.monotonic()
+        self.paused_until = 0.0
         self.lock = asyncio.Lock()
     
+    def pause(self, seconds: float):
+        """Hold back every caller for a while (e.g. after a 429 Retry-After).
+        
+        Args:
+            seconds: How long to stop handing out permits
+        """
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        # Resume at the steady rate rather than with a refilled burst
+        self.tokens = min(self.tokens, 0)
+        self.last_update = self.paused_until
+    
     async def acquire(self):
         """Acquire permission to make a request."""
         async with self.lock:
-            now = asyncio.get_event_loop().time()
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                now = time.monotonic()
             elapsed = now - self.last_update
             
             # Refill tokens based on elapsed time
@@ -283,7 +301,7 @@ class RateLimiter:
                 self.logger.debug(f"Rate limit reached, waiting {wait_time:.2f}s")
                 await asyncio.sleep(wait_time)
                 self.tokens = 1
-                self.last_update = asyncio.get_event_loop().time()
+                self.last_update = time.monotonic()
             
             # Consume a token
             self.tokens -= 1
@@ -299,13 +317,24 @@ class RateLimiter:
 
 
 class ConnectionPoolManager:
-    """Manages a pool of connections for parallel operations."""
+    """Manages a pool of connections for parallel operations.
+    
+    Every session handed out shares one keep-alive TCPConnector, so TLS
+    handshakes and DNS lookups are paid once per host rather than once per
+    request. aiohttp connectors are bound to the event loop that created
+    them; if the pool is used from a new loop (e.g. a later asyncio.run()),
+    it is transparently rebuilt there.
+    """
     
     def __init__(
         self,
         size: int = 5,
         timeout: int = 30,
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        keepalive_timeout: float = 60.0,
+        dns_cache_ttl: int = 300
     ):
         """Initialize connection pool manager.
         
@@ -313,35 +342,89 @@ class ConnectionPoolManager:
             size: Pool size
             timeout: Connection timeout
             logger: Logger instance
+            limit: Maximum open connections across all hosts
+            limit_per_host: Maximum open connections to a single host
+            keepalive_timeout: Seconds an idle connection is kept for reuse
+            dns_cache_ttl: Seconds resolved host addresses are cached
         """
         self.size = size
         self.timeout = timeout
         self.logger = logger or logging.getLogger(__name__)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
         self.pool: list = []
-        self.available: asyncio.Queue = asyncio.Queue()
+        self.available: Optional[asyncio.Queue] = None
         self.initialized = False
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+    
+    def _new_session(self) -> aiohttp.ClientSession:
+        """Create a session on the shared connector."""
+        return aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            connector=self._connector,
+            connector_owner=False
+        )
+    
+    def _bind_loop(self):
+        """Create the connector for the running loop, dropping one left on a dead loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._connector is not None and not self._connector.closed:
+            return
+        if self._loop is not None and self._loop is not loop:
+            self.logger.debug("Event loop changed; rebuilding connection pool")
+            self.pool.clear()
+            self.initialized = False
+        self._connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl
+        )
+        self._session = None
+        self._loop = loop
     
     async def initialize(self):
         """Initialize the connection pool."""
+        self._bind_loop()
         if self.initialized:
             return
         
+        self.available = asyncio.Queue()
         for i in range(self.size):
-            timeout_config = aiohttp.ClientTimeout(total=self.timeout)
-            session = aiohttp.ClientSession(timeout=timeout_config)
+            session = self._new_session()
             self.pool.append(session)
             await self.available.put(session)
         
         self.initialized = True
         self.logger.info(f"Initialized connection pool with {self.size} connections")
     
+    async def session(self) -> aiohttp.ClientSession:
+        """Shared session for the running event loop.
+        
+        Unlike acquire(), the session is not checked out: any number of
+        concurrent requests may use it, bounded by the connector limits.
+        Do not close it; call close() on the pool at shutdown.
+        
+        Returns:
+            Session backed by the pooled connector
+        """
+        self._bind_loop()
+        if self._session is None or self._session.closed:
+            self._session = self._new_session()
+        return self._session
+    
     async def acquire(self) -> aiohttp.ClientSession:
         """Acquire a connection from the pool.
         
         Returns:
             Available session
         """
-        if not self.initialized:
+        if not self.initialized or self._loop is not asyncio.get_running_loop():
             await self.initialize()
         
         session = await self.available.get()
@@ -358,15 +441,32 @@ class ConnectionPoolManager:
     
     async def close(self):
         """Close all connections in the pool."""
-        for session in self.pool:
+        if self._loop is not None and self._loop is not asyncio.get_running_loop():
+            # Connections belong to a loop that has already finished
+            self._reset()
+            return
+        
+        sessions = list(self.pool)
+        if self._session is not None:
+            sessions.append(self._session)
+        for session in sessions:
             await session.close()
+        if self._connector is not None:
+            await self._connector.close()
         
         # Wait for connections to close
-        await asyncio.sleep(0.5)
+        await asyncio.sleep(0.25)
         
+        self._reset()
+        self.logger.info("Closed connection pool")
+    
+    def _reset(self):
         self.pool.clear()
+        self.available = None
         self.initialized = False
-        self.logger.info("Closed connection pool")
+        self._session = None
+        self._connector = None
+        self._loop = None
     
     async def __aenter__(self):
         """Context manager entry."""
@@ -378,6 +478,38 @@ class ConnectionPoolManager:
         await self.close()
 
 
+_connection_pool: Optional[ConnectionPoolManager] = None
+_connection_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> ConnectionPoolManager:
+    """Get the process-wide HTTP connection pool.
+    
+    Limits come from HTTP_POOL_LIMIT, HTTP_POOL_LIMIT_PER_HOST and
+    HTTP_KEEPALIVE_TIMEOUT. Call close_connection_pool() at shutdown.
+    
+    Returns:
+        Shared ConnectionPoolManager
+    """
+    global _connection_pool
+    if _connection_pool is None:
+        with _connection_pool_lock:
+            if _connection_pool is None:
+                _connection_pool = ConnectionPoolManager(
+                    timeout=int(os.getenv('HTTP_POOL_TIMEOUT', '300')),
+                    limit=int(os.getenv('HTTP_POOL_LIMIT', '100')),
+                    limit_per_host=int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '10')),
+                    keepalive_timeout=float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '60'))
+                )
+    return _connection_pool
+
+
+async def close_connection_pool():
+    """Close the process-wide connection pool if it was created."""
+    if _connection_pool is not None:
+        await _connection_pool.close()
+
+
 def create_resource_manager(logger: Optional[logging.Logger] = None) -> ResourceManager:
     """Create and configure a resource manager.
     
@@ -77,8 +77,7 @@ PROMPT: Create an elegant scene with mahogany desk and golden fountain pen.
     try:
         logs_dir = orchestrator.logs_dir
         print(f"   ✅ Logging directory: {logs_dir}")
-        print(f"   ✅ Individual log files: logs/llm_generations/llm_generation_[model]_[timestamp].json")
-        print(f"   ✅ Master log file: logs/llm_generations/master_llm_log.jsonl")
+        print(f"   ✅ Master log file: logs/llm_generations/master_llm_log.jsonl (buffered, rotated to .gz archives)")
         print("   ✅ All LLM interactions will be logged with full context")
         
     except Exception as e:
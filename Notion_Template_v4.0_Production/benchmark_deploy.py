@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Deployment benchmark against a local mock Notion API
+Runs NotionTemplateDeployer end to end against modules.mock_notion and
+reports wall time, throughput and request counts - no workspace or token needed
+
+Usage:
+  python benchmark_deploy.py                              # split_yaml, default latency
+  python benchmark_deploy.py --workers 4 --throttle-rps 20
+  python benchmark_deploy.py --async --latency 0.2 --jitter 0.1 --rate-limit-rate 0.02
+  python benchmark_deploy.py --json baseline.json         # keep results for comparison
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import socket
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Benchmark deploy.py against a local mock Notion API')
+    parser.add_argument('--yaml-dir', type=Path, help='YAML directory (default: split_yaml)')
+    parser.add_argument('--csv-dir', type=Path, help='CSV directory (default: csv)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Deployer workers (default: DEPLOY_WORKERS)')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Benchmark the aiohttp backend')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Deploy, then benchmark an incremental redeploy of the same YAML')
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='Server latency per request in seconds (default: 0.05)')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='Extra random latency up to this many seconds')
+    parser.add_argument('--server-rps', type=float, default=None,
+                        help='Enforce this average rate on the server, answering 429 above it')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0,
+                        help='Fraction of requests answered 429 regardless of rate')
+    parser.add_argument('--retry-after', type=int, default=1,
+                        help='Retry-After seconds sent with 429s (default: 1)')
+    parser.add_argument('--throttle-rps', type=float, default=None,
+                        help='Client rate limit (default: THROTTLE_RPS or 2.5; 0 disables)')
+    parser.add_argument('--seed', type=int, default=1, help='Seed for jitter and 429 injection')
+    parser.add_argument('--json', type=Path, metavar='FILE', help='Also write the results as JSON')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Show deployer logging')
+    return parser.parse_args(argv)
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Start a mock server, point deploy.py at it and run one deployment (two with --incremental)"""
+    with socket.socket() as probe:  # free port for the mock server
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+
+    # The API base and worker count are read when the modules are first imported
+    os.environ['NOTION_API_BASE'] = f"http://127.0.0.1:{port}/v1"
+    os.environ.setdefault('NOTION_TOKEN', 'secret_benchmark')
+    if args.workers:
+        os.environ['DEPLOY_WORKERS'] = str(args.workers)
+
+    import deploy
+    from modules.mock_notion import MockNotionServer
+    if deploy.NOTION_API_BASE != os.environ['NOTION_API_BASE']:
+        raise RuntimeError("deploy was imported before the benchmark set NOTION_API_BASE; "
+                           "run the benchmark in a fresh process")
+    from modules.profiler import get_profiler
+    from modules.rate_limiter import configure_rate_limiter
+
+    server = MockNotionServer(port=port, latency=args.latency, jitter=args.jitter, rps=args.server_rps,
+                              rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after,
+                              root_ids=[deploy.NOTION_PARENT_PAGEID], seed=args.seed)
+    server.start()
+    if args.throttle_rps is not None:
+        configure_rate_limiter(rps=args.throttle_rps, burst=max(3.0, args.throttle_rps))
+    limiter = deploy.get_rate_limiter()
+    profiler = get_profiler()
+
+    runs = []
+    try:
+        with tempfile.TemporaryDirectory(prefix='notion_bench_') as scratch:
+            passes = ['full', 'incremental'] if args.incremental else ['full']
+            for name in passes:
+                deploy_args = deploy.CLIInterface.setup_parser().parse_args(
+                    [a for a in ('--async' if args.use_async else None,
+                                 '--incremental' if name == 'incremental' else None) if a] +
+                    ['--workers', str(args.workers or deploy.DEPLOY_WORKERS),
+                     '--manifest', os.path.join(scratch, 'manifest.json')] +
+                    (['--yaml-dir', str(args.yaml_dir)] if args.yaml_dir else []) +
+                    (['--csv-dir', str(args.csv_dir)] if args.csv_dir else []))
+                deployer = deploy.NotionTemplateDeployer(deploy_args)
+                if not args.verbose:
+                    for handler in logging.root.handlers:
+                        if not isinstance(handler, logging.FileHandler):
+                            handler.setLevel(logging.ERROR)
+                deployer.state.checkpoint_file = os.path.join(scratch, 'state')
+
+                server.reset_stats()
+                profiler.enable()
+                retries_before = limiter.rate_limited_count
+                started = time.perf_counter()
+                if args.use_async:
+                    success = asyncio.run(deployer.run_async())
+                else:
+                    success = deployer.run()
+                elapsed = time.perf_counter() - started
+                report = profiler.report()
+                profiler.enabled = False
+                runs.append(summarize(name, success, elapsed, server.snapshot(), report,
+                                      limiter.rate_limited_count - retries_before))
+    finally:
+        server.stop()
+
+    return {
+        'config': {
+            'yaml_dir': str(args.yaml_dir or 'split_yaml'),
+            'backend': 'async' if args.use_async else 'sync',
+            'workers': args.workers or int(os.environ.get('DEPLOY_WORKERS', '1')),
+            'throttle_rps': limiter.max_rps,
+            'latency': args.latency, 'jitter': args.jitter,
+            'server_rps': args.server_rps, 'rate_limit_rate': args.rate_limit_rate,
+        },
+        'runs': runs,
+    }
+
+
+def summarize(name: str, success: bool, elapsed: float, stats: Dict[str, Any],
+              report: Dict[str, Any], client_backoffs: int) -> Dict[str, Any]:
+    requests = stats['requests']
+    return {
+        'run': name,
+        'success': success,
+        'wall_time_s': round(elapsed, 3),
+        'requests': requests,
+        'requests_per_s': round(requests / elapsed, 2) if elapsed else 0.0,
+        'pages': stats['pages'],
+        'databases': stats['databases'],
+        'blocks_created': stats['blocks_created'],
+        'rate_limited': stats['rate_limited'],
+        'client_backoffs': client_backoffs,
+        'errors': stats['errors'],
+        'peak_in_flight': stats['peak_in_flight'],
+        'by_endpoint': dict(sorted(stats['by_endpoint'].items(), key=lambda kv: -kv[1])),
+        'phases': {phase: entry['wall_time_s'] for phase, entry in report.get('phases', {}).items()},
+    }
+
+
+def print_results(results: Dict[str, Any]):
+    config = results['config']
+    print("\n" + "=" * 60)
+    print("DEPLOYMENT BENCHMARK (mock Notion API)")
+    print("=" * 60)
+    print(f"Backend: {config['backend']}, workers: {config['workers']}, client limit: {config['throttle_rps']} rps")
+    print(f"Server: {config['latency'] * 1000:.0f}ms latency (+{config['jitter'] * 1000:.0f}ms jitter), "
+          f"limit {config['server_rps'] or 'none'}, injected 429 rate {config['rate_limit_rate']}")
+    for run in results['runs']:
+        print(f"\n--- {run['run']} deploy {'✅' if run['success'] else '❌'} ---")
+        print(f"⏱️  Wall time:      {run['wall_time_s']:.2f}s")
+        print(f"📡 Requests:       {run['requests']} ({run['requests_per_s']:.1f}/s)")
+        print(f"📄 Pages:          {run['pages']}   🗄️  Databases: {run['databases']}   "
+              f"🧱 Blocks: {run['blocks_created']}")
+        print(f"🚦 429s:           {run['rate_limited']} (client backoffs: {run['client_backoffs']})   "
+              f"❗ Errors: {run['errors']}   Peak in flight: {run['peak_in_flight']}")
+        print("   Top endpoints:")
+        for endpoint, count in list(run['by_endpoint'].items())[:8]:
+            print(f"     {count:6d}  {endpoint}")
+        if run['phases']:
+            print("   Phases: " + ", ".join(f"{p} {s:.2f}s" for p, s in run['phases'].items() if s >= 0.01))
+    print("=" * 60)
+
+
+def main():
+    args = parse_args()
+    results = run_benchmark(args)
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+    sys.exit(0 if all(run['success'] for run in results['runs']) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,11 +20,13 @@ import time
 import argparse
 import logging
 import pickle
+import threading
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed, FIRST_COMPLETED
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable, Awaitable
 from dataclasses import dataclass, field
 from enum import Enum
-import yaml
 import csv
 import requests
 from dotenv import load_dotenv
@@ -32,6 +34,18 @@ from urllib.parse import quote
 from datetime import datetime
 import re
 
+from modules.rate_limiter import get_rate_limiter, parse_retry_after
+from modules.notion_api import create_session
+from modules.async_notion_api import AsyncNotionClient, AIOHTTP_AVAILABLE, NOTION_API_BASE
+from modules.manifest import DeploymentManifest, fingerprint, page_fingerprints, diff_block_span
+from modules.yaml_cache import YamlSnapshotCache, LIBYAML_AVAILABLE
+from modules.profiler import get_profiler, profiled
+from modules.planner import get_planner
+from modules.checkpoint_journal import CheckpointJournal
+from modules.block_compiler import compile_block, rich_text, text_item, text_block
+# Re-exported: tests and older callers import it from deploy
+from modules.block_compiler import convert_legacy_block_format
+
 # Import v4.1 enhancements
 try:
     import deploy_v41_enhancements as v41
@@ -53,13 +67,32 @@ NOTION_TOKEN = os.getenv("NOTION_TOKEN")
 NOTION_VERSION = os.getenv("NOTION_VERSION", "2025-09-03")
 NOTION_PARENT_PAGEID = "277a6c4ebadd80799d19d839db90e901"  # Hardcoded correct page ID
 
-GLOBAL_THROTTLE_RPS = float(os.getenv("THROTTLE_RPS", "2.5"))
+DEPLOY_WORKERS = int(os.getenv("DEPLOY_WORKERS", "1"))
+PAGE_CREATE_PAUSE = float(os.getenv("PAGE_CREATE_PAUSE", "0.5"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", str(max(10, DEPLOY_WORKERS))))
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "4"))
+ASYNC_MAX_IN_FLIGHT = int(os.getenv("ASYNC_MAX_IN_FLIGHT", "8"))
+CLEAR_WORKERS = int(os.getenv("CLEAR_WORKERS", "4"))
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", str(max(4, DEPLOY_WORKERS))))
+IMPORT_CHECKPOINT_ROWS = int(os.getenv("IMPORT_CHECKPOINT_ROWS", "25"))
+CHECKPOINT_COMPACT_EVERY = int(os.getenv("CHECKPOINT_COMPACT_EVERY", "1000"))
+CHECKPOINT_FSYNC = os.getenv("CHECKPOINT_FSYNC", "1") in ("1", "true", "True", "yes", "YES")
+YAML_CACHE_FILE = os.getenv("YAML_CACHE_FILE", str(Path(__file__).parent / ".notion_yaml_cache.pickle"))
+DEPLOY_MANIFEST = os.getenv("DEPLOY_MANIFEST", ".notion_deploy_manifest.json")
 ENABLE_SEARCH_FALLBACK = os.getenv("ENABLE_SEARCH_FALLBACK", "1") in ("1", "true", "True", "yes", "YES")
 
 # ============================================================================
 # VARIABLE SUBSTITUTION SYSTEM
 # ============================================================================
 
+# Compiled once; matches ${VARIABLE} or ${VARIABLE:-default}
+_VARIABLE_PATTERN = re.compile(r'\$\{([A-Z_][A-Z0-9_]*?)(?::-(.*?))?\}')
+
+def _substitute_env_var(match: 're.Match') -> str:
+    default_value = match.group(2) if match.group(2) is not None else ''
+    # Get value from environment, fall back to default
+    return os.getenv(match.group(1), default_value)
+
 def process_variable_substitution(content: str) -> str:
     """
     Process variable substitution for ${VARIABLE} patterns in content
@@ -71,20 +104,9 @@ def process_variable_substitution(content: str) -> str:
     Returns:
         String with variables substituted from environment
     """
-    if not isinstance(content, str):
+    if not isinstance(content, str) or '${' not in content:
         return content
-
-    # Pattern matches ${VARIABLE} or ${VARIABLE:-default}
-    pattern = r'\$\{([A-Z_][A-Z0-9_]*?)(?::-(.*?))?\}'
-
-    def substitute_var(match):
-        var_name = match.group(1)
-        default_value = match.group(2) if match.group(2) is not None else ''
-
-        # Get value from environment, fall back to default
-        return os.getenv(var_name, default_value)
-
-    return re.sub(pattern, substitute_var, content)
+    return _VARIABLE_PATTERN.sub(_substitute_env_var, content)
 
 
 def process_content_substitution(data: Any) -> Any:
@@ -97,18 +119,26 @@ def process_content_substitution(data: Any) -> Any:
     Returns:
         Data structure with variables substituted
     """
-    if isinstance(data, dict):
+    if isinstance(data, str):
+        return process_variable_substitution(data)
+    elif isinstance(data, dict):
         return {key: process_content_substitution(value) for key, value in data.items()}
     elif isinstance(data, list):
         return [process_content_substitution(item) for item in data]
-    elif isinstance(data, str):
-        return process_variable_substitution(data)
     else:
         return data
 
 # FORMULA PLACEHOLDER SYSTEM
 # ============================================================================
 
+# Compiled once; matches {{formula:expression}}
+_FORMULA_PATTERN = re.compile(r'\{\{formula:(.*?)\}\}')
+
+def _render_formula(match: 're.Match') -> str:
+    # For now, replace with a placeholder that indicates formula was here
+    # In production, this could be connected to an actual formula evaluator
+    return f"[Formula: {match.group(1)}]"
+
 def process_formula_placeholder(content: str) -> str:
     """
     Process formula placeholder patterns {{formula:expression}} in content
@@ -120,19 +150,9 @@ def process_formula_placeholder(content: str) -> str:
     Returns:
         String with formula placeholders replaced with placeholder text
     """
-    if not isinstance(content, str):
+    if not isinstance(content, str) or '{{' not in content:
         return content
-
-    # Pattern matches {{formula:expression}}
-    pattern = r'\{\{formula:(.*?)\}\}'
-
-    def substitute_formula(match):
-        formula_expr = match.group(1)
-        # For now, replace with a placeholder that indicates formula was here
-        # In production, this could be connected to an actual formula evaluator
-        return f"[Formula: {formula_expr}]"
-
-    return re.sub(pattern, substitute_formula, content)
+    return _FORMULA_PATTERN.sub(_render_formula, content)
 
 
 def process_formula_substitution(data: Any) -> Any:
@@ -145,16 +165,61 @@ def process_formula_substitution(data: Any) -> Any:
     Returns:
         Data structure with formula placeholders processed
     """
-    if isinstance(data, dict):
+    if isinstance(data, str):
+        return process_formula_placeholder(data)
+    elif isinstance(data, dict):
         return {key: process_formula_substitution(value) for key, value in data.items()}
     elif isinstance(data, list):
         return [process_formula_substitution(item) for item in data]
-    elif isinstance(data, str):
-        return process_formula_placeholder(data)
     else:
         return data
 
 
+@profiled("substitution")
+def substitute_placeholders(data: Any) -> Any:
+    """
+    Apply {{formula:}} and then ${VARIABLE} substitution in a single traversal
+
+    Equivalent to process_content_substitution(process_formula_substitution(data)).
+    Strings without '{{' or '${' are passed through untouched and each
+    environment variable is read once per call. Containers are always
+    rebuilt, so the result never shares dicts or lists with the input.
+    load_all_yaml applies this once; everything downstream receives
+    already-substituted data.
+
+    Args:
+        data: Dict, List, or primitive containing content to process
+
+    Returns:
+        Data structure with formulas and variables substituted
+    """
+    env_cache: Dict[str, Optional[str]] = {}
+
+    def substitute_var(match: 're.Match') -> str:
+        var_name = match.group(1)
+        if var_name not in env_cache:
+            env_cache[var_name] = os.environ.get(var_name)
+        value = env_cache[var_name]
+        if value is None:
+            return match.group(2) if match.group(2) is not None else ''
+        return value
+
+    def walk(value: Any) -> Any:
+        if isinstance(value, str):
+            if '{{' in value:
+                value = _FORMULA_PATTERN.sub(_render_formula, value)
+            if '${' in value:
+                value = _VARIABLE_PATTERN.sub(substitute_var, value)
+            return value
+        if isinstance(value, dict):
+            return {key: walk(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [walk(item) for item in value]
+        return value
+
+    return walk(data)
+
+
 # ENHANCED SELECT OPTIONS SUPPORT
 # ============================================================================
 
@@ -297,28 +362,221 @@ class DeploymentPhase(Enum):
 
 @dataclass
 class DeploymentState:
-    """Tracks deployment progress for recovery after failures"""
+    """Tracks deployment progress for recovery after failures
+
+    Checkpoints are an append-only journal (modules.checkpoint_journal):
+    record_* calls queue one JSON record each, and save_checkpoint appends
+    the queue plus any new errors/CSV/patch entries and phase changes with
+    a single fsync, compacting to a fresh snapshot every
+    CHECKPOINT_COMPACT_EVERY records.
+    """
     phase: DeploymentPhase = DeploymentPhase.VALIDATION
     created_pages: Dict[str, str] = field(default_factory=dict)
     created_databases: Dict[str, str] = field(default_factory=dict)
     processed_csv: List[str] = field(default_factory=list)
     applied_patches: List[str] = field(default_factory=list)
     errors: List[Dict[str, Any]] = field(default_factory=list)
+    cleared_blocks: List[str] = field(default_factory=list)
+    imported_rows: Dict[str, List[str]] = field(default_factory=dict)
+    # Rollup/relation properties added once every database exists, by database name
+    pending_rollups: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    pending_relations: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    content_cleared: bool = False
     start_time: float = field(default_factory=time.time)
     checkpoint_file: str = ".notion_deploy_state"
-    
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
+    _journal: Optional[CheckpointJournal] = field(default=None, repr=False, compare=False)
+    # Lengths of the append-only lists and scalar values already in the journal
+    _journaled: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    # Appended to directly by callers; new entries are journaled at checkpoints
+    JOURNALED_LISTS = {'errors': 'error', 'processed_csv': 'csv', 'applied_patches': 'patch'}
+    # Journal record kind -> deferred property field
+    PENDING_FIELDS = {'rollups': 'pending_rollups', 'relations': 'pending_relations'}
+
+    def __setattr__(self, name, value):
+        # Phase changes attribute request metrics to the right phase when profiling
+        if name == 'phase':
+            get_profiler().set_phase(value.name.lower())
+            get_planner().set_phase(value.name.lower())
+        super().__setattr__(name, value)
+
+    def __getstate__(self):
+        # Locks cannot be pickled; a fresh one is created on load
+        state = self.__dict__.copy()
+        state.pop('_lock', None)
+        state.pop('_journal', None)
+        state.pop('_journaled', None)
+        return state
+
+    def __setstate__(self, state):
+        state.setdefault('cleared_blocks', [])
+        state.setdefault('imported_rows', {})
+        state.setdefault('pending_rollups', {})
+        state.setdefault('pending_relations', {})
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        self._journal = None
+        self._journaled = {}
+
+    def _log(self, record: Dict[str, Any]):
+        # Before the first checkpoint the snapshot will carry the change
+        if self._journal is not None:
+            self._journal.append(record)
+
+    def record_page(self, title: str, page_id: str):
+        """Record a created page (safe to call from deployment worker threads)"""
+        with self._lock:
+            self.created_pages[title] = page_id
+            self._log({'op': 'page', 'title': title, 'id': page_id})
+
+    def record_database(self, db_name: str, db_id: str):
+        """Record a created database (safe to call from deployment worker threads)"""
+        with self._lock:
+            self.created_databases[db_name] = db_id
+            self._log({'op': 'database', 'name': db_name, 'id': db_id})
+
+    def record_cleared(self, block_id: str):
+        """Record a block deleted during teardown (safe to call from worker threads)"""
+        with self._lock:
+            self.cleared_blocks.append(block_id)
+            self._log({'op': 'cleared', 'id': block_id})
+
+    def record_imported_row(self, db_name: str, key: str):
+        """Record a seeded database row by its key (safe to call from worker threads)"""
+        with self._lock:
+            self.imported_rows.setdefault(db_name, []).append(key)
+            self._log({'op': 'row', 'db': db_name, 'key': key})
+
+    def record_pending(self, kind: str, db_name: str, properties: Dict[str, Any]):
+        """Record a database's deferred 'rollups' or 'relations' for the relations phase"""
+        with self._lock:
+            getattr(self, self.PENDING_FIELDS[kind])[db_name] = properties
+            self._log({'op': kind, 'db': db_name, 'properties': properties})
+
+    def settle_pending(self, kind: str, remaining: Dict[str, Dict[str, Any]]):
+        """Replace deferred 'rollups' or 'relations' with what a pass left to retry"""
+        with self._lock:
+            remaining = dict(remaining)  # May be the pending dict itself
+            getattr(self, self.PENDING_FIELDS[kind]).clear()
+            self._log({'op': f"{kind}_cleared"})
+            for db_name, properties in remaining.items():
+                self.record_pending(kind, db_name, properties)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable copy of the recoverable state"""
+        with self._lock:
+            return {
+                'phase': self.phase.value,
+                'created_pages': dict(self.created_pages),
+                'created_databases': dict(self.created_databases),
+                'processed_csv': list(self.processed_csv),
+                'applied_patches': list(self.applied_patches),
+                'errors': list(self.errors),
+                'cleared_blocks': list(self.cleared_blocks),
+                'imported_rows': {name: list(keys) for name, keys in self.imported_rows.items()},
+                'pending_rollups': dict(self.pending_rollups),
+                'pending_relations': dict(self.pending_relations),
+                'content_cleared': self.content_cleared,
+                'start_time': self.start_time,
+            }
+
+    def _journal_changes(self) -> bool:
+        """Queue records for list entries and scalar changes since the last checkpoint
+
+        Returns False if the state changed in a way records cannot express
+        (a list shrank), so the caller must compact instead.
+        """
+        for name, op in self.JOURNALED_LISTS.items():
+            values = getattr(self, name)
+            done = self._journaled.get(name, 0)
+            if len(values) < done:
+                return False
+            for value in values[done:]:
+                self._journal.append({'op': op, 'value': value})
+        if self._journaled.get('content_cleared') != self.content_cleared:
+            self._journal.append({'op': 'content_cleared', 'value': self.content_cleared})
+        if self._journaled.get('phase') != self.phase.value:
+            self._journal.append({'op': 'phase', 'value': self.phase.value})
+        self._mark_journaled()
+        return True
+
+    def _mark_journaled(self):
+        self._journaled = {name: len(getattr(self, name)) for name in self.JOURNALED_LISTS}
+        self._journaled.update(phase=self.phase.value, content_cleared=self.content_cleared)
+
+    def _apply(self, record: Dict[str, Any]):
+        """Replay one journal record"""
+        op = record.get('op')
+        if op == 'page':
+            self.created_pages[record['title']] = record['id']
+        elif op == 'database':
+            self.created_databases[record['name']] = record['id']
+        elif op == 'cleared':
+            self.cleared_blocks.append(record['id'])
+        elif op == 'row':
+            self.imported_rows.setdefault(record['db'], []).append(record['key'])
+        elif op in self.PENDING_FIELDS:
+            getattr(self, self.PENDING_FIELDS[op])[record['db']] = record['properties']
+        elif op in ('rollups_cleared', 'relations_cleared'):
+            getattr(self, self.PENDING_FIELDS[op.split('_')[0]]).clear()
+        elif op in ('error', 'csv', 'patch'):
+            name = next(n for n, o in self.JOURNALED_LISTS.items() if o == op)
+            getattr(self, name).append(record['value'])
+        elif op == 'content_cleared':
+            self.content_cleared = record['value']
+            if self.content_cleared:
+                self.cleared_blocks.clear()
+        elif op == 'phase':
+            self.phase = DeploymentPhase(record['value'])
+        else:
+            logging.warning(f"Skipping unknown checkpoint record: {op}")
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict[str, Any], checkpoint_file: str) -> 'DeploymentState':
+        state = cls(checkpoint_file=checkpoint_file)
+        state.phase = DeploymentPhase(snapshot.get('phase', DeploymentPhase.VALIDATION.value))
+        for name in ('created_pages', 'created_databases', 'imported_rows', 'pending_rollups', 'pending_relations'):
+            getattr(state, name).update(snapshot.get(name, {}))
+        for name in ('processed_csv', 'applied_patches', 'errors', 'cleared_blocks'):
+            getattr(state, name).extend(snapshot.get(name, []))
+        state.content_cleared = snapshot.get('content_cleared', False)
+        state.start_time = snapshot.get('start_time', state.start_time)
+        return state
+
     def save_checkpoint(self):
-        """Save current state to disk for recovery"""
-        with open(self.checkpoint_file, 'wb') as f:
-            pickle.dump(self, f)
-        logging.debug(f"Checkpoint saved at phase: {self.phase.value}")
+        """Append changes since the last checkpoint to the journal on disk"""
+        with self._lock:
+            journal = self._journal
+            if journal is None or journal.path != self.checkpoint_file:
+                # First checkpoint of this run: start the file over from a snapshot
+                journal = self._journal = CheckpointJournal(
+                    self.checkpoint_file, CHECKPOINT_COMPACT_EVERY, CHECKPOINT_FSYNC)
+            if not self._journal_changes() or journal.needs_compaction:
+                journal.compact(self.snapshot())
+                self._mark_journaled()
+                logging.debug(f"Checkpoint compacted at phase: {self.phase.value}")
+            else:
+                written = journal.flush()
+                logging.debug(f"Checkpoint: {written} records at phase: {self.phase.value}")
     
     def load_checkpoint(self) -> Optional['DeploymentState']:
-        """Load previous state if exists"""
+        """Load previous state if exists (journal replay; older pickle checkpoints still load)"""
         if Path(self.checkpoint_file).exists():
             try:
-                with open(self.checkpoint_file, 'rb') as f:
-                    state = pickle.load(f)
+                snapshot, records, clean = CheckpointJournal.read(self.checkpoint_file)
+                if snapshot is None:
+                    with open(self.checkpoint_file, 'rb') as f:
+                        state = pickle.load(f)
+                else:
+                    state = DeploymentState.from_snapshot(snapshot, self.checkpoint_file)
+                    for record in records:
+                        state._apply(record)
+                    # Keep appending to this file; a torn tail forces a fresh snapshot first
+                    state._journal = CheckpointJournal(
+                        self.checkpoint_file, CHECKPOINT_COMPACT_EVERY, CHECKPOINT_FSYNC)
+                    state._journal.records = len(records) if clean else None
+                    state._mark_journaled()
                 logging.info(f"Recovered state from phase: {state.phase.value}")
                 return state
             except Exception as e:
@@ -327,9 +585,11 @@ class DeploymentState:
     
     def clear_checkpoint(self):
         """Remove checkpoint after successful completion"""
-        if Path(self.checkpoint_file).exists():
-            os.remove(self.checkpoint_file)
-            logging.debug("Checkpoint cleared")
+        with self._lock:
+            self._journal = None
+            if Path(self.checkpoint_file).exists():
+                os.remove(self.checkpoint_file)
+                logging.debug("Checkpoint cleared")
 
 # ============================================================================
 # LOGGING & PROGRESS (Gemini feature)
@@ -354,6 +614,20 @@ class ProgressTracker:
         if self.current_step >= self.total_steps:
             print()  # New line at completion
 
+class LazyJSON:
+    """Log argument that serializes a payload only if a handler emits the record"""
+    __slots__ = ('value', '_text')
+
+    def __init__(self, value: Any):
+        self.value = value
+        self._text = None
+
+    def __str__(self) -> str:
+        # Formatters may call getMessage() more than once per record
+        if self._text is None:
+            self._text = json.dumps(self.value, indent=2, ensure_ascii=False)
+        return self._text
+
 # ============================================================================
 # VALIDATION MODULE (ChatGPT foundation)
 # ============================================================================
@@ -439,18 +713,33 @@ class Validator:
 # CORE REQUEST HANDLING (From all builds)
 # ============================================================================
 
-_LAST_REQ_TS = [0.0]
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
 
-def _throttle():
-    """Rate limiting to respect Notion API limits"""
-    if GLOBAL_THROTTLE_RPS <= 0:
-        return
-    min_interval = 1.0 / GLOBAL_THROTTLE_RPS
-    now = time.time()
-    elapsed = now - _LAST_REQ_TS[0]
-    if elapsed < min_interval:
-        time.sleep(min_interval - elapsed + 0.02)
-    _LAST_REQ_TS[0] = time.time()
+def get_session() -> requests.Session:
+    """Shared pooled keep-alive session for all deploy requests
+
+    Connection errors, timeouts and 502/503/504 responses are retried with
+    backoff by the session's HTTPAdapter; 500s only for idempotent methods, as
+    a failed POST or PATCH may already have been applied. 429s are left to
+    req() so the shared rate limiter sees them and pauses every caller.
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = create_session(
+                    max_retries=int(os.getenv("RETRY_MAX", "5")),
+                    backoff_base=float(os.getenv("RETRY_BACKOFF_BASE", "1.5")),
+                    pool_connections=HTTP_POOL_HOSTS,
+                    pool_maxsize=HTTP_POOL_SIZE,
+                    pool_block=True,
+                    status_forcelist=(500, 502, 503, 504),
+                    allowed_methods=("HEAD", "GET", "OPTIONS", "POST", "PATCH", "DELETE"),
+                    idempotent_only_statuses=(500,)
+                )
+                logging.debug(f"HTTP session pool: {HTTP_POOL_SIZE} connections per host")
+    return _SESSION
 
 def req(method: str, url: str, headers: Optional[Dict] = None, 
         data: Optional[str] = None, files: Optional[Any] = None, 
@@ -464,52 +753,64 @@ def req(method: str, url: str, headers: Optional[Dict] = None,
     if "Content-Type" not in headers and data is not None and files is None:
         headers["Content-Type"] = "application/json"
     
+    planner = get_planner()
+    if planner.enabled:
+        return _planned_response(planner, method, url, data)
+
     timeout = timeout or int(os.getenv("NOTION_TIMEOUT", "25"))
     max_try = int(os.getenv("RETRY_MAX", "5"))
-    backoff = float(os.getenv("RETRY_BACKOFF_BASE", "1.5"))
 
     r = None  # Initialize r to avoid UnboundLocalError
-
+    limiter = get_rate_limiter()
+    session = get_session()
+    profiler = get_profiler()
 
     for attempt in range(max_try):
+        waited = limiter.acquire(method, url)
+        started = time.perf_counter()
+        response = None
         try:
-            _throttle()
-            r = requests.request(method, url, headers=headers, data=data,
-                               files=files, timeout=timeout)
+            response = session.request(method, url, headers=headers, data=data,
+                                       files=files, timeout=timeout)
+        finally:
+            if profiler.enabled:
+                _profile_request(profiler, method, url, data, response, started, waited)
+        r = response
+
+        # Handle rate limiting - the shared limiter pauses every caller
+        if r.status_code == 429:
+            retry_after = parse_retry_after(r.headers.get('Retry-After'))
+            logging.warning(f"Rate limited, waiting {retry_after}s")
+            limiter.on_rate_limited(retry_after)
+            profiler.record_retry(method, url)
+            continue
 
-            
-            # Handle rate limiting
-            if r.status_code == 429:
-                retry_after = int(r.headers.get('Retry-After', '5'))
-                logging.warning(f"Rate limited, waiting {retry_after}s")
-                time.sleep(retry_after)
-                continue
-                
-            # Handle server errors with exponential backoff
-            if r.status_code in (502, 503, 504):
-                if attempt < max_try - 1:
-                    wait_time = backoff ** attempt
-                    logging.warning(f"Server error {r.status_code}, retrying in {wait_time}s")
-                    time.sleep(wait_time)
-                    continue
-                    
-            return r
-            
-        except requests.exceptions.Timeout:
-            if attempt == max_try - 1:
-                raise
-            logging.warning(f"Timeout on attempt {attempt + 1}, retrying...")
-            time.sleep(backoff ** attempt)
-            
-        except requests.exceptions.ConnectionError as e:
-            if attempt == max_try - 1:
-                raise
-            logging.warning(f"Connection error: {e}, retrying...")
-            time.sleep(backoff ** attempt)
-
-    # If we exhausted all attempts without returning, r might be None or last failed response
-    if r is None:
-        logging.error(f"Failed to get response after {max_try} attempts for {url}")
+        limiter.on_success()
+        return r
+
+    # If we exhausted all attempts without returning, r is the last 429 response
+    logging.error(f"Failed to get response after {max_try} attempts for {url}")
+    return r
+
+def _profile_request(profiler, method: str, url: str, data: Optional[Any],
+                     r: Optional[requests.Response], started: float, waited: float):
+    """Report one round trip (and any retries the pooled adapter made) to the profiler"""
+    bytes_sent = len(data.encode('utf-8')) if isinstance(data, str) else len(data or b'')
+    status = r.status_code if r is not None else None
+    profiler.record_request(method, url, status, time.perf_counter() - started, bytes_sent)
+    profiler.record_sleep(method, url, waited)
+    retries = getattr(getattr(r, 'raw', None), 'retries', None)
+    if retries is not None:
+        profiler.record_retry(method, url, len(getattr(retries, 'history', ()) or ()))
+
+def _planned_response(planner, method: str, url: str, data: Optional[Any]) -> requests.Response:
+    """Record a request in the offline plan and answer it without touching the network"""
+    status, body = planner.respond(method, url, data)
+    r = requests.Response()
+    r.status_code = status
+    r.url = url
+    r.headers['Content-Type'] = 'application/json'
+    r._content = json.dumps(body).encode('utf-8')
     return r
 
 def j(r: requests.Response) -> Dict:
@@ -534,6 +835,224 @@ def expect_ok(resp: requests.Response, context: str = "") -> bool:
         return False
     return True
 
+# ============================================================================
+# BLOCK BATCHING (Notion request limits)
+# ============================================================================
+
+# Notion accepts at most 100 blocks per children array, 1000 blocks per
+# request and two levels of nesting below the blocks being appended.
+NOTION_MAX_CHILDREN = 100
+NOTION_MAX_BLOCKS_PER_REQUEST = 1000
+NOTION_MAX_NESTING = 2
+
+# Block types Notion refuses to create without their children inline,
+# mapped to the nesting depth those children need
+_INLINE_CHILDREN_DEPTH = {'table': 1, 'column': 1, 'column_list': 2}
+
+@dataclass
+class BlockBatch:
+    """Blocks that fit a single request, plus nested children that must follow
+
+    deferred holds (path, blocks) pairs: path indexes into `blocks` (then into
+    each level of children) to locate the block the overflow is appended to.
+    """
+    blocks: List[Dict] = field(default_factory=list)
+    deferred: List[Tuple[Tuple[int, ...], List[Dict]]] = field(default_factory=list)
+    size: int = 0
+
+def _block_type(block: Dict) -> Optional[str]:
+    """Block type key for both typed and legacy {"toggle": {...}} blocks"""
+    if block.get('type'):
+        return block['type']
+    return next((key for key, value in block.items() if isinstance(value, dict)), None)
+
+def _trim_block(block: Dict, depth: int, path: Tuple[int, ...],
+                deferred: List[Tuple[Tuple[int, ...], List[Dict]]]) -> Tuple[Dict, int]:
+    """Copy block keeping only the children one request may carry; returns (block, block count)"""
+    block_type = _block_type(block)
+    body = block.get(block_type) if block_type else None
+    if not isinstance(body, dict) or not body.get('children'):
+        return block, 1
+
+    kids = body['children']
+    inline = []
+    if depth < NOTION_MAX_NESTING:
+        for kid in kids[:NOTION_MAX_CHILDREN]:
+            # Stop before a child whose own children cannot be inlined at this depth
+            if depth + 1 + _INLINE_CHILDREN_DEPTH.get(_block_type(kid), 0) > NOTION_MAX_NESTING:
+                break
+            inline.append(kid)
+
+    trimmed_kids = []
+    size = 1
+    for idx, kid in enumerate(inline):
+        trimmed, kid_size = _trim_block(kid, depth + 1, path + (idx,), deferred)
+        trimmed_kids.append(trimmed)
+        size += kid_size
+    if len(inline) < len(kids):
+        deferred.append((path, kids[len(inline):]))
+
+    new_body = dict(body)
+    if trimmed_kids:
+        new_body['children'] = trimmed_kids
+    else:
+        new_body.pop('children', None)
+    new_block = dict(block)
+    new_block[block_type] = new_body
+    return new_block, size
+
+@profiled("plan_block_batches")
+def plan_block_batches(blocks: List[Dict]) -> List[BlockBatch]:
+    """Pack blocks into the fewest requests Notion's per-request limits allow
+
+    Nested children that are too deep (or too many) to send inline are split
+    off into each batch's deferred list and appended in follow-up calls once
+    their parent block exists.
+    """
+    batches: List[BlockBatch] = []
+    current = BlockBatch()
+    for block in blocks:
+        deferred: List[Tuple[Tuple[int, ...], List[Dict]]] = []
+        trimmed, size = _trim_block(block, 0, (0,), deferred)
+        if current.blocks and (len(current.blocks) >= NOTION_MAX_CHILDREN or
+                               current.size + size > NOTION_MAX_BLOCKS_PER_REQUEST):
+            batches.append(current)
+            current = BlockBatch()
+        idx = len(current.blocks)
+        current.blocks.append(trimmed)
+        current.size += size
+        current.deferred.extend(((idx,) + path[1:], kids) for path, kids in deferred)
+    if current.blocks:
+        batches.append(current)
+    return batches
+
+def resolve_block_path(top_ids: List[str], path: Tuple[int, ...],
+                       list_children: Callable[[str], List[str]]) -> Optional[str]:
+    """Walk a deferred path down from the ids of a batch's top-level blocks"""
+    ids = top_ids
+    block_id = None
+    for depth, idx in enumerate(path):
+        if idx >= len(ids):
+            return None
+        block_id = ids[idx]
+        if depth < len(path) - 1:
+            ids = list_children(block_id)
+    return block_id
+
+def _list_child_ids(block_id: str) -> List[str]:
+    r = req("GET", f"{NOTION_API_BASE}/blocks/{block_id}/children?page_size={NOTION_MAX_CHILDREN}")
+    if not expect_ok(r, f"Listing children of block {block_id}"):
+        return []
+    return [block.get('id') for block in j(r).get('results', [])]
+
+def _append_deferred(top_ids: List[str], deferred: List[Tuple[Tuple[int, ...], List[Dict]]],
+                     context: str) -> bool:
+    listed: Dict[str, List[str]] = {}
+
+    def list_children(block_id: str) -> List[str]:
+        if block_id not in listed:
+            listed[block_id] = _list_child_ids(block_id)
+        return listed[block_id]
+
+    for path, blocks in deferred:
+        target = resolve_block_path(top_ids, path, list_children)
+        if not target:
+            logging.error(f"{context}: could not locate nested block {path} for {len(blocks)} deferred children")
+            return False
+        if not append_block_batches(target, plan_block_batches(blocks), context):
+            return False
+    return True
+
+def append_block_batches(block_id: str, batches: List[BlockBatch], context: str = "",
+                         first_sent: bool = False, after: Optional[str] = None) -> bool:
+    """Append planned batches under block_id, then their deferred nested children
+
+    With first_sent the first batch was already created (e.g. inline with
+    POST /pages) and only its deferred children still need sending. With
+    after, the blocks are inserted after that existing child instead of at
+    the end.
+    """
+    for n, batch in enumerate(batches):
+        if n == 0 and first_sent:
+            if not batch.deferred:
+                continue
+            top_ids = _list_child_ids(block_id)
+        else:
+            body = {"children": batch.blocks}
+            if after:
+                body["after"] = after
+            r = req("PATCH", f"{NOTION_API_BASE}/blocks/{block_id}/children",
+                    data=json.dumps(body))
+            if not expect_ok(r, f"{context}: appending blocks (batch {n + 1}/{len(batches)})"):
+                return False
+            top_ids = [block.get('id') for block in j(r).get('results', [])]
+            if after and top_ids:
+                after = top_ids[-1]
+        if batch.deferred and not _append_deferred(top_ids, batch.deferred, context):
+            return False
+    return True
+
+def append_block_children(block_id: str, blocks: List[Dict], context: str = "",
+                          after: Optional[str] = None) -> bool:
+    """Append any number of blocks (with any nesting) under block_id in as few calls as possible"""
+    return append_block_batches(block_id, plan_block_batches(blocks), context, after=after)
+
+def list_all_block_children(block_id: str) -> Optional[List[Dict]]:
+    """Every direct child of a block, following pagination; None on failure"""
+    results = []
+    start_cursor = None
+    while True:
+        url = f"{NOTION_API_BASE}/blocks/{block_id}/children?page_size={NOTION_MAX_CHILDREN}"
+        if start_cursor:
+            url += f"&start_cursor={start_cursor}"
+        r = req("GET", url)
+        if not expect_ok(r, f"Listing children of block {block_id}"):
+            return None
+        data = j(r)
+        results.extend(data.get('results', []))
+        if not data.get('has_more'):
+            return results
+        start_cursor = data.get('next_cursor')
+
+def delete_blocks(block_ids: List[str], context: str = "", workers: int = 1,
+                  on_deleted: Optional[Callable[[str], None]] = None) -> int:
+    """Delete (archive) blocks or pages by id; returns the number of failures
+
+    Deleting a block archives its whole subtree, so callers only pass the
+    topmost ids. Blocks that turn out to be archived already count as
+    deleted. With workers > 1 deletes run concurrently; the shared rate
+    limiter still bounds the request rate.
+    """
+    def delete_one(block_id: str) -> bool:
+        r = req("DELETE", f"{NOTION_API_BASE}/blocks/{block_id}")
+        if r is not None and r.status_code == 400 and 'archived' in j(r).get('message', '').lower():
+            logging.debug(f"Block {block_id} was already archived")
+        elif not expect_ok(r, f"{context}: deleting block {block_id}"):
+            return False
+        if on_deleted:
+            on_deleted(block_id)
+        return True
+
+    failures = 0
+    if workers <= 1 or len(block_ids) <= 1:
+        for block_id in block_ids:
+            try:
+                failures += not delete_one(block_id)
+            except Exception as e:
+                logging.warning(f"{context}: error deleting block {block_id}: {e}")
+                failures += 1
+        return failures
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="delete-block") as executor:
+        futures = {executor.submit(delete_one, block_id): block_id for block_id in block_ids}
+        for future in as_completed(futures):
+            try:
+                failures += not future.result()
+            except Exception as e:
+                logging.warning(f"{context}: error deleting block {futures[future]}: {e}")
+                failures += 1
+    return failures
+
 # ============================================================================
 # YAML & DATA LOADING
 # ============================================================================
@@ -568,8 +1087,26 @@ def flatten_pages_with_children(pages: List[Dict]) -> List[Dict]:
 
     return flattened
 
+_YAML_CACHE: Optional[YamlSnapshotCache] = None
+_MERGED_YAML: Dict[Tuple, bytes] = {}
+
+def get_yaml_cache() -> YamlSnapshotCache:
+    """Process-wide parsed-YAML cache backed by the YAML_CACHE_FILE snapshot"""
+    global _YAML_CACHE
+    if _YAML_CACHE is None:
+        _YAML_CACHE = YamlSnapshotCache(YAML_CACHE_FILE or None)
+    return _YAML_CACHE
+
+@profiled("yaml_load")
 def load_all_yaml(yaml_dir: Optional[Path] = None) -> Dict:
-    """Load and merge all YAML files from split_yaml directory"""
+    """Load and merge all YAML files from split_yaml directory
+
+    Files are parsed with libyaml when available and reused from the YAML
+    snapshot while unchanged. The merged result is memoized per process
+    (keyed by file mtimes/sizes and the environment used for substitution),
+    so validation, deployment and finalization only re-stat the files.
+    Every call returns an independent copy.
+    """
     if yaml_dir is None:
         yaml_dir = Path(__file__).parent / "split_yaml"
     else:
@@ -579,6 +1116,16 @@ def load_all_yaml(yaml_dir: Optional[Path] = None) -> Dict:
         logging.error(f"YAML directory not found: {yaml_dir}")
         return {}
 
+    yaml_files = sorted(yaml_dir.glob("*.yaml"))
+    memo_key = (
+        str(yaml_dir.resolve()),
+        tuple((f.name, f.stat().st_mtime_ns, f.stat().st_size) for f in yaml_files),
+        hash(frozenset(os.environ.items())),
+    )
+    if memo_key in _MERGED_YAML:
+        logging.debug(f"Reusing merged YAML for {yaml_dir}")
+        return pickle.loads(_MERGED_YAML[memo_key])
+
     merged = {
         "pages": [],
         "db": {
@@ -590,21 +1137,20 @@ def load_all_yaml(yaml_dir: Optional[Path] = None) -> Dict:
     }
 
     # Process YAML files in sorted order
-    yaml_files = sorted(yaml_dir.glob("*.yaml"))
     logging.info(f"Found {len(yaml_files)} YAML files to process")
+    cache = get_yaml_cache()
+    hits, misses = cache.hits, cache.misses
 
     for yaml_file in yaml_files:
         logging.debug(f"Loading {yaml_file.name}")
         try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+            data = cache.load(yaml_file)
 
             if not data:
                 continue
 
-            # Apply formula placeholders first, then variable substitution
-            data = process_formula_substitution(data)
-            data = process_content_substitution(data)
+            # Formula placeholders, then variable substitution - once, for the whole template
+            data = substitute_placeholders(data)
 
             # Merge pages (including processing children)
             if 'pages' in data:
@@ -627,11 +1173,22 @@ def load_all_yaml(yaml_dir: Optional[Path] = None) -> Dict:
 
             # Merge standalone databases
             if 'databases' in data:
-                merged['standalone_databases'].extend(data['databases'])
+                databases = data['databases']
+                if isinstance(databases, dict):
+                    # Some files key their databases by name instead of listing them
+                    databases = [{'title': key, **db} for key, db in databases.items()]
+                merged['standalone_databases'].extend(databases)
 
         except Exception as e:
             logging.error(f"Failed to load {yaml_file.name}: {e}")
 
+    cache.prune(yaml_files)
+    cache.save()
+    logging.debug(f"YAML cache: {cache.misses - misses} parsed, {cache.hits - hits} reused "
+                  f"({'libyaml' if LIBYAML_AVAILABLE else 'pure-Python'} loader)")
+    _MERGED_YAML.clear()
+    _MERGED_YAML[memo_key] = pickle.dumps(merged, protocol=pickle.HIGHEST_PROTOCOL)
+
     logging.info(f"Merged {len(merged['pages'])} pages (including children), {len(merged['db']['schemas'])} database schemas, {len(merged['standalone_databases'])} standalone databases, and {len(merged['letters'])} letters")
     return merged
 
@@ -747,19 +1304,15 @@ def get_asset_url(page_data: Dict, asset_type: str) -> Optional[str]:
 
     return None
 
-def create_page(page_data: Dict, state: DeploymentState, parent_id: Optional[str] = None) -> Optional[str]:
-    """Create a Notion page with comprehensive error handling"""
-    # Process formula placeholders first, then variable substitution
-    page_data = process_formula_substitution(page_data)
-    page_data = process_content_substitution(page_data)
+@profiled("build_page_payload")
+def build_page_payload(page_data: Dict, state: DeploymentState, parent_id: Optional[str] = None) -> Dict:
+    """Build the POST /pages request body for an already-substituted page definition
 
+    children holds the page's full content; callers split it with
+    plan_block_batches before sending.
+    """
     title = page_data.get('title', 'Untitled')
 
-    # Check if already created
-    if title in state.created_pages:
-        logging.debug(f"Page '{title}' already exists: {state.created_pages[title]}")
-        return state.created_pages[title]
-
     # Build page properties
     properties = {
         "title": {
@@ -867,8 +1420,6 @@ def create_page(page_data: Dict, state: DeploymentState, parent_id: Optional[str
     if blocks_data:
         logging.debug(f"Processing {len(blocks_data)} blocks for page '{title}'")
         for block in blocks_data:
-            # Process variable substitution in block content
-            block = process_content_substitution(block)
             built_block = build_block(block, state)
 
             # Handle multi-block responses (e.g., bulleted_list with items)
@@ -877,16 +1428,14 @@ def create_page(page_data: Dict, state: DeploymentState, parent_id: Optional[str
                 logging.debug(f"Built multi-block: {len(built_block['_blocks'])} blocks")
             else:
                 children.append(built_block)
-                logging.debug(f"Built block: {json.dumps(built_block, indent=2)}")
     else:
         logging.debug(f"No content generated for page '{title}', adding empty paragraph")
         # Add an empty paragraph block for pages without content
         children = [{"type": "paragraph", "paragraph": {"rich_text": []}}]
 
-    # Handle Notion's 100-block limit per page creation
-    if len(children) > 100:
-        logging.warning(f"Page '{title}' has {len(children)} blocks, exceeding Notion's 100-block limit. Using first 100 blocks.")
-        children = children[:100]
+    # Blocks beyond Notion's per-request limits are split off by plan_block_batches
+    if len(children) > NOTION_MAX_CHILDREN:
+        logging.info(f"Page '{title}' has {len(children)} blocks; the remainder will be appended after creation")
 
     # Create page
     payload = {
@@ -923,6 +1472,27 @@ def create_page(page_data: Dict, state: DeploymentState, parent_id: Optional[str
     if children:
         payload["children"] = children
 
+    return payload
+
+def create_page(page_data: Dict, state: DeploymentState, parent_id: Optional[str] = None) -> Optional[str]:
+    """Create a Notion page with comprehensive error handling
+
+    page_data is expected to be substituted already (load_all_yaml does this).
+    """
+    title = page_data.get('title', 'Untitled')
+
+    # Check if already created
+    if title in state.created_pages:
+        logging.debug(f"Page '{title}' already exists: {state.created_pages[title]}")
+        return state.created_pages[title]
+
+    payload = build_page_payload(page_data, state, parent_id)
+    parent = payload["parent"]
+    children = payload.pop("children", [])
+    batches = plan_block_batches(children)
+    if batches:
+        payload["children"] = batches[0].blocks
+
     # Proactive deletion commented out for debugging child page creation failure
     """
     # Check if page already exists and delete it to avoid archived conflicts
@@ -930,7 +1500,7 @@ def create_page(page_data: Dict, state: DeploymentState, parent_id: Optional[str
         parent_page_id = parent.get("page_id")
         if parent_page_id:
             # Get children of parent page to find existing page
-            search_r = req("GET", f"https://api.notion.com/v1/blocks/{parent_page_id}/children")
+            search_r = req("GET", f"{NOTION_API_BASE}/blocks/{parent_page_id}/children")
             if expect_ok(search_r, f"Searching for existing page '{title}'"):
                 blocks = j(search_r).get('results', [])
                 existing_page_id = None
@@ -943,7 +1513,7 @@ def create_page(page_data: Dict, state: DeploymentState, parent_id: Optional[str
 
                 if existing_page_id:
                     logging.info(f"Found existing page '{title}' with ID: {existing_page_id}. Deleting to avoid conflicts...")
-                    delete_r = req("DELETE", f"https://api.notion.com/v1/blocks/{existing_page_id}")
+                    delete_r = req("DELETE", f"{NOTION_API_BASE}/blocks/{existing_page_id}")
                     if expect_ok(delete_r, f"Deleting existing page '{title}'"):
                         logging.info(f"Successfully deleted existing page '{title}'")
                     else:
@@ -953,11 +1523,11 @@ def create_page(page_data: Dict, state: DeploymentState, parent_id: Optional[str
     """
 
     try:
-        logging.info(f"Creating page '{title}' with {len(children)} blocks")
+        logging.info(f"Creating page '{title}' with {len(children)} blocks in {max(1, len(batches))} request(s)")
         if children:
-            logging.debug(f"Page payload: {json.dumps(payload, indent=2)}")
+            logging.debug("Page payload: %s", LazyJSON(payload))
 
-        r = req("POST", "https://api.notion.com/v1/pages", data=json.dumps(payload))
+        r = req("POST", f"{NOTION_API_BASE}/pages", data=json.dumps(payload))
 
         # Check for archived content error BEFORE expect_ok
         response_data = j(r) if r else {}
@@ -972,7 +1542,7 @@ def create_page(page_data: Dict, state: DeploymentState, parent_id: Optional[str
                 parent_page_id = parent.get("page_id")
                 if parent_page_id:
                     # Get children of parent page to find existing page
-                    search_r = req("GET", f"https://api.notion.com/v1/blocks/{parent_page_id}/children")
+                    search_r = req("GET", f"{NOTION_API_BASE}/blocks/{parent_page_id}/children")
                     if expect_ok(search_r, f"Searching for existing page '{title}'"):
                         blocks = j(search_r).get('results', [])
                         existing_page_id = None
@@ -987,7 +1557,7 @@ def create_page(page_data: Dict, state: DeploymentState, parent_id: Optional[str
                             logging.info(f"Found existing page '{title}' with ID: {existing_page_id}")
 
                             # Get the existing page's children and delete archived blocks
-                            page_r = req("GET", f"https://api.notion.com/v1/blocks/{existing_page_id}/children")
+                            page_r = req("GET", f"{NOTION_API_BASE}/blocks/{existing_page_id}/children")
                             if expect_ok(page_r, f"Getting children of existing page '{title}'"):
                                 page_blocks = j(page_r).get('results', [])
 
@@ -995,22 +1565,20 @@ def create_page(page_data: Dict, state: DeploymentState, parent_id: Optional[str
                                 for block in page_blocks:
                                     block_id = block.get('id')
                                     if block_id:
-                                        delete_r = req("DELETE", f"https://api.notion.com/v1/blocks/{block_id}")
+                                        delete_r = req("DELETE", f"{NOTION_API_BASE}/blocks/{block_id}")
                                         if expect_ok(delete_r, f"Deleting block {block_id}"):
                                             logging.debug(f"Deleted block {block_id}")
 
                                 # Now add new content to the existing page
                                 if children:
-                                    add_payload = {"children": children}
-                                    add_r = req("PATCH", f"https://api.notion.com/v1/blocks/{existing_page_id}/children",
-                                               data=json.dumps(add_payload))
-                                    if expect_ok(add_r, f"Adding content to existing page '{title}'"):
-                                        state.created_pages[title] = existing_page_id
+                                    if append_block_batches(existing_page_id, batches,
+                                                            f"Adding content to existing page '{title}'"):
+                                        state.record_page(title, existing_page_id)
                                         logging.info(f"✅ Updated existing page '{title}': {existing_page_id} with {len(children)} blocks")
                                         return existing_page_id
 
                             # If we couldn't add content, at least return the existing page ID
-                            state.created_pages[title] = existing_page_id
+                            state.record_page(title, existing_page_id)
                             logging.warning(f"⚠️ Found existing page '{title}' but couldn't update content: {existing_page_id}")
                             return existing_page_id
 
@@ -1022,12 +1590,15 @@ def create_page(page_data: Dict, state: DeploymentState, parent_id: Optional[str
         # Normal successful creation
         if expect_ok(r, f"Creating page '{title}'"):
             page_id = j(r).get('id')
-            state.created_pages[title] = page_id
+            state.record_page(title, page_id)
+            if not append_block_batches(page_id, batches, f"Page '{title}'", first_sent=True):
+                logging.error(f"Page '{title}' was created but some of its {len(children)} blocks failed to append")
+                state.errors.append({"phase": "pages", "item": title, "error": "incomplete content"})
             logging.info(f"✅ Created page '{title}': {page_id} with {len(children)} blocks")
 
             # Verify blocks were added
-            if children:
-                time.sleep(0.5)  # Brief pause for API consistency
+            if children and PAGE_CREATE_PAUSE > 0 and not get_planner().enabled:
+                time.sleep(PAGE_CREATE_PAUSE)  # Brief pause for API consistency
                 logging.info(f"Page '{title}' created successfully with content blocks")
 
             return page_id
@@ -1045,7 +1616,7 @@ def create_page(page_data: Dict, state: DeploymentState, parent_id: Optional[str
                 parent_page_id = parent.get("page_id")
                 if parent_page_id:
                     # Get children of parent page to find existing page
-                    search_r = req("GET", f"https://api.notion.com/v1/blocks/{parent_page_id}/children")
+                    search_r = req("GET", f"{NOTION_API_BASE}/blocks/{parent_page_id}/children")
                     if expect_ok(search_r, f"Searching for existing page '{title}' after exception"):
                         blocks = j(search_r).get('results', [])
                         existing_page_id = None
@@ -1060,7 +1631,7 @@ def create_page(page_data: Dict, state: DeploymentState, parent_id: Optional[str
                             logging.info(f"Found existing page '{title}' with ID: {existing_page_id}")
 
                             # Get the existing page's children and delete archived blocks
-                            page_r = req("GET", f"https://api.notion.com/v1/blocks/{existing_page_id}/children")
+                            page_r = req("GET", f"{NOTION_API_BASE}/blocks/{existing_page_id}/children")
                             if expect_ok(page_r, f"Getting children of existing page '{title}' after exception"):
                                 page_blocks = j(page_r).get('results', [])
 
@@ -1068,22 +1639,20 @@ def create_page(page_data: Dict, state: DeploymentState, parent_id: Optional[str
                                 for block in page_blocks:
                                     block_id = block.get('id')
                                     if block_id:
-                                        delete_r = req("DELETE", f"https://api.notion.com/v1/blocks/{block_id}")
+                                        delete_r = req("DELETE", f"{NOTION_API_BASE}/blocks/{block_id}")
                                         if expect_ok(delete_r, f"Deleting block {block_id} after exception"):
                                             logging.debug(f"Deleted block {block_id}")
 
                                 # Now add new content to the existing page
                                 if children:
-                                    add_payload = {"children": children}
-                                    add_r = req("PATCH", f"https://api.notion.com/v1/blocks/{existing_page_id}/children",
-                                               data=json.dumps(add_payload))
-                                    if expect_ok(add_r, f"Adding content to existing page '{title}' after exception"):
-                                        state.created_pages[title] = existing_page_id
+                                    if append_block_batches(existing_page_id, batches,
+                                                            f"Adding content to existing page '{title}' after exception"):
+                                        state.record_page(title, existing_page_id)
                                         logging.info(f"✅ Updated existing page '{title}' after exception: {existing_page_id} with {len(children)} blocks")
                                         return existing_page_id
 
                             # If we couldn't add content, at least return the existing page ID
-                            state.created_pages[title] = existing_page_id
+                            state.record_page(title, existing_page_id)
                             logging.warning(f"⚠️ Found existing page '{title}' but couldn't update content after exception: {existing_page_id}")
                             return existing_page_id
 
@@ -1113,7 +1682,7 @@ def add_database_view_to_page(page_id: str, database_id: str, title: str = "") -
         }
 
         # Add the database view as a child block
-        r = req("PATCH", f"https://api.notion.com/v1/blocks/{page_id}/children",
+        r = req("PATCH", f"{NOTION_API_BASE}/blocks/{page_id}/children",
                 data=json.dumps(payload))
 
         if expect_ok(r, f"Adding database view to page"):
@@ -1149,11 +1718,7 @@ def add_letters_content_to_page(page_id: str, letters: List[Dict]) -> bool:
         # Create content for each category
         for category, category_letters in categories.items():
             # Add category heading
-            children.append({
-                "heading_2": {
-                    "rich_text": [{"text": {"content": f"{category} Letters"}}]
-                }
-            })
+            children.append(text_block("heading_2", f"{category} Letters"))
 
             # Add each letter as a toggle block
             for letter in category_letters:
@@ -1170,61 +1735,31 @@ def add_letters_content_to_page(page_id: str, letters: List[Dict]) -> bool:
                 if audience:
                     toggle_children.append({
                         "paragraph": {
-                            "rich_text": [
-                                {"text": {"content": "To: ", "annotations": {"bold": True}}},
-                                {"text": {"content": audience}}
-                            ]
+                            "rich_text": [text_item("To: ", bold=True), *rich_text(audience)]
                         }
                     })
 
                 # Add body
                 if body:
-                    toggle_children.append({
-                        "paragraph": {
-                            "rich_text": [{"text": {"content": body}}]
-                        }
-                    })
+                    toggle_children.append(text_block("paragraph", body))
 
                 # Add customization prompt
                 if prompt:
-                    toggle_children.append({
-                        "callout": {
-                            "rich_text": [{"text": {"content": prompt}}],
-                            "icon": {"emoji": "💡"},
-                            "color": "blue_background"
-                        }
-                    })
+                    toggle_children.append(build_block(
+                        {"type": "callout", "content": prompt, "icon": "💡", "color": "blue_background"}))
 
                 # Add disclaimer
                 if disclaimer:
-                    toggle_children.append({
-                        "callout": {
-                            "rich_text": [{"text": {"content": disclaimer}}],
-                            "icon": {"emoji": "⚠️"},
-                            "color": "yellow_background"
-                        }
-                    })
+                    toggle_children.append(build_block(
+                        {"type": "callout", "content": disclaimer, "icon": "⚠️", "color": "yellow_background"}))
 
                 # Create the toggle block
-                children.append({
-                    "toggle": {
-                        "rich_text": [{"text": {"content": f"📄 {title}"}}],
-                        "children": toggle_children
-                    }
-                })
+                children.append(text_block("toggle", f"📄 {title}", children=toggle_children))
 
-        # Split into chunks if needed (Notion has a 100-block limit per request)
-        chunk_size = 50
-        for i in range(0, len(children), chunk_size):
-            chunk = children[i:i+chunk_size]
-            payload = {"children": chunk}
-
-            r = req("PATCH", f"https://api.notion.com/v1/blocks/{page_id}/children",
-                    data=json.dumps(payload))
-
-            if not expect_ok(r, f"Adding letter templates chunk {i//chunk_size + 1}"):
-                logging.error(f"Failed to add letter templates chunk")
-                return False
+        # Batched to Notion's per-request limits
+        if not append_block_children(page_id, children, "Adding letter templates"):
+            logging.error(f"Failed to add letter templates chunk")
+            return False
 
         logging.info(f"✅ Added all letter templates to page")
         return True
@@ -1250,13 +1785,32 @@ def create_database(db_name: str, schema: Dict, state: DeploymentState,
         logging.debug(f"Database '{db_name}' already exists: {state.created_databases[db_name]}")
         return state.created_databases[db_name]
 
+    payload = build_database_payload(db_name, schema, state, parent_id, skip_rollups)
+
+    try:
+
+        r = req("POST", f"{NOTION_API_BASE}/databases", data=json.dumps(payload))
+        if expect_ok(r, f"Creating database '{db_name}'"):
+            db_id = j(r).get('id')
+            state.record_database(db_name, db_id)
+            logging.info(f"Created database '{db_name}': {db_id}")
+            return db_id
+    except Exception as e:
+        logging.error(f"Failed to create database '{db_name}': {e}")
+        state.errors.append({"phase": "databases", "item": db_name, "error": str(e)})
+    
+    return None
+
+def build_database_payload(db_name: str, schema: Dict, state: DeploymentState,
+                           parent_id: Optional[str] = None, skip_rollups: bool = False) -> Dict:
+    """Build the POST /databases request body, deferring rollups when skip_rollups is set"""
     # Build properties schema
     properties = {}
     rollup_definitions = {}  # Store rollups for later if skipping
 
     for prop_name, prop_def in schema.get('properties', {}).items():
         # Skip rollup properties if requested (first pass)
-        if skip_rollups and prop_def.get('type') == 'rollup':
+        if skip_rollups and isinstance(prop_def, dict) and prop_def.get('type') == 'rollup':
             rollup_definitions[prop_name] = prop_def
             logging.debug(f"Skipping rollup property '{prop_name}' in database '{db_name}' (will add in second pass)")
             continue
@@ -1264,13 +1818,22 @@ def create_database(db_name: str, schema: Dict, state: DeploymentState,
 
     # Store rollup definitions for later processing
     if rollup_definitions:
-        if not hasattr(state, 'pending_rollups'):
-            state.pending_rollups = {}
-        state.pending_rollups[db_name] = rollup_definitions
+        state.record_pending('rollups', db_name, rollup_definitions)
 
     # Resolve database references in relation properties
     properties = resolve_database_references(properties, state)
 
+    # Relations to databases not created yet are added by add_deferred_relations once all exist
+    deferred_relations = {
+        prop_name: prop for prop_name, prop in properties.items()
+        if isinstance(prop, dict) and _relation_unresolved(prop.get('relation'))
+    }
+    if deferred_relations:
+        for prop_name in deferred_relations:
+            del properties[prop_name]
+            logging.debug(f"Deferring relation '{prop_name}' in database '{db_name}' until all databases exist")
+        state.record_pending('relations', db_name, deferred_relations)
+
     # Ensure at least one title property exists (but not multiple)
     has_title_property = any(
         isinstance(prop, dict) and 'title' in prop
@@ -1292,25 +1855,11 @@ def create_database(db_name: str, schema: Dict, state: DeploymentState,
         parent = {"type": "page_id", "page_id": NOTION_PARENT_PAGEID}
     
     # Create database
-    payload = {
+    return {
         "parent": parent,
         "title": [{"text": {"content": db_name}}],
         "properties": properties
     }
-    
-    try:
-
-        r = req("POST", "https://api.notion.com/v1/databases", data=json.dumps(payload))
-        if expect_ok(r, f"Creating database '{db_name}'"):
-            db_id = j(r).get('id')
-            state.created_databases[db_name] = db_id
-            logging.info(f"Created database '{db_name}': {db_id}")
-            return db_id
-    except Exception as e:
-        logging.error(f"Failed to create database '{db_name}': {e}")
-        state.errors.append({"phase": "databases", "item": db_name, "error": str(e)})
-    
-    return None
 
 def add_rollup_properties(state: DeploymentState) -> bool:
     """Add rollup properties to databases after all relations are established
@@ -1320,7 +1869,7 @@ def add_rollup_properties(state: DeploymentState) -> bool:
     """
     # Use v4.1 enhanced rollup handling with retry logic if available
     if V41_AVAILABLE:
-        return v41.add_rollup_properties_with_retry(state, max_retries=3)
+        return v41.add_rollup_properties_with_retry(state, max_retries=3, request_fn=req)
 
     # Fallback to original implementation
     if not hasattr(state, 'pending_rollups') or not state.pending_rollups:
@@ -1375,7 +1924,7 @@ def add_rollup_properties(state: DeploymentState) -> bool:
 
         try:
             # Use PATCH to update the database
-            r = req("PATCH", f"https://api.notion.com/v1/databases/{db_id}",
+            r = req("PATCH", f"{NOTION_API_BASE}/databases/{db_id}",
                    data=json.dumps(payload))
 
             if expect_ok(r, f"Adding rollup properties to '{db_name}'"):
@@ -1398,490 +1947,66 @@ def add_rollup_properties(state: DeploymentState) -> bool:
 
     return success
 
-def convert_legacy_block_format(block_def: Dict) -> Dict:
-    """
-    Convert old block formats to modern Notion API format
-    Handles legacy patterns like type: H1/H2/H3 and heading field
-    """
-    block_def = block_def.copy()  # Don't mutate original
-
-    # Convert old heading format: type: H1/H2/H3 -> type: heading_1/2/3
-    if 'type' in block_def:
-        old_type = block_def['type']
-        if old_type == 'H1':
-            block_def['type'] = 'heading_1'
-        elif old_type == 'H2':
-            block_def['type'] = 'heading_2'
-        elif old_type == 'H3':
-            block_def['type'] = 'heading_3'
-
-    # Move 'heading' field to 'content' if present
-    if 'heading' in block_def and 'content' not in block_def:
-        block_def['content'] = block_def.pop('heading')
-
-    return block_def
-
-
-def build_block(block_def, state: DeploymentState = None) -> Dict:
-    """Build a Notion block from definition"""
-    # Handle string blocks (convert to paragraph)
-    if isinstance(block_def, str):
-        block_def = {"type": "paragraph", "content": block_def}
-
-    # Convert legacy formats first
-    block_def = convert_legacy_block_format(block_def)
-
-    block_type = block_def.get('type', 'paragraph')
-
-    # Handle alternative content field names
-    content = block_def.get('content', block_def.get('text', block_def.get('summary', '')))
+def _relation_unresolved(relation: Any) -> bool:
+    """True for a relation whose target is missing or still a ref: marker"""
+    if not isinstance(relation, dict):
+        return False
+    target = relation.get('database_id')
+    return not target or str(target).startswith('ref:')
 
-    if block_type == 'heading_1':
-        return {
-            "heading_1": {
-                "rich_text": [{"text": {"content": content}}]
-            }
-        }
-    elif block_type == 'heading_2':
-        return {
-            "heading_2": {
-                "rich_text": [{"text": {"content": content}}]
-            }
-        }
-    elif block_type == 'heading_3':
-        return {
-            "heading_3": {
-                "rich_text": [{"text": {"content": content}}]
-            }
-        }
-    elif block_type == 'paragraph':
-        return {
-            "paragraph": {
-                "rich_text": [{"text": {"content": content}}]
-            }
-        }
-    elif block_type == 'bulleted_list_item':
-        return {
-            "bulleted_list_item": {
-                "rich_text": [{"text": {"content": content}}]
-            }
-        }
-    elif block_type == 'bulleted_list':
-        # Handle bulleted_list with items
-        children = []
-        if 'items' in block_def:
-            for item in block_def['items']:
-                children.append({
-                    "bulleted_list_item": {
-                        "rich_text": [{"text": {"content": item if isinstance(item, str) else str(item)}}]
-                    }
-                })
-        return children[0] if len(children) == 1 else {"paragraph": {"rich_text": [{"text": {"content": f"[bulleted_list with {len(children)} items]"}}]}}
-    elif block_type == 'numbered_list_item':
-        return {
-            "numbered_list_item": {
-                "rich_text": [{"text": {"content": content}}]
-            }
-        }
-    elif block_type == 'callout':
-        return {
-            "callout": {
-                "rich_text": [{"text": {"content": content}}],
-                "icon": {"emoji": block_def.get('icon', '💡').replace('emoji:', '')},
-                "color": block_def.get('color', 'gray_background')
-            }
-        }
-    elif block_type == 'toggle':
-        block_data = {
-            "toggle": {
-                "rich_text": [{"text": {"content": content}}]
-            }
-        }
-        # Handle nested blocks in toggle - check multiple field names
-        children_data = block_def.get('children', block_def.get('blocks', []))
-        if children_data:
-            children = []
-            for child_block in children_data:
-                # Process variable substitution in nested blocks
-                child_block = process_content_substitution(child_block)
-                built_child = build_block(child_block, state)
-
-                # Handle multi-block responses in toggle children
-                if isinstance(built_child, dict) and built_child.get('_multi_block'):
-                    children.extend(built_child['_blocks'])
-                else:
-                    children.append(built_child)
+def add_deferred_relations(state: DeploymentState) -> bool:
+    """Add relation properties whose target database did not exist when their database was created
 
-            block_data["toggle"]["children"] = children
-        return block_data
-    elif block_type == 'code':
-        return {
-            "code": {
-                "rich_text": [{"text": {"content": content}}],
-                "language": block_def.get('language', 'plain text')
-            }
-        }
-    elif block_type == 'divider':
-        return {"divider": {}}
-    elif block_type == 'to_do':
-        # Handle complex to_do structure from YAML files
-        if 'to_do' in block_def:
-            to_do_data = block_def['to_do']
-            # Check if it has rich_text array structure
-            if 'rich_text' in to_do_data:
-                rich_text_array = []
-                for rt_item in to_do_data['rich_text']:
-                    if isinstance(rt_item, dict):
-                        if 'text' in rt_item and 'content' in rt_item['text']:
-                            rich_text_array.append({
-                                "text": {"content": rt_item['text']['content']}
-                            })
-                        elif 'type' in rt_item and rt_item['type'] == 'text':
-                            # Handle alternative format
-                            rich_text_array.append({
-                                "text": {"content": rt_item.get('text', {}).get('content', '')}
-                            })
-                    elif isinstance(rt_item, str):
-                        # If rich_text item is just a string
-                        rich_text_array.append({"text": {"content": rt_item}})
-
-                return {
-                    "to_do": {
-                        "rich_text": rich_text_array if rich_text_array else [{"text": {"content": content}}],
-                        "checked": to_do_data.get('checked', False)
-                    }
-                }
-            else:
-                # Fallback for simpler to_do structure
-                return {
-                    "to_do": {
-                        "rich_text": [{"text": {"content": to_do_data.get('content', content)}}],
-                        "checked": to_do_data.get('checked', False)
-                    }
-                }
-        else:
-            # Original simple to_do handling
-            return {
-                "to_do": {
-                    "rich_text": [{"text": {"content": content}}],
-                    "checked": block_def.get('checked', False)
-                }
-            }
-    elif block_type == 'bulleted_list':
-        # Handle bulleted_list with items array - this is a special case
-        # We need to return a list of blocks, not a single block
-        items = block_def.get('items', [])
-        if not items:
-            # Fallback to single item with content
-            return {
-                "bulleted_list_item": {
-                    "rich_text": [{"text": {"content": content}}]
-                }
-            }
-        else:
-            # Mark this as a multi-block response
-            return {
-                "_multi_block": True,
-                "_blocks": [
-                    {
-                        "bulleted_list_item": {
-                            "rich_text": [{"text": {"content": item}}]
-                        }
-                    }
-                    for item in items
-                ]
-            }
-    elif block_type == 'numbered_list':
-        # Handle numbered_list with items array - similar to bulleted_list
-        items = block_def.get('items', [])
-        if not items:
-            return {
-                "numbered_list_item": {
-                    "rich_text": [{"text": {"content": content}}]
-                }
-            }
-        else:
-            return {
-                "_multi_block": True,
-                "_blocks": [
-                    {
-                        "numbered_list_item": {
-                            "rich_text": [{"text": {"content": item}}]
-                        }
-                    }
-                    for item in items
-                ]
-            }
-    elif block_type == 'embed':
-        # Handle embed blocks with proper Notion API format
-        url = block_def.get('url', content if isinstance(content, str) and content.startswith('http') else '')
-        if url:
-            return {
-                "embed": {
-                    "url": url
-                }
-            }
-        else:
-            # Fallback if no valid URL
-            return {
-                "paragraph": {
-                    "rich_text": [{"text": {"content": f"[EMBED: No valid URL provided]"}}]
-                }
-            }
-    elif block_type == 'table':
-        # Handle table blocks with proper Notion API format
-        # Tables in Notion API require table_width and has_column_header
-        rows = block_def.get('rows', [])
-        if rows and isinstance(rows, list):
-            # Calculate table width from first row
-            table_width = len(rows[0].get('cells', [])) if rows else 3
-
-            # Build table rows
-            table_rows = []
-            for row in rows:
-                cells = row.get('cells', []) if isinstance(row, dict) else row if isinstance(row, list) else []
-                # Convert cells to rich text format
-                formatted_cells = []
-                for cell in cells:
-                    cell_content = str(cell) if cell else ""
-                    formatted_cells.append([{"text": {"content": cell_content}}])
-
-                # Pad row if needed
-                while len(formatted_cells) < table_width:
-                    formatted_cells.append([{"text": {"content": ""}}])
-
-                table_rows.append({"cells": formatted_cells[:table_width]})
+    Targets are resolved again now that every database exists. Relations
+    that still cannot be resolved are reported and left out; databases
+    whose PATCH fails stay pending so --resume retries them.
+    """
+    if not state.pending_relations:
+        logging.debug("No deferred relation properties to add")
+        return True
 
-            return {
-                "table": {
-                    "table_width": table_width,
-                    "has_column_header": block_def.get('has_header', True),
-                    "has_row_header": block_def.get('has_row_header', False),
-                    "children": table_rows if table_rows else [
-                        {"cells": [[{"text": {"content": ""}}] for _ in range(table_width)]}
-                    ]
-                }
-            }
-        else:
-            # Fallback for invalid table structure
-            return {
-                "paragraph": {
-                    "rich_text": [{"text": {"content": f"[TABLE: Invalid structure]"}}]
-                }
-            }
-    elif block_type == 'child_database':
-        # Handle child_database blocks for embedded database views
-        database_id = block_def.get('database_id')
-        title = block_def.get('title', content)
+    success = True
+    remaining = {}
+    logging.info(f"Adding deferred relation properties to {len(state.pending_relations)} databases")
 
-        if database_id:
-            return {
-                "child_database": {
-                    "title": title
-                }
-            }
-        else:
-            # Fallback with reference lookup
-            db_ref = block_def.get('database_ref')
-            if db_ref and hasattr(state, 'created_databases'):
-                resolved_id = state.created_databases.get(db_ref)
-                if resolved_id:
-                    return {
-                        "child_database": {
-                            "title": title
-                        }
-                    }
+    for db_name, relations in state.pending_relations.items():
+        db_id = state.created_databases.get(db_name)
+        if not db_id:
+            logging.error(f"Cannot add relations to '{db_name}': database not found")
+            success = False
+            continue
 
-            # Fallback if no valid database reference
-            return {
-                "paragraph": {
-                    "rich_text": [{"text": {"content": f"[DATABASE: {title} - Reference not resolved]"}}]
-                }
-            }
-    elif 'linked_db' in block_def:
-        # Handle linked_db as a reference to a database (convert to child_database)
-        db_name = block_def.get('linked_db', '')
-        logging.info(f"Converting linked_db '{db_name}' to child_database reference")
+        properties = {}
+        for prop_name, prop_def in relations.items():
+            relation = dict(prop_def['relation'])
+            target = str(relation.get('database_id') or '')
+            relation['database_id'] = target[4:] if target.startswith('ref:') else target
+            relation = resolve_database_references({prop_name: {'relation': relation}}, state)[prop_name]['relation']
+            if _relation_unresolved(relation):
+                logging.warning(f"Database '{db_name}': relation '{prop_name}' target "
+                                f"'{target[4:] or 'not set'}' does not exist; property not added")
+                state.errors.append({"phase": "relations", "item": f"{db_name}.{prop_name}",
+                                     "error": "relation target not found"})
+                success = False
+                continue
+            properties[prop_name] = {**prop_def, 'relation': relation}
 
-        # Try to find the database ID if it was already created
-        if hasattr(state, 'created_databases') and db_name in state.created_databases:
-            return {
-                "child_database": {
-                    "title": db_name
-                }
-            }
+        if not properties:
+            continue
+        r = req("PATCH", f"{NOTION_API_BASE}/databases/{db_id}", data=json.dumps({"properties": properties}))
+        if expect_ok(r, f"Adding relation properties to '{db_name}'"):
+            logging.info(f"Added {len(properties)} deferred relation properties to '{db_name}'")
         else:
-            # Fallback: create a placeholder that references the database
-            return {
-                "paragraph": {
-                    "rich_text": [{"text": {"content": f"[DATABASE VIEW: {db_name}]"}}],
-                    "color": "gray_background"
-                }
-            }
-    elif block_type == "image":
-        # Image block
-        image_url = block_def.get("url") or block_def.get("src") or block_def.get("image_url") or ""
-        caption = block_def.get("caption") or block_def.get("alt") or ""
-
-        if not image_url:
-            logger.warning("Image block missing URL")
-            return {"paragraph": {"rich_text": [{"text": {"content": "[Image - URL missing]"}}]}}
-
-        return {
-            "image": {
-                "type": "external",
-                "external": {"url": image_url},
-                "caption": [{"text": {"content": caption}}] if caption else []
-            }
-        }
-
-    elif block_type == "file":
-        # File attachment block
-        file_url = block_def.get("url") or block_def.get("file_url") or ""
-        file_name = block_def.get("name") or block_def.get("filename") or "File"
-
-        if not file_url:
-            logger.warning("File block missing URL")
-            return {"paragraph": {"rich_text": [{"text": {"content": f"[File: {file_name} - URL missing]"}}]}}
-
-        return {
-            "file": {
-                "type": "external",
-                "external": {"url": file_url},
-                "caption": [{"text": {"content": file_name}}]
-            }
-        }
-
-    elif block_type == "pdf":
-        # PDF embed block
-        pdf_url = block_def.get("url") or block_def.get("pdf_url") or ""
-        title = block_def.get("title") or "PDF Document"
-
-        if not pdf_url:
-            logger.warning("PDF block missing URL")
-            return {"paragraph": {"rich_text": [{"text": {"content": f"[PDF: {title} - URL missing]"}}]}}
-
-        return {
-            "pdf": {
-                "type": "external",
-                "external": {"url": pdf_url},
-                "caption": [{"text": {"content": title}}]
-            }
-        }
-
-    elif block_type == "bookmark":
-        # Bookmark/web link block
-        url = block_def.get("url") or block_def.get("link") or ""
-        caption = block_def.get("caption") or block_def.get("title") or url
-
-        if not url:
-            logger.warning("Bookmark block missing URL")
-            return {"paragraph": {"rich_text": [{"text": {"content": "[Bookmark - URL missing]"}}]}}
-
-        return {
-            "bookmark": {
-                "url": url,
-                "caption": [{"text": {"content": caption}}] if caption != url else []
-            }
-        }
-
-    elif block_type == "quote":
-        # Quote block
-        text = block_def.get("content") or block_def.get("text") or ""
-        author = block_def.get("author") or block_def.get("citation") or ""
-
-        quote_content = text
-        if author:
-            quote_content = f"{text}\n— {author}"
-
-        return {
-            "quote": {
-                "rich_text": [{"text": {"content": quote_content}}],
-                "color": "default"
-            }
-        }
-
-    elif block_type == "column_list":
-        # Column layout container - requires special handling
-        columns = block_def.get("columns") or []
-
-        if not columns:
-            logger.warning("Column list block missing columns")
-            return {"paragraph": {"rich_text": [{"text": {"content": "[Column Layout]"}}]}}
-
-        # For now, flatten columns into sequential blocks
-        # Notion API requires creating column_list with column children
-        # This would need special handling in create_page_with_blocks
-        logger.info(f"Column layout with {len(columns)} columns - flattening for now")
-        return {"paragraph": {"rich_text": [{"text": {"content": f"[Column Layout: {len(columns)} columns]"}}]}}
-
-    elif block_type == "link_to_page":
-        # Link to another page block
-        page_id = block_def.get("page_id") or block_def.get("target_page_id") or ""
-        page_title = block_def.get("title") or block_def.get("page_title") or "Linked Page"
-
-        if not page_id:
-            # Try to find page by title if ID not provided
-            page_title_to_find = block_def.get("page_title") or block_def.get("title")
-            # Note: page_ids would need to be tracked globally or passed in
-            # For now, just fallback to text
-
-        if not page_id:
-            logger.warning(f"Link to page block missing page_id for: {page_title}")
-            return {"paragraph": {"rich_text": [{"text": {"content": f"→ {page_title}"}}]}}
-
-        return {
-            "link_to_page": {
-                "type": "page_id",
-                "page_id": page_id
-            }
-        }
-
-    elif block_type == "child_page":
-        # Child page reference block - creates a link to a subpage
-        page_id = block_def.get("page_id") or ""
-        title = block_def.get("title") or block_def.get("page_title") or "Child Page"
-        icon = block_def.get("icon") or ""
-
-        if not page_id:
-            # Note: Would need global page_ids tracking for title resolution
-            logging.warning(f"Child page block missing page_id, using fallback for: {title}")
-            # Fallback to a styled paragraph that looks like a child page link
-            icon_str = f"{icon} " if icon else "📄 "
-            return {"paragraph": {"rich_text": [{"text": {"content": f"{icon_str}{title}"}}]}}
-
-        return {
-            "child_page": {
-                "page_id": page_id
-            }
-        }
-
-    elif block_type == "table_of_contents":
-        # Automatic table of contents from headings in the page
-        # TOC automatically includes all heading_1, heading_2, heading_3 blocks
-        color = block_def.get("color") or block_def.get("background_color") or "default"
-
-        # Notion API table_of_contents block
-        return {
-            "table_of_contents": {
-                "color": color
-            }
-        }
+            remaining[db_name] = relations
+            success = False
 
-    elif block_type == "breadcrumb":
-        # Navigation breadcrumb showing page hierarchy
-        # Breadcrumb automatically generates from the page's position in workspace
-        # No additional configuration needed - it reads from page hierarchy
-        return {
-            "breadcrumb": {}
-        }
+    state.settle_pending('relations', remaining)
+    return success
 
-    else:  # Default to paragraph
-        return {
-            "paragraph": {
-                "rich_text": [{"text": {"content": f"[{block_type}] {content}"}}]
-            }
-        }
+@profiled("build_block")
+def build_block(block_def, state: DeploymentState = None) -> Dict:
+    """Build a Notion block from definition (dispatched by modules.block_compiler)"""
+    return compile_block(block_def, state)
 
 def resolve_database_references(properties: Dict, state: Any) -> Dict:
     """Resolve database_id_ref markers and name-based references to actual database IDs"""
@@ -2000,64 +2125,432 @@ def build_property_schema(prop_def) -> Dict:
             if expression != original:
                 logging.debug(f"Formula escaped: {original[:50]}... -> {expression[:50]}...")
 
-        return {
-            "formula": {
-                "expression": expression
-            }
-        }
-    elif prop_type == 'relation':
-        # Handle database_id_ref pattern from YAML
-        database_id = prop_def.get('database_id', '')
+        return {
+            "formula": {
+                "expression": expression
+            }
+        }
+    elif prop_type == 'relation':
+        # Handle database_id_ref pattern from YAML
+        database_id = prop_def.get('database_id', '')
+
+        # If database_id_ref is provided, mark for later resolution
+        if not database_id and 'database_id_ref' in prop_def:
+            database_ref = prop_def.get('database_id_ref')
+            # Use a marker that will be resolved during database creation
+            database_id = f"ref:{database_ref}"
+
+        # Build relation property according to Sept 2025 API format
+        relation_config = {"database_id": database_id}
+
+        # Handle dual_property relations if specified
+        # Check both old format (relation_type) and new format (nested in relation)
+        relation_def = prop_def.get('relation', {})
+
+        if prop_def.get('relation_type') == 'dual_property' or relation_def.get('type') == 'dual_property':
+            # Extract dual_property config from either format
+            dual_prop_config = prop_def.get('dual_property') or relation_def.get('dual_property', {})
+
+            if dual_prop_config:
+                relation_config["type"] = "dual_property"
+                relation_config["dual_property"] = {
+                    "synced_property_name": dual_prop_config.get('synced_property_name', ''),
+                    "synced_property_id": dual_prop_config.get('synced_property_id', '')
+                }
+
+        return {"relation": relation_config}
+    elif prop_type == 'rollup':
+        # Handle rollup properties
+        rollup_config = {
+            "relation_property_name": prop_def.get('relation_property_name', ''),
+            "relation_property_id": prop_def.get('relation_property_id', ''),
+            "rollup_property_name": prop_def.get('rollup_property_name', ''),
+            "rollup_property_id": prop_def.get('rollup_property_id', ''),
+            "function": prop_def.get('function', 'count')  # count, count_values, sum, average, median, min, max, etc.
+        }
+        return {"rollup": rollup_config}
+    elif prop_type == 'people':
+        # Handle people property type
+        return {"people": {}}
+    elif prop_type == 'last_edited_time':
+        # Handle last_edited_time property type
+        return {"last_edited_time": {}}
+    elif prop_type == 'created_time':
+        # Handle created_time property type
+        return {"created_time": {}}
+    elif prop_type == 'files':
+        # Handle files property type for file attachments
+        return {"files": {}}
+    else:  # Default to rich_text
+        return {"rich_text": {}}
+
+# ============================================================================
+# DATA IMPORT (seed rows and CSV)
+# ============================================================================
+
+def schema_property_types(schema: Dict) -> Dict[str, str]:
+    """Map each property in a database schema to its Notion type"""
+    types = {}
+    for prop_name, prop_def in schema.get('properties', {}).items():
+        prop_type = prop_def if isinstance(prop_def, str) else (prop_def or {}).get('type', 'rich_text')
+        types[prop_name] = 'rich_text' if prop_type == 'text' else prop_type
+    return types
+
+def _text_items(value: str) -> List[Dict]:
+    return rich_text(value) if value else []
+
+def _split_values(value: Any) -> List[str]:
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [v.strip() for v in str(value).split(',') if v.strip()]
+
+def convert_row_to_properties(row: Dict[str, Any], property_types: Dict[str, str],
+                              state: Optional[DeploymentState] = None) -> Dict:
+    """Convert a seed or CSV row to a Notion page properties payload
+
+    Columns are matched to schema properties by name (case-insensitively as a
+    fallback). Empty values, unknown columns and computed property types
+    (formula, rollup, timestamps) are skipped. Relation values are page titles
+    and only resolve to pages created by this deployment.
+    """
+    by_lower = {name.lower(): name for name in property_types}
+    properties = {}
+
+    for column, value in row.items():
+        prop_name = column if column in property_types else by_lower.get(str(column).lower())
+        if prop_name is None or value is None or value == '' or value == []:
+            continue
+        prop_type = property_types[prop_name]
+        text = value if isinstance(value, str) else str(value)
+
+        if prop_type == 'title':
+            properties[prop_name] = {"title": _text_items(text)}
+        elif prop_type == 'rich_text':
+            properties[prop_name] = {"rich_text": _text_items(text)}
+        elif prop_type == 'number':
+            try:
+                number = value if isinstance(value, (int, float)) else float(text.replace('$', '').replace(',', ''))
+            except ValueError:
+                logging.warning(f"Invalid number for '{prop_name}': {value}")
+                continue
+            properties[prop_name] = {"number": number}
+        elif prop_type == 'select':
+            properties[prop_name] = {"select": {"name": text.strip()}}
+        elif prop_type == 'multi_select':
+            properties[prop_name] = {"multi_select": [{"name": v} for v in _split_values(value)]}
+        elif prop_type == 'date':
+            properties[prop_name] = {"date": {"start": text.strip()}}
+        elif prop_type == 'checkbox':
+            checked = value if isinstance(value, bool) else text.strip().lower() in ("true", "yes", "1", "x")
+            properties[prop_name] = {"checkbox": checked}
+        elif prop_type in ('url', 'email', 'phone_number'):
+            properties[prop_name] = {prop_type: text.strip()}
+        elif prop_type == 'relation' and state is not None:
+            ids = [state.created_pages[t] for t in _split_values(value) if t in state.created_pages]
+            if ids:
+                properties[prop_name] = {"relation": [{"id": page_id} for page_id in ids]}
+
+    return properties
+
+def row_key_property(schema: Dict, property_types: Dict[str, str]) -> Optional[str]:
+    """Property that identifies a row for deduplication: schema 'seed_key', else the title"""
+    key = schema.get('seed_key')
+    if key in property_types:
+        return key
+    return next((name for name, prop_type in property_types.items() if prop_type == 'title'), None)
+
+def _property_text(prop: Dict) -> str:
+    """Plain-text value of a queried page property, for key comparison"""
+    prop_type = prop.get('type')
+    value = prop.get(prop_type)
+    if prop_type in ('title', 'rich_text'):
+        return ''.join(item.get('plain_text') or item.get('text', {}).get('content', '') for item in value or [])
+    if prop_type == 'select':
+        return (value or {}).get('name', '')
+    if value is None:
+        return ''
+    return str(value)
+
+def query_existing_row_keys(database_id: str, key_property: str) -> Optional[set]:
+    """Keys of rows already in a database (None if the query fails)"""
+    keys = set()
+    payload: Dict[str, Any] = {"page_size": 100}
+    while True:
+        r = req("POST", f"{NOTION_API_BASE}/databases/{database_id}/query", data=json.dumps(payload))
+        if not expect_ok(r, f"Querying rows of {database_id}"):
+            return None
+        data = j(r)
+        for page in data.get('results', []):
+            prop = page.get('properties', {}).get(key_property)
+            if prop:
+                keys.add(_property_text(prop))
+        if not data.get('has_more'):
+            return keys
+        payload["start_cursor"] = data.get('next_cursor')
+
+def create_database_row(database_id: str, properties: Dict, context: str = "") -> Optional[str]:
+    """Create one row (page) in a database and return its ID"""
+    payload = {"parent": {"database_id": database_id}, "properties": properties}
+    r = req("POST", f"{NOTION_API_BASE}/pages", data=json.dumps(payload))
+    if expect_ok(r, context or f"Creating row in {database_id}"):
+        return j(r).get('id')
+    return None
+
+def import_database_rows(db_name: str, database_id: str, schema: Dict, rows: List[Dict],
+                         state: DeploymentState, workers: int = IMPORT_WORKERS,
+                         checkpoint_rows: int = IMPORT_CHECKPOINT_ROWS) -> Tuple[int, int, int]:
+    """Create database rows concurrently, skipping rows whose key already exists
+
+    Existing keys come from the database itself (so reruns and rows created
+    just before a crash are not duplicated) and from state.imported_rows.
+    Rows are created in ranges of checkpoint_rows across a worker pool that
+    shares the global request throttle; the state is checkpointed after each
+    range so --resume continues from the last completed range.
+
+    Returns:
+        (created, skipped, failed) row counts
+    """
+    property_types = schema_property_types(schema)
+    key_property = row_key_property(schema, property_types)
+    if key_property is None:
+        logging.warning(f"Database '{db_name}' has no title property; cannot import rows")
+        return 0, 0, len(rows)
+
+    existing = set(state.imported_rows.get(db_name, []))
+    remote = query_existing_row_keys(database_id, key_property)
+    if remote is None:
+        logging.warning(f"Could not read existing rows of '{db_name}'; deduplicating on local state only")
+    else:
+        existing |= remote
+
+    pending = []
+    skipped = 0
+    for row in rows:
+        properties = convert_row_to_properties(row, property_types, state)
+        key = _property_text({'type': property_types[key_property], **properties[key_property]}) \
+            if key_property in properties else ''
+        if not key or key in existing:
+            skipped += 1
+            continue
+        existing.add(key)
+        pending.append((key, properties))
+
+    if skipped:
+        logging.info(f"'{db_name}': skipping {skipped} rows that already exist or have no key")
+
+    created = failed = 0
+
+    def create(key: str, properties: Dict) -> bool:
+        row_id = create_database_row(database_id, properties, f"Importing '{key}' into '{db_name}'")
+        if row_id:
+            state.record_imported_row(db_name, key)
+        return row_id is not None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="import-row") as executor:
+        for start in range(0, len(pending), checkpoint_rows):
+            batch = pending[start:start + checkpoint_rows]
+            for (key, _), future in zip(batch, [executor.submit(create, key, props) for key, props in batch]):
+                try:
+                    ok = future.result()
+                except Exception as e:
+                    logging.error(f"Failed to import row '{key}' into '{db_name}': {e}")
+                    ok = False
+                if ok:
+                    created += 1
+                else:
+                    failed += 1
+                    state.errors.append({"phase": "data", "item": f"{db_name}: {key}", "error": "row creation failed"})
+            state.save_checkpoint()
+
+    return created, skipped, failed
+
+# ============================================================================
+# ASYNC DEPLOYMENT (aiohttp backend)
+# ============================================================================
+
+def relation_targets(schema: Dict) -> set:
+    """Names of databases referenced by relation properties in a schema"""
+    targets = set()
+    for prop_def in schema.get('properties', {}).values():
+        if not isinstance(prop_def, dict) or prop_def.get('type') != 'relation':
+            continue
+        ref = prop_def.get('database_id_ref') or prop_def.get('database_id') or \
+            (prop_def.get('relation') or {}).get('database_id', '')
+        if isinstance(ref, str) and ref:
+            targets.add(ref[4:] if ref.startswith('ref:') else ref)
+    return targets
+
+async def run_dependency_dag(items: List[Any], key_of: Callable[[Any], str],
+                             deps_of: Callable[[Any], set], create: Callable[[Any], Awaitable[Any]],
+                             on_result: Callable[[Any, Any], bool], limit: int) -> bool:
+    """Run create(item) with at most `limit` in flight, each once all of its dependency keys succeeded
+
+    deps_of should only return keys that are still outstanding. on_result is
+    called for every finished item and returns False to stop scheduling new
+    work. Items stuck behind a dependency cycle are released once nothing else
+    is in flight. Returns False if any on_result call failed.
+    """
+    dependents: Dict[str, List[int]] = {}
+    remaining: Dict[int, set] = {}
+    ready: List[int] = []
+    keys = {key_of(item) for item in items}
+    for idx, item in enumerate(items):
+        deps = {d for d in deps_of(item) if d in keys and d != key_of(item)}
+        if deps:
+            remaining[idx] = deps
+            for dep in deps:
+                dependents.setdefault(dep, []).append(idx)
+        else:
+            ready.append(idx)
+
+    failed = False
+    in_flight: Dict[asyncio.Task, int] = {}
+
+    while ready or in_flight or remaining:
+        while ready and not failed and len(in_flight) < limit:
+            idx = ready.pop(0)
+            in_flight[asyncio.ensure_future(create(items[idx]))] = idx
+
+        if not in_flight:
+            if failed or not remaining:
+                break
+            logging.warning(f"Releasing {len(remaining)} items blocked on unresolved dependencies")
+            ready.extend(remaining)
+            remaining.clear()
+            continue
+
+        done, _ = await asyncio.wait(list(in_flight), return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            idx = in_flight.pop(task)
+            try:
+                result = task.result()
+            except Exception as e:
+                logging.error(f"Async task failed for '{key_of(items[idx])}': {e}")
+                result = None
+            if not on_result(items[idx], result):
+                failed = True
+                continue
+            for dependent in dependents.pop(key_of(items[idx]), []):
+                deps = remaining.get(dependent)
+                if deps is None:
+                    continue
+                deps.discard(key_of(items[idx]))
+                if not deps:
+                    del remaining[dependent]
+                    ready.append(dependent)
+
+    return not failed
+
+async def _list_child_ids_async(client: 'AsyncNotionClient', block_id: str) -> List[str]:
+    r = await client.list_block_children(block_id, page_size=NOTION_MAX_CHILDREN)
+    if not expect_ok(r, f"Listing children of block {block_id}"):
+        return []
+    return [block.get('id') for block in r.data.get('results', [])]
+
+async def _append_deferred_async(client: 'AsyncNotionClient', top_ids: List[str],
+                                 deferred: List[Tuple[Tuple[int, ...], List[Dict]]], context: str) -> bool:
+    listed: Dict[str, List[str]] = {}
+
+    async def resolve(path: Tuple[int, ...]) -> Optional[str]:
+        # resolve_block_path needs synchronous listing, so prefetch each level first
+        ids = top_ids
+        for depth, idx in enumerate(path[:-1]):
+            if idx >= len(ids):
+                return None
+            if ids[idx] not in listed:
+                listed[ids[idx]] = await _list_child_ids_async(client, ids[idx])
+            ids = listed[ids[idx]]
+        return resolve_block_path(top_ids, path, listed.get)
+
+    # Deferred children target different parent blocks, so order between them doesn't matter
+    async def send(path: Tuple[int, ...], blocks: List[Dict]) -> bool:
+        target = await resolve(path)
+        if not target:
+            logging.error(f"{context}: could not locate nested block {path} for {len(blocks)} deferred children")
+            return False
+        return await append_block_batches_async(client, target, plan_block_batches(blocks), context)
+
+    results = await asyncio.gather(*(send(path, blocks) for path, blocks in deferred))
+    return all(results)
 
-        # If database_id_ref is provided, mark for later resolution
-        if not database_id and 'database_id_ref' in prop_def:
-            database_ref = prop_def.get('database_id_ref')
-            # Use a marker that will be resolved during database creation
-            database_id = f"ref:{database_ref}"
+async def append_block_batches_async(client: 'AsyncNotionClient', block_id: str, batches: List[BlockBatch],
+                                     context: str = "", first_sent: bool = False) -> bool:
+    """Async append_block_batches; nested follow-ups overlap with later top-level batches
 
-        # Build relation property according to Sept 2025 API format
-        relation_config = {"database_id": database_id}
+    Top-level batches go out in order (Notion appends to the end), while each
+    batch's deferred children are sent concurrently under their own parents.
+    """
+    ok = True
+    followups = []
+    for n, batch in enumerate(batches):
+        if n == 0 and first_sent:
+            if not batch.deferred:
+                continue
+            top_ids = await _list_child_ids_async(client, block_id)
+        else:
+            r = await client.append_block_children(block_id, batch.blocks)
+            if not expect_ok(r, f"{context}: appending blocks (batch {n + 1}/{len(batches)})"):
+                ok = False
+                break
+            top_ids = [block.get('id') for block in r.data.get('results', [])]
+        if batch.deferred:
+            followups.append(asyncio.ensure_future(_append_deferred_async(client, top_ids, batch.deferred, context)))
+    if followups:
+        ok = all(await asyncio.gather(*followups)) and ok
+    return ok
+
+async def create_page_async(client: 'AsyncNotionClient', page_data: Dict, state: DeploymentState,
+                            parent_id: Optional[str] = None) -> Optional[str]:
+    """Async variant of create_page; archived-content recovery falls back to the sync path"""
+    title = page_data.get('title', 'Untitled')
+    if title in state.created_pages:
+        return state.created_pages[title]
 
-        # Handle dual_property relations if specified
-        # Check both old format (relation_type) and new format (nested in relation)
-        relation_def = prop_def.get('relation', {})
+    payload = build_page_payload(page_data, state, parent_id)
+    batches = plan_block_batches(payload.pop("children", []))
+    if batches:
+        payload["children"] = batches[0].blocks
+    try:
+        logging.info(f"Creating page '{title}' with content in {max(1, len(batches))} request(s)")
+        r = await client.create_page(payload)
+    except Exception as e:
+        logging.error(f"Failed to create page '{title}': {e}")
+        state.errors.append({"phase": "pages", "item": title, "error": str(e)})
+        return None
 
-        if prop_def.get('relation_type') == 'dual_property' or relation_def.get('type') == 'dual_property':
-            # Extract dual_property config from either format
-            dual_prop_config = prop_def.get('dual_property') or relation_def.get('dual_property', {})
+    if r is not None and r.status_code == 400 and 'archived' in r.data.get('message', '').lower():
+        logging.warning(f"Page creation failed due to archived content, retrying '{title}' synchronously")
+        return await asyncio.to_thread(create_page, page_data, state, parent_id)
+
+    if expect_ok(r, f"Creating page '{title}'"):
+        page_id = r.data.get('id')
+        state.record_page(title, page_id)
+        if not await append_block_batches_async(client, page_id, batches, f"Page '{title}'", first_sent=True):
+            logging.error(f"Page '{title}' was created but some of its blocks failed to append")
+            state.errors.append({"phase": "pages", "item": title, "error": "incomplete content"})
+        logging.info(f"✅ Created page '{title}': {page_id}")
+        return page_id
+    return None
 
-            if dual_prop_config:
-                relation_config["type"] = "dual_property"
-                relation_config["dual_property"] = {
-                    "synced_property_name": dual_prop_config.get('synced_property_name', ''),
-                    "synced_property_id": dual_prop_config.get('synced_property_id', '')
-                }
+async def create_database_async(client: 'AsyncNotionClient', db_name: str, schema: Dict,
+                                state: DeploymentState, parent_id: Optional[str] = None,
+                                skip_rollups: bool = False) -> Optional[str]:
+    """Async variant of create_database"""
+    if db_name in state.created_databases:
+        return state.created_databases[db_name]
 
-        return {"relation": relation_config}
-    elif prop_type == 'rollup':
-        # Handle rollup properties
-        rollup_config = {
-            "relation_property_name": prop_def.get('relation_property_name', ''),
-            "relation_property_id": prop_def.get('relation_property_id', ''),
-            "rollup_property_name": prop_def.get('rollup_property_name', ''),
-            "rollup_property_id": prop_def.get('rollup_property_id', ''),
-            "function": prop_def.get('function', 'count')  # count, count_values, sum, average, median, min, max, etc.
-        }
-        return {"rollup": rollup_config}
-    elif prop_type == 'people':
-        # Handle people property type
-        return {"people": {}}
-    elif prop_type == 'last_edited_time':
-        # Handle last_edited_time property type
-        return {"last_edited_time": {}}
-    elif prop_type == 'created_time':
-        # Handle created_time property type
-        return {"created_time": {}}
-    elif prop_type == 'files':
-        # Handle files property type for file attachments
-        return {"files": {}}
-    else:  # Default to rich_text
-        return {"rich_text": {}}
+    payload = build_database_payload(db_name, schema, state, parent_id, skip_rollups)
+    try:
+        r = await client.create_database(payload)
+        if expect_ok(r, f"Creating database '{db_name}'"):
+            db_id = r.data.get('id')
+            state.record_database(db_name, db_id)
+            logging.info(f"Created database '{db_name}': {db_id}")
+            return db_id
+    except Exception as e:
+        logging.error(f"Failed to create database '{db_name}': {e}")
+        state.errors.append({"phase": "databases", "item": db_name, "error": str(e)})
+    return None
 
 # ============================================================================
 # CLI INTERFACE (Qwen feature)
@@ -2079,6 +2572,8 @@ Examples:
   %(prog)s --interactive           # Step-by-step deployment
   %(prog)s --resume                # Resume from last checkpoint
   %(prog)s --validate-only         # Only run validation
+  %(prog)s --incremental           # Redeploy only what changed
+  %(prog)s --plan                  # Compile every request offline, no API calls
             """
         )
         
@@ -2092,6 +2587,10 @@ Examples:
                                help='Resume from last checkpoint')
         mode_group.add_argument('--validate-only', action='store_true',
                                help='Only validate, no deployment')
+        mode_group.add_argument('--plan', nargs='?', const='deployment_plan.json', metavar='FILE',
+                               help='Compile every Notion request offline with placeholder IDs and write '
+                                    'the bodies, request counts and time-at-rate estimate to FILE '
+                                    '(default: deployment_plan.json)')
         
         # Selective deployment
         parser.add_argument('--phase', choices=[p.name.lower() for p in DeploymentPhase],
@@ -2106,6 +2605,21 @@ Examples:
                           help='Directory containing CSV files')
         parser.add_argument('--parent-id',
                           help='Override parent page ID')
+
+        # Performance
+        parser.add_argument('--workers', type=int, default=DEPLOY_WORKERS,
+                          help='Concurrent page creation workers (default: DEPLOY_WORKERS or 1)')
+        parser.add_argument('--async', dest='use_async', action='store_true',
+                          help='Use the aiohttp backend with many requests in flight '
+                               '(--workers or ASYNC_MAX_IN_FLIGHT bounds concurrency)')
+        parser.add_argument('--incremental', action='store_true',
+                          help='Only create, update or archive what changed since the last deployment')
+        parser.add_argument('--manifest', type=Path,
+                          help='Deployment manifest file (default: DEPLOY_MANIFEST or .notion_deploy_manifest.json)')
+        parser.add_argument('--profile', nargs='?', const='deployment_profile.json', metavar='REPORT',
+                          help='Write per-phase/per-endpoint timings as JSON (default: deployment_profile.json)')
+        parser.add_argument('--cprofile', type=Path, metavar='FILE',
+                          help='Dump cProfile stats of the main thread to FILE (view with python -m pstats)')
         
         # Logging
         parser.add_argument('--verbose', '-v', action='count', default=0,
@@ -2133,6 +2647,7 @@ class NotionTemplateDeployer:
         self.state = DeploymentState()
         self.validator = Validator()
         self.progress = None
+        self.manifest: Optional[DeploymentManifest] = None
         self.setup_logging()
         
     def setup_logging(self):
@@ -2237,19 +2752,32 @@ class NotionTemplateDeployer:
                 self.progress.update(DeploymentPhase.PREPARATION, "Setting up deployment")
                 self.state.save_checkpoint()
             
+            self.load_manifest()
+
             # Phase 3: Create Pages
             if not self.skip_phase(DeploymentPhase.PAGES):
-                # Clear existing content first to avoid archived conflicts
-                if not self.clear_existing_content():
-                    logging.warning("Failed to clear existing content, but continuing...")
+                if self.args.incremental:
+                    # Only touch what changed since the manifest was written
+                    if not self.sync_incremental_pages(yaml_data):
+                        return False
+                else:
+                    # Clear existing content first to avoid archived conflicts
+                    if not self.clear_existing_content():
+                        logging.warning("Failed to clear existing content, but continuing...")
+                    self.manifest.clear()
 
                 if not self.deploy_pages(yaml_data):
                     return False
+                self.record_manifest_pages(yaml_data)
             
             # Phase 4: Create Databases
             if not self.skip_phase(DeploymentPhase.DATABASES):
+                if self.args.incremental:
+                    self.sync_incremental_databases(yaml_data)
                 if not self.deploy_databases(yaml_data):
                     return False
+                self.update_changed_databases()
+                self.record_manifest_databases(yaml_data)
             
             # Phase 5: Set Relations
             if not self.skip_phase(DeploymentPhase.RELATIONS):
@@ -2258,7 +2786,7 @@ class NotionTemplateDeployer:
             
             # Phase 6: Import Data
             if not self.skip_phase(DeploymentPhase.DATA):
-                if not self.import_data(csv_data):
+                if not self.import_data(csv_data, yaml_data):
                     return False
             
             # Phase 7: Apply Patches
@@ -2286,6 +2814,189 @@ class NotionTemplateDeployer:
             self.state.save_checkpoint()
             return False
     
+    def run_plan(self) -> bool:
+        """Compile the whole deployment offline and write the plan file (--plan)
+
+        Every request goes to the planner instead of Notion: creates answer
+        with placeholder IDs so children, relations and rows resolve against
+        their parents, and reads answer as a fresh workspace would. The
+        checkpoint and manifest are redirected to a scratch directory so a
+        plan never disturbs a resumable or incremental deployment.
+        """
+        import tempfile
+
+        planner = get_planner()
+        planner.enable()
+
+        with tempfile.TemporaryDirectory(prefix='notion_plan_') as scratch:
+            self.state.checkpoint_file = os.path.join(scratch, 'state')
+            self.args.manifest = Path(scratch) / 'manifest.json'
+            try:
+                success = self.run()
+            finally:
+                planner.enabled = False
+
+        plan = planner.write_plan(self.args.plan, get_rate_limiter(), extra={
+            'parent_id': self.args.parent_id or NOTION_PARENT_PAGEID,
+            'complete': success,
+            'pages': len(self.state.created_pages),
+            'databases': len(self.state.created_databases),
+        })
+        summary = plan['summary']
+        print(f"\n📝 Plan written to {self.args.plan}: {summary['requests']} requests "
+              f"({summary['by_class']['write']} writes, {summary['by_class']['read']} reads), "
+              f"~{summary['estimated_seconds']}s at {summary['rate_rps']} rps")
+        return success
+
+    async def run_async(self) -> bool:
+        """Async deployment entry point
+
+        Pages and databases are created through AsyncNotionClient with many
+        requests in flight (scheduled on the page hierarchy and relation
+        dependencies); the remaining phases reuse the synchronous
+        implementations in a worker thread so they overlap with the event loop.
+        """
+        if not AIOHTTP_AVAILABLE:
+            logging.error("aiohttp is not installed - run without --async or pip install aiohttp")
+            return False
+
+        try:
+            if self.args.resume:
+                loaded_state = self.state.load_checkpoint()
+                if loaded_state:
+                    self.state = loaded_state
+                    logging.info(f"Resuming from phase: {self.state.phase.value}")
+
+            if not self.skip_phase(DeploymentPhase.VALIDATION):
+                if not self.validate():
+                    return False
+            if self.args.validate_only:
+                print("\n✅ Validation successful!")
+                return True
+
+            yaml_data = load_all_yaml(self.args.yaml_dir)
+            csv_data = load_csv_data(self.args.csv_dir)
+            if self.args.dry_run:
+                return await asyncio.to_thread(self._run_comprehensive_dry_run, yaml_data, csv_data)
+
+            total_steps = (
+                len(yaml_data.get('pages', [])) +
+                len(yaml_data.get('db', {}).get('schemas', {})) +
+                len(csv_data) + 10
+            )
+            self.progress = ProgressTracker(total_steps)
+            limit = self.args.workers if (getattr(self.args, 'workers', 1) or 1) > 1 else ASYNC_MAX_IN_FLIGHT
+
+            async with AsyncNotionClient(NOTION_TOKEN, NOTION_VERSION, base_url=NOTION_API_BASE,
+                                         limit_per_host=limit) as client:
+                if not self.skip_phase(DeploymentPhase.PREPARATION):
+                    self.state.phase = DeploymentPhase.PREPARATION
+                    self.progress.update(DeploymentPhase.PREPARATION, "Setting up deployment")
+                    self.state.save_checkpoint()
+
+                self.load_manifest()
+
+                if not self.skip_phase(DeploymentPhase.PAGES):
+                    if self.args.incremental:
+                        if not await asyncio.to_thread(self.sync_incremental_pages, yaml_data):
+                            return False
+                    else:
+                        if not await asyncio.to_thread(self.clear_existing_content):
+                            logging.warning("Failed to clear existing content, but continuing...")
+                        self.manifest.clear()
+                    if not await self._deploy_pages_async(client, yaml_data, limit):
+                        return False
+                    self.record_manifest_pages(yaml_data)
+
+                if not self.skip_phase(DeploymentPhase.DATABASES):
+                    if self.args.incremental:
+                        self.sync_incremental_databases(yaml_data)
+                    if not await self._deploy_databases_async(client, yaml_data, limit):
+                        return False
+                    await asyncio.to_thread(self.update_changed_databases)
+                    self.record_manifest_databases(yaml_data)
+
+            for phase, step in ((DeploymentPhase.RELATIONS, self.setup_relations),
+                                (DeploymentPhase.DATA, lambda data: self.import_data(csv_data, data)),
+                                (DeploymentPhase.PATCHES, self.apply_patches)):
+                if not self.skip_phase(phase):
+                    if not await asyncio.to_thread(step, yaml_data):
+                        return False
+
+            if not self.skip_phase(DeploymentPhase.FINALIZATION):
+                await asyncio.to_thread(self.finalize_deployment)
+
+            self.state.phase = DeploymentPhase.COMPLETED
+            self.state.clear_checkpoint()
+            self.print_summary()
+            return True
+
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            logging.warning("\n\nDeployment interrupted! Run with --resume to continue.")
+            self.state.save_checkpoint()
+            return False
+        except Exception as e:
+            logging.error(f"Deployment failed: {e}")
+            self.state.errors.append({"phase": self.state.phase.value, "error": str(e)})
+            self.state.save_checkpoint()
+            return False
+
+    async def _deploy_pages_async(self, client: AsyncNotionClient, yaml_data: Dict, limit: int) -> bool:
+        """Create pages with up to `limit` requests in flight, each after its parent exists"""
+        self.state.phase = DeploymentPhase.PAGES
+        pages = yaml_data.get('pages', [])
+        if V41_AVAILABLE:
+            pages = v41.order_pages_by_hierarchy(pages)
+        root_id = self.args.parent_id or NOTION_PARENT_PAGEID
+        completed = [0]
+
+        async def create(page):
+            return await create_page_async(client, page, self.state,
+                                           None if page.get('parent') else root_id)
+
+        def on_result(page, page_id) -> bool:
+            completed[0] += 1
+            title = page.get('title', 'Untitled')
+            self.progress.update(DeploymentPhase.PAGES, f"Created page {completed[0]}/{len(pages)}: {title}")
+            if not page_id:
+                logging.error(f"Failed to create page '{title}'")
+                return False
+            if completed[0] % 10 == 0:
+                self.state.save_checkpoint()
+            return True
+
+        ok = await run_dependency_dag(
+            pages,
+            key_of=lambda page: page.get('title', 'Untitled'),
+            deps_of=lambda page: {page['parent']} if page.get('parent') and page['parent'] not in self.state.created_pages else set(),
+            create=create, on_result=on_result, limit=limit)
+        self.state.save_checkpoint()
+        return ok
+
+    async def _deploy_databases_async(self, client: AsyncNotionClient, yaml_data: Dict, limit: int) -> bool:
+        """First database pass (no rollups), each database after the databases it relates to"""
+        self.state.phase = DeploymentPhase.DATABASES
+        schemas, converted_standalone = self._collect_databases(yaml_data)
+        all_databases = list({**schemas, **converted_standalone}.items())
+        parent_id = self.args.parent_id or NOTION_PARENT_PAGEID
+
+        async def create(item):
+            db_name, schema = item
+            return await create_database_async(client, db_name, schema, self.state, parent_id, skip_rollups=True)
+
+        def on_result(item, db_id) -> bool:
+            self.progress.update(DeploymentPhase.DATABASES, f"Created: {item[0]} (without rollups)")
+            return bool(db_id)
+
+        ok = await run_dependency_dag(
+            all_databases,
+            key_of=lambda item: item[0],
+            deps_of=lambda item: relation_targets(item[1]) - set(self.state.created_databases),
+            create=create, on_result=on_result, limit=limit)
+        self.state.save_checkpoint()
+        logging.info("Databases created. Rollup properties will be added after relations are established.")
+        return ok
+
     def skip_phase(self, phase: DeploymentPhase) -> bool:
         """Check if phase should be skipped"""
         if self.args.phase and phase.name.lower() != self.args.phase:
@@ -2304,8 +3015,8 @@ class NotionTemplateDeployer:
         self.state.phase = DeploymentPhase.VALIDATION
         errors = []
         
-        # Environment validation
-        env_errors = self.validator.validate_environment()
+        # Environment validation (a plan never talks to Notion)
+        env_errors = [] if getattr(self.args, 'plan', None) else self.validator.validate_environment()
         if env_errors:
             errors.extend(env_errors)
         
@@ -2332,73 +3043,273 @@ class NotionTemplateDeployer:
         return True
     
     def clear_existing_content(self) -> bool:
-        """Clear ALL existing content from the target page, handling archived blocks properly"""
+        """Delete every top-level block under the target page, concurrently and resumably
+
+        Deleting a block archives its whole subtree, so only the parent's
+        direct children are listed and deleted. Blocks already in the trash
+        are skipped, and deleted ids are checkpointed so an interrupted
+        teardown resumes where it stopped (and a resumed deployment never
+        clears the pages it already created).
+        """
+        if self.state.content_cleared:
+            logging.info("Existing content already cleared in this deployment, skipping")
+            return True
+
         try:
             parent_id = self.args.parent_id or NOTION_PARENT_PAGEID
             logging.info(f"Clearing existing content from page: {parent_id}")
 
-            # Get ALL blocks including archived ones with pagination
-            all_blocks = []
-            start_cursor = None
-            has_more = True
+            all_blocks = list_all_block_children(parent_id)
+            if all_blocks is None:
+                return False
+
+            done = set(self.state.cleared_blocks)
+            pending = [block['id'] for block in all_blocks
+                       if block.get('id') and block['id'] not in done
+                       and not block.get('archived') and not block.get('in_trash')]
+            skipped = len(all_blocks) - len(pending)
+
+            if pending:
+                workers = getattr(self.args, 'workers', 1) or 1
+                workers = workers if workers > 1 else CLEAR_WORKERS
+                logging.info(f"Clearing {len(pending)} blocks with {workers} workers"
+                             + (f" ({skipped} already archived or cleared)" if skipped else ""))
+
+                cleared = [0]
+                counter_lock = threading.Lock()
+
+                def on_deleted(block_id: str):
+                    self.state.record_cleared(block_id)
+                    with counter_lock:
+                        cleared[0] += 1
+                        count = cleared[0]
+                    if count % 25 == 0:
+                        logging.info(f"Cleared {count}/{len(pending)} blocks")
+                        self.state.save_checkpoint()
+
+                failed_count = delete_blocks(pending, "Clearing existing content", workers, on_deleted)
+                logging.info(f"✅ Cleared {len(pending) - failed_count} blocks, {failed_count} failures")
+            else:
+                logging.info("No existing content to clear")
+                failed_count = 0
 
-            while has_more:
-                url = f"https://api.notion.com/v1/blocks/{parent_id}/children?page_size=100"
-                if start_cursor:
-                    url += f"&start_cursor={start_cursor}"
+            if failed_count == 0:
+                self.state.content_cleared = True
+                self.state.cleared_blocks.clear()
+            self.state.save_checkpoint()
+            return failed_count == 0  # Only return True if all blocks were cleared
 
-                r = req("GET", url)
-                if not expect_ok(r, "Getting existing content"):
-                    return False
+        except Exception as e:
+            logging.error(f"Error clearing existing content: {e}")
+            return False
 
-                response_data = j(r)
-                all_blocks.extend(response_data.get('results', []))
-                has_more = response_data.get('has_more', False)
-                start_cursor = response_data.get('next_cursor')
+    # ------------------------------------------------------------------
+    # Incremental redeploy (manifest diff)
+    # ------------------------------------------------------------------
+
+    def load_manifest(self) -> DeploymentManifest:
+        """Load the manifest for the current deployment root"""
+        path = getattr(self.args, 'manifest', None) or DEPLOY_MANIFEST
+        self.manifest = DeploymentManifest.load(str(path), self.args.parent_id or NOTION_PARENT_PAGEID)
+        self.unchanged_items = set()
+        self.incremental_failures = set()
+        return self.manifest
+
+    def _is_fresh(self, name: str) -> bool:
+        """True if a page/database was created (not carried over from the manifest) in this run"""
+        return name not in getattr(self, 'unchanged_items', set())
+
+    def _page_blocks(self, page: Dict) -> List[Dict]:
+        """Top-level content blocks exactly as create_page sends them"""
+        return build_page_payload(page, self.state).get('children', [])
+
+    def sync_incremental_pages(self, yaml_data: Dict) -> bool:
+        """Reconcile deployed pages with the YAML instead of clearing the workspace
+
+        Unchanged pages are recorded from the manifest with no API calls,
+        changed pages are patched in place, pages that were removed or moved
+        to a new parent are archived. deploy_pages then only creates what is
+        still missing.
+        """
+        manifest = self.manifest
+        pages = {}
+        for page in yaml_data.get('pages', []):
+            pages[page.get('title', 'Untitled')] = page
+
+        # A page must be recreated if its parent changed or its old parent goes away
+        archived = set(manifest.pages) - set(pages)
+        changed = True
+        while changed:
+            changed = False
+            for title, page in pages.items():
+                entry = manifest.pages.get(title)
+                if entry is None or title in archived:
+                    continue
+                parent = page.get('parent') or ''
+                if entry.get('parent', '') != parent or parent in archived:
+                    archived.add(title)
+                    changed = True
+
+        # Archiving a page archives its subtree, so only archive the topmost ones
+        to_archive = [manifest.pages[t]['id'] for t in archived
+                      if manifest.pages[t].get('parent', '') not in archived]
+        if to_archive:
+            logging.info(f"Archiving {len(to_archive)} removed or moved pages")
+            if delete_blocks(to_archive, "Incremental deploy", workers=CLEAR_WORKERS):
+                logging.warning("Some removed pages could not be archived")
+        for title in archived:
+            manifest.pages.pop(title, None)
+
+        updated = 0
+        for title, page in pages.items():
+            entry = manifest.pages.get(title)
+            if entry is None:
+                continue
+            page_id = entry['id']
+            self.state.record_page(title, page_id)
+            self.unchanged_items.add(title)
+
+            meta_hash, content_hash = page_fingerprints(page)
+            if meta_hash != entry.get('meta'):
+                updated += 1
+                payload = build_page_payload(page, self.state)
+                patch = {k: payload[k] for k in ('properties', 'icon', 'cover') if k in payload}
+                r = req("PATCH", f"{NOTION_API_BASE}/pages/{page_id}", data=json.dumps(patch))
+                if not expect_ok(r, f"Updating page '{title}'"):
+                    self.incremental_failures.add(title)
+            if content_hash != entry.get('content'):
+                updated += 1
+                if not self._update_page_content(title, page_id, page, entry.get('blocks')):
+                    self.incremental_failures.add(title)
+
+        logging.info(f"Incremental pages: {len(self.unchanged_items)} kept ({updated} updates), "
+                     f"{len(archived)} archived, {len(set(pages) - self.unchanged_items)} to create")
+        return True
 
-            if not all_blocks:
-                logging.info("No existing content to clear")
-                return True
+    def _update_page_content(self, title: str, page_id: str, page: Dict,
+                             old_hashes: Optional[List[str]]) -> bool:
+        """Replace only the span of top-level blocks that changed since the last deploy"""
+        new_blocks = self._page_blocks(page)
+        new_hashes = [fingerprint(block) for block in new_blocks]
 
-            logging.info(f"Found {len(all_blocks)} existing blocks to clear")
+        listed = list_all_block_children(page_id)
+        if listed is None:
+            return False
+        # Sub-pages and database views live alongside the page's own content
+        content_ids = [b['id'] for b in listed if b.get('type') not in ('child_page', 'child_database')]
 
-            # Process all blocks: unarchive first if needed, then delete
-            deleted_count = 0
-            failed_count = 0
+        if old_hashes is None or len(content_ids) < len(old_hashes):
+            logging.warning(f"Page '{title}' no longer matches the manifest; replacing all of its content")
+            self.unchanged_items.discard(title)
+            if delete_blocks(content_ids, f"Page '{title}'", workers=CLEAR_WORKERS):
+                return False
+            return append_block_children(page_id, new_blocks, f"Page '{title}'")
+
+        old_ids = content_ids[:len(old_hashes)]
+        prefix, suffix = diff_block_span(old_hashes, new_hashes)
+        if prefix == 0 and suffix == len(old_hashes) and old_ids:
+            # Notion can't insert before the first child, so re-send it to anchor the insert
+            suffix -= 1
+        remove = old_ids[prefix:len(old_ids) - suffix]
+        insert = new_blocks[prefix:len(new_blocks) - suffix]
+        anchor = old_ids[prefix - 1] if prefix else (remove[0] if remove else None)
+
+        logging.info(f"Page '{title}': replacing {len(remove)} of {len(old_ids)} blocks with {len(insert)}")
+        if insert and not append_block_children(page_id, insert, f"Page '{title}'", after=anchor):
+            return False
+        return delete_blocks(remove, f"Page '{title}'", workers=CLEAR_WORKERS) == 0
 
-            for block in all_blocks:
-                block_id = block.get('id')
-                if not block_id:
-                    continue
+    def sync_incremental_databases(self, yaml_data: Dict) -> bool:
+        """Record unchanged databases from the manifest and archive removed ones
 
-                try:
-                    # If block is archived, unarchive it first
-                    if block.get('archived'):
-                        logging.debug(f"Unarchiving block {block_id}")
-                        patch_r = req("PATCH", f"https://api.notion.com/v1/blocks/{block_id}",
-                                    json={"archived": False})
-                        if not expect_ok(patch_r, f"Unarchiving block {block_id}"):
-                            logging.warning(f"Failed to unarchive block {block_id}, trying to delete anyway")
-
-                    # Now delete the block
-                    delete_r = req("DELETE", f"https://api.notion.com/v1/blocks/{block_id}")
-                    if expect_ok(delete_r, f"Deleting block {block_id}"):
-                        deleted_count += 1
-                        logging.debug(f"Deleted block {block_id}")
-                    else:
-                        failed_count += 1
-                        logging.warning(f"Failed to delete block {block_id}")
+        Changed databases are recorded too (so relations to them resolve) and
+        their schemas are patched by update_changed_databases once every
+        database exists.
+        """
+        manifest = self.manifest
+        schemas, converted_standalone = self._collect_databases(yaml_data)
+        all_databases = {**schemas, **converted_standalone}
 
-                except Exception as e:
-                    failed_count += 1
-                    logging.warning(f"Error processing block {block_id}: {e}")
+        removed = [name for name in manifest.databases if name not in all_databases]
+        if removed:
+            logging.info(f"Archiving {len(removed)} removed databases")
+            if delete_blocks([manifest.databases[name]['id'] for name in removed], "Incremental deploy",
+                             workers=CLEAR_WORKERS):
+                logging.warning("Some removed databases could not be archived")
+            for name in removed:
+                manifest.databases.pop(name)
 
-            logging.info(f"✅ Cleared {deleted_count} blocks, {failed_count} failures")
-            return failed_count == 0  # Only return True if all blocks were cleared
+        self.changed_databases = {}
+        for db_name, schema in all_databases.items():
+            entry = manifest.databases.get(db_name)
+            if entry is None:
+                continue
+            self.state.record_database(db_name, entry['id'])
+            self.unchanged_items.add(db_name)
+            if fingerprint(schema) != entry.get('hash'):
+                self.changed_databases[db_name] = schema
 
-        except Exception as e:
-            logging.error(f"Error clearing existing content: {e}")
-            return False
+        logging.info(f"Incremental databases: {len(all_databases) - len(self.changed_databases)} unchanged or new, "
+                     f"{len(self.changed_databases)} changed, {len(removed)} archived")
+        return True
+
+    def update_changed_databases(self) -> bool:
+        """PATCH the schema of databases whose definition changed, dropping removed properties"""
+        parent_id = self.args.parent_id or NOTION_PARENT_PAGEID
+        for db_name, schema in getattr(self, 'changed_databases', {}).items():
+            db_id = self.state.created_databases[db_name]
+            payload = build_database_payload(db_name, schema, self.state, parent_id, skip_rollups=True)
+            properties = payload['properties']
+            for old_prop in self.manifest.databases[db_name].get('properties', []):
+                if old_prop not in schema.get('properties', {}) and old_prop not in properties:
+                    properties[old_prop] = None
+            r = req("PATCH", f"{NOTION_API_BASE}/databases/{db_id}",
+                    data=json.dumps({"title": payload['title'], "properties": properties}))
+            if not expect_ok(r, f"Updating database '{db_name}'"):
+                self.incremental_failures.add(db_name)
+        return True
+
+    def record_manifest_pages(self, yaml_data: Dict):
+        """Store fingerprints of every page deployed in this run"""
+        manifest = getattr(self, 'manifest', None)
+        if manifest is None:
+            return
+        incomplete = {e.get('item') for e in self.state.errors if e.get('error') == 'incomplete content'}
+        for page in yaml_data.get('pages', []):
+            title = page.get('title', 'Untitled')
+            page_id = self.state.created_pages.get(title)
+            if not page_id or title in self.incremental_failures:
+                continue
+            meta_hash, content_hash = page_fingerprints(page)
+            entry = manifest.pages.get(title)
+            if entry and entry['id'] == page_id and entry.get('meta') == meta_hash and entry.get('content') == content_hash:
+                continue
+            complete = title not in incomplete
+            manifest.pages[title] = {
+                'id': page_id,
+                'parent': page.get('parent') or '',
+                'meta': meta_hash,
+                'content': content_hash if complete else None,
+                'blocks': [fingerprint(b) for b in self._page_blocks(page)] if complete else None,
+            }
+        manifest.save()
+
+    def record_manifest_databases(self, yaml_data: Dict):
+        """Store fingerprints of every database deployed in this run"""
+        manifest = getattr(self, 'manifest', None)
+        if manifest is None:
+            return
+        schemas, converted_standalone = self._collect_databases(yaml_data)
+        for db_name, schema in {**schemas, **converted_standalone}.items():
+            db_id = self.state.created_databases.get(db_name)
+            if not db_id or db_name in self.incremental_failures:
+                continue
+            manifest.databases[db_name] = {
+                'id': db_id,
+                'hash': fingerprint(schema),
+                'properties': sorted(schema.get('properties', {})),
+            }
+        manifest.save()
 
     def deploy_pages(self, yaml_data: Dict) -> bool:
         """Deploy all pages with proper parent-child ordering (supports multi-level hierarchy)"""
@@ -2409,6 +3320,13 @@ class NotionTemplateDeployer:
             if not CLIInterface.prompt_continue(f"Deploy {len(pages)} pages?"):
                 return False
 
+        # Concurrent mode schedules pages as soon as their parent exists
+        workers = getattr(self.args, 'workers', None) or DEPLOY_WORKERS
+        if workers > 1 and not self.args.interactive:
+            if V41_AVAILABLE:
+                pages = v41.order_pages_by_hierarchy(pages)
+            return self._deploy_pages_concurrent(pages, workers)
+
         # Use v4.1 multi-level hierarchy sorting if available
         if V41_AVAILABLE:
             logging.info("Using v4.1 multi-level hierarchy sorting...")
@@ -2495,15 +3413,86 @@ class NotionTemplateDeployer:
 
         return True
     
-    def deploy_databases(self, yaml_data: Dict) -> bool:
-        """Deploy all databases from both db.schemas and standalone databases formats
-
-        Uses a two-pass system:
-        1. First pass: Create databases without rollup properties
-        2. Second pass: Add rollup properties after all relations are established
+    def _deploy_pages_concurrent(self, pages: List[Dict], workers: int) -> bool:
+        """Create pages across a bounded worker pool, driven by the hierarchy DAG
+
+        A page is submitted as soon as its parent title lands in
+        state.created_pages; root pages and pages whose parent is not part of
+        this deployment are ready immediately. All workers share the global
+        request throttle, so the pool saturates the allowed rate instead of
+        idling between dependent calls.
         """
-        self.state.phase = DeploymentPhase.DATABASES
+        root_id = self.args.parent_id or NOTION_PARENT_PAGEID
+        titles = {page.get('title', 'Untitled') for page in pages}
+
+        # Build parent title -> waiting child indices
+        waiting: Dict[str, List[int]] = {}
+        ready: List[int] = []
+        for idx, page in enumerate(pages):
+            parent = page.get('parent')
+            if parent and parent in titles and parent not in self.state.created_pages:
+                waiting.setdefault(parent, []).append(idx)
+            else:
+                ready.append(idx)
+
+        logging.info(f"Concurrent page deployment: {len(pages)} pages, {workers} workers, "
+                     f"{len(ready)} initially ready")
+
+        completed = 0
+        failed = False
+        in_flight = {}
+
+        def submit(executor, idx):
+            page = pages[idx]
+            parent_id = None if page.get('parent') else root_id
+            in_flight[executor.submit(create_page, page, self.state, parent_id)] = idx
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="deploy-page") as executor:
+            while ready or in_flight or waiting:
+                while ready and not failed:
+                    submit(executor, ready.pop(0))
 
+                if not in_flight:
+                    if failed or not waiting:
+                        break
+                    # Remaining pages wait on parents that will never be created
+                    # (cycles); deploy them anyway so create_page falls back to root
+                    for parent, children in waiting.items():
+                        logging.warning(f"Parent '{parent}' unresolved, releasing {len(children)} pages")
+                        ready.extend(children)
+                    waiting.clear()
+                    continue
+
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx = in_flight.pop(future)
+                    title = pages[idx].get('title', 'Untitled')
+                    completed += 1
+                    try:
+                        page_id = future.result()
+                    except Exception as e:
+                        logging.error(f"Worker failed creating page '{title}': {e}")
+                        self.state.errors.append({"phase": "pages", "item": title, "error": str(e)})
+                        page_id = None
+
+                    self.progress.update(DeploymentPhase.PAGES,
+                                         f"Created page {completed}/{len(pages)}: {title}")
+
+                    if not page_id:
+                        logging.error(f"Failed to create page '{title}'")
+                        failed = True
+                        continue
+
+                    ready.extend(waiting.pop(title, []))
+
+                    if completed % 10 == 0:  # Save checkpoint every 10 pages
+                        self.state.save_checkpoint()
+
+        self.state.save_checkpoint()
+        return not failed
+
+    def _collect_databases(self, yaml_data: Dict) -> Tuple[Dict, Dict]:
+        """Return (db.schemas, converted standalone databases), moving standalone seed rows into db.seed_rows"""
         # Get databases from db.schemas format
         schemas = yaml_data.get('db', {}).get('schemas', {})
 
@@ -2524,6 +3513,19 @@ class NotionTemplateDeployer:
                     yaml_data['db']['seed_rows'] = {}
                 yaml_data['db']['seed_rows'][db_name] = converted['seed_rows']
 
+        return schemas, converted_standalone
+
+    def deploy_databases(self, yaml_data: Dict) -> bool:
+        """Deploy all databases from both db.schemas and standalone databases formats
+
+        Uses a two-pass system:
+        1. First pass: Create databases without rollup properties
+        2. Second pass: Add rollup properties after all relations are established
+        """
+        self.state.phase = DeploymentPhase.DATABASES
+
+        schemas, converted_standalone = self._collect_databases(yaml_data)
+
         # Combine both types of databases
         all_databases = {**schemas, **converted_standalone}
 
@@ -2564,15 +3566,18 @@ class NotionTemplateDeployer:
         self.state.phase = DeploymentPhase.RELATIONS
         self.progress.update(DeploymentPhase.RELATIONS, "Configuring relations")
 
-        # Note: Relations are already created during database creation
-        # The relation properties were included in the first pass
-        # Now we need to add the rollup properties that depend on them
+        # Relations were created with their databases unless the target database
+        # came later; add those now, before the rollups that depend on them
+        if not add_deferred_relations(self.state):
+            logging.warning("Some relation properties could not be added")
 
         logging.info("Adding rollup properties to databases...")
         self.progress.update(DeploymentPhase.RELATIONS, "Adding rollup properties")
 
         # SECOND PASS: Add rollup properties now that all databases and relations exist
         rollup_success = add_rollup_properties(self.state)
+        # Only rollups that failed are kept for --resume (v4.1 leaves them all pending on success)
+        self.state.settle_pending('rollups', {} if rollup_success else self.state.pending_rollups)
 
         if not rollup_success:
             logging.warning("Some rollup properties could not be added")
@@ -2585,26 +3590,74 @@ class NotionTemplateDeployer:
         self.state.save_checkpoint()
         return True
     
-    def import_data(self, csv_data: Dict[str, List[Dict]]) -> bool:
-        """Import CSV data into databases"""
+    def _collect_import_rows(self, yaml_data: Dict, csv_data: Dict[str, List[Dict]]) -> Dict[str, Tuple[Dict, List[Dict]]]:
+        """Group seed rows (schema, db.seed_rows and standalone) and CSV rows by database
+
+        CSV files are matched to databases by file name, ignoring case and
+        treating underscores as spaces (Bucket_List.csv -> "Bucket List").
+        """
+        schemas, converted_standalone = self._collect_databases(yaml_data)
+        all_databases = {**schemas, **converted_standalone}
+        seed_rows = yaml_data.get('db', {}).get('seed_rows', {})
+
+        imports = {}
+        for db_name, schema in all_databases.items():
+            rows = list(schema.get('seed_rows') or []) + list(seed_rows.get(db_name) or [])
+            if rows:
+                imports[db_name] = (schema, rows)
+
+        by_normalized_name = {name.lower().replace('_', ' '): name for name in all_databases}
+        for csv_name, rows in csv_data.items():
+            db_name = by_normalized_name.get(csv_name.lower().replace('_', ' '))
+            if db_name is None:
+                logging.warning(f"No database matches CSV '{csv_name}', skipping {len(rows)} rows")
+                continue
+            schema, existing = imports.get(db_name, (all_databases[db_name], []))
+            imports[db_name] = (schema, existing + rows)
+
+        return imports
+
+    def import_data(self, csv_data: Dict[str, List[Dict]], yaml_data: Optional[Dict] = None) -> bool:
+        """Seed databases with YAML seed rows and CSV data
+
+        Databases are imported one after another, each with rows created
+        concurrently by import_database_rows. A database is marked processed
+        only once all of its rows exist, so --resume retries partial imports
+        without duplicating rows.
+        """
         self.state.phase = DeploymentPhase.DATA
+        imports = self._collect_import_rows(yaml_data or {}, csv_data)
         
         if self.args.interactive:
-            if not CLIInterface.prompt_continue(f"Import data for {len(csv_data)} databases?"):
+            if not CLIInterface.prompt_continue(f"Import data for {len(imports)} databases?"):
                 return False
         
-        for db_name, rows in csv_data.items():
+        total_failed = 0
+        for db_name, (schema, rows) in imports.items():
             if db_name in self.state.processed_csv:
                 continue
-                
+
+            database_id = self.state.created_databases.get(db_name)
+            if not database_id:
+                logging.warning(f"Database '{db_name}' was not created, skipping {len(rows)} rows")
+                continue
+
             self.progress.update(DeploymentPhase.DATA, f"Importing: {db_name} ({len(rows)} rows)")
-            
-            # TODO: Implement CSV import logic
-            # This requires creating pages in the database with CSV data
-            
+            created, skipped, failed = import_database_rows(db_name, database_id, schema, rows, self.state)
+            logging.info(f"Imported '{db_name}': {created} created, {skipped} skipped, {failed} failed")
+
+            if failed:
+                total_failed += failed
+                continue
+
             self.state.processed_csv.append(db_name)
             self.state.save_checkpoint()
         
+        if total_failed:
+            logging.error(f"{total_failed} rows failed to import; run with --resume to retry them")
+            if self.args.interactive:
+                return CLIInterface.prompt_continue("Some rows failed to import. Continue?")
+            return False
         return True
     
     def deploy_page_content(self, yaml_data: Dict) -> bool:
@@ -2619,7 +3672,7 @@ class NotionTemplateDeployer:
             logging.info("Deploying additional page content...")
 
             # Add letters content to Letters page if it exists
-            if "Letters" in self.state.created_pages:
+            if "Letters" in self.state.created_pages and self._is_fresh("Letters"):
                 letters_page_id = self.state.created_pages["Letters"]
                 letters = yaml_data.get("letters", [])
                 if letters:
@@ -2637,7 +3690,8 @@ class NotionTemplateDeployer:
             }
 
             for db_name, page_title in database_page_mappings.items():
-                if db_name in self.state.created_databases and page_title in self.state.created_pages:
+                if (db_name in self.state.created_databases and page_title in self.state.created_pages
+                        and (self._is_fresh(db_name) or self._is_fresh(page_title))):
                     database_id = self.state.created_databases[db_name]
                     page_id = self.state.created_pages[page_title]
                     logging.info(f"Linking database '{db_name}' to page '{page_title}'")
@@ -2648,7 +3702,8 @@ class NotionTemplateDeployer:
                 db_title = db_data.get("title", "")
                 parent_page = db_data.get("parent", "")
 
-                if db_title in self.state.created_databases and parent_page in self.state.created_pages:
+                if (db_title in self.state.created_databases and parent_page in self.state.created_pages
+                        and (self._is_fresh(db_title) or self._is_fresh(parent_page))):
                     database_id = self.state.created_databases[db_title]
                     page_id = self.state.created_pages[parent_page]
                     logging.info(f"Linking standalone database '{db_title}' to page '{parent_page}'")
@@ -2709,7 +3764,8 @@ class NotionTemplateDeployer:
             except Exception as e:
                 logging.error(f"Verification failed: {e}")
 
-        time.sleep(1)  # Give progress bar time to complete
+        if not get_planner().enabled:
+            time.sleep(1)  # Give progress bar time to complete
     
     def print_summary(self):
         """Print deployment summary"""
@@ -2723,6 +3779,13 @@ class NotionTemplateDeployer:
         print(f"📄 Pages created: {len(self.state.created_pages)}")
         print(f"🗄️  Databases created: {len(self.state.created_databases)}")
         print(f"📊 Data imported: {len(self.state.processed_csv)} datasets")
+
+        profiler = get_profiler()
+        if profiler.enabled:
+            print("\n⏱️  Time by phase:")
+            for name, entry in profiler.report()['phases'].items():
+                print(f"  - {name}: {entry['wall_time_s']:.1f}s, {entry.get('requests', 0)} requests"
+                      f" (p95 {entry.get('latency_s', {}).get('p95', 0):.2f}s, {entry.get('status_429', 0)} rate limited)")
         
         if self.state.errors:
             print(f"\n⚠️  Errors encountered: {len(self.state.errors)}")
@@ -3184,7 +4247,7 @@ class NotionTemplateDeployer:
             if test_page_id:
                 try:
                     print("\n🧹 Cleaning up test workspace...")
-                    req("DELETE", f"https://api.notion.com/v1/blocks/{test_page_id}")
+                    req("DELETE", f"{NOTION_API_BASE}/blocks/{test_page_id}")
                     print("✅ Test workspace deleted")
                 except:
                     print(f"⚠️  Could not delete test workspace {test_page_id[:8]}... - please delete manually")
@@ -3335,9 +4398,32 @@ def main():
     if args.parent_id:
         os.environ['NOTION_PARENT_PAGEID'] = args.parent_id
     
+    profiler = get_profiler()
+    if args.profile:
+        profiler.enable()
+    cprof = None
+    if args.cprofile:
+        import cProfile
+        cprof = cProfile.Profile()
+        cprof.enable()
+
     # Run deployment
-    deployer = NotionTemplateDeployer(args)
-    success = deployer.run()
+    try:
+        deployer = NotionTemplateDeployer(args)
+        if args.plan:
+            # The planner stands in for req(); the async client is never planned
+            success = deployer.run_plan()
+        elif args.use_async:
+            success = asyncio.run(deployer.run_async())
+        else:
+            success = deployer.run()
+    finally:
+        if cprof:
+            cprof.disable()
+            cprof.dump_stats(str(args.cprofile))
+            logging.info(f"cProfile stats written to {args.cprofile}")
+        if args.profile:
+            profiler.write_report(args.profile)
     
     sys.exit(0 if success else 1)
 
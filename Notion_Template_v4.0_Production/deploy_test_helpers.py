@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures for the deploy tests
+A deployer builder that skips logging setup and an in-process Notion transport
+"""
+
+import sys
+import json
+import argparse
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Add the parent directory to sys.path to import deploy module
+sys.path.insert(0, str(Path(__file__).parent))
+
+import deploy
+from modules.mock_notion import MockNotionServer
+
+DEFAULT_ARGS = dict(interactive=False, parent_id='root-page', workers=4, phase=None,
+                    skip_phases=None, manifest=None, incremental=False)
+
+
+def make_deployer(checkpoint_file: Optional[str] = None, args: Optional[argparse.Namespace] = None,
+                  **arg_values) -> 'deploy.NotionTemplateDeployer':
+    """Build a deployer without touching logging setup
+
+    ``args`` defaults to DEFAULT_ARGS updated with ``arg_values``; pass
+    parsed CLI arguments instead to exercise the parser.
+    """
+    deployer = deploy.NotionTemplateDeployer.__new__(deploy.NotionTemplateDeployer)
+    deployer.args = args or argparse.Namespace(**dict(DEFAULT_ARGS, **arg_values))
+    deployer.state = deploy.DeploymentState(checkpoint_file=checkpoint_file) if checkpoint_file \
+        else deploy.DeploymentState()
+    deployer.validator = deploy.Validator()
+    deployer.progress = deploy.ProgressTracker(100)
+    deployer.manifest = None
+    deployer.unchanged_items = set()
+    deployer.incremental_failures = set()
+    return deployer
+
+
+class FakeResponse:
+    """Just enough of requests.Response for deploy.req callers"""
+
+    def __init__(self, status_code: int = 200, body: Any = None, headers: Optional[Dict[str, str]] = None):
+        self.status_code = status_code
+        self.body = {} if body is None else body
+        self.headers = headers or {}
+        self.text = json.dumps(self.body)
+
+    def json(self):
+        return self.body
+
+
+class FakeNotion:
+    """Drop-in for deploy.req backed by an in-process MockNotionServer
+
+    Requests go straight to MockNotionServer.handle, so tests get Notion's
+    limits, pagination and archive semantics without a socket. Every call
+    is logged in ``calls`` as (method, path) with the /v1/ prefix and query
+    stripped. Override ``handle`` to inject failures or edit responses.
+    """
+
+    def __init__(self, root_ids=('root-page',), latency: float = 0.0):
+        self.server = MockNotionServer(latency=latency, root_ids=root_ids)
+        self.server.httpd.server_close()  # served in-process; the listening socket is never used
+        self.calls: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, method: str, url: str, headers: Optional[Dict] = None,
+                 data: Optional[str] = None, files: Optional[Any] = None,
+                 timeout: Optional[int] = None) -> FakeResponse:
+        split = urlsplit(url)
+        path = split.path.split('/v1/', 1)[-1]
+        with self._lock:
+            self.calls.append((method, path))
+        body = json.loads(data) if data else {}
+        return self.handle(method, path + (f"?{split.query}" if split.query else ''), body)
+
+    def handle(self, method: str, path: str, body: Dict) -> FakeResponse:
+        status, result, headers = self.server.handle(method, f"/v1/{path}", json.dumps(body).encode('utf-8'))
+        return FakeResponse(status, result, headers)
+
+    def count(self, method: str, prefix: str = '') -> int:
+        """Number of logged calls with this method whose path starts with prefix"""
+        with self._lock:
+            return sum(1 for m, p in self.calls if m == method and p.startswith(prefix))
+
+    # Seeding and inspection bypass the call log
+
+    def add(self, parent_id: str, *blocks: Dict) -> List[str]:
+        """Append blocks under parent_id; returns their ids"""
+        return [b['id'] for b in self._direct('PATCH', f"blocks/{parent_id}/children",
+                                              {'children': list(blocks)})['results']]
+
+    def add_page(self, title: str, parent_id: str, children: Optional[List[Dict]] = None) -> str:
+        page = self._direct('POST', 'pages', {'parent': {'page_id': parent_id},
+                                              'properties': {'title': {'title': [{'text': {'content': title}}]}},
+                                              'children': children or []})
+        return page['id']
+
+    def add_database(self, title: str, parent_id: str = 'root-page',
+                     properties: Optional[Dict] = None) -> str:
+        database = self._direct('POST', 'databases', {'parent': {'page_id': parent_id},
+                                                      'title': [{'text': {'content': title}}],
+                                                      'properties': properties or {}})
+        return database['id']
+
+    def children(self, parent_id: str) -> List[Dict]:
+        """Live children of a block, all pages of the listing"""
+        with self.server._lock:
+            return [self.server._child_view(c) for c in self.server.children.get(parent_id, [])
+                    if not self.server._record(c)['archived']]
+
+    def texts(self, parent_id: str) -> List[Tuple[str, list]]:
+        """(text, nested texts) for every rich-text child of a block"""
+        result = []
+        for block in self.children(parent_id):
+            rich_text = (block.get(block['type']) or {}).get('rich_text')
+            if rich_text is not None:
+                nested = self.texts(block['id']) if block['has_children'] else []
+                result.append((''.join(t['text']['content'] for t in rich_text), nested))
+        return result
+
+    def rows(self, database_id: str) -> List[Dict]:
+        """Live rows of a database as query results return them"""
+        with self.server._lock:
+            return [self.server._page_view(r) for r in self.server.rows.get(database_id, [])
+                    if not self.server.blocks[r]['archived']]
+
+    def _direct(self, method: str, path: str, body: Dict) -> Dict:
+        status, result, _ = self.server.handle(method, f"/v1/{path}", json.dumps(body).encode('utf-8'))
+        assert status == 200, f"seeding {method} {path} failed: {result}"
+        return result
+
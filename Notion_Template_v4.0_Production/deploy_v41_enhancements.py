@@ -19,9 +19,12 @@ import re
 import json
 import time
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from collections import defaultdict, deque
 
+from modules.rate_limiter import get_rate_limiter
+from modules.async_notion_api import NOTION_API_BASE
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -314,13 +317,16 @@ def resolve_multi_level_parents(pages: List[Dict[str, Any]], state: Any) -> None
 # ENHANCED ROLLUP HANDLING
 # ============================================================================
 
-def add_rollup_properties_with_retry(state: Any, max_retries: int = 3) -> bool:
+def add_rollup_properties_with_retry(state: Any, max_retries: int = 3,
+                                     request_fn: Optional[Callable] = None) -> bool:
     """
     Add rollup properties with retry logic for failed attempts.
 
     Args:
         state: DeploymentState object with pending_rollups
         max_retries: Maximum number of retry attempts
+        request_fn: Optional ``req(method, url, data=...)`` callable used to PATCH
+            each database; rate limiting is shared through modules.rate_limiter
 
     Returns:
         True if all rollups were successfully added
@@ -366,8 +372,12 @@ def add_rollup_properties_with_retry(state: Any, max_retries: int = 3) -> bool:
                     }
 
                     # Update database with rollup property
-                    # This would need to call the actual Notion API
-                    # For now, we'll simulate success
+                    if request_fn is not None:
+                        r = request_fn("PATCH", f"{NOTION_API_BASE}/databases/{db_id}",
+                                       data=json.dumps({"properties": rollup_property}))
+                        if r is None or r.status_code not in (200, 201):
+                            status = r.status_code if r is not None else 'no response'
+                            raise RuntimeError(f"Notion API returned {status}")
                     logging.info(f"✅ Added rollup '{prop_name}' to database '{db_name}'")
                     successful_count += 1
 
@@ -386,7 +396,8 @@ def add_rollup_properties_with_retry(state: Any, max_retries: int = 3) -> bool:
         state.pending_rollups = failed_rollups
 
         if attempt < max_retries - 1:
-            wait_time = 2 ** attempt  # Exponential backoff
+            # Exponential backoff, never shorter than an active 429 pause
+            wait_time = max(2 ** attempt, get_rate_limiter().global_bucket.delay())
             logging.info(f"Waiting {wait_time} seconds before retry...")
             time.sleep(wait_time)
 
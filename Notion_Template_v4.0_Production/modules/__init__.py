@@ -6,6 +6,14 @@ Refactored modules for better maintainability and organization
 from .config import initialize_config, load_config, validate_config
 from .auth import validate_token, validate_token_with_api
 from .notion_api import req, expect_ok, j, throttle, create_session
+from .rate_limiter import TokenBucket, NotionRateLimiter, get_rate_limiter, configure_rate_limiter
+from .async_notion_api import AsyncNotionClient, NotionResponse, AIOHTTP_AVAILABLE
+from .manifest import DeploymentManifest, fingerprint
+from .checkpoint_journal import CheckpointJournal
+from .profiler import DeploymentProfiler, get_profiler, profiled
+from .planner import DeploymentPlanner, get_planner
+from .mock_notion import MockNotionServer
+from .block_compiler import compile_block, rich_text, text_item, text_block
 from .validation import sanitize_input, check_role_permission, filter_content_by_role
 from .database import create_database_entry, update_rollup_properties, complete_database_relationships
 
@@ -14,6 +22,14 @@ __all__ = [
     "initialize_config", "load_config", "validate_config",
     "validate_token", "validate_token_with_api", 
     "req", "expect_ok", "j", "throttle", "create_session",
+    "TokenBucket", "NotionRateLimiter", "get_rate_limiter", "configure_rate_limiter",
+    "AsyncNotionClient", "NotionResponse", "AIOHTTP_AVAILABLE",
+    "DeploymentManifest", "fingerprint",
+    "CheckpointJournal",
+    "DeploymentProfiler", "get_profiler", "profiled",
+    "DeploymentPlanner", "get_planner",
+    "MockNotionServer",
+    "compile_block", "rich_text", "text_item", "text_block",
     "sanitize_input", "check_role_permission", "filter_content_by_role",
     "create_database_entry", "update_rollup_properties", "complete_database_relationships"
 ]
\ No newline at end of file
@@ -0,0 +1,186 @@
+"""
+Async Notion API Client Module
+aiohttp-based client with the same retry/429 semantics as deploy.req
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .rate_limiter import NotionRateLimiter, get_rate_limiter, parse_retry_after
+from .profiler import get_profiler
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+NOTION_API_BASE = os.getenv("NOTION_API_BASE", "https://api.notion.com/v1").rstrip("/")
+RETRYABLE_STATUSES = (500, 502, 503, 504)
+
+
+@dataclass
+class NotionResponse:
+    """Minimal response object mirroring the parts of requests.Response deploy.py uses"""
+    status_code: int
+    data: Dict[str, Any] = field(default_factory=dict)
+    headers: Dict[str, str] = field(default_factory=dict)
+    text: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code in (200, 201)
+
+    def json(self) -> Dict[str, Any]:
+        return self.data
+
+
+class AsyncNotionClient:
+    """Async Notion client sharing the process-wide rate limiter
+
+    Use as an async context manager so the pooled connector is closed:
+
+        async with AsyncNotionClient(token, version) as client:
+            r = await client.create_page(payload)
+    """
+
+    def __init__(self, token: str, notion_version: str, base_url: str = NOTION_API_BASE,
+                 timeout: Optional[float] = None, max_retries: Optional[int] = None,
+                 backoff_base: Optional[float] = None, limit_per_host: int = 10,
+                 limiter: Optional[NotionRateLimiter] = None):
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is required for AsyncNotionClient (pip install aiohttp)")
+        self.token = token
+        self.notion_version = notion_version
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout or float(os.getenv("NOTION_TIMEOUT", "25"))
+        self.max_retries = max_retries or int(os.getenv("RETRY_MAX", "5"))
+        self.backoff_base = backoff_base or float(os.getenv("RETRY_BACKOFF_BASE", "1.5"))
+        self.limit_per_host = limit_per_host
+        self.limiter = limiter or get_rate_limiter()
+        self._session: Optional["aiohttp.ClientSession"] = None
+
+    async def __aenter__(self) -> "AsyncNotionClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit_per_host * 2,
+                                             limit_per_host=self.limit_per_host,
+                                             keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={
+                    "Authorization": f"Bearer {self.token}",
+                    "Notion-Version": self.notion_version,
+                    "Content-Type": "application/json",
+                },
+            )
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _url(self, path_or_url: str) -> str:
+        if path_or_url.startswith("http"):
+            return path_or_url
+        return f"{self.base_url}/{path_or_url.lstrip('/')}"
+
+    async def request(self, method: str, path_or_url: str,
+                      payload: Optional[Dict[str, Any]] = None) -> NotionResponse:
+        """Send a request with rate limiting, 429 backoff and 5xx/connection retries"""
+        await self.open()
+        url = self._url(path_or_url)
+        body = json.dumps(payload) if payload is not None else None
+        response = None
+        profiler = get_profiler()
+        bytes_sent = len(body.encode('utf-8')) if body else 0
+
+        for attempt in range(self.max_retries):
+            waited = await self.limiter.acquire_async(method, url)
+            profiler.record_sleep(method, url, waited)
+            started = time.perf_counter()
+            try:
+                async with self._session.request(method, url, data=body) as r:
+                    text = await r.text()
+                    try:
+                        data = json.loads(text) if text else {}
+                    except json.JSONDecodeError:
+                        logger.error(f"Failed to parse JSON: {text[:500]}")
+                        data = {}
+                    response = NotionResponse(r.status, data, dict(r.headers), text)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                profiler.record_request(method, url, None, time.perf_counter() - started, bytes_sent)
+                if attempt == self.max_retries - 1:
+                    raise
+                logger.warning(f"Connection error on {method} {url}: {e}, retrying...")
+                profiler.record_retry(method, url)
+                profiler.record_sleep(method, url, self.backoff_base ** attempt)
+                await asyncio.sleep(self.backoff_base ** attempt)
+                continue
+            profiler.record_request(method, url, response.status_code, time.perf_counter() - started, bytes_sent)
+
+            if response.status_code == 429:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                logger.warning(f"Rate limited, waiting {retry_after}s")
+                self.limiter.on_rate_limited(retry_after)
+                profiler.record_retry(method, url)
+                continue
+
+            if response.status_code in RETRYABLE_STATUSES and attempt < self.max_retries - 1:
+                wait_time = self.backoff_base ** attempt
+                logger.warning(f"Server error {response.status_code}, retrying in {wait_time}s")
+                profiler.record_retry(method, url)
+                profiler.record_sleep(method, url, wait_time)
+                await asyncio.sleep(wait_time)
+                continue
+
+            self.limiter.on_success()
+            return response
+
+        logger.error(f"Failed to get response after {self.max_retries} attempts for {url}")
+        return response
+
+    # ------------------------------------------------------------------
+    # Endpoint helpers
+    # ------------------------------------------------------------------
+
+    async def create_page(self, payload: Dict[str, Any]) -> NotionResponse:
+        return await self.request("POST", "pages", payload)
+
+    async def append_block_children(self, block_id: str, children: List[Dict[str, Any]]) -> NotionResponse:
+        return await self.request("PATCH", f"blocks/{block_id}/children", {"children": children})
+
+    async def list_block_children(self, block_id: str, start_cursor: Optional[str] = None,
+                                  page_size: int = 100) -> NotionResponse:
+        path = f"blocks/{block_id}/children?page_size={page_size}"
+        if start_cursor:
+            path += f"&start_cursor={start_cursor}"
+        return await self.request("GET", path)
+
+    async def delete_block(self, block_id: str) -> NotionResponse:
+        return await self.request("DELETE", f"blocks/{block_id}")
+
+    async def create_database(self, payload: Dict[str, Any]) -> NotionResponse:
+        return await self.request("POST", "databases", payload)
+
+    async def update_database(self, database_id: str, payload: Dict[str, Any]) -> NotionResponse:
+        return await self.request("PATCH", f"databases/{database_id}", payload)
+
+    async def query_database(self, database_id: str,
+                             payload: Optional[Dict[str, Any]] = None) -> NotionResponse:
+        return await self.request("POST", f"databases/{database_id}/query", payload or {})
@@ -0,0 +1,106 @@
+"""
+Checkpoint Journal Module
+Append-only JSON-lines checkpoint file: one snapshot record followed by
+one record per change, replayed on resume
+"""
+
+import os
+import json
+import logging
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_VERSION = 1
+
+
+class CheckpointJournal:
+    """Checkpoint file that grows by appends instead of full rewrites
+
+    The first line is a snapshot of the whole state; every later line is
+    one change. append() only buffers a record, flush() writes everything
+    buffered with a single write and fsync, and compact() atomically
+    replaces the file with a fresh snapshot once enough records pile up.
+    Not thread-safe on its own; the owner serializes calls.
+    """
+
+    def __init__(self, path: str, compact_every: int = 1000, fsync: bool = True):
+        self.path = path
+        self.compact_every = max(1, compact_every)
+        self.fsync = fsync
+        self.pending: List[str] = []
+        # Records on disk after the snapshot; None until a snapshot is written or loaded
+        self.records: Optional[int] = None
+
+    def append(self, record: Dict[str, Any]):
+        self.pending.append(json.dumps(record, ensure_ascii=False, default=str))
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self.records is None or self.records + len(self.pending) >= self.compact_every
+
+    def flush(self) -> int:
+        """Append buffered records to the file; returns how many were written"""
+        if not self.pending:
+            return 0
+        lines, self.pending = self.pending, []
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self.records = (self.records or 0) + len(lines)
+        return len(lines)
+
+    def compact(self, snapshot: Dict[str, Any]):
+        """Atomically replace the file with a single snapshot record"""
+        record = {'op': 'snapshot', 'version': JOURNAL_VERSION, 'state': snapshot}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.checkpoint-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.pending.clear()
+        self.records = 0
+
+    @staticmethod
+    def read(path: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]], bool]:
+        """Return (snapshot state, change records, clean)
+
+        snapshot is None if the file is not a journal (e.g. an older pickle
+        checkpoint). Replay stops at the first unreadable line - the torn
+        tail of an append interrupted by a crash - and clean is then False.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        if not data.startswith(b'{'):
+            return None, [], True
+
+        lines = data.split(b'\n')
+        try:
+            head = json.loads(lines[0])
+        except ValueError:
+            return None, [], True
+        if head.get('op') != 'snapshot' or head.get('version') != JOURNAL_VERSION:
+            return None, [], True
+
+        records = []
+        for number, line in enumerate(lines[1:], start=2):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logger.warning(f"Checkpoint {path}: ignoring unreadable record at line {number} and after")
+                return head['state'], records, False
+        # A record missing its newline would merge with the next append
+        return head['state'], records, data.endswith(b'\n')
@@ -0,0 +1,108 @@
+"""
+Deployment Manifest Module
+Fingerprints of deployed pages/databases for incremental redeploys
+"""
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# Page definition keys that map to page properties rather than content blocks
+PAGE_META_KEYS = ('title', 'parent', 'icon', 'icon_file', 'cover', 'cover_file', 'properties')
+
+
+def fingerprint(data: Any) -> str:
+    """Stable SHA-256 of any JSON-serialisable structure"""
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def page_fingerprints(page_data: Dict) -> Tuple[str, str]:
+    """(meta, content) fingerprints of an already-substituted page definition"""
+    meta = {k: page_data.get(k) for k in PAGE_META_KEYS if k in page_data}
+    content = {k: v for k, v in page_data.items() if k not in PAGE_META_KEYS}
+    return fingerprint(meta), fingerprint(content)
+
+
+def diff_block_span(old: List[str], new: List[str]) -> Tuple[int, int]:
+    """Length of the common prefix and suffix of two block fingerprint lists
+
+    Everything between them is the changed span: old[p:len(old)-s] is
+    replaced by new[p:len(new)-s].
+    """
+    limit = min(len(old), len(new))
+    prefix = 0
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    return prefix, suffix
+
+
+class DeploymentManifest:
+    """Persistent map of page titles / database names to Notion IDs and fingerprints
+
+    Stored as JSON next to the checkpoint. Entries only describe what was
+    deployed under `root_id`; a manifest for a different root is ignored.
+    """
+
+    def __init__(self, path: str, root_id: str = ""):
+        self.path = path
+        self.root_id = root_id
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.databases: Dict[str, Dict[str, Any]] = {}
+        self.updated_at: Optional[str] = None
+
+    @classmethod
+    def load(cls, path: str, root_id: str) -> 'DeploymentManifest':
+        manifest = cls(path, root_id)
+        if not os.path.exists(path):
+            return manifest
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable manifest {path}: {e}")
+            return manifest
+        if data.get('version') != MANIFEST_VERSION or data.get('root_id') != root_id:
+            logger.info(f"Manifest {path} belongs to a different deployment root; starting fresh")
+            return manifest
+        manifest.pages = data.get('pages', {})
+        manifest.databases = data.get('databases', {})
+        manifest.updated_at = data.get('updated_at')
+        return manifest
+
+    def save(self):
+        """Atomically write the manifest"""
+        self.updated_at = datetime.now().isoformat()
+        data = {
+            'version': MANIFEST_VERSION,
+            'root_id': self.root_id,
+            'updated_at': self.updated_at,
+            'pages': self.pages,
+            'databases': self.databases,
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.manifest-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        logger.debug(f"Saved manifest with {len(self.pages)} pages and {len(self.databases)} databases")
+
+    def clear(self):
+        self.pages.clear()
+        self.databases.clear()
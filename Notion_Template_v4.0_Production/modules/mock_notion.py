@@ -0,0 +1,452 @@
+"""
+Mock Notion API Module
+Local stand-in for the Notion REST API used by deploy benchmarks and load tests
+"""
+
+import json
+import time
+import random
+import logging
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .profiler import endpoint_key
+from .rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Limits Notion enforces on block appends
+MAX_CHILDREN = 100
+MAX_BLOCKS_PER_REQUEST = 1000
+MAX_PAGE_SIZE = 100
+
+ARCHIVED_MESSAGE = "Can't edit block that is archived. You must unarchive the block before editing."
+
+
+class MockNotionError(Exception):
+    """An error response in Notion's shape"""
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+    def body(self) -> Dict[str, Any]:
+        return {'object': 'error', 'status': self.status, 'code': self.code, 'message': self.message}
+
+
+class MockNotionServer:
+    """In-memory Notion workspace served over HTTP on localhost
+
+    Supports pages, block children (append with ``after``, paginated
+    listing, delete-as-archive), databases (create, update, query) and
+    search. Latency, jitter and 429s are injected per request: ``rps``
+    enforces a token bucket like Notion's average limit (429 with
+    ``Retry-After`` in whole seconds when exceeded) and ``rate_limit_rate``
+    adds random 429s on top. Writes to archived blocks fail with Notion's validation error.
+
+    Usage:
+        with MockNotionServer(latency=0.05, rps=3) as server:
+            os.environ['NOTION_API_BASE'] = server.base_url
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.0, rps: Optional[float] = None, burst: float = 10.0,
+                 rate_limit_rate: float = 0.0, retry_after: int = 1,
+                 root_ids: Iterable[str] = (), seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.bucket = TokenBucket(rps, burst, "mock") if rps else None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.blocks: Dict[str, Dict[str, Any]] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.databases: Dict[str, Dict[str, Any]] = {}
+        self.rows: Dict[str, List[str]] = {}
+        self.reset_stats()
+        for root_id in root_ids:
+            self.add_page(root_id)
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True  # headers and body are separate writes
+
+            def _dispatch(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length) if length else b''
+                status, body, headers = server.handle(self.command, self.path, raw)
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _dispatch
+
+            def log_message(self, format, *args):
+                logger.debug("mock notion: " + format % args)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-notion", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> 'MockNotionServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats: Dict[str, Any] = {
+                'requests': 0, 'rate_limited': 0, 'errors': 0,
+                'blocks_created': 0, 'in_flight': 0, 'peak_in_flight': 0,
+                'by_endpoint': {},
+            }
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats, by_endpoint=dict(self.stats['by_endpoint']))
+            stats['pages'] = sum(1 for b in self.blocks.values() if b['object'] == 'page' and not b['archived'])
+            stats['databases'] = len(self.databases)
+        return stats
+
+    # ------------------------------------------------------------------
+    # Workspace
+    # ------------------------------------------------------------------
+
+    def add_page(self, page_id: Optional[str] = None, parent: Optional[Dict] = None) -> str:
+        """Create a page directly (e.g. the deployment's root page)"""
+        with self._lock:
+            return self._new_block('page', {'type': 'child_page'}, parent or {'type': 'workspace'},
+                                   block_id=page_id)
+
+    def _new_block(self, obj: str, block: Dict, parent: Dict, block_id: Optional[str] = None) -> str:
+        block_id = block_id or str(uuid.uuid4())
+        self.blocks[block_id] = {'object': obj, 'id': block_id, 'parent': parent,
+                                 'archived': False, 'block': block}
+        return block_id
+
+    def _record(self, block_id: str) -> Optional[Dict[str, Any]]:
+        return self.blocks.get(block_id) or self.databases.get(block_id)
+
+    def _get(self, block_id: str, kind: str = 'block') -> Dict[str, Any]:
+        block = self._record(block_id)
+        if block is None:
+            raise MockNotionError(404, 'object_not_found',
+                                  f"Could not find {kind} with ID: {block_id}.")
+        return block
+
+    def _is_archived(self, block_id: str) -> bool:
+        """Archived blocks and everything below them are in the trash"""
+        while block_id:
+            block = self._record(block_id)
+            if block is None:
+                return False
+            if block['archived']:
+                return True
+            parent = block['parent']
+            block_id = parent.get('page_id') or parent.get('block_id') or parent.get('database_id')
+        return False
+
+    def _editable(self, block_id: str, kind: str = 'block') -> Dict[str, Any]:
+        block = self._get(block_id, kind)
+        if self._is_archived(block_id):
+            raise MockNotionError(400, 'validation_error', ARCHIVED_MESSAGE)
+        return block
+
+    @staticmethod
+    def _block_type(block: Dict) -> Optional[str]:
+        return block.get('type') or next((k for k in block if k not in ('object', 'id')), None)
+
+    def _check_limits(self, blocks: List[Dict], depth: int = 0) -> int:
+        """Validate children arrays as Notion does; returns the total block count"""
+        if len(blocks) > MAX_CHILDREN:
+            raise MockNotionError(400, 'validation_error',
+                                  f"body.children.length should be ≤ `{MAX_CHILDREN}`, instead was `{len(blocks)}`.")
+        total = len(blocks)
+        for block in blocks:
+            content = block.get(self._block_type(block)) or {}
+            nested = content.get('children', []) if isinstance(content, dict) else []
+            if nested:
+                if depth >= 2:
+                    raise MockNotionError(400, 'validation_error',
+                                          "body.children should be defined at most two levels deep.")
+                total += self._check_limits(nested, depth + 1)
+        return total
+
+    def _append(self, parent_id: str, blocks: List[Dict], after: Optional[str] = None) -> List[Dict]:
+        created = []
+        for block in blocks:
+            block_type = self._block_type(block)
+            content = block.get(block_type) if block_type else None
+            nested = []
+            if isinstance(content, dict):
+                content = dict(content)
+                nested = content.pop('children', [])
+            block_id = self._new_block('block', {'type': block_type, block_type: content},
+                                       {'type': 'block_id', 'block_id': parent_id})
+            self.stats['blocks_created'] += 1
+            if nested:
+                self._append(block_id, nested)
+            created.append(self._block_view(block_id))
+
+        siblings = self.children.setdefault(parent_id, [])
+        ids = [b['id'] for b in created]
+        if after and after in siblings:
+            index = siblings.index(after) + 1
+            siblings[index:index] = ids
+        else:
+            siblings.extend(ids)
+        return created
+
+    def _block_view(self, block_id: str) -> Dict[str, Any]:
+        block = self.blocks[block_id]
+        view = {'object': 'block', 'id': block_id, 'parent': block['parent'], 'archived': block['archived'],
+                'has_children': any(not self._record(c)['archived'] for c in self.children.get(block_id, ()))}
+        view.update(block['block'])
+        return view
+
+    def _child_view(self, child_id: str) -> Dict[str, Any]:
+        """A child as it appears in a children listing (pages and databases as child blocks)"""
+        if child_id in self.databases:
+            database = self.databases[child_id]
+            return {'object': 'block', 'id': child_id, 'type': 'child_database', 'archived': database['archived'],
+                    'has_children': False, 'child_database': {'title': _plain_text(database['title'])}}
+        block = self.blocks[child_id]
+        if block['object'] == 'page':
+            return {'object': 'block', 'id': child_id, 'type': 'child_page', 'archived': block['archived'],
+                    'has_children': bool(self.children.get(child_id)),
+                    'child_page': {'title': _title_of(block.get('properties', {}))}}
+        return self._block_view(child_id)
+
+    def _page_view(self, page_id: str) -> Dict[str, Any]:
+        page = self.blocks[page_id]
+        # Property values come back tagged with their type, as Notion returns them
+        properties = {name: {'type': next(iter(value)), **value} if isinstance(value, dict) and value else value
+                      for name, value in page.get('properties', {}).items()}
+        return {'object': 'page', 'id': page_id, 'parent': page['parent'], 'archived': page['archived'],
+                'properties': properties, 'url': f"https://www.notion.so/{page_id.replace('-', '')}"}
+
+    @staticmethod
+    def _paginate(items: List[Dict], params: Dict[str, Any]) -> Dict[str, Any]:
+        start = int(params.get('start_cursor') or 0)
+        size = min(int(params.get('page_size') or MAX_PAGE_SIZE), MAX_PAGE_SIZE)
+        page = items[start:start + size]
+        more = start + len(page) < len(items)
+        return {'object': 'list', 'results': page, 'has_more': more,
+                'next_cursor': str(start + len(page)) if more else None}
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+
+    def create_page(self, body: Dict) -> Dict[str, Any]:
+        parent = body.get('parent') or {}
+        children = body.get('children', [])
+        if self._check_limits(children) > MAX_BLOCKS_PER_REQUEST:
+            raise MockNotionError(400, 'validation_error', "Request body contains too many blocks.")
+        if 'database_id' in parent:
+            self._editable(parent['database_id'], 'database')
+        elif 'page_id' in parent:
+            self._editable(parent['page_id'], 'page')
+        else:
+            raise MockNotionError(400, 'validation_error', "body.parent should be defined.")
+
+        parent_id = parent.get('page_id') or parent.get('database_id')
+        page_id = self._new_block('page', {'type': 'child_page', 'child_page': {}},
+                                  {'type': 'database_id' if 'database_id' in parent else 'page_id', **parent})
+        self.blocks[page_id]['properties'] = body.get('properties', {})
+        if 'database_id' in parent:
+            self.rows.setdefault(parent_id, []).append(page_id)
+        else:
+            self.children.setdefault(parent_id, []).append(page_id)
+        self._append(page_id, children)
+        return self._page_view(page_id)
+
+    def update_page(self, page_id: str, body: Dict) -> Dict[str, Any]:
+        page = self._get(page_id, 'page')
+        if body.get('archived') is False or body.get('in_trash') is False:
+            page['archived'] = False
+        elif self._is_archived(page_id):
+            raise MockNotionError(400, 'validation_error', ARCHIVED_MESSAGE)
+        page.setdefault('properties', {}).update(body.get('properties', {}))
+        if body.get('archived') or body.get('in_trash'):
+            page['archived'] = True
+        return self._page_view(page_id)
+
+    def append_children(self, block_id: str, body: Dict) -> Dict[str, Any]:
+        self._editable(block_id)
+        children = body.get('children', [])
+        if self._check_limits(children) > MAX_BLOCKS_PER_REQUEST:
+            raise MockNotionError(400, 'validation_error', "Request body contains too many blocks.")
+        created = self._append(block_id, children, body.get('after'))
+        return {'object': 'list', 'results': created, 'has_more': False, 'next_cursor': None}
+
+    def list_children(self, block_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        self._get(block_id)
+        live = [self._child_view(c) for c in self.children.get(block_id, []) if not self._record(c)['archived']]
+        return self._paginate(live, params)
+
+    def delete_block(self, block_id: str) -> Dict[str, Any]:
+        block = self._editable(block_id)
+        block['archived'] = True
+        return self._child_view(block_id)
+
+    def create_database(self, body: Dict) -> Dict[str, Any]:
+        parent = body.get('parent') or {}
+        self._editable(parent.get('page_id', ''), 'page')
+        for name, prop in (body.get('properties') or {}).items():
+            relation = prop.get('relation') if isinstance(prop, dict) else None
+            if relation and relation.get('database_id') not in self.databases:
+                raise MockNotionError(400, 'validation_error',
+                                      f"Relation property {name} references an unknown database.")
+        database_id = str(uuid.uuid4())
+        self.databases[database_id] = {'object': 'database', 'id': database_id, 'parent': parent,
+                                       'archived': False, 'title': body.get('title', []),
+                                       'properties': dict(body.get('properties') or {})}
+        self.children.setdefault(parent['page_id'], []).append(database_id)
+        return self._database_view(database_id)
+
+    def update_database(self, database_id: str, body: Dict) -> Dict[str, Any]:
+        database = self._editable(database_id, 'database')
+        database['properties'].update(body.get('properties') or {})
+        if 'title' in body:
+            database['title'] = body['title']
+        return self._database_view(database_id)
+
+    def query_database(self, database_id: str, body: Dict) -> Dict[str, Any]:
+        self._get(database_id, 'database')
+        rows = [self._page_view(r) for r in self.rows.get(database_id, []) if not self.blocks[r]['archived']]
+        return self._paginate(rows, body)
+
+    def _database_view(self, database_id: str) -> Dict[str, Any]:
+        database = self.databases[database_id]
+        return {k: database[k] for k in ('object', 'id', 'parent', 'archived', 'title', 'properties')}
+
+    def route(self, method: str, parts: List[str], params: Dict[str, Any], body: Dict) -> Dict[str, Any]:
+        """Dispatch /v1/<parts> to an endpoint"""
+        resource = parts[0] if parts else ''
+        if resource == 'pages' and len(parts) == 1 and method == 'POST':
+            return self.create_page(body)
+        if resource == 'pages' and len(parts) == 2:
+            if method == 'GET':
+                self._get(parts[1], 'page')
+                return self._page_view(parts[1])
+            if method == 'PATCH':
+                return self.update_page(parts[1], body)
+        if resource == 'blocks' and len(parts) == 3 and parts[2] == 'children':
+            if method == 'PATCH':
+                return self.append_children(parts[1], body)
+            if method == 'GET':
+                return self.list_children(parts[1], params)
+        if resource == 'blocks' and len(parts) == 2:
+            if method == 'DELETE':
+                return self.delete_block(parts[1])
+            if method == 'GET':
+                self._get(parts[1])
+                return self._child_view(parts[1])
+        if resource == 'databases' and len(parts) == 1 and method == 'POST':
+            return self.create_database(body)
+        if resource == 'databases' and len(parts) == 2:
+            if method == 'PATCH':
+                return self.update_database(parts[1], body)
+            if method == 'GET':
+                self._get(parts[1], 'database')
+                return self._database_view(parts[1])
+        if resource == 'databases' and len(parts) == 3 and parts[2] == 'query' and method == 'POST':
+            return self.query_database(parts[1], body)
+        if resource == 'search' and method == 'POST':
+            return {'object': 'list', 'results': [], 'has_more': False, 'next_cursor': None}
+        raise MockNotionError(400, 'invalid_request_url', f"Invalid request URL: {method} /{'/'.join(parts)}")
+
+    def handle(self, method: str, path: str, raw: bytes) -> Tuple[int, Dict, Dict[str, str]]:
+        """Serve one request: (status, body, extra headers)"""
+        url = urlsplit(path)
+        key = endpoint_key(method, url.path)
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['by_endpoint'][key] = self.stats['by_endpoint'].get(key, 0) + 1
+            self.stats['in_flight'] += 1
+            self.stats['peak_in_flight'] = max(self.stats['peak_in_flight'], self.stats['in_flight'])
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            inject_429 = self.rate_limit_rate and self._random.random() < self.rate_limit_rate
+        try:
+            if delay > 0:
+                time.sleep(delay)
+            limited = inject_429
+            if not limited and self.bucket is not None and self.bucket.reserve() > 0:
+                self.bucket.reserve(-1.0)  # a rejected request doesn't consume capacity
+                limited = True
+            if limited:
+                with self._lock:
+                    self.stats['rate_limited'] += 1
+                return 429, {'object': 'error', 'status': 429, 'code': 'rate_limited',
+                             'message': "You have been rate limited. Please try again in a few minutes."}, \
+                    {'Retry-After': str(int(self.retry_after))}
+
+            parts = [p for p in url.path.split('/') if p]
+            if parts and parts[0] == 'v1':
+                parts = parts[1:]
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                raise MockNotionError(400, 'invalid_json', "Error parsing JSON body.")
+            with self._lock:
+                return 200, self.route(method, parts, params, body), {}
+        except MockNotionError as e:
+            with self._lock:
+                self.stats['errors'] += 1
+            return e.status, e.body(), {}
+        except Exception as e:
+            logger.exception(f"Mock Notion failed on {method} {path}")
+            with self._lock:
+                self.stats['errors'] += 1
+            return 500, {'object': 'error', 'status': 500, 'code': 'internal_server_error', 'message': str(e)}, {}
+        finally:
+            with self._lock:
+                self.stats['in_flight'] -= 1
+
+
+def _plain_text(rich_text: List[Dict[str, Any]]) -> str:
+    return ''.join(t.get('plain_text') or t.get('text', {}).get('content', '') for t in rich_text or [])
+
+
+def _title_of(properties: Dict[str, Any]) -> str:
+    for prop in properties.values():
+        if isinstance(prop, dict) and 'title' in prop:
+            return _plain_text(prop['title'])
+    return ''
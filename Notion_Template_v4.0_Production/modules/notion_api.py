@@ -3,9 +3,8 @@ Notion API Client Module
 Handles core API communication, rate limiting, and session management
 """
 
-import time
 import logging
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -21,33 +20,72 @@ except ImportError:
 import os
 use_simple_logging = os.getenv('USE_SIMPLE_LOGGING', '').lower() in ('true', '1', 'yes')
 
-logger = logging.getLogger(__name__)
+from .rate_limiter import get_rate_limiter, parse_retry_after
 
-# Rate limiting state
-_last_request_time = [0.0]
+logger = logging.getLogger(__name__)
 
-def throttle(rate_limit_rps: float):
-    """Implement rate limiting at specified requests per second"""
+def throttle(rate_limit_rps: float, method: str = "GET", url: str = ""):
+    """Wait for the shared Notion rate budget (disabled when rate_limit_rps <= 0)"""
     if rate_limit_rps <= 0:
         return
-    min_interval = 1.0 / rate_limit_rps
-    now = time.time()
-    elapsed = now - _last_request_time[0]
-    if elapsed < min_interval:
-        sleep_time = min_interval - elapsed
-        time.sleep(sleep_time)
-    _last_request_time[0] = time.time()
-
-def create_session(max_retries: int = 5, backoff_base: float = 1.5) -> requests.Session:
-    """Create a requests session with retry strategy"""
+    get_rate_limiter().acquire(method, url)
+
+class StatusRetry(Retry):
+    """urllib3 Retry that repeats some statuses for idempotent methods only
+
+    A 500 on POST or PATCH may mean the write already happened, so replaying
+    it can duplicate pages or blocks; gateway errors (502/503/504) are safe
+    to replay for every method.
+    """
+
+    def __init__(self, *args, idempotent_only_statuses: Tuple[int, ...] = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.idempotent_only_statuses = frozenset(idempotent_only_statuses)
+
+    def new(self, **kw) -> 'StatusRetry':
+        retry = super().new(**kw)
+        retry.idempotent_only_statuses = self.idempotent_only_statuses
+        return retry
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code in self.idempotent_only_statuses and method.upper() not in Retry.DEFAULT_ALLOWED_METHODS:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+def create_session(max_retries: int = 5, backoff_base: float = 1.5,
+                   pool_connections: int = 10, pool_maxsize: int = 10,
+                   pool_block: bool = False,
+                   status_forcelist: Tuple[int, ...] = (429, 500, 502, 503, 504),
+                   allowed_methods: Tuple[str, ...] = ("HEAD", "GET", "OPTIONS", "POST", "PATCH"),
+                   idempotent_only_statuses: Tuple[int, ...] = ()) -> requests.Session:
+    """Create a pooled keep-alive requests session with retry strategy
+
+    Args:
+        max_retries: Total retries for connection errors and retryable statuses
+        backoff_base: urllib3 backoff factor between retries
+        pool_connections: Number of per-host connection pools to cache
+        pool_maxsize: Maximum keep-alive connections kept per host
+        pool_block: Block instead of opening extra connections beyond pool_maxsize
+        status_forcelist: HTTP statuses retried by the adapter
+        allowed_methods: HTTP methods the adapter may retry
+        idempotent_only_statuses: Statuses from status_forcelist retried only for
+            idempotent methods (GET, HEAD, PUT, DELETE, OPTIONS, TRACE)
+    """
     session = requests.Session()
-    retry_strategy = Retry(
+    retry_strategy = StatusRetry(
         total=max_retries,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "OPTIONS", "POST", "PATCH"],
-        backoff_factor=backoff_base
+        idempotent_only_statuses=idempotent_only_statuses,
+        status_forcelist=list(status_forcelist),
+        allowed_methods=list(allowed_methods),
+        backoff_factor=backoff_base,
+        raise_on_status=False,
+        # Without this urllib3 retries any 429 carrying Retry-After itself
+        respect_retry_after_header=429 in status_forcelist
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    adapter = HTTPAdapter(max_retries=retry_strategy,
+                          pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          pool_block=pool_block)
     session.mount("https://", adapter)
     session.mount("http://", adapter)
     return session
@@ -65,7 +103,7 @@ def req(method: str, url: str, headers: Dict = None, data: str = None,
     else:
         api_logger = APIRequestLogger() if APIRequestLogger else None
 
-    throttle(rate_limit_rps)  # Apply rate limiting
+    throttle(rate_limit_rps, method, url)  # Apply rate limiting
 
     headers = headers or {}
 
@@ -105,6 +143,12 @@ def req(method: str, url: str, headers: Dict = None, data: str = None,
         else:
             raise ValueError(f"Unsupported HTTP method: {method}")
 
+        # Feed the shared limiter so every caller backs off together
+        if response.status_code == 429:
+            get_rate_limiter().on_rate_limited(parse_retry_after(response.headers.get('Retry-After')))
+        else:
+            get_rate_limiter().on_success()
+
         # Log the response
         success = response.status_code in [200, 201]
 
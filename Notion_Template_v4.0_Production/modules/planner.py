@@ -0,0 +1,180 @@
+"""
+Deployment Planner Module
+Offline compile-only deployments: records every Notion request body and
+answers with synthetic responses carrying placeholder IDs
+"""
+
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .profiler import endpoint_key
+from .rate_limiter import NotionRateLimiter, READ, WRITE
+
+logger = logging.getLogger(__name__)
+
+PLAN_VERSION = 1
+
+
+def placeholder_id(n: int) -> str:
+    """UUID-shaped placeholder so ID parsing and endpoint grouping behave as for real IDs"""
+    return f"00000000-0000-4000-8000-{n:012d}"
+
+
+class DeploymentPlanner:
+    """Thread-safe recorder standing in for the Notion API during --plan
+
+    Creates return fresh placeholder IDs and every block sent inline gets
+    one too, so children listings return what was created under a block
+    (deferred nested children resolve their parents exactly as against
+    Notion). Other reads (queries, search, unknown blocks) return empty
+    results, as they would for a fresh workspace.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._next_id = 0
+            self._children: Dict[str, List[Dict[str, Any]]] = {}
+            self.current_phase = 'startup'
+            self.requests: List[Dict[str, Any]] = []
+
+    def enable(self):
+        self.reset()
+        self.enabled = True
+
+    def set_phase(self, phase: str):
+        if self.enabled:
+            self.current_phase = phase
+
+    def _new_id(self) -> str:
+        self._next_id += 1
+        return placeholder_id(self._next_id)
+
+    def _create_blocks(self, parent_id: str, blocks: List[Dict]) -> List[Dict[str, Any]]:
+        """Give each block (and its inline children) an ID under parent_id"""
+        created = []
+        for block in blocks:
+            # Like Notion, accept blocks that only name their type by their content key
+            block_type = block.get('type') or next((k for k in block if k != 'object'), None)
+            block_id = self._new_id()
+            content = block.get(block_type) if block_type else None
+            nested = content.get('children', []) if isinstance(content, dict) else []
+            if nested:
+                self._create_blocks(block_id, nested)
+            created.append({'object': 'block', 'id': block_id, 'type': block_type,
+                            'has_children': bool(nested)})
+        self._children.setdefault(parent_id, []).extend(created)
+        return created
+
+    def _list_children(self, block_id: str, query: str) -> Dict[str, Any]:
+        params = dict(p.split('=', 1) for p in query.split('&') if '=' in p)
+        start = int(params.get('start_cursor') or 0)
+        size = int(params.get('page_size') or 100)
+        children = self._children.get(block_id, [])
+        page = children[start:start + size]
+        more = start + len(page) < len(children)
+        return {'object': 'list', 'results': page, 'has_more': more,
+                'next_cursor': str(start + len(page)) if more else None}
+
+    def respond(self, method: str, url: str, data: Optional[Any] = None) -> Tuple[int, Dict]:
+        """Record a request and return (status, body) for it"""
+        method = method.upper()
+        body = None
+        if isinstance(data, (str, bytes)) and data:
+            try:
+                body = json.loads(data)
+            except ValueError:
+                body = None
+        path, _, query = url.partition('?')
+        path = path.rstrip('/')
+
+        with self._lock:
+            self.requests.append({
+                'seq': len(self.requests) + 1,
+                'phase': self.current_phase,
+                'method': method,
+                'endpoint': endpoint_key(method, url),
+                'url': url,
+                'body': body,
+            })
+
+            if path.endswith('/children'):
+                block_id = path.rsplit('/', 2)[-2]
+                if method == 'PATCH':
+                    created = self._create_blocks(block_id, (body or {}).get('children', []))
+                    return 200, {'object': 'list', 'results': created, 'has_more': False, 'next_cursor': None}
+                return 200, self._list_children(block_id, query)
+            if path.endswith('/query') or path.endswith('/search'):
+                return 200, {'object': 'list', 'results': [], 'has_more': False, 'next_cursor': None}
+            if method == 'POST':
+                kind = 'database' if path.endswith('/databases') else 'page'
+                new_id = self._new_id()
+                self._create_blocks(new_id, (body or {}).get('children', []))
+                return 200, {'object': kind, 'id': new_id, 'archived': False}
+            return 200, {'object': 'page', 'id': path.rsplit('/', 1)[-1], 'archived': method == 'DELETE'}
+
+    def summary(self, limiter: NotionRateLimiter) -> Dict[str, Any]:
+        """Request counts by endpoint and class, and the time they take at the limiter's rates"""
+        by_endpoint: Dict[str, int] = {}
+        by_phase: Dict[str, int] = {}
+        by_class = {READ: 0, WRITE: 0}
+        bytes_sent = 0
+        with self._lock:
+            for request in self.requests:
+                by_endpoint[request['endpoint']] = by_endpoint.get(request['endpoint'], 0) + 1
+                by_phase[request['phase']] = by_phase.get(request['phase'], 0) + 1
+                by_class[limiter.classify(request['method'], request['url'])] += 1
+                if request['body'] is not None:
+                    bytes_sent += len(json.dumps(request['body']).encode('utf-8'))
+            total = len(self.requests)
+
+        estimate = None
+        if limiter.enabled:
+            # Each request draws from the global bucket and its class bucket
+            estimate = max(
+                total / limiter.global_bucket.rate,
+                by_class[READ] / limiter.buckets[READ].rate,
+                by_class[WRITE] / limiter.buckets[WRITE].rate,
+            )
+        return {
+            'requests': total,
+            'by_phase': by_phase,
+            'by_class': by_class,
+            'by_endpoint': dict(sorted(by_endpoint.items(), key=lambda kv: -kv[1])),
+            'bytes_sent': bytes_sent,
+            'rate_rps': limiter.max_rps,
+            'estimated_seconds': round(estimate, 1) if estimate is not None else None,
+        }
+
+    def write_plan(self, path: str, limiter: NotionRateLimiter, extra: Optional[Dict] = None) -> Dict[str, Any]:
+        """Write the summary and every request body to `path` as JSON"""
+        summary = self.summary(limiter)
+        with self._lock:
+            requests = list(self.requests)
+        plan = {
+            'version': PLAN_VERSION,
+            'generated_at': datetime.now().isoformat(),
+            'summary': summary,
+            **(extra or {}),
+            'requests': requests,
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(plan, f, indent=2, ensure_ascii=False)
+        logger.info(f"Deployment plan written to {path}: {summary['requests']} requests, "
+                    f"~{summary['estimated_seconds']}s at {summary['rate_rps']} rps")
+        return plan
+
+
+_planner = DeploymentPlanner()
+
+
+def get_planner() -> DeploymentPlanner:
+    """Return the process-wide planner"""
+    return _planner
@@ -0,0 +1,224 @@
+"""
+Deployment Profiler Module
+Per-phase and per-endpoint request metrics plus local work timings
+"""
+
+import re
+import json
+import math
+import time
+import bisect
+import logging
+import functools
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+_ID_PATTERN = re.compile(r'/[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}(?=/|$)')
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """'PATCH https://api.notion.com/v1/blocks/<uuid>/children?x' -> 'PATCH /blocks/{id}/children'"""
+    path = url.split('?', 1)[0]
+    if '/v1/' in path:
+        path = '/' + path.split('/v1/', 1)[1]
+    return f"{method.upper()} {_ID_PATTERN.sub('/{id}', path)}"
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class RequestStats:
+    """Aggregated request metrics for one phase or endpoint"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.bytes_sent = 0
+        self.status_429 = 0
+        self.status_5xx = 0
+        self.errors = 0
+        self.retries = 0
+        self.sleep_time = 0.0
+
+    def add(self, status: Optional[int], latency: float, bytes_sent: int):
+        self.latencies.append(latency)
+        self.bytes_sent += bytes_sent
+        if status is None:
+            self.errors += 1
+        elif status == 429:
+            self.status_429 += 1
+        elif status >= 500:
+            self.status_5xx += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        values = sorted(self.latencies)
+        histogram = [0] * len(LATENCY_BUCKETS)
+        for value in values:
+            histogram[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        return {
+            'requests': len(values),
+            'latency_s': {
+                'p50': round(percentile(values, 50), 4),
+                'p95': round(percentile(values, 95), 4),
+                'p99': round(percentile(values, 99), 4),
+                'max': round(values[-1], 4) if values else 0.0,
+                'total': round(sum(values), 4),
+            },
+            'latency_histogram': {('inf' if b == float('inf') else f"<={b}"): n
+                                  for b, n in zip(LATENCY_BUCKETS, histogram)},
+            'bytes_sent': self.bytes_sent,
+            'status_429': self.status_429,
+            'status_5xx': self.status_5xx,
+            'errors': self.errors,
+            'retries': self.retries,
+            'sleep_s': round(self.sleep_time, 4),
+        }
+
+
+class DeploymentProfiler:
+    """Thread-safe collector of deployment timings
+
+    Disabled by default so instrumentation costs a single attribute check;
+    enable() it (deploy.py --profile) to start collecting.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.perf_counter()
+            self.current_phase = 'startup'
+            self._phase_started = self.started
+            self.phase_wall: Dict[str, float] = {}
+            self.phases: Dict[str, RequestStats] = {}
+            self.endpoints: Dict[str, RequestStats] = {}
+            self.local_work: Dict[str, Dict[str, float]] = {}
+
+    def enable(self):
+        self.reset()
+        self.enabled = True
+
+    def set_phase(self, phase: str):
+        """Close the current phase's wall-clock timer and start `phase`"""
+        if not self.enabled:
+            return
+        with self._lock:
+            now = time.perf_counter()
+            self.phase_wall[self.current_phase] = self.phase_wall.get(self.current_phase, 0.0) + now - self._phase_started
+            self.current_phase = phase
+            self._phase_started = now
+
+    def _stats(self, method: str, url: str) -> List[RequestStats]:
+        phase = self.phases.setdefault(self.current_phase, RequestStats())
+        endpoint = self.endpoints.setdefault(endpoint_key(method, url), RequestStats())
+        return [phase, endpoint]
+
+    def record_request(self, method: str, url: str, status: Optional[int],
+                       latency: float, bytes_sent: int = 0):
+        """Record one HTTP round trip (status None for a transport error)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            for stats in self._stats(method, url):
+                stats.add(status, latency, bytes_sent)
+
+    def record_retry(self, method: str, url: str, count: int = 1):
+        if not self.enabled or count <= 0:
+            return
+        with self._lock:
+            for stats in self._stats(method, url):
+                stats.retries += count
+
+    def record_sleep(self, method: str, url: str, seconds: float):
+        """Time spent waiting on the rate limiter or a retry backoff before a request"""
+        if not self.enabled or seconds <= 0:
+            return
+        with self._lock:
+            for stats in self._stats(method, url):
+                stats.sleep_time += seconds
+
+    @contextmanager
+    def timed(self, name: str):
+        """Time a block of local work; nested/recursive uses only count the outermost"""
+        if not self.enabled:
+            yield
+            return
+        depth = getattr(self._local, 'depth', None)
+        if depth is None:
+            depth = self._local.depth = {}
+        if depth.get(name):
+            yield
+            return
+        depth[name] = 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            depth[name] = 0
+            with self._lock:
+                entry = self.local_work.setdefault(name, {'calls': 0, 'total_s': 0.0})
+                entry['calls'] += 1
+                entry['total_s'] += elapsed
+
+    def report(self) -> Dict[str, Any]:
+        """Snapshot of everything collected so far"""
+        self.set_phase(self.current_phase)  # flush the open phase's wall time
+        with self._lock:
+            phases = {}
+            for name in list(self.phase_wall) + [p for p in self.phases if p not in self.phase_wall]:
+                entry = {'wall_time_s': round(self.phase_wall.get(name, 0.0), 4)}
+                if name in self.phases:
+                    entry.update(self.phases[name].to_dict())
+                phases[name] = entry
+            return {
+                'generated_at': datetime.now().isoformat(),
+                'wall_time_s': round(time.perf_counter() - self.started, 4),
+                'phases': phases,
+                'endpoints': {name: stats.to_dict() for name, stats in sorted(self.endpoints.items())},
+                'local_work': {name: {'calls': int(v['calls']), 'total_s': round(v['total_s'], 4)}
+                               for name, v in sorted(self.local_work.items(), key=lambda kv: -kv[1]['total_s'])},
+            }
+
+    def write_report(self, path: str) -> Dict[str, Any]:
+        report = self.report()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Profile report written to {path}")
+        return report
+
+
+_profiler = DeploymentProfiler()
+
+
+def get_profiler() -> DeploymentProfiler:
+    """Return the process-wide profiler"""
+    return _profiler
+
+
+def profiled(name: str) -> Callable:
+    """Decorator timing a function as local work under `name` when profiling is enabled"""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _profiler.enabled:
+                return fn(*args, **kwargs)
+            with _profiler.timed(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
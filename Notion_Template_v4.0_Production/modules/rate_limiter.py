@@ -0,0 +1,201 @@
+"""
+Rate Limiting Module
+Shared token-bucket rate limiter for every Notion API caller (thread and asyncio safe)
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Endpoint classes with independent budgets
+READ = "read"
+WRITE = "write"
+
+
+class TokenBucket:
+    """Thread-safe token bucket with burst capacity
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Callers reserve a token under the lock and sleep outside it, so waiting
+    threads or coroutines never block each other while sleeping.
+    """
+
+    def __init__(self, rate: float, capacity: float, name: str = "bucket"):
+        self.name = name
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Reserve tokens and return how many seconds the caller must wait"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            wait = 0.0
+            if self._tokens < 0:
+                wait = -self._tokens / self.rate
+            if self._paused_until > now:
+                wait = max(wait, self._paused_until - now)
+            return wait
+
+    def delay(self) -> float:
+        """Seconds until the next token would be granted, without consuming one"""
+        return self.reserve(0)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until tokens are available; returns seconds slept"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Await until tokens are available without blocking the event loop"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for ``seconds`` (e.g. after a 429 Retry-After)"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._paused_until = max(self._paused_until, now + seconds)
+            # Drop accumulated burst so callers resume at the steady rate
+            self._tokens = min(self._tokens, 0.0)
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+
+
+class NotionRateLimiter:
+    """Global Notion request budget with per-endpoint-class sub-budgets
+
+    Every request draws from the global bucket and from the bucket of its
+    endpoint class (reads vs. writes). A 429 pauses all buckets for the
+    ``Retry-After`` period and multiplicatively lowers the rate; subsequent
+    successes recover it additively up to the configured ceiling.
+    """
+
+    def __init__(self, rps: float = 2.5, burst: float = 3.0,
+                 read_rps: Optional[float] = None, write_rps: Optional[float] = None,
+                 min_rps: float = 0.5, recovery_step: float = 0.05):
+        self.max_rps = float(rps)
+        self.min_rps = min(float(min_rps), self.max_rps) if self.max_rps > 0 else 0.0
+        self.recovery_step = recovery_step
+        self.global_bucket = TokenBucket(rps, burst, "global")
+        self.buckets: Dict[str, TokenBucket] = {
+            READ: TokenBucket(read_rps or rps, burst, READ),
+            WRITE: TokenBucket(write_rps or rps, burst, WRITE),
+        }
+        self._lock = threading.Lock()
+        self.rate_limited_count = 0
+
+    @staticmethod
+    def classify(method: str, url: str = "") -> str:
+        """Map a request to its endpoint class"""
+        method = method.upper()
+        if method == "GET":
+            return READ
+        # Database queries and search are POSTs that only read
+        if method == "POST" and (url.rstrip("/").endswith("/query") or url.rstrip("/").endswith("/search")):
+            return READ
+        return WRITE
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rps > 0
+
+    def acquire(self, method: str = "GET", url: str = "") -> float:
+        """Block until a request of this class may be sent; returns seconds slept"""
+        if not self.enabled:
+            return 0.0
+        bucket = self.buckets[self.classify(method, url)]
+        wait = max(self.global_bucket.reserve(), bucket.reserve())
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, method: str = "GET", url: str = "") -> float:
+        """Async variant of acquire()"""
+        if not self.enabled:
+            return 0.0
+        bucket = self.buckets[self.classify(method, url)]
+        wait = max(self.global_bucket.reserve(), bucket.reserve())
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def on_rate_limited(self, retry_after: float):
+        """Back off every bucket after a 429 and lower the sustained rate"""
+        with self._lock:
+            self.rate_limited_count += 1
+            new_rate = max(self.min_rps, self.global_bucket.rate * 0.5)
+            self.global_bucket.set_rate(new_rate)
+        for bucket in (self.global_bucket, *self.buckets.values()):
+            bucket.pause(retry_after)
+        logger.warning(f"Rate limited: pausing {retry_after:.1f}s, global rate now {new_rate:.2f} rps")
+
+    def on_success(self):
+        """Additively recover the global rate after a 429 backoff"""
+        if self.global_bucket.rate >= self.max_rps:
+            return
+        with self._lock:
+            self.global_bucket.set_rate(min(self.max_rps, self.global_bucket.rate + self.recovery_step))
+
+
+def parse_retry_after(value: Optional[str], default: float = 5.0) -> float:
+    """Parse a Retry-After header value in seconds"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+_limiter: Optional[NotionRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> NotionRateLimiter:
+    """Return the process-wide limiter, configured from the environment on first use"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                rps = float(os.getenv("THROTTLE_RPS", "2.5"))
+                _limiter = NotionRateLimiter(
+                    rps=rps,
+                    burst=float(os.getenv("THROTTLE_BURST", "3")),
+                    read_rps=float(os.getenv("THROTTLE_READ_RPS", "0")) or None,
+                    write_rps=float(os.getenv("THROTTLE_WRITE_RPS", "0")) or None,
+                )
+                logger.debug(f"Notion rate limiter initialised at {rps} rps")
+    return _limiter
+
+
+def configure_rate_limiter(**kwargs) -> NotionRateLimiter:
+    """Replace the process-wide limiter (e.g. from validated config.yaml values)"""
+    global _limiter
+    with _limiter_lock:
+        _limiter = NotionRateLimiter(**kwargs)
+    return _limiter
@@ -0,0 +1,104 @@
+"""
+YAML Cache Module
+libyaml-backed parsing with a persistent per-file snapshot of parsed YAML
+"""
+
+import os
+import pickle
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# The C loader is ~10x faster than the pure-Python one and accepts the same documents
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+LIBYAML_AVAILABLE = SafeLoader is not yaml.SafeLoader
+
+SNAPSHOT_VERSION = 1
+
+
+def parse_yaml(text: str) -> Any:
+    """yaml.safe_load using libyaml when it is installed"""
+    return yaml.load(text, Loader=SafeLoader)
+
+
+class YamlSnapshotCache:
+    """Parsed YAML per file, reused while the file is unchanged
+
+    A file is considered unchanged if its mtime and size match the snapshot,
+    or, failing that, if its SHA-256 still matches (e.g. after a checkout
+    touched it). The snapshot is pickled to `path` so later processes skip
+    parsing entirely; pass path=None to keep it in memory only.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        if path:
+            self._read_snapshot()
+
+    def _read_snapshot(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                snapshot = pickle.load(f)
+            if snapshot.get('version') == SNAPSHOT_VERSION and snapshot.get('libyaml') == LIBYAML_AVAILABLE:
+                self.entries = snapshot.get('files', {})
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable YAML snapshot {self.path}: {e}")
+
+    def load(self, file_path: Path) -> Any:
+        """Parsed contents of a YAML file, from the snapshot when unchanged"""
+        key = str(Path(file_path).resolve())
+        stat = os.stat(key)
+        entry = self.entries.get(key)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            self.hits += 1
+            return entry['data']
+
+        raw = Path(key).read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry and entry['sha256'] == digest:
+            self.hits += 1
+            data = entry['data']
+        else:
+            self.misses += 1
+            data = parse_yaml(raw.decode('utf-8'))
+        self.entries[key] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                             'sha256': digest, 'data': data}
+        self._dirty = True
+        return data
+
+    def prune(self, keep: Iterable[Path]):
+        """Forget files that no longer exist in the directories being loaded"""
+        keep_keys = {str(Path(p).resolve()) for p in keep}
+        dirs = {os.path.dirname(k) for k in keep_keys}
+        for key in [k for k in self.entries if os.path.dirname(k) in dirs and k not in keep_keys]:
+            del self.entries[key]
+            self._dirty = True
+
+    def save(self):
+        """Atomically persist the snapshot if anything changed"""
+        if not self.path or not self._dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.yaml-snapshot-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump({'version': SNAPSHOT_VERSION, 'libyaml': LIBYAML_AVAILABLE,
+                             'files': self.entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            logger.warning(f"Could not write YAML snapshot {self.path}: {e}")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test the async deployment scheduler
+Runs run_dependency_dag with stub coroutines (no API calls)
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+# Add the parent directory to sys.path to import deploy module
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import deploy
+except ImportError as e:
+    print(f"❌ Failed to import deploy module: {e}")
+    sys.exit(1)
+
+
+def test_relation_targets():
+    """Relation properties in every supported format are detected"""
+    print("=== Testing Relation Target Detection ===")
+    schema = {'properties': {
+        'Name': {'type': 'title'},
+        'Owner': {'type': 'relation', 'database_id_ref': 'ref:People'},
+        'Project': {'type': 'relation', 'database_id': 'Projects'},
+        'Legacy': {'type': 'relation', 'relation': {'database_id': 'Archive'}},
+    }}
+    assert deploy.relation_targets(schema) == {'People', 'Projects', 'Archive'}
+    print("✅ Relation targets detected")
+
+
+def test_dependency_dag():
+    """Dependencies complete first and independent items overlap"""
+    print("\n=== Testing Async Dependency DAG ===")
+    items = [
+        {'key': 'Tasks', 'deps': {'Projects', 'People'}},
+        {'key': 'Projects', 'deps': {'People'}},
+        {'key': 'People', 'deps': set()},
+        {'key': 'Notes', 'deps': set()},
+        {'key': 'Tags', 'deps': set()},
+    ]
+    done = set()
+    active = [0]
+    peak = [0]
+
+    async def create(item):
+        assert item['deps'] <= done, f"'{item['key']}' started before {item['deps'] - done}"
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.01)
+        active[0] -= 1
+        return f"id-{item['key']}"
+
+    def on_result(item, result):
+        done.add(item['key'])
+        return bool(result)
+
+    ok = asyncio.run(deploy.run_dependency_dag(
+        items, key_of=lambda i: i['key'], deps_of=lambda i: i['deps'] - done,
+        create=create, on_result=on_result, limit=3))
+
+    assert ok
+    assert done == {i['key'] for i in items}
+    assert 1 < peak[0] <= 3, f"Expected bounded overlap, got peak {peak[0]}"
+    print(f"✅ {len(done)} items created with peak concurrency {peak[0]}")
+
+
+def test_dependency_dag_cycle_and_failure():
+    """Cycles are released; a failure stops dependents being scheduled"""
+    print("\n=== Testing Cycles and Failures ===")
+    started = []
+
+    async def create(item):
+        started.append(item['key'])
+        return None if item['key'] == 'Broken' else item['key']
+
+    cyclic = [{'key': 'A', 'deps': {'B'}}, {'key': 'B', 'deps': {'A'}}]
+    assert asyncio.run(deploy.run_dependency_dag(
+        cyclic, key_of=lambda i: i['key'], deps_of=lambda i: i['deps'],
+        create=create, on_result=lambda i, r: bool(r), limit=2))
+    assert sorted(started) == ['A', 'B']
+
+    started.clear()
+    broken = [{'key': 'Broken', 'deps': set()}, {'key': 'Child', 'deps': {'Broken'}}]
+    assert not asyncio.run(deploy.run_dependency_dag(
+        broken, key_of=lambda i: i['key'], deps_of=lambda i: i['deps'],
+        create=create, on_result=lambda i, r: bool(r), limit=2))
+    assert started == ['Broken']
+    print("✅ Cycles released and failures stop scheduling")
+
+
+if __name__ == "__main__":
+    test_relation_targets()
+    test_dependency_dag()
+    test_dependency_dag_cycle_and_failure()
+    print("\n🎉 All async deployment tests passed!")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test block batching for pages beyond Notion's 100-block / nesting limits
+Runs plan_block_batches and append_block_batches against an in-process mock Notion (no API calls)
+"""
+
+import sys
+from pathlib import Path
+
+# Add the parent directory to sys.path to import deploy module
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import deploy
+    from deploy_test_helpers import FakeNotion
+except ImportError as e:
+    print(f"❌ Failed to import deploy module: {e}")
+    sys.exit(1)
+
+
+def paragraph(text):
+    return {"type": "paragraph", "paragraph": {"rich_text": [{"text": {"content": text}}]}}
+
+
+def toggle(text, children):
+    return {"type": "toggle", "toggle": {"rich_text": [{"text": {"content": text}}], "children": children}}
+
+
+def expected(blocks):
+    return [(b[b['type']]['rich_text'][0]['text']['content'], expected(b[b['type']].get('children', [])))
+            for b in blocks]
+
+
+def test_plan_respects_limits():
+    """Large pages pack into 100-block requests; deep nesting is deferred"""
+    print("=== Testing Batch Planning ===")
+    blocks = [paragraph(f"p{i}") for i in range(250)]
+    batches = deploy.plan_block_batches(blocks)
+    assert [len(b.blocks) for b in batches] == [100, 100, 50]
+
+    deep = [toggle("t0", [toggle("t1", [toggle("t2", [paragraph("leaf")])])])]
+    batches = deploy.plan_block_batches(deep)
+    assert len(batches) == 1
+    assert batches[0].deferred == [((0, 0, 0), [paragraph("leaf")])]
+    print("✅ Batches respect block count and nesting limits")
+
+
+def test_append_preserves_content():
+    """Every block arrives in order, with the fewest PATCH calls"""
+    print("\n=== Testing Batched Append ===")
+    blocks = [paragraph(f"p{i}") for i in range(150)]
+    blocks.insert(10, toggle("deep", [toggle("d1", [toggle("d2", [toggle("d3", [paragraph("leaf")])])])]))
+    blocks.append(toggle("wide", [paragraph(f"w{i}") for i in range(120)]))
+
+    fake = FakeNotion(root_ids=["page"])
+    original_req = deploy.req
+    deploy.req = fake
+    try:
+        assert deploy.append_block_children("page", blocks, "test page")
+    finally:
+        deploy.req = original_req
+
+    assert fake.texts("page") == expected(blocks)
+    # 2 top-level batches + 1 overflow append for "wide" + list/append for the deep toggle
+    assert fake.count("PATCH") == 4, fake.calls
+    print(f"✅ {len(blocks)} top-level blocks appended with {len(fake.calls)} calls")
+
+
+if __name__ == "__main__":
+    test_plan_respects_limits()
+    test_append_preserves_content()
+    print("\n🎉 All block batching tests passed!")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test the block compiler behind build_block
+Type -> handler dispatch, shared rich_text builders, the static block cache and lazy payload logging
+"""
+
+import sys
+import logging
+from pathlib import Path
+
+# Add the parent directory to sys.path to import deploy module
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import deploy
+    from modules.block_compiler import (BLOCK_HANDLERS, NOTION_MAX_TEXT, block_cache_info,
+                                        clear_block_cache, text_item)
+except ImportError as e:
+    print(f"❌ Failed to import deploy module: {e}")
+    sys.exit(1)
+
+
+def test_dispatch_and_legacy_fields():
+    """Legacy types and fields resolve without copying the definition; unknown types fall back"""
+    print("=== Testing Handler Dispatch ===")
+    block_def = {'type': 'H2', 'heading': 'Overview'}
+    assert deploy.build_block(block_def) == {'heading_2': {'rich_text': [{'text': {'content': 'Overview'}}]}}
+    assert block_def == {'type': 'H2', 'heading': 'Overview'}, "Definition was mutated"
+
+    assert deploy.build_block('Plain string') == {'paragraph': {'rich_text': [{'text': {'content': 'Plain string'}}]}}
+    assert deploy.build_block({'type': 'summary_card', 'summary': 'x'})['paragraph']['rich_text'][0]['text']['content'] == '[summary_card] x'
+    assert deploy.build_block({'type': 'linked_view', 'linked_db': 'Accounts'})['paragraph']['rich_text'][0]['text']['content'] == '[DATABASE VIEW: Accounts]'
+
+    toggle = deploy.build_block({'type': 'toggle', 'content': 'Steps', 'blocks': [
+        {'type': 'numbered_list', 'items': ['One', 2]}, {'type': 'divider'}]})
+    kids = toggle['toggle']['children']
+    assert [next(iter(k)) for k in kids] == ['numbered_list_item', 'numbered_list_item', 'divider']
+    assert kids[1]['numbered_list_item']['rich_text'][0]['text']['content'] == '2'
+
+    listed = deploy.build_block({'type': 'bulleted_list', 'items': ['a', 'b', 'c']})
+    assert listed['_multi_block'] and len(listed['_blocks']) == 3, "List items replaced by a placeholder"
+    listed = deploy.build_block({'type': 'bulleted_list', 'bulleted_list': ['Vigil', 'Funeral', 'Committal']})
+    assert [b['bulleted_list_item']['rich_text'][0]['text']['content'] for b in listed['_blocks']] == \
+        ['Vigil', 'Funeral', 'Committal']
+    empty = deploy.build_block({'type': 'numbered_list'})
+    assert 'numbered_list_item' not in empty, "Empty list item emitted"
+    assert {'divider', 'toggle', 'table', 'breadcrumb', 'table_of_contents'} <= set(BLOCK_HANDLERS)
+    print(f"✅ {len(BLOCK_HANDLERS)} block types registered; legacy H2/heading handled in place")
+
+
+def test_rich_text_builders():
+    """Long text is split into 2000 character runs; annotations sit beside the text object"""
+    print("=== Testing Rich Text Builders ===")
+    long_text = 'x' * (NOTION_MAX_TEXT * 2 + 5)
+    runs = deploy.build_block({'type': 'paragraph', 'content': long_text})['paragraph']['rich_text']
+    assert [len(r['text']['content']) for r in runs] == [NOTION_MAX_TEXT, NOTION_MAX_TEXT, 5]
+    assert text_item('To: ', bold=True) == {'text': {'content': 'To: '}, 'annotations': {'bold': True}}
+    assert deploy._text_items('') == []
+    print("✅ 4005 characters split into 3 runs; bold annotation outside text")
+
+
+def test_static_block_cache():
+    """Identical static blocks are built once; blocks with state or children are not cached"""
+    print("=== Testing Static Block Cache ===")
+    clear_block_cache()
+    disclaimer = {'type': 'callout', 'content': 'Not legal advice', 'icon': '⚠️', 'color': 'yellow_background'}
+    built = [deploy.build_block(dict(disclaimer)) for _ in range(50)]
+    assert all(b is built[0] for b in built)
+    assert deploy.build_block({'type': 'divider'}) is deploy.build_block({'type': 'divider'})
+    assert deploy.build_block({**disclaimer, 'color': 'red_background'}) is not built[0]
+
+    toggle = {'type': 'toggle', 'content': 'Same', 'blocks': ['child']}
+    assert deploy.build_block(toggle) is not deploy.build_block(toggle)
+    to_do = {'type': 'to_do', 'to_do': {'rich_text': ['Call bank'], 'checked': True}}
+    assert deploy.build_block(to_do) == {'to_do': {'rich_text': [{'text': {'content': 'Call bank'}}], 'checked': True}}
+
+    # The toggle's 'child' paragraph is itself static and is reused on the second build
+    info = block_cache_info()
+    assert info['hits'] == 51 and info['size'] == 4, info
+    print(f"✅ 50 repeated disclaimers built once (cache: {info})")
+
+
+def test_lazy_payload_logging():
+    """Page payloads are only serialized when a DEBUG record is emitted, and only once"""
+    print("=== Testing Lazy Payload Logging ===")
+
+    formatted = []
+
+    class Tracked(deploy.LazyJSON):
+        __slots__ = ()
+
+        def __str__(self):
+            formatted.append(self.value)
+            return super().__str__()
+
+    root = logging.getLogger()
+    level = root.level
+    try:
+        root.setLevel(logging.INFO)
+        logging.debug("Page payload: %s", Tracked({'a': 1}))
+        assert not formatted, "Payload serialized with DEBUG off"
+    finally:
+        root.setLevel(level)
+
+    lazy = deploy.LazyJSON({'parent': {'page_id': 'x'}})
+    assert str(lazy) is str(lazy) and '"page_id": "x"' in str(lazy)
+    print("✅ No serialization with DEBUG off; formatted text reused")
+
+
+if __name__ == "__main__":
+    test_dispatch_and_legacy_fields()
+    test_rich_text_builders()
+    test_static_block_cache()
+    test_lazy_payload_logging()
+    print("\n🎉 All block compiler tests passed!")
@@ -15,6 +15,8 @@ try:
     from deploy import (
         process_variable_substitution,
         process_content_substitution,
+        process_formula_substitution,
+        substitute_placeholders,
         build_block
     )
 except ImportError as e:
@@ -200,6 +202,34 @@ def test_complex_nested_structure():
 
     return True
 
+def test_single_pass_substitution():
+    """substitute_placeholders matches the two-pass formula + variable substitution"""
+    print("\n=== Testing Single-Pass Substitution ===")
+
+    os.environ['SUPPORT_EMAIL'] = 'support@example.com'
+    data = {
+        'title': 'Totals',
+        'blocks': [
+            {'type': 'paragraph', 'content': 'Sum: {{formula:prop("Amount") * 2}} - ask ${SUPPORT_EMAIL}'},
+            {'type': 'callout', 'content': '{{formula:${MISSING_VAR:-fallback}}}'},
+            {'type': 'divider'},
+        ],
+        'order': 3,
+        'flags': [True, None, 'plain text'],
+    }
+
+    expected = process_content_substitution(process_formula_substitution(data))
+    result = substitute_placeholders(data)
+    assert result == expected, f"{result} != {expected}"
+    assert result['blocks'][1]['content'] == '[Formula: fallback]'
+
+    # The result never aliases the input, so callers may mutate it freely
+    assert result['blocks'] is not data['blocks']
+    assert data['blocks'][0]['content'].startswith('Sum: {{formula:')
+    print("✅ Single pass matches the two-pass result")
+
+    return True
+
 def main():
     """Run all tests"""
     print("🚀 Testing Block Variable Substitution\n")
@@ -213,6 +243,9 @@ def main():
         if not test_complex_nested_structure():
             return 1
 
+        if not test_single_pass_substitution():
+            return 1
+
         print("\n" + "="*50)
         print("✅ ALL TESTS PASSED!")
         print("✅ Variable substitution in blocks is working correctly")
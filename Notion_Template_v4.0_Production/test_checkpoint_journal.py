@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test append-only checkpoint journaling in DeploymentState
+Checkpoints append one JSON record per change; resume replays them, surviving a torn final write
+"""
+
+import sys
+import json
+import pickle
+import tempfile
+from pathlib import Path
+
+# Add the parent directory to sys.path to import deploy module
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import deploy
+    from deploy import DeploymentState, DeploymentPhase
+except ImportError as e:
+    print(f"❌ Failed to import deploy module: {e}")
+    sys.exit(1)
+
+
+def read_lines(path: Path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+def test_checkpoints_append_records(tmp_path: Path):
+    """The first checkpoint writes a snapshot; later ones only append what changed"""
+    print("=== Testing Journal Appends ===")
+    path = tmp_path / 'state'
+    state = DeploymentState(checkpoint_file=str(path))
+    state.record_page('Estate Hub', 'page-0')
+    state.phase = DeploymentPhase.PAGES
+    state.save_checkpoint()
+    lines = read_lines(path)
+    assert len(lines) == 1 and lines[0]['op'] == 'snapshot'
+    assert lines[0]['state']['created_pages'] == {'Estate Hub': 'page-0'}
+
+    for i in range(1, 21):
+        state.record_page(f"Page {i}", f"page-{i}")
+    state.save_checkpoint()
+    state.record_database('Accounts', 'db-1')
+    state.record_imported_row('Accounts', 'Checking')
+    state.errors.append({'phase': 'data', 'item': 'Accounts: Savings', 'error': 'row creation failed'})
+    state.processed_csv.append('Contacts')
+    state.phase = DeploymentPhase.DATA
+    state.save_checkpoint()
+    state.save_checkpoint()  # Nothing new: nothing appended
+
+    lines = read_lines(path)
+    assert lines[0]['state']['created_pages'] == {'Estate Hub': 'page-0'}, "Snapshot was rewritten"
+    ops = [line['op'] for line in lines[1:]]
+    assert ops == ['page'] * 20 + ['database', 'row', 'error', 'csv', 'phase']
+    print(f"✅ 1 snapshot + {len(ops)} records for 25 changes over 4 checkpoints")
+
+
+def test_resume_replays_and_survives_torn_write(tmp_path: Path):
+    """Replay restores the state; a half-written last record is dropped and compacted away"""
+    print("=== Testing Journal Replay ===")
+    path = tmp_path / 'state'
+    state = DeploymentState(checkpoint_file=str(path))
+    state.save_checkpoint()
+    for i in range(5):
+        state.record_cleared(f"blk-{i}")
+    state.save_checkpoint()
+    state.content_cleared = True
+    state.cleared_blocks.clear()
+    state.record_page('Executor Guide', 'page-9')
+    state.phase = DeploymentPhase.DATABASES
+    state.save_checkpoint()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "page", "title": "Half writ')  # Crash mid-append
+
+    resumed = state.load_checkpoint()
+    assert resumed is not state
+    assert resumed.created_pages == {'Executor Guide': 'page-9'}
+    assert resumed.content_cleared and resumed.cleared_blocks == []
+    assert resumed.phase == DeploymentPhase.DATABASES
+
+    resumed.record_page('Letters', 'page-10')
+    resumed.save_checkpoint()
+    lines = read_lines(path)  # Torn tail replaced by a fresh snapshot
+    assert len(lines) == 1 and lines[0]['state']['created_pages']['Letters'] == 'page-10'
+    again = resumed.load_checkpoint()
+    assert again.created_pages == resumed.created_pages and again.phase == resumed.phase
+    print("✅ Replayed pages, phase and clearing; torn record dropped")
+
+
+def test_periodic_compaction(tmp_path: Path):
+    """Past CHECKPOINT_COMPACT_EVERY records the journal is rewritten as one snapshot"""
+    print("=== Testing Journal Compaction ===")
+    path = tmp_path / 'state'
+    original = deploy.CHECKPOINT_COMPACT_EVERY
+    deploy.CHECKPOINT_COMPACT_EVERY = 50
+    try:
+        state = DeploymentState(checkpoint_file=str(path))
+        sizes = []
+        for batch in range(6):
+            for i in range(20):
+                state.record_imported_row('Accounts', f"row-{batch}-{i}")
+            state.save_checkpoint()
+            sizes.append(len(read_lines(path)))
+    finally:
+        deploy.CHECKPOINT_COMPACT_EVERY = original
+
+    assert sizes == [1, 21, 41, 1, 21, 41], sizes
+    resumed = state.load_checkpoint()
+    assert len(resumed.imported_rows['Accounts']) == 120
+    print(f"✅ Journal lengths per checkpoint {sizes}; all 120 rows replayed")
+
+
+def test_resume_keeps_pending_rollups(tmp_path: Path):
+    """Rollups deferred during DATABASES survive --resume and are dropped once applied"""
+    print("=== Testing Pending Rollups on Resume ===")
+    path = tmp_path / 'state'
+    state = DeploymentState(checkpoint_file=str(path))
+    state.save_checkpoint()
+    rollup = {'Total': {'rollup': {'relation_property_name': 'Accounts',
+                                   'rollup_property_name': 'Balance', 'function': 'sum'}}}
+    state.record_pending('rollups', 'Estate Summary', rollup)
+    state.record_database('Estate Summary', 'db-3')
+    state.phase = DeploymentPhase.DATABASES
+    state.save_checkpoint()
+    assert [line['op'] for line in read_lines(path)[1:]] == ['rollups', 'database', 'phase']
+
+    resumed = state.load_checkpoint()
+    assert resumed.pending_rollups == {'Estate Summary': rollup}, resumed.pending_rollups
+
+    resumed.settle_pending('rollups', {})
+    resumed.save_checkpoint()
+    assert resumed.load_checkpoint().pending_rollups == {}
+    print("✅ Pending rollups replayed after resume and cleared after the second pass")
+
+
+def test_legacy_pickle_checkpoint(tmp_path: Path):
+    """Checkpoints pickled by earlier versions still resume, then continue as a journal"""
+    print("=== Testing Legacy Checkpoint ===")
+    path = tmp_path / 'state'
+    legacy = DeploymentState(checkpoint_file=str(path))
+    legacy.created_databases['Contacts'] = 'db-7'
+    with open(path, 'wb') as f:
+        pickle.dump(legacy, f)
+
+    resumed = DeploymentState(checkpoint_file=str(path)).load_checkpoint()
+    assert resumed.created_databases == {'Contacts': 'db-7'}
+    resumed.save_checkpoint()
+    assert read_lines(path)[0]['op'] == 'snapshot'
+    print("✅ Pickled checkpoint loaded and rewritten as a journal")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ('append', 'replay', 'compact', 'rollups', 'legacy'):
+            (Path(tmp) / name).mkdir()
+        test_checkpoints_append_records(Path(tmp) / 'append')
+        test_resume_replays_and_survives_torn_write(Path(tmp) / 'replay')
+        test_periodic_compaction(Path(tmp) / 'compact')
+        test_resume_keeps_pending_rollups(Path(tmp) / 'rollups')
+        test_legacy_pickle_checkpoint(Path(tmp) / 'legacy')
+    print("\n🎉 All checkpoint journal tests passed!")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test concurrent page deployment driven by the hierarchy DAG
+Runs NotionTemplateDeployer.deploy_pages with a stubbed create_page (no API calls)
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+# Add the parent directory to sys.path to import deploy module
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import deploy
+    from deploy_test_helpers import FakeNotion, FakeResponse, make_deployer
+except ImportError as e:
+    print(f"❌ Failed to import deploy module: {e}")
+    sys.exit(1)
+
+
+def test_concurrent_page_deployment(tmp_path: Path):
+    """Parents must always exist before their children are created"""
+    print("=== Testing Concurrent Page Deployment ===")
+
+    created_order = []
+    active = [0]
+    peak = [0]
+    lock = threading.Lock()
+
+    def fake_create_page(page_data, state, parent_id=None):
+        parent = page_data.get('parent')
+        if parent:
+            assert parent in state.created_pages, f"'{page_data['title']}' created before parent '{parent}'"
+        else:
+            assert parent_id == 'root-page'
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        page_id = f"id-{page_data['title']}"
+        state.record_page(page_data['title'], page_id)
+        with lock:
+            active[0] -= 1
+            created_order.append(page_data['title'])
+        return page_id
+
+    original_create_page = deploy.create_page
+    deploy.create_page = fake_create_page
+    try:
+        pages = [
+            {'title': 'Root A'},
+            {'title': 'Root B'},
+            {'title': 'Root C'},
+            {'title': 'Child A1', 'parent': 'Root A'},
+            {'title': 'Child A2', 'parent': 'Root A'},
+            {'title': 'Grandchild A1', 'parent': 'Child A1'},
+            {'title': 'Child B1', 'parent': 'Root B'},
+        ]
+        deployer = make_deployer(str(tmp_path / 'state'), workers=4)
+        assert deployer.deploy_pages({'pages': pages})
+    finally:
+        deploy.create_page = original_create_page
+
+    assert len(created_order) == len(pages)
+    assert set(deployer.state.created_pages) == {p['title'] for p in pages}
+    assert peak[0] > 1, "Independent pages should be created concurrently"
+    print(f"✅ Created {len(created_order)} pages with peak concurrency {peak[0]}")
+
+
+def test_concurrent_failure_stops_scheduling(tmp_path: Path):
+    """A failed parent must stop its subtree from being scheduled"""
+    print("\n=== Testing Failure Handling ===")
+
+    def fake_create_page(page_data, state, parent_id=None):
+        if page_data['title'] == 'Broken':
+            return None
+        state.record_page(page_data['title'], f"id-{page_data['title']}")
+        return f"id-{page_data['title']}"
+
+    original_create_page = deploy.create_page
+    deploy.create_page = fake_create_page
+    try:
+        pages = [{'title': 'Broken'}, {'title': 'Orphaned', 'parent': 'Broken'}]
+        deployer = make_deployer(str(tmp_path / 'state'), workers=2)
+        assert not deployer.deploy_pages({'pages': pages})
+    finally:
+        deploy.create_page = original_create_page
+
+    assert 'Orphaned' not in deployer.state.created_pages
+    print("✅ Children of failed pages are not scheduled")
+
+
+class FlakyTeardown(FakeNotion):
+    """Fails one delete, loses a race with another and reports an archived block in listings"""
+
+    def __init__(self):
+        super().__init__()
+        blocks = [{'type': 'paragraph', 'paragraph': {'rich_text': [{'text': {'content': f"Block {i}"}}]}}
+                  for i in range(150)]
+        self.ids = self.add('root-page', *blocks[:100]) + self.add('root-page', *blocks[100:])
+        self.fail_on = {self.ids[10]}
+        self.raced = self.ids[20]
+        self.listed_archived = self.ids[3]
+        self.deleted = []
+        self._deleted_lock = threading.Lock()
+
+    def handle(self, method, path, body):
+        block_id = path.split('?')[0].split('/')[1]
+        if method == "DELETE":
+            if block_id in self.fail_on:
+                return FakeResponse(500, {'message': 'boom'})
+            if block_id == self.raced:
+                self.server.blocks[block_id]['archived'] = True  # archived by someone else first
+        response = super().handle(method, path, body)
+        if method == "GET":
+            for block in response.body['results']:
+                if block['id'] == self.listed_archived:
+                    block['archived'] = True
+        elif method == "DELETE" and response.status_code == 200:
+            time.sleep(0.002)
+            with self._deleted_lock:
+                assert block_id not in self.deleted, f"{block_id} deleted twice"
+                self.deleted.append(block_id)
+        return response
+
+
+def test_concurrent_clear_existing_content(tmp_path: Path):
+    """Teardown deletes top-level blocks in parallel and resumes without repeating work"""
+    print("\n=== Testing Concurrent Teardown ===")
+
+    fake = FlakyTeardown()
+    original_req = deploy.req
+    deploy.req = fake
+    try:
+        deployer = make_deployer(str(tmp_path / 'state'), workers=4)
+        assert not deployer.clear_existing_content(), "A failed delete must be reported"
+        assert len(deployer.state.cleared_blocks) == 148
+        assert fake.listed_archived not in fake.deleted
+
+        # Resume: only the failed block is retried
+        fake.fail_on.clear()
+        resumed = deployer.state.load_checkpoint()
+        deployer.state = resumed
+        before = len(fake.deleted)
+        assert deployer.clear_existing_content()
+        assert len(fake.deleted) == before + 1
+        assert deployer.state.content_cleared
+        assert deployer.clear_existing_content()  # No further calls once cleared
+    finally:
+        deploy.req = original_req
+
+    print(f"✅ Cleared {len(fake.deleted)} blocks concurrently; resume retried only the failure")
+
+
+if __name__ == "__main__":
+    import tempfile
+    deploy.PAGE_CREATE_PAUSE = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        test_concurrent_page_deployment(Path(tmp))
+        test_concurrent_failure_stops_scheduling(Path(tmp))
+        test_concurrent_clear_existing_content(Path(tmp))
+    print("\n🎉 All concurrent deployment tests passed!")
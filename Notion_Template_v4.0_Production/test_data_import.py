@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test seed-row and CSV import into created databases
+Runs NotionTemplateDeployer.import_data against an in-process mock Notion (no API calls)
+"""
+
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+# Add the parent directory to sys.path to import deploy module
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import deploy
+    from deploy_test_helpers import FakeNotion, FakeResponse, make_deployer
+except ImportError as e:
+    print(f"❌ Failed to import deploy module: {e}")
+    sys.exit(1)
+
+
+class ImportNotion(FakeNotion):
+    """The template's databases, with optional failures for row creation"""
+
+    def __init__(self, fail_titles=()):
+        super().__init__(latency=0.01)
+        self.fail_titles = set(fail_titles)
+        self.databases = {title: self.add_database(title) for title in ('Accounts', 'Bucket List')}
+        self.active = 0
+        self.peak = 0
+
+    def handle(self, method, path, body):
+        if method != "POST" or path != 'pages':
+            return super().handle(method, path, body)
+        title = ''.join(t['text']['content'] for t in body['properties']['Name']['title'])
+        if title in self.fail_titles:
+            return FakeResponse(400, {'message': 'validation_error'})
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            return super().handle(method, path, body)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def database_rows(self, title):
+        return self.rows(self.databases[title])
+
+
+YAML_DATA = {
+    'db': {
+        'schemas': {
+            'Accounts': {
+                'properties': {
+                    'Name': 'title',
+                    'Institution': 'text',
+                    'Type': 'select',
+                    'Balance': {'type': 'number'},
+                    'Tags': {'type': 'multi_select', 'options': ['Tax', 'Transfer']},
+                    'Closed': {'type': 'checkbox'},
+                    'Summary': {'type': 'formula', 'formula': 'prop("Name")'},
+                },
+                'seed_rows': [
+                    {'Name': f'Account {i}', 'Institution': 'Bank', 'Type': 'Bank',
+                     'Balance': '$1,200.50', 'Tags': ['Tax'], 'Closed': 'no', 'Summary': 'x'}
+                    for i in range(60)
+                ],
+            },
+            'Bucket List': {'properties': {'Name': 'title', 'Goal': 'text'}},
+        },
+        'seed_rows': {},
+    },
+}
+
+CSV_DATA = {
+    'Bucket_List': [{'name': 'Kyoto', 'Goal': 'Travel'}, {'name': 'Skydive', 'Goal': 'Adventure'}],
+    'Unknown_Sheet': [{'Name': 'ignored'}],
+}
+
+
+def run_import(fake: ImportNotion, deployer) -> bool:
+    deployer.state.created_databases = dict(fake.databases)
+    original_req = deploy.req
+    deploy.req = fake
+    try:
+        return deployer.import_data(CSV_DATA, json.loads(json.dumps(YAML_DATA)))
+    finally:
+        deploy.req = original_req
+
+
+def test_import_converts_and_parallelises(tmp_path: Path):
+    """Seed rows and matching CSV rows are created concurrently with typed properties"""
+    print("=== Testing Seed Row and CSV Import ===")
+    fake = ImportNotion()
+    deployer = make_deployer(str(tmp_path / 'state'))
+    assert run_import(fake, deployer)
+
+    assert len(fake.database_rows('Accounts')) == 60 and len(fake.database_rows('Bucket List')) == 2
+    account = fake.database_rows('Accounts')[0]['properties']
+    assert account['Balance']['number'] == 1200.5
+    assert account['Tags']['multi_select'] == [{'name': 'Tax'}]
+    assert account['Closed']['checkbox'] is False and 'Summary' not in account
+    assert fake.peak > 1, "Rows should be created concurrently"
+    assert set(deployer.state.processed_csv) == {'Accounts', 'Bucket List'}
+    print(f"✅ Imported 62 rows with peak concurrency {fake.peak}")
+
+
+def test_rerun_does_not_duplicate(tmp_path: Path):
+    """A fresh deploy state still skips rows already present in the database"""
+    print("=== Testing Import Deduplication ===")
+    fake = ImportNotion()
+    assert run_import(fake, make_deployer(str(tmp_path / 'first')))
+    creates = fake.count("POST", 'pages')
+    assert run_import(fake, make_deployer(str(tmp_path / 'second')))
+    assert fake.count("POST", 'pages') == creates, f"{fake.count('POST', 'pages') - creates} duplicate rows created"
+    print(f"✅ Rerun created 0 of {creates} existing rows")
+
+
+def test_resume_retries_failed_rows(tmp_path: Path):
+    """Failed rows leave the database unprocessed; resuming creates only what is missing"""
+    print("=== Testing Import Resume ===")
+    fake = ImportNotion(fail_titles={'Account 7', 'Account 42'})
+    deployer = make_deployer(str(tmp_path / 'state'))
+    assert not run_import(fake, deployer)
+    assert 'Accounts' not in deployer.state.processed_csv
+    assert len(deployer.state.imported_rows['Accounts']) == 58
+
+    resumed = deployer.state.load_checkpoint()
+    assert len(resumed.imported_rows['Accounts']) == 58, "Checkpoint saved after each row range"
+    deployer.state = resumed
+    fake.fail_titles.clear()
+    assert run_import(fake, deployer)
+    titles = [r['properties']['Name']['title'][0]['text']['content'] for r in fake.database_rows('Accounts')]
+    assert len(titles) == len(set(titles)) == 60
+    print("✅ Resume created the 2 failed rows without duplicates")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ('import', 'dedupe', 'resume'):
+            (Path(tmp) / name).mkdir()
+        test_import_converts_and_parallelises(Path(tmp) / 'import')
+        test_rerun_does_not_duplicate(Path(tmp) / 'dedupe')
+        test_resume_retries_failed_rows(Path(tmp) / 'resume')
+    print("\n🎉 All data import tests passed!")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Test offline deployment plans (--plan)
+Compiles full deployments with the planner standing in for the Notion API; any socket use fails the test
+"""
+
+import os
+import sys
+import json
+import socket
+import tempfile
+from pathlib import Path
+
+# Add the parent directory to sys.path to import deploy module
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import deploy
+    from modules.planner import placeholder_id
+    from deploy_test_helpers import make_deployer
+except ImportError as e:
+    print(f"❌ Failed to import deploy module: {e}")
+    sys.exit(1)
+
+SPLIT_YAML = Path(__file__).parent / 'split_yaml'
+
+PLAN_YAML = """
+pages:
+  - title: Estate Hub
+    description: Start here
+    blocks:
+      - type: toggle
+        content: Step 1
+        blocks:
+          - type: toggle
+            content: Level 2
+            blocks:
+              - type: toggle
+                content: Level 3
+                blocks:
+                  - type: paragraph
+                    content: Too deep to send inline
+  - title: Executor Guide
+    parent: Estate Hub
+    blocks:
+      - type: paragraph
+        content: For the executor
+db:
+  schemas:
+    Contacts:
+      properties:
+        Name: title
+        Role: select
+    Accounts:
+      properties:
+        Name: title
+        Balance: number
+  seed_rows:
+    Contacts:
+      - Name: Jane
+        Role: Attorney
+"""
+
+
+def no_network(*args, **kwargs):
+    raise AssertionError("plan mode opened a network connection")
+
+
+def run_plan(argv, workdir: Path):
+    original_connect, original_cwd = socket.socket.connect, os.getcwd()
+    socket.socket.connect = no_network
+    os.chdir(workdir)
+    try:
+        deployer = make_deployer(args=deploy.CLIInterface.setup_parser().parse_args(argv))
+        success = deployer.run_plan()
+    finally:
+        socket.socket.connect = original_connect
+        os.chdir(original_cwd)
+    with open(deployer.args.plan, encoding='utf-8') as f:
+        return success, deployer, json.load(f)
+
+
+def test_plan_resolves_placeholders(tmp_path: Path):
+    """Child pages, deferred blocks and seed rows point at the IDs created before them"""
+    print("=== Testing Plan Placeholder IDs ===")
+    yaml_dir = tmp_path / 'yaml'
+    yaml_dir.mkdir()
+    (yaml_dir / '01_plan.yaml').write_text(PLAN_YAML, encoding='utf-8')
+    plan_file = tmp_path / 'plan.json'
+
+    success, deployer, plan = run_plan(['--plan', str(plan_file), '--yaml-dir', str(yaml_dir),
+                                        '--csv-dir', str(tmp_path / 'csv')], tmp_path)
+    assert success and plan['complete']
+    assert not (tmp_path / deploy.DeploymentState.checkpoint_file).exists(), "Plan wrote a real checkpoint"
+    assert not list(tmp_path.glob('.notion_deploy_manifest*')), "Plan wrote a real manifest"
+
+    requests = plan['requests']
+    pages = deployer.state.created_pages
+    databases = deployer.state.created_databases
+    assert all(page_id.startswith(placeholder_id(0)[:24]) for page_id in pages.values())
+
+    guide = next(r for r in requests if r['endpoint'] == 'POST /pages'
+                 and 'Executor Guide' in json.dumps(r['body']))
+    assert guide['body']['parent']['page_id'] == pages['Estate Hub']
+
+    appends = [r for r in requests if r['endpoint'] == 'PATCH /blocks/{id}/children']
+    assert appends, "Deeply nested toggle should be appended in a follow-up request"
+    assert all(placeholder_id(0)[:24] in r['url'] for r in appends)
+
+    rows = [r for r in requests if r['endpoint'] == 'POST /pages' and 'database_id' in r['body']['parent']]
+    assert [r['body']['parent']['database_id'] for r in rows] == [databases['Contacts']]
+    print(f"✅ {len(requests)} requests with placeholder IDs resolved between them")
+
+
+RELATION_YAML = """
+db:
+  schemas:
+    Accounts:
+      properties:
+        Name: title
+        Owner:
+          type: relation
+          database_id: Contacts
+        Orphan:
+          type: relation
+          database_id: null
+    Contacts:
+      properties:
+        Name: title
+"""
+
+
+def test_plan_defers_forward_relations(tmp_path: Path):
+    """A relation to a database created later is PATCHed in once it exists; an unset target is reported"""
+    print("=== Testing Deferred Relations ===")
+    yaml_dir = tmp_path / 'yaml'
+    yaml_dir.mkdir()
+    (yaml_dir / '01_relations.yaml').write_text(RELATION_YAML, encoding='utf-8')
+    success, deployer, plan = run_plan(['--plan', str(tmp_path / 'plan.json'), '--yaml-dir', str(yaml_dir),
+                                        '--csv-dir', str(tmp_path / 'csv')], tmp_path)
+    assert success and plan['complete']
+    databases = deployer.state.created_databases
+    requests = plan['requests']
+
+    created = next(r for r in requests if r['endpoint'] == 'POST /databases'
+                   and r['body']['title'][0]['text']['content'] == 'Accounts')
+    assert 'Owner' not in created['body']['properties'] and 'Orphan' not in created['body']['properties']
+    patch = next(r for r in requests if r['endpoint'] == 'PATCH /databases/{id}' and databases['Accounts'] in r['url'])
+    assert patch['body']['properties']['Owner']['relation']['database_id'] == databases['Contacts']
+    assert 'Orphan' not in patch['body']['properties']
+    assert any(e['item'] == 'Accounts.Orphan' for e in deployer.state.errors)
+    assert not deployer.state.pending_relations
+    print("✅ Forward relation added after Contacts was created; unset target reported")
+
+
+def test_plan_summary_estimate(tmp_path: Path):
+    """The summary counts every request and estimates time at the configured rate"""
+    print("=== Testing Plan Summary ===")
+    plan_file = tmp_path / 'plan.json'
+    success, deployer, plan = run_plan(['--plan', str(plan_file), '--csv-dir', str(tmp_path / 'csv')], tmp_path)
+    summary = plan['summary']
+
+    assert success and plan['complete']
+    assert summary['requests'] == len(plan['requests']) > 300
+    assert sum(summary['by_endpoint'].values()) == sum(summary['by_phase'].values()) == summary['requests']
+    assert summary['by_class']['read'] + summary['by_class']['write'] == summary['requests']
+    limiter = deploy.get_rate_limiter()
+    if limiter.enabled:
+        assert summary['estimated_seconds'] >= round(summary['requests'] / limiter.max_rps, 1)
+    assert plan['pages'] == len(deployer.state.created_pages) > 200
+    print(f"✅ {summary['requests']} requests for {SPLIT_YAML.name}, "
+          f"~{summary['estimated_seconds']}s at {summary['rate_rps']} rps")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ('placeholders', 'relations', 'summary'):
+            (Path(tmp) / name).mkdir()
+        test_plan_resolves_placeholders(Path(tmp) / 'placeholders')
+        test_plan_defers_forward_relations(Path(tmp) / 'relations')
+        test_plan_summary_estimate(Path(tmp) / 'summary')
+    print("\n🎉 All deployment plan tests passed!")
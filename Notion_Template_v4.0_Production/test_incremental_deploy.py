@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test incremental redeploys driven by the deployment manifest
+Runs the manifest diff against an in-process mock Notion (no API calls)
+"""
+
+import sys
+from pathlib import Path
+
+# Add the parent directory to sys.path to import deploy module
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import deploy
+    from modules.manifest import DeploymentManifest, diff_block_span, page_fingerprints
+    from deploy_test_helpers import FakeNotion, make_deployer
+except ImportError as e:
+    print(f"❌ Failed to import deploy module: {e}")
+    sys.exit(1)
+
+
+def page(title, lines, parent=None):
+    data = {'title': title, 'blocks': [{'type': 'paragraph', 'content': line} for line in lines]}
+    if parent:
+        data['parent'] = parent
+    return data
+
+
+def deploy_manifest_entry(deployer, fake, data):
+    """Simulate a previous deployment of a page into the fake workspace"""
+    parent = deployer.manifest.pages.get(data.get('parent'), {}).get('id', 'root')
+    page_id = fake.add_page(data['title'], parent, deployer._page_blocks(data))
+    meta, content = page_fingerprints(data)
+    deployer.manifest.pages[data['title']] = {
+        'id': page_id, 'parent': data.get('parent', ''), 'meta': meta, 'content': content,
+        'blocks': [deploy.fingerprint(b) for b in deployer._page_blocks(data)],
+    }
+    return page_id
+
+
+def test_diff_block_span():
+    print("=== Testing Block Span Diff ===")
+    assert diff_block_span(list("abcde"), list("abXde")) == (2, 2)
+    assert diff_block_span(list("abc"), list("abc")) == (3, 0)
+    assert diff_block_span(list("abc"), list("Xabc")) == (0, 3)
+    assert diff_block_span(list("aaa"), list("aa")) == (2, 0)
+    print("✅ Changed spans detected")
+
+
+def test_incremental_pages(tmp_path: Path):
+    """A one-line edit costs a handful of calls; moved and removed pages are archived"""
+    print("\n=== Testing Incremental Page Sync ===")
+    fake = FakeNotion(root_ids=['root'])
+    manifest = DeploymentManifest(str(tmp_path / 'manifest.json'), 'root')
+    deployer = make_deployer(str(tmp_path / 'state'), parent_id='root', manifest=manifest.path, incremental=True)
+    deployer.manifest = manifest
+
+    lines = [f"line {i}" for i in range(40)]
+    guide_id = deploy_manifest_entry(deployer, fake, page('Guide', lines))
+    deploy_manifest_entry(deployer, fake, page('Unchanged', ['same']))
+    moved_id = deploy_manifest_entry(deployer, fake, page('Moved', ['x'], parent='Guide'))
+    removed_id = deploy_manifest_entry(deployer, fake, page('Removed', ['gone']))
+    page_ids = {entry['id'] for entry in manifest.pages.values()}
+
+    edited = list(lines)
+    edited[20] = "line 20 (edited)"
+    yaml_data = {'pages': [page('Guide', edited), page('Unchanged', ['same']),
+                           page('Moved', ['x'], parent='Unchanged'), page('New', ['fresh'])]}
+
+    original_req = deploy.req
+    deploy.req = fake
+    try:
+        assert deployer.sync_incremental_pages(yaml_data)
+        deployer.record_manifest_pages(yaml_data)
+    finally:
+        deploy.req = original_req
+
+    assert [text for text, _ in fake.texts(guide_id)] == edited
+    assert set(deployer.state.created_pages) == {'Guide', 'Unchanged'}
+    archived = [path for method, path in fake.calls if method == "DELETE" and path.split('/')[1] in page_ids]
+    assert sorted(archived) == sorted([f'blocks/{moved_id}', f'blocks/{removed_id}'])
+    page_calls = [c for c in fake.calls if c not in [("DELETE", path) for path in archived]]
+    assert len(page_calls) == 3, page_calls  # list, insert after, delete the old block
+    assert 'New' not in manifest.pages and 'Removed' not in manifest.pages
+    print(f"✅ Edit applied with {len(page_calls)} calls; {len(archived)} pages archived")
+
+
+def test_manifest_roundtrip(tmp_path: Path):
+    print("\n=== Testing Manifest Persistence ===")
+    manifest = DeploymentManifest(str(tmp_path / 'roundtrip.json'), 'root')
+    manifest.pages['A'] = {'id': 'a', 'parent': '', 'meta': 'm', 'content': 'c', 'blocks': []}
+    manifest.save()
+    assert DeploymentManifest.load(manifest.path, 'root').pages == manifest.pages
+    assert DeploymentManifest.load(manifest.path, 'other-root').pages == {}
+    print("✅ Manifest saved and scoped to its deployment root")
+
+
+if __name__ == "__main__":
+    import tempfile
+    test_diff_block_span()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_incremental_pages(Path(tmp))
+        test_manifest_roundtrip(Path(tmp))
+    print("\n🎉 All incremental deploy tests passed!")
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Test the local mock Notion API and the deployment benchmark harness
+deploy.req talks to modules.mock_notion over HTTP on localhost (no workspace or token needed)
+"""
+
+import os
+import sys
+import json
+import tempfile
+import subprocess
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to sys.path to import deploy module
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import deploy
+    from modules import async_notion_api
+    from modules.mock_notion import MockNotionServer, ARCHIVED_MESSAGE
+    from modules.rate_limiter import configure_rate_limiter
+except ImportError as e:
+    print(f"❌ Failed to import deploy module: {e}")
+    sys.exit(1)
+
+ROOT = '11111111-1111-4111-8111-111111111111'
+
+BENCH_YAML = """
+pages:
+  - title: Estate Hub
+    blocks:
+      - type: paragraph
+        content: Start here
+  - title: Executor Guide
+    parent: Estate Hub
+    blocks:
+      - type: to_do
+        content: Find the will
+db:
+  schemas:
+    Contacts:
+      properties:
+        Name: title
+        Role: select
+  seed_rows:
+    Contacts:
+      - Name: Jane
+        Role: Attorney
+"""
+
+
+@contextmanager
+def pointed_at(mock: MockNotionServer):
+    """Send deploy's requests to the mock
+
+    deploy and the v4.1 enhancements copy NOTION_API_BASE when they are
+    imported, so the copies are patched rather than the environment.
+    """
+    with pytest.MonkeyPatch.context() as patch:
+        for module in (deploy, async_notion_api, getattr(deploy, 'v41', None)):
+            if module is not None:
+                patch.setattr(module, 'NOTION_API_BASE', mock.base_url)
+        yield mock
+
+
+@pytest.fixture(scope='module')
+def server():
+    with MockNotionServer(root_ids=[ROOT], seed=7) as mock, pointed_at(mock):
+        yield mock
+
+
+def api(path: str) -> str:
+    return f"{deploy.NOTION_API_BASE}{path}"
+
+
+def create_page(title: str, parent: str = ROOT, children=()):
+    r = deploy.req("POST", api("/pages"), data=json.dumps({
+        'parent': {'page_id': parent},
+        'properties': {'title': {'title': [{'text': {'content': title}}]}},
+        'children': list(children),
+    }))
+    assert r.status_code == 200, r.text
+    return r.json()['id']
+
+
+def paragraph(text: str):
+    return {'paragraph': {'rich_text': [{'text': {'content': text}}]}}
+
+
+def test_pages_blocks_and_pagination(server: MockNotionServer):
+    """Pages and appended blocks are listed back in order, 100 per page"""
+    print("=== Testing Pages, Blocks and Pagination ===")
+    page_id = create_page('Checklist', children=[paragraph('first')])
+    for start in (1, 101):
+        r = deploy.req("PATCH", api(f"/blocks/{page_id}/children"),
+                       data=json.dumps({'children': [paragraph(f"item {i}") for i in range(start, start + 100)]}))
+        assert r.status_code == 200 and len(r.json()['results']) == 100
+
+    first = deploy.req("GET", api(f"/blocks/{page_id}/children?page_size=100")).json()
+    second = deploy.req("GET", api(f"/blocks/{page_id}/children?page_size=100"
+                                   f"&start_cursor={first['next_cursor']}")).json()
+    rest = deploy.req("GET", api(f"/blocks/{page_id}/children?page_size=100"
+                                 f"&start_cursor={second['next_cursor']}")).json()
+    texts = [b['paragraph']['rich_text'][0]['text']['content'] for b in first['results'] + second['results'] + rest['results']]
+    assert first['has_more'] and second['has_more'] and not rest['has_more']
+    assert texts == ['first'] + [f"item {i}" for i in range(1, 201)]
+
+    too_many = deploy.req("PATCH", api(f"/blocks/{page_id}/children"),
+                          data=json.dumps({'children': [paragraph('x')] * 101}))
+    assert too_many.status_code == 400 and too_many.json()['code'] == 'validation_error'
+    print("✅ 201 blocks listed over 3 pages; 101-child append rejected")
+
+
+def test_archived_block_errors(server: MockNotionServer):
+    """Deleted blocks disappear from listings and reject further edits, as do their children"""
+    print("=== Testing Archived Block Errors ===")
+    page_id = create_page('Old Page', children=[paragraph('keep out')])
+    child_id = deploy.req("GET", api(f"/blocks/{page_id}/children")).json()['results'][0]['id']
+    assert deploy.req("DELETE", api(f"/blocks/{page_id}")).status_code == 200
+
+    listed = [b['id'] for b in deploy.req("GET", api(f"/blocks/{ROOT}/children")).json()['results']]
+    assert page_id not in listed
+    for target in (page_id, child_id):
+        r = deploy.req("PATCH", api(f"/blocks/{target}/children"), data=json.dumps({'children': [paragraph('x')]}))
+        assert r.status_code == 400 and r.json()['message'] == ARCHIVED_MESSAGE
+    assert deploy.req("DELETE", api(f"/blocks/{page_id}")).status_code == 400
+    missing = deploy.req("GET", api("/blocks/22222222-2222-4222-8222-222222222222/children"))
+    assert missing.status_code == 404 and missing.json()['code'] == 'object_not_found'
+    print("✅ Archived page and its children rejected edits; unknown block returned 404")
+
+
+def test_rate_limit_injection(server: MockNotionServer):
+    """429s carry Retry-After and deploy.req backs off until the request succeeds"""
+    print("=== Testing 429 Injection ===")
+    limiter = configure_rate_limiter(rps=0)
+    server.rate_limit_rate, server.retry_after = 0.3, 0
+    server.reset_stats()
+    try:
+        ids = [create_page(f"Page {i}") for i in range(20)]
+    finally:
+        server.rate_limit_rate = 0.0
+    stats = server.snapshot()
+    assert len(set(ids)) == 20
+    assert stats['rate_limited'] > 0 and limiter.rate_limited_count == stats['rate_limited']
+    assert stats['requests'] == 20 + stats['rate_limited']
+
+    strict = MockNotionServer(rps=5, burst=2, retry_after=2)
+    rejected = [strict.handle('POST', '/v1/search', b'{}') for _ in range(4)]
+    assert [status for status, _, _ in rejected] == [200, 200, 429, 429]
+    assert rejected[2][2]['Retry-After'] == '2'
+    strict.httpd.server_close()
+    print(f"✅ {stats['rate_limited']} injected 429s retried; server rate limit answers 429 over burst")
+
+
+def test_benchmark_harness(tmp_path: Path):
+    """benchmark_deploy.py deploys a small template against the mock and reports counts"""
+    print("=== Testing Benchmark Harness ===")
+    yaml_dir = tmp_path / 'yaml'
+    yaml_dir.mkdir()
+    (yaml_dir / '01_bench.yaml').write_text(BENCH_YAML, encoding='utf-8')
+    results_file = tmp_path / 'results.json'
+    env = {k: v for k, v in os.environ.items() if k != 'NOTION_API_BASE'}
+    env['PAGE_CREATE_PAUSE'] = '0'
+    proc = subprocess.run(
+        [sys.executable, str(Path(__file__).parent / 'benchmark_deploy.py'),
+         '--yaml-dir', str(yaml_dir), '--csv-dir', str(tmp_path / 'csv'), '--incremental',
+         '--throttle-rps', '0', '--latency', '0.005', '--json', str(results_file)],
+        cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stdout[-2000:] + proc.stderr[-2000:]
+
+    full, incremental = json.loads(results_file.read_text())['runs']
+    assert full['success'] and incremental['success']
+    assert full['by_endpoint']['POST /pages'] == 3  # two pages and one seed row
+    assert full['by_endpoint']['POST /databases'] == 1 and full['blocks_created'] == 2
+    assert full['requests'] == sum(full['by_endpoint'].values()) and full['requests_per_s'] > 0
+    assert 'POST /pages' not in incremental['by_endpoint'], "Incremental redeploy recreated pages or rows"
+    print(f"✅ Full deploy {full['requests']} requests in {full['wall_time_s']:.2f}s, "
+          f"incremental {incremental['requests']}")
+
+
+if __name__ == "__main__":
+    with MockNotionServer(root_ids=[ROOT], seed=7) as mock, pointed_at(mock):
+        test_pages_blocks_and_pagination(mock)
+        test_archived_block_errors(mock)
+        test_rate_limit_injection(mock)
+    with tempfile.TemporaryDirectory() as tmp:
+        test_benchmark_harness(Path(tmp))
+    print("\n🎉 All mock Notion tests passed!")
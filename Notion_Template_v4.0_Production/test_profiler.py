@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test the deployment profiler
+Drives deploy.req through a fake session and checks the per-phase/per-endpoint report
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Add the parent directory to sys.path to import deploy module
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import deploy
+    from modules.profiler import endpoint_key, percentile, get_profiler
+    from modules.rate_limiter import NotionRateLimiter
+    from deploy_test_helpers import FakeResponse
+except ImportError as e:
+    print(f"❌ Failed to import deploy module: {e}")
+    sys.exit(1)
+
+PAGE_ID = "12345678-1234-1234-1234-123456789abc"
+
+
+class FakeSession:
+    """Answers with a scripted sequence of status codes"""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+
+    def request(self, method, url, **kwargs):
+        status = self.statuses.pop(0)
+        return FakeResponse(status, headers={'Retry-After': '0'} if status == 429 else {})
+
+
+def test_endpoint_key():
+    print("=== Testing Endpoint Normalisation ===")
+    assert endpoint_key("patch", f"https://api.notion.com/v1/blocks/{PAGE_ID}/children?page_size=100") \
+        == "PATCH /blocks/{id}/children"
+    assert endpoint_key("POST", "https://api.notion.com/v1/pages") == "POST /pages"
+    assert endpoint_key("GET", f"https://api.notion.com/v1/pages/{PAGE_ID.replace('-', '')}") == "GET /pages/{id}"
+    print("✅ IDs and query strings collapse into one endpoint")
+
+
+def test_percentile():
+    print("\n=== Testing Percentiles ===")
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) == 0.0
+    print("✅ Nearest-rank percentiles")
+
+
+def test_request_report(tmp_path: Path):
+    """Requests land in the phase that was active and the endpoint they hit"""
+    print("\n=== Testing Request Instrumentation ===")
+    profiler = get_profiler()
+    profiler.enable()
+    original_session, original_limiter = deploy._SESSION, deploy.get_rate_limiter
+    unlimited = NotionRateLimiter(rps=0)
+    deploy.get_rate_limiter = lambda: unlimited
+    deploy._SESSION = FakeSession([200, 429, 200, 200])
+    try:
+        state = deploy.DeploymentState(checkpoint_file=str(tmp_path / 'state'))
+        state.phase = deploy.DeploymentPhase.PAGES
+        deploy.req("POST", "https://api.notion.com/v1/pages", data=json.dumps({"title": "x"}))
+        deploy.req("POST", "https://api.notion.com/v1/pages", data="{}")
+        state.phase = deploy.DeploymentPhase.DATABASES
+        deploy.req("GET", f"https://api.notion.com/v1/databases/{PAGE_ID}")
+        deploy.build_block({'type': 'paragraph', 'content': 'hello'})
+        report = profiler.write_report(str(tmp_path / 'profile.json'))
+    finally:
+        deploy._SESSION, deploy.get_rate_limiter = original_session, original_limiter
+        profiler.enabled = False
+
+    pages = report['phases']['pages']
+    assert pages['requests'] == 3 and pages['status_429'] == 1 and pages['retries'] == 1
+    assert pages['bytes_sent'] == len(json.dumps({"title": "x"})) + 4
+    assert report['phases']['databases']['requests'] == 1
+    assert report['endpoints']['POST /pages']['requests'] == 3
+    assert report['endpoints']['GET /databases/{id}']['requests'] == 1
+    assert report['local_work']['build_block']['calls'] == 1
+    assert json.loads((tmp_path / 'profile.json').read_text())['phases'].keys() == report['phases'].keys()
+    print(f"✅ Report covers phases {list(report['phases'])}")
+
+
+def test_disabled_is_noop():
+    print("\n=== Testing Disabled Profiler ===")
+    profiler = get_profiler()
+    profiler.reset()
+    profiler.record_request("GET", "https://api.notion.com/v1/pages", 200, 0.1)
+    deploy.build_block({'type': 'paragraph', 'content': 'hello'})
+    assert not profiler.endpoints and not profiler.local_work
+    print("✅ Nothing collected unless --profile is given")
+
+
+if __name__ == "__main__":
+    import tempfile
+    test_endpoint_key()
+    test_percentile()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_request_report(Path(tmp))
+    test_disabled_is_noop()
+    print("\n🎉 All profiler tests passed!")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test the shared token-bucket rate limiter used by every Notion API caller
+"""
+
+import sys
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+# Add the parent directory to sys.path to import modules package
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    from modules.rate_limiter import TokenBucket, NotionRateLimiter, READ, WRITE, parse_retry_after
+except ImportError as e:
+    print(f"❌ Failed to import rate limiter: {e}")
+    sys.exit(1)
+
+
+def test_burst_then_steady_rate():
+    """Burst capacity is granted immediately, then the steady rate applies"""
+    print("=== Testing Burst Capacity ===")
+    bucket = TokenBucket(rate=20, capacity=3)
+
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.05, "Burst tokens should not wait"
+
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+    assert 0.15 <= elapsed < 0.4, f"Expected ~0.2s at 20 rps, got {elapsed:.3f}s"
+    print(f"✅ Burst of 3 immediate, 4 more took {elapsed:.3f}s")
+
+
+def test_thread_safety():
+    """Concurrent threads share one budget"""
+    print("\n=== Testing Thread Safety ===")
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(11)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - start
+    assert elapsed >= 0.18, f"11 requests at 50 rps with burst 1 need ~0.2s, got {elapsed:.3f}s"
+    print(f"✅ 11 threaded acquires took {elapsed:.3f}s")
+
+
+def test_async_acquire():
+    """Async callers wait without blocking the event loop"""
+    print("\n=== Testing Async Acquire ===")
+    limiter = NotionRateLimiter(rps=50, burst=1)
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire_async("GET") for _ in range(6)))
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(run())
+    assert elapsed >= 0.08, f"Expected ~0.1s, got {elapsed:.3f}s"
+    print(f"✅ 6 async acquires took {elapsed:.3f}s")
+
+
+def test_endpoint_classes():
+    """Reads and writes are classified into separate budgets"""
+    print("\n=== Testing Endpoint Classification ===")
+    classify = NotionRateLimiter.classify
+    assert classify("GET", "https://api.notion.com/v1/blocks/x/children") == READ
+    assert classify("POST", "https://api.notion.com/v1/databases/x/query") == READ
+    assert classify("POST", "https://api.notion.com/v1/pages") == WRITE
+    assert classify("PATCH", "https://api.notion.com/v1/blocks/x/children") == WRITE
+    assert classify("DELETE", "https://api.notion.com/v1/blocks/x") == WRITE
+    print("✅ Read/write classification correct")
+
+
+def test_rate_limited_backoff_and_recovery():
+    """A 429 pauses all buckets and halves the rate, successes recover it"""
+    print("\n=== Testing 429 Backoff ===")
+    limiter = NotionRateLimiter(rps=4, burst=2, min_rps=1, recovery_step=1)
+    limiter.on_rate_limited(0.2)
+    assert limiter.global_bucket.rate == 2
+    assert limiter.rate_limited_count == 1
+
+    start = time.monotonic()
+    limiter.acquire("POST", "https://api.notion.com/v1/pages")
+    assert time.monotonic() - start >= 0.18, "Requests must wait for Retry-After"
+
+    limiter.on_success()
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.global_bucket.rate == 4, "Rate should recover to the configured ceiling"
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) == 5.0
+    print("✅ Backoff and recovery work")
+
+
+if __name__ == "__main__":
+    test_burst_then_steady_rate()
+    test_thread_safety()
+    test_async_acquire()
+    test_endpoint_classes()
+    test_rate_limited_backoff_and_recovery()
+    print("\n🎉 All rate limiter tests passed!")
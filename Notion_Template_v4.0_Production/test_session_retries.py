@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test which failed requests the shared deploy session replays
+Runs deploy.get_session against a local HTTP server that answers with a fixed status
+"""
+
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add the parent directory to sys.path to import deploy module
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import deploy
+except ImportError as e:
+    print(f"❌ Failed to import deploy module: {e}")
+    sys.exit(1)
+
+
+class StatusServer:
+    """Answers every request with ``status`` and counts hits per method"""
+
+    def __init__(self, status: int):
+        self.status = status
+        self.hits = {}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _dispatch(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                server.hits[self.command] = server.hits.get(self.command, 0) + 1
+                self.send_response(server.status)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'{}')
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _dispatch
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1/pages"
+
+    def __enter__(self) -> 'StatusServer':
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def fresh_session():
+    """Build deploy's shared session config with 3 retries and no backoff sleeps"""
+    saved = {name: os.environ.get(name) for name in ('RETRY_MAX', 'RETRY_BACKOFF_BASE')}
+    os.environ.update(RETRY_MAX='3', RETRY_BACKOFF_BASE='0')
+    original = deploy._SESSION
+    deploy._SESSION = None
+    try:
+        return deploy.get_session()
+    finally:
+        deploy._SESSION = original
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name)
+            else:
+                os.environ[name] = value
+
+
+def test_500_replayed_for_idempotent_methods_only():
+    """A 500 on a write may have been applied, so only reads and deletes are retried"""
+    print("=== Testing 500 Retries ===")
+    session = fresh_session()
+    with StatusServer(500) as server:
+        for method in ("GET", "DELETE", "POST", "PATCH"):
+            assert session.request(method, server.url, data='{}', timeout=5).status_code == 500
+    assert server.hits == {'GET': 4, 'DELETE': 4, 'POST': 1, 'PATCH': 1}, server.hits
+    print(f"✅ 500s: {server.hits}")
+
+
+def test_gateway_errors_replayed_for_every_method():
+    """502/503/504 never reached the API, so writes are retried too"""
+    print("\n=== Testing Gateway Error Retries ===")
+    session = fresh_session()
+    with StatusServer(503) as server:
+        for method in ("GET", "POST", "PATCH"):
+            assert session.request(method, server.url, data='{}', timeout=5).status_code == 503
+    assert server.hits == {'GET': 4, 'POST': 4, 'PATCH': 4}, server.hits
+    print(f"✅ 503s: {server.hits}")
+
+
+if __name__ == "__main__":
+    test_500_replayed_for_idempotent_methods_only()
+    test_gateway_errors_replayed_for_every_method()
+    print("\n🎉 All session retry tests passed!")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test the YAML snapshot cache and memoized load_all_yaml
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to sys.path to import deploy module
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import deploy
+    from modules.yaml_cache import YamlSnapshotCache
+except ImportError as e:
+    print(f"❌ Failed to import deploy module: {e}")
+    sys.exit(1)
+
+
+def write(path: Path, text: str):
+    path.write_text(text, encoding='utf-8')
+    # Ensure a distinct mtime even on coarse filesystems
+    stamp = time.time() + len(text)
+    os.utime(path, (stamp, stamp))
+
+
+def test_snapshot_cache(tmp_path: Path):
+    """Unchanged files come from the snapshot, edited files are re-parsed"""
+    print("=== Testing YAML Snapshot Cache ===")
+    yaml_dir = tmp_path / 'yaml'
+    yaml_dir.mkdir()
+    write(yaml_dir / '01.yaml', "pages:\n  - title: One\n")
+    write(yaml_dir / '02.yaml', "pages:\n  - title: Two\n")
+    snapshot = str(tmp_path / 'snapshot.pickle')
+
+    cache = YamlSnapshotCache(snapshot)
+    for f in sorted(yaml_dir.glob('*.yaml')):
+        cache.load(f)
+    cache.save()
+    assert (cache.misses, cache.hits) == (2, 0)
+
+    # A new process reuses the snapshot; a touched-but-identical file is matched by hash
+    os.utime(yaml_dir / '01.yaml', (1, 1))
+    write(yaml_dir / '02.yaml', "pages:\n  - title: Two (edited)\n")
+    cache = YamlSnapshotCache(snapshot)
+    assert cache.load(yaml_dir / '01.yaml') == {'pages': [{'title': 'One'}]}
+    assert cache.load(yaml_dir / '02.yaml') == {'pages': [{'title': 'Two (edited)'}]}
+    assert (cache.misses, cache.hits) == (1, 1)
+    print("✅ Snapshot reused for unchanged files")
+
+
+def test_load_all_yaml_memo(tmp_path: Path):
+    """Repeated loads return equal, independent copies and pick up edits"""
+    print("\n=== Testing Memoized load_all_yaml ===")
+    yaml_dir = tmp_path / 'memo'
+    yaml_dir.mkdir()
+    write(yaml_dir / '01.yaml', "pages:\n  - title: Home\n    description: ${MISSING_VAR:-fallback}\n")
+
+    original_file, original_cache = deploy.YAML_CACHE_FILE, deploy._YAML_CACHE
+    deploy.YAML_CACHE_FILE = str(tmp_path / 'memo.pickle')
+    deploy._YAML_CACHE = None
+    try:
+        first = deploy.load_all_yaml(yaml_dir)
+        assert first['pages'][0]['description'] == 'fallback'
+        first['pages'].append({'title': 'mutated'})
+        second = deploy.load_all_yaml(yaml_dir)
+        assert [p['title'] for p in second['pages']] == ['Home']
+
+        write(yaml_dir / '01.yaml', "pages:\n  - title: Home v2\n")
+        assert deploy.load_all_yaml(yaml_dir)['pages'][0]['title'] == 'Home v2'
+        assert deploy.get_yaml_cache().path == deploy.YAML_CACHE_FILE
+    finally:
+        deploy.YAML_CACHE_FILE, deploy._YAML_CACHE = original_file, original_cache
+    print("✅ Memoized result is copied and invalidated on edit")
+
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_snapshot_cache(Path(tmp))
+        test_load_all_yaml_memo(Path(tmp))
+    print("\n🎉 All YAML cache tests passed!")